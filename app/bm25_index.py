@@ -0,0 +1,401 @@
+"""BM25 inverted index persisted in SQLite, one logical index per collection.
+
+Built next to the Chroma collection at index time so lexical matches (clause
+numbers, product codes, exact CJK terms) are retrievable without over-fetching
+vector candidates. Tokenisation reuses the reranker's CJK-aware ``_tokenize``
+plus compound tokens for dotted/hyphenated codes such as ``5.2.3`` or
+``ABC-123``.
+
+Per (tenant, project) document frequencies are maintained alongside the
+postings so the TF-IDF fallback reranker can score candidates with corpus IDF
+instead of IDF over the handful of retrieved chunks.
+
+Storage location:
+  - ``LIGHTRAG_BM25_PATH`` if set
+  - ``$CHROMA_PERSIST_DIR/bm25.sqlite3`` when Chroma is persistent
+  - in-memory otherwise
+
+With a remote Chroma (``CHROMA_HOST``) every API and worker process shares the
+vectors, so a per-process in-memory BM25 table would disagree between them;
+BM25 (lexical channel and constraint pushdown) is disabled in that setup
+unless ``LIGHTRAG_BM25_PATH`` points at a shared file.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+from functools import lru_cache
+from typing import Any
+
+from app.reranker import _tokenize
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_COMPOUND_TOKEN_RE = re.compile(r"[A-Za-z0-9]+(?:[.\-_/][A-Za-z0-9]+)+")
+_FILTER_COLUMNS = ("tenant_id", "project_id", "supplier_id", "document_id", "doc_type")
+
+
+def index_terms(text: str) -> list[str]:
+    """Tokens indexed for *text*: CJK unigrams, Latin/digit runs and compound codes."""
+    tokens = _tokenize(text)
+    tokens.extend(m.group(0).lower() for m in _COMPOUND_TOKEN_RE.finditer(text))
+    return tokens
+
+
+class Bm25Index:
+    """SQLite-backed BM25 index. Thread-safe; safe to share process-wide."""
+
+    def __init__(self, path: str = ":memory:", *, k1: float = BM25_K1, b: float = BM25_B) -> None:
+        self._k1 = k1
+        self._b = b
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS bm25_docs (
+                index_name TEXT NOT NULL,
+                chunk_id TEXT NOT NULL,
+                tenant_id TEXT NOT NULL DEFAULT '',
+                project_id TEXT NOT NULL DEFAULT '',
+                supplier_id TEXT NOT NULL DEFAULT '',
+                document_id TEXT NOT NULL DEFAULT '',
+                doc_type TEXT NOT NULL DEFAULT '',
+                doc_len INTEGER NOT NULL,
+                text TEXT NOT NULL,
+                metadata TEXT NOT NULL,
+                PRIMARY KEY (index_name, chunk_id)
+            );
+            CREATE TABLE IF NOT EXISTS bm25_postings (
+                index_name TEXT NOT NULL,
+                term TEXT NOT NULL,
+                chunk_id TEXT NOT NULL,
+                tf INTEGER NOT NULL,
+                PRIMARY KEY (index_name, term, chunk_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_bm25_postings_chunk ON bm25_postings (index_name, chunk_id);
+            CREATE INDEX IF NOT EXISTS idx_bm25_docs_scope ON bm25_docs (tenant_id, project_id, chunk_id);
+            CREATE TABLE IF NOT EXISTS bm25_term_stats (
+                tenant_id TEXT NOT NULL,
+                project_id TEXT NOT NULL,
+                term TEXT NOT NULL,
+                df INTEGER NOT NULL,
+                PRIMARY KEY (tenant_id, project_id, term)
+            );
+            CREATE TABLE IF NOT EXISTS bm25_scope_stats (
+                tenant_id TEXT NOT NULL,
+                project_id TEXT NOT NULL,
+                n_docs INTEGER NOT NULL,
+                PRIMARY KEY (tenant_id, project_id)
+            );
+            """
+        )
+        self._conn.commit()
+        self._backfill_scope_stats()
+
+    def upsert(self, *, index_name: str, docs: list[tuple[str, str, dict[str, Any]]]) -> int:
+        """Index ``(chunk_id, text, metadata)`` rows, replacing earlier postings."""
+        if not docs:
+            return 0
+        doc_rows: list[tuple[Any, ...]] = []
+        posting_rows: list[tuple[str, str, str, int]] = []
+        for chunk_id, text, metadata in docs:
+            terms = Counter(index_terms(text))
+            doc_rows.append(
+                (
+                    index_name,
+                    chunk_id,
+                    *(str(metadata.get(col) or "") for col in _FILTER_COLUMNS),
+                    sum(terms.values()),
+                    text,
+                    json.dumps(metadata, ensure_ascii=False, sort_keys=True),
+                )
+            )
+            posting_rows.extend((index_name, term, chunk_id, tf) for term, tf in terms.items())
+        with self._lock, self._conn:
+            self._adjust_scope_stats(index_name=index_name, chunk_ids=[row[1] for row in doc_rows], sign=-1)
+            self._conn.executemany(
+                "DELETE FROM bm25_postings WHERE index_name = ? AND chunk_id = ?",
+                [(index_name, row[1]) for row in doc_rows],
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO bm25_docs "
+                "(index_name, chunk_id, tenant_id, project_id, supplier_id, document_id, doc_type, "
+                "doc_len, text, metadata) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                doc_rows,
+            )
+            self._conn.executemany(
+                "INSERT INTO bm25_postings (index_name, term, chunk_id, tf) VALUES (?, ?, ?, ?)",
+                posting_rows,
+            )
+            self._adjust_scope_stats(index_name=index_name, chunk_ids=[row[1] for row in doc_rows], sign=1)
+        return len(doc_rows)
+
+    def delete(self, *, index_name: str, chunk_ids: list[str]) -> None:
+        rows = [(index_name, chunk_id) for chunk_id in chunk_ids]
+        with self._lock, self._conn:
+            self._adjust_scope_stats(index_name=index_name, chunk_ids=chunk_ids, sign=-1)
+            self._conn.executemany("DELETE FROM bm25_postings WHERE index_name = ? AND chunk_id = ?", rows)
+            self._conn.executemany("DELETE FROM bm25_docs WHERE index_name = ? AND chunk_id = ?", rows)
+
+    def search(
+        self,
+        *,
+        index_name: str,
+        query: str,
+        top_k: int,
+        filters: dict[str, str] | None = None,
+        doc_types: list[str] | None = None,
+        must_include: list[str] | None = None,
+        must_exclude: list[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return up to *top_k* ``{chunk_id, score, text, metadata}`` ranked by BM25.
+
+        ``must_include``/``must_exclude`` are case-insensitive substring
+        constraints evaluated in SQL before scoring.
+        """
+        query_terms = Counter(index_terms(query))
+        if not query_terms or top_k <= 0:
+            return []
+        terms = list(query_terms)
+        term_marks = ",".join("?" for _ in terms)
+        doc_where, doc_params = _doc_conditions(
+            filters=filters, doc_types=doc_types, must_include=must_include, must_exclude=must_exclude
+        )
+        where = ["p.index_name = ?", f"p.term IN ({term_marks})", *doc_where]
+        params: list[Any] = [index_name, *terms, *doc_params]
+
+        with self._lock:
+            n_docs, avg_len = self._conn.execute(
+                "SELECT COUNT(*), AVG(doc_len) FROM bm25_docs WHERE index_name = ?",
+                (index_name,),
+            ).fetchone()
+            if not n_docs:
+                return []
+            df = dict(
+                self._conn.execute(
+                    f"SELECT term, COUNT(*) FROM bm25_postings WHERE index_name = ? AND term IN ({term_marks}) "
+                    "GROUP BY term",
+                    (index_name, *terms),
+                ).fetchall()
+            )
+            rows = self._conn.execute(
+                "SELECT p.chunk_id, p.term, p.tf, d.doc_len FROM bm25_postings p "
+                "JOIN bm25_docs d ON d.index_name = p.index_name AND d.chunk_id = p.chunk_id "
+                f"WHERE {' AND '.join(where)}",
+                params,
+            ).fetchall()
+
+        avg_len = float(avg_len or 1.0)
+        scores: dict[str, float] = {}
+        for chunk_id, term, tf, doc_len in rows:
+            n_t = df.get(term, 0)
+            idf = math.log(1.0 + (n_docs - n_t + 0.5) / (n_t + 0.5))
+            norm = tf + self._k1 * (1.0 - self._b + self._b * doc_len / avg_len)
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + query_terms[term] * idf * tf * (self._k1 + 1.0) / norm
+        best = heapq.nlargest(top_k, scores.items(), key=lambda kv: (kv[1], kv[0]))
+        if not best:
+            return []
+
+        ids = [chunk_id for chunk_id, _ in best]
+        with self._lock:
+            details = {
+                chunk_id: (text, metadata)
+                for chunk_id, text, metadata in self._conn.execute(
+                    f"SELECT chunk_id, text, metadata FROM bm25_docs WHERE index_name = ? "
+                    f"AND chunk_id IN ({','.join('?' for _ in ids)})",
+                    (index_name, *ids),
+                ).fetchall()
+            }
+        out: list[dict[str, Any]] = []
+        for chunk_id, score in best:
+            text, metadata = details.get(chunk_id, ("", "{}"))
+            out.append({"chunk_id": chunk_id, "score": score, "text": text, "metadata": json.loads(metadata)})
+        return out
+
+    def doc_count(self, *, index_name: str) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) FROM bm25_docs WHERE index_name = ?", (index_name,)).fetchone()
+        return int(row[0] or 0)
+
+    def matching_ids(
+        self,
+        *,
+        index_name: str,
+        filters: dict[str, str] | None = None,
+        doc_types: list[str] | None = None,
+        must_include: list[str] | None = None,
+        must_exclude: list[str] | None = None,
+    ) -> set[str]:
+        """Chunk ids in *index_name* satisfying the scope and substring constraints."""
+        doc_where, doc_params = _doc_conditions(
+            filters=filters, doc_types=doc_types, must_include=must_include, must_exclude=must_exclude
+        )
+        where = ["d.index_name = ?", *doc_where]
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT d.chunk_id FROM bm25_docs d WHERE {' AND '.join(where)}",
+                (index_name, *doc_params),
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def corpus_stats(self, *, tenant_id: str, project_id: str, terms: list[str]) -> tuple[int, dict[str, int]]:
+        """``(n_docs, {term: df})`` for the tenant×project corpus (across shards)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT n_docs FROM bm25_scope_stats WHERE tenant_id = ? AND project_id = ?",
+                (tenant_id, project_id),
+            ).fetchone()
+            if not row or not terms:
+                return (int(row[0]) if row else 0), {}
+            df = self._conn.execute(
+                "SELECT term, df FROM bm25_term_stats WHERE tenant_id = ? AND project_id = ? "
+                f"AND term IN ({','.join('?' for _ in terms)})",
+                (tenant_id, project_id, *terms),
+            ).fetchall()
+        return int(row[0]), {term: int(n) for term, n in df}
+
+    def term_frequencies(
+        self,
+        *,
+        tenant_id: str,
+        project_id: str,
+        chunk_ids: list[str],
+        terms: list[str],
+    ) -> dict[str, tuple[int, dict[str, int]]]:
+        """Precomputed ``(doc_len, {term: tf})`` for indexed chunks, restricted to *terms*."""
+        if not chunk_ids:
+            return {}
+        id_marks = ",".join("?" for _ in chunk_ids)
+        out: dict[str, tuple[int, dict[str, int]]] = {}
+        with self._lock:
+            docs = self._conn.execute(
+                "SELECT index_name, chunk_id, doc_len FROM bm25_docs WHERE tenant_id = ? AND project_id = ? "
+                f"AND chunk_id IN ({id_marks})",
+                (tenant_id, project_id, *chunk_ids),
+            ).fetchall()
+            index_of: dict[str, str] = {}
+            for index_name, chunk_id, doc_len in docs:
+                if chunk_id not in out:
+                    out[chunk_id] = (int(doc_len), {})
+                    index_of[chunk_id] = index_name
+            if not out or not terms:
+                return out
+            rows = self._conn.execute(
+                "SELECT p.index_name, p.chunk_id, p.term, p.tf FROM bm25_postings p "
+                "JOIN bm25_docs d ON d.index_name = p.index_name AND d.chunk_id = p.chunk_id "
+                f"WHERE d.tenant_id = ? AND d.project_id = ? AND p.chunk_id IN ({id_marks}) "
+                f"AND p.term IN ({','.join('?' for _ in terms)})",
+                (tenant_id, project_id, *chunk_ids, *terms),
+            ).fetchall()
+        for index_name, chunk_id, term, tf in rows:
+            if index_of.get(chunk_id) == index_name:
+                out[chunk_id][1][term] = int(tf)
+        return out
+
+    def _adjust_scope_stats(self, *, index_name: str, chunk_ids: list[str], sign: int) -> None:
+        """Add (``sign=1``) or remove (``sign=-1``) the stored chunks' contribution to corpus stats."""
+        if not chunk_ids:
+            return
+        id_marks = ",".join("?" for _ in chunk_ids)
+        docs = self._conn.execute(
+            f"SELECT tenant_id, project_id FROM bm25_docs WHERE index_name = ? AND chunk_id IN ({id_marks})",
+            (index_name, *chunk_ids),
+        ).fetchall()
+        if not docs:
+            return
+        terms = self._conn.execute(
+            "SELECT d.tenant_id, d.project_id, p.term, COUNT(*) FROM bm25_postings p "
+            "JOIN bm25_docs d ON d.index_name = p.index_name AND d.chunk_id = p.chunk_id "
+            f"WHERE p.index_name = ? AND p.chunk_id IN ({id_marks}) GROUP BY d.tenant_id, d.project_id, p.term",
+            (index_name, *chunk_ids),
+        ).fetchall()
+        scopes = Counter((tenant_id, project_id) for tenant_id, project_id in docs)
+        self._conn.executemany(
+            "INSERT INTO bm25_scope_stats (tenant_id, project_id, n_docs) VALUES (?, ?, ?) "
+            "ON CONFLICT (tenant_id, project_id) DO UPDATE SET n_docs = n_docs + excluded.n_docs",
+            [(tenant_id, project_id, sign * n) for (tenant_id, project_id), n in scopes.items()],
+        )
+        self._conn.executemany(
+            "INSERT INTO bm25_term_stats (tenant_id, project_id, term, df) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (tenant_id, project_id, term) DO UPDATE SET df = df + excluded.df",
+            [(tenant_id, project_id, term, sign * n) for tenant_id, project_id, term, n in terms],
+        )
+        if sign < 0:
+            self._conn.execute("DELETE FROM bm25_term_stats WHERE df <= 0")
+            self._conn.execute("DELETE FROM bm25_scope_stats WHERE n_docs <= 0")
+
+    def _backfill_scope_stats(self) -> None:
+        """Derive corpus stats for index files written before they were tracked."""
+        with self._lock, self._conn:
+            if self._conn.execute("SELECT 1 FROM bm25_scope_stats LIMIT 1").fetchone():
+                return
+            if not self._conn.execute("SELECT 1 FROM bm25_docs LIMIT 1").fetchone():
+                return
+            self._conn.execute(
+                "INSERT INTO bm25_scope_stats (tenant_id, project_id, n_docs) "
+                "SELECT tenant_id, project_id, COUNT(*) FROM bm25_docs GROUP BY tenant_id, project_id"
+            )
+            self._conn.execute(
+                "INSERT INTO bm25_term_stats (tenant_id, project_id, term, df) "
+                "SELECT d.tenant_id, d.project_id, p.term, COUNT(*) FROM bm25_postings p "
+                "JOIN bm25_docs d ON d.index_name = p.index_name AND d.chunk_id = p.chunk_id "
+                "GROUP BY d.tenant_id, d.project_id, p.term"
+            )
+
+
+def _doc_conditions(
+    *,
+    filters: dict[str, str] | None,
+    doc_types: list[str] | None,
+    must_include: list[str] | None,
+    must_exclude: list[str] | None,
+) -> tuple[list[str], list[Any]]:
+    where: list[str] = []
+    params: list[Any] = []
+    for column, value in (filters or {}).items():
+        if column not in _FILTER_COLUMNS:
+            raise ValueError(f"unsupported bm25 filter column: {column}")
+        where.append(f"d.{column} = ?")
+        params.append(value)
+    if doc_types:
+        where.append(f"d.doc_type IN ({','.join('?' for _ in doc_types)})")
+        params.extend(doc_types)
+    for term in must_include or []:
+        where.append("instr(lower(d.text), ?) > 0")
+        params.append(term.lower())
+    for term in must_exclude or []:
+        where.append("instr(lower(d.text), ?) = 0")
+        params.append(term.lower())
+    return where, params
+
+
+def _bm25_path() -> str:
+    path = os.environ.get("LIGHTRAG_BM25_PATH", "").strip()
+    if path:
+        return path
+    persist_dir = os.environ.get("CHROMA_PERSIST_DIR", "").strip()
+    return os.path.join(persist_dir, "bm25.sqlite3") if persist_dir else ""
+
+
+def bm25_enabled() -> bool:
+    raw = os.environ.get("LIGHTRAG_BM25_ENABLED", "true").strip().lower()
+    if raw in {"0", "false", "no", "off"}:
+        return False
+    # A remote Chroma is shared across processes; an in-memory BM25 table is not.
+    return bool(_bm25_path()) or not os.environ.get("CHROMA_HOST", "").strip()
+
+
+@lru_cache(maxsize=1)
+def get_bm25_index() -> Bm25Index:
+    path = _bm25_path()
+    if path:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    return Bm25Index(path or ":memory:")
@@ -28,18 +28,23 @@ def evaluate_cost_gate(*, dataset_id: str, metrics: dict[str, float | bool]) ->
     if budget_alert_coverage < float(COST_THRESHOLDS["budget_alert_coverage_min"]):
         failed_checks.append("BUDGET_ALERT_COVERAGE_LOW")
 
+    values: dict[str, Any] = {
+        "task_cost_p95": task_cost_p95,
+        "baseline_task_cost_p95": baseline_task_cost_p95,
+        "task_cost_p95_ratio": task_cost_p95_ratio,
+        "routing_degrade_passed": routing_degrade_passed,
+        "degrade_availability": degrade_availability,
+        "budget_alert_coverage": budget_alert_coverage,
+    }
+    # Informational: scoring served from the LLM response cache costs zero tokens.
+    if metrics.get("llm_cache_hit_rate") is not None:
+        values["llm_cache_hit_rate"] = float(metrics["llm_cache_hit_rate"])
+
     return {
         "gate": "cost",
         "dataset_id": dataset_id,
         "passed": len(failed_checks) == 0,
         "failed_checks": failed_checks,
         "thresholds": dict(COST_THRESHOLDS),
-        "values": {
-            "task_cost_p95": task_cost_p95,
-            "baseline_task_cost_p95": baseline_task_cost_p95,
-            "task_cost_p95_ratio": task_cost_p95_ratio,
-            "routing_degrade_passed": routing_degrade_passed,
-            "degrade_availability": degrade_availability,
-            "budget_alert_coverage": budget_alert_coverage,
-        },
+        "values": values,
     }
@@ -8,14 +8,24 @@ Falls back gracefully when optional dependencies are unavailable.
 from __future__ import annotations
 
 import hashlib
+import itertools
+import logging
+import multiprocessing
+import os
 import re
-import uuid
+import tempfile
+import threading
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass, field
 from typing import Any
 
 from app.errors import ApiError
 from app.parse_utils import normalize_bbox
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class PageBlock:
@@ -42,8 +52,15 @@ CHUNK_OVERLAP = 150
 MIN_CHUNK_SIZE = 50
 
 
-def _generate_chunk_id() -> str:
-    return f"ck_{uuid.uuid4().hex[:16]}"
+def _generate_chunk_id(content_key: str, start_char: int, text: str) -> str:
+    """Content-addressed chunk id: stable across re-parses of the same file with the same parser."""
+    raw = f"{content_key}\x1f{start_char}\x1f{text}"
+    return f"ck_{hashlib.sha256(raw.encode('utf-8')).hexdigest()[:16]}"
+
+
+def chunk_content_key(*, document_id: str, content_sha256: str, parser_name: str, parser_version: str) -> str:
+    # document_id keeps ids unique when the same file is attached to several documents.
+    return f"{document_id}:{content_sha256}:{parser_name}:{parser_version}"
 
 
 def _chunk_hash(text: str) -> str:
@@ -65,20 +82,24 @@ def _extract_heading_path(text: str) -> list[str]:
     return headings if headings else ["content"]
 
 
-def chunk_text_blocks(
-    blocks: list[PageBlock],
+def iter_chunks(
+    blocks: Iterable[PageBlock],
     *,
     chunk_size: int = CHUNK_SIZE,
     chunk_overlap: int = CHUNK_OVERLAP,
-) -> list[DocumentChunk]:
-    """Split page blocks into overlapping chunks preserving page/bbox metadata."""
-    if not blocks:
-        return []
-
-    chunks: list[DocumentChunk] = []
+    content_key: str = "",
+) -> Iterator[DocumentChunk]:
+    """Lazily split page blocks into overlapping chunks preserving page/bbox metadata.
+
+    Holds one finished chunk back so a short trailing remainder can still be
+    merged into it; memory use is bounded by ``chunk_size``, not by the input.
+    Chunk ids derive from *content_key* (see :func:`chunk_content_key`), the
+    chunk's start offset and its final text.
+    """
+    pending: DocumentChunk | None = None
     current_text = ""
-    current_page = blocks[0].page if blocks else 1
-    current_bbox = blocks[0].bbox if blocks else [0.0, 0.0, 1.0, 1.0]
+    current_page = 1
+    current_bbox = [0.0, 0.0, 1.0, 1.0]
     char_offset = 0
 
     for block in blocks:
@@ -87,17 +108,16 @@ def chunk_text_blocks(
             continue
 
         if len(current_text) + len(text) + 1 > chunk_size and len(current_text) >= MIN_CHUNK_SIZE:
-            heading_path = _extract_heading_path(current_text)
-            chunks.append(
-                DocumentChunk(
-                    chunk_id=_generate_chunk_id(),
-                    text=current_text.strip(),
-                    page=current_page,
-                    bbox=current_bbox,
-                    heading_path=heading_path,
-                    start_char=char_offset,
-                    end_char=char_offset + len(current_text),
-                )
+            if pending is not None:
+                yield _with_chunk_id(pending, content_key)
+            pending = DocumentChunk(
+                chunk_id="",
+                text=current_text.strip(),
+                page=current_page,
+                bbox=current_bbox,
+                heading_path=_extract_heading_path(current_text),
+                start_char=char_offset,
+                end_char=char_offset + len(current_text),
             )
             char_offset += len(current_text) - chunk_overlap
             overlap_text = current_text[-chunk_overlap:] if len(current_text) > chunk_overlap else ""
@@ -114,28 +134,175 @@ def chunk_text_blocks(
 
     if current_text.strip():
         is_last_remainder = len(current_text.strip()) < MIN_CHUNK_SIZE
-        if not is_last_remainder or not chunks:
-            heading_path = _extract_heading_path(current_text)
-            chunks.append(
-                DocumentChunk(
-                    chunk_id=_generate_chunk_id(),
-                    text=current_text.strip(),
-                    page=current_page,
-                    bbox=current_bbox,
-                    heading_path=heading_path,
-                    start_char=char_offset,
-                    end_char=char_offset + len(current_text),
-                )
+        if not is_last_remainder or pending is None:
+            if pending is not None:
+                yield _with_chunk_id(pending, content_key)
+            pending = DocumentChunk(
+                chunk_id="",
+                text=current_text.strip(),
+                page=current_page,
+                bbox=current_bbox,
+                heading_path=_extract_heading_path(current_text),
+                start_char=char_offset,
+                end_char=char_offset + len(current_text),
             )
-        elif chunks:
-            chunks[-1].text += "\n" + current_text.strip()
-            chunks[-1].end_char = char_offset + len(current_text)
+        else:
+            pending.text += "\n" + current_text.strip()
+            pending.end_char = char_offset + len(current_text)
 
-    return chunks
+    if pending is not None:
+        yield _with_chunk_id(pending, content_key)
 
 
-def parse_pdf_bytes(file_bytes: bytes) -> list[DocumentChunk]:
-    """Parse PDF bytes into chunks using PyMuPDF."""
+def _with_chunk_id(chunk: DocumentChunk, content_key: str) -> DocumentChunk:
+    chunk.chunk_id = _generate_chunk_id(content_key, chunk.start_char, chunk.text)
+    return chunk
+
+
+def chunk_text_blocks(
+    blocks: list[PageBlock],
+    *,
+    chunk_size: int = CHUNK_SIZE,
+    chunk_overlap: int = CHUNK_OVERLAP,
+) -> list[DocumentChunk]:
+    """Split page blocks into overlapping chunks preserving page/bbox metadata."""
+    return list(iter_chunks(blocks, chunk_size=chunk_size, chunk_overlap=chunk_overlap))
+
+
+def _pdf_parse_workers() -> int:
+    raw = os.environ.get("PDF_PARSE_WORKERS", "").strip()
+    if raw:
+        try:
+            return max(1, int(raw))
+        except ValueError:
+            pass
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+def _pdf_parallel_min_pages() -> int:
+    try:
+        return max(1, int(os.environ.get("PDF_PARSE_PARALLEL_MIN_PAGES", "64").strip()))
+    except ValueError:
+        return 64
+
+
+def _extract_page_blocks(page: Any, page_num: int, pymupdf: Any) -> list[PageBlock]:
+    page_rect = page.rect
+    pw = max(page_rect.width, 1.0)
+    ph = max(page_rect.height, 1.0)
+
+    blocks: list[PageBlock] = []
+    text_dict = page.get_text("dict", flags=pymupdf.TEXT_PRESERVE_WHITESPACE)
+    for block in text_dict.get("blocks", []):
+        if block.get("type") != 0:
+            continue
+        lines_text = []
+        for line in block.get("lines", []):
+            spans_text = []
+            for span in line.get("spans", []):
+                t = span.get("text", "")
+                if t.strip():
+                    spans_text.append(t)
+            if spans_text:
+                lines_text.append(" ".join(spans_text))
+        text = "\n".join(lines_text).strip()
+        if not text:
+            continue
+
+        raw_bbox = block.get("bbox", [0, 0, pw, ph])
+        normalized = [
+            round(raw_bbox[0] / pw, 4),
+            round(raw_bbox[1] / ph, 4),
+            round(raw_bbox[2] / pw, 4),
+            round(raw_bbox[3] / ph, 4),
+        ]
+        blocks.append(PageBlock(page=page_num, text=text, bbox=normalized))
+
+    if not blocks:
+        plain = page.get_text("text").strip()
+        if plain:
+            blocks.append(PageBlock(page=page_num, text=plain, bbox=[0.0, 0.0, 1.0, 1.0]))
+    return blocks
+
+
+def _extract_pdf_pages(doc: Any, start: int, stop: int, pymupdf: Any) -> list[PageBlock]:
+    blocks: list[PageBlock] = []
+    for page_idx in range(start, stop):
+        blocks.extend(_extract_page_blocks(doc[page_idx], page_idx + 1, pymupdf))
+    return blocks
+
+
+def _extract_pdf_page_range(path: str, start: int, stop: int) -> list[PageBlock]:
+    """Worker entry point: open the shared temp file once and extract pages [start, stop)."""
+    import pymupdf
+
+    doc = pymupdf.open(path)
+    try:
+        return _extract_pdf_pages(doc, start, stop, pymupdf)
+    finally:
+        doc.close()
+
+
+_pdf_pool: ProcessPoolExecutor | None = None
+_pdf_pool_workers = 0
+_pdf_pool_lock = threading.Lock()
+
+
+def _get_pdf_pool(workers: int) -> ProcessPoolExecutor:
+    global _pdf_pool, _pdf_pool_workers
+    with _pdf_pool_lock:
+        if _pdf_pool is None or _pdf_pool_workers != workers:
+            if _pdf_pool is not None:
+                _pdf_pool.shutdown(wait=False, cancel_futures=True)
+            # spawn: forking a threaded API/worker process is unsafe.
+            _pdf_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _pdf_pool_workers = workers
+        return _pdf_pool
+
+
+def shutdown_pdf_pool() -> None:
+    global _pdf_pool, _pdf_pool_workers
+    with _pdf_pool_lock:
+        if _pdf_pool is not None:
+            _pdf_pool.shutdown(wait=True, cancel_futures=True)
+        _pdf_pool = None
+        _pdf_pool_workers = 0
+
+
+def _page_ranges(page_count: int, shards: int) -> list[tuple[int, int]]:
+    size = max(1, -(-page_count // shards))
+    return [(start, min(page_count, start + size)) for start in range(0, page_count, size)]
+
+
+def _extract_pdf_parallel(file_bytes: bytes, page_count: int, workers: int) -> Iterator[tuple[int, list[PageBlock]]]:
+    """Shard pages across the process pool; workers open one shared temp file by path.
+
+    Yields ``(stop_page_idx, blocks)`` per shard in page order. At most two
+    shards per worker are in flight, so finished-but-unconsumed shards stay bounded.
+    """
+    pool = _get_pdf_pool(workers)
+    # Several shards per worker keeps the pool busy when page densities differ.
+    ranges = _page_ranges(page_count, workers * 4)
+    window = workers * 2
+    with tempfile.NamedTemporaryFile(suffix=".pdf") as tmp:
+        tmp.write(file_bytes)
+        tmp.flush()
+        pending: deque[tuple[int, Future[list[PageBlock]]]] = deque()
+        try:
+            for start, stop in ranges:
+                pending.append((stop, pool.submit(_extract_pdf_page_range, tmp.name, start, stop)))
+                if len(pending) >= window:
+                    stop_idx, future = pending.popleft()
+                    yield stop_idx, future.result()
+            while pending:
+                stop_idx, future = pending.popleft()
+                yield stop_idx, future.result()
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+
+def _open_pdf(file_bytes: bytes) -> tuple[Any, Any]:
     try:
         import pymupdf
     except ImportError:
@@ -157,63 +324,46 @@ def parse_pdf_bytes(file_bytes: bytes) -> list[DocumentChunk]:
             retryable=False,
             http_status=422,
         )
+    return pymupdf, doc
 
-    blocks: list[PageBlock] = []
+
+def iter_pdf_blocks(file_bytes: bytes) -> Iterator[PageBlock]:
+    """Yield PDF page blocks in page order using PyMuPDF.
+
+    Documents with at least ``PDF_PARSE_PARALLEL_MIN_PAGES`` pages are parsed
+    in page-range shards on a process pool (``PDF_PARSE_WORKERS``). If the pool
+    fails part-way, the remaining pages are extracted serially, so the output
+    always matches the serial path.
+    """
+    pymupdf, doc = _open_pdf(file_bytes)
     try:
-        for page_idx in range(len(doc)):
-            page = doc[page_idx]
-            page_num = page_idx + 1
-            page_rect = page.rect
-            pw = max(page_rect.width, 1.0)
-            ph = max(page_rect.height, 1.0)
-
-            text_dict = page.get_text("dict", flags=pymupdf.TEXT_PRESERVE_WHITESPACE)
-            for block in text_dict.get("blocks", []):
-                if block.get("type") != 0:
-                    continue
-                lines_text = []
-                for line in block.get("lines", []):
-                    spans_text = []
-                    for span in line.get("spans", []):
-                        t = span.get("text", "")
-                        if t.strip():
-                            spans_text.append(t)
-                    if spans_text:
-                        lines_text.append(" ".join(spans_text))
-                text = "\n".join(lines_text).strip()
-                if not text:
-                    continue
-
-                raw_bbox = block.get("bbox", [0, 0, pw, ph])
-                normalized = [
-                    round(raw_bbox[0] / pw, 4),
-                    round(raw_bbox[1] / ph, 4),
-                    round(raw_bbox[2] / pw, 4),
-                    round(raw_bbox[3] / ph, 4),
-                ]
-                blocks.append(PageBlock(page=page_num, text=text, bbox=normalized))
-
-            if not any(b.page == page_num for b in blocks):
-                plain = page.get_text("text").strip()
-                if plain:
-                    blocks.append(
-                        PageBlock(
-                            page=page_num,
-                            text=plain,
-                            bbox=[0.0, 0.0, 1.0, 1.0],
-                        )
-                    )
+        page_count = len(doc)
+        next_page = 0
+        workers = min(_pdf_parse_workers(), page_count)
+        if workers > 1 and page_count >= _pdf_parallel_min_pages():
+            try:
+                for stop_idx, shard_blocks in _extract_pdf_parallel(file_bytes, page_count, workers):
+                    yield from shard_blocks
+                    next_page = stop_idx
+            except Exception as exc:
+                logger.warning(
+                    "parallel PDF parse failed at page %d (%s), continuing serially",
+                    next_page + 1,
+                    type(exc).__name__,
+                )
+        for page_idx in range(next_page, page_count):
+            yield from _extract_page_blocks(doc[page_idx], page_idx + 1, pymupdf)
     finally:
         doc.close()
 
-    if not blocks:
-        return []
 
-    return chunk_text_blocks(blocks)
+def parse_pdf_bytes(file_bytes: bytes) -> list[DocumentChunk]:
+    """Parse PDF bytes into chunks using PyMuPDF (see :func:`iter_pdf_blocks`)."""
+    return list(iter_chunks(iter_pdf_blocks(file_bytes)))
 
 
-def parse_docx_bytes(file_bytes: bytes) -> list[DocumentChunk]:
-    """Parse DOCX bytes into chunks using python-docx."""
+def iter_docx_blocks(file_bytes: bytes) -> Iterator[PageBlock]:
+    """Yield DOCX paragraphs as page blocks using python-docx."""
     try:
         import docx
     except ImportError:
@@ -238,7 +388,6 @@ def parse_docx_bytes(file_bytes: bytes) -> list[DocumentChunk]:
             http_status=422,
         )
 
-    blocks: list[PageBlock] = []
     page_num = 1
     page_char_count = 0
     chars_per_page = 3000
@@ -247,50 +396,107 @@ def parse_docx_bytes(file_bytes: bytes) -> list[DocumentChunk]:
         text = para.text.strip()
         if not text:
             continue
-        blocks.append(
-            PageBlock(
-                page=page_num,
-                text=text,
-                bbox=[0.0, 0.0, 1.0, 1.0],
-                block_type="heading" if para.style and para.style.name.startswith("Heading") else "text",
-            )
+        yield PageBlock(
+            page=page_num,
+            text=text,
+            bbox=[0.0, 0.0, 1.0, 1.0],
+            block_type="heading" if para.style and para.style.name.startswith("Heading") else "text",
         )
         page_char_count += len(text)
         if page_char_count >= chars_per_page:
             page_num += 1
             page_char_count = 0
 
-    if not blocks:
-        return []
 
-    return chunk_text_blocks(blocks)
+def parse_docx_bytes(file_bytes: bytes) -> list[DocumentChunk]:
+    """Parse DOCX bytes into chunks using python-docx."""
+    return list(iter_chunks(iter_docx_blocks(file_bytes)))
 
 
-def parse_plain_text_bytes(file_bytes: bytes) -> list[DocumentChunk]:
-    """Parse plain text file bytes into chunks."""
+def iter_text_blocks(file_bytes: bytes) -> Iterator[PageBlock]:
+    """Yield blank-line separated paragraphs of a plain text file as page blocks."""
     from app.parse_utils import decode_text_with_fallback
 
     text = decode_text_with_fallback(file_bytes)
-    if not text.strip():
-        return []
-
-    paragraphs = re.split(r"\n{2,}", text)
-    blocks: list[PageBlock] = []
     page_num = 1
     page_char_count = 0
     chars_per_page = 3000
 
-    for para in paragraphs:
-        para = para.strip()
+    start = 0
+    for match in itertools.chain(re.finditer(r"\n{2,}", text), (None,)):
+        end = match.start() if match is not None else len(text)
+        para = text[start:end].strip()
+        start = match.end() if match is not None else end
         if not para:
             continue
-        blocks.append(PageBlock(page=page_num, text=para, bbox=[0.0, 0.0, 1.0, 1.0]))
+        yield PageBlock(page=page_num, text=para, bbox=[0.0, 0.0, 1.0, 1.0])
         page_char_count += len(para)
         if page_char_count >= chars_per_page:
             page_num += 1
             page_char_count = 0
 
-    return chunk_text_blocks(blocks)
+
+def parse_plain_text_bytes(file_bytes: bytes) -> list[DocumentChunk]:
+    """Parse plain text file bytes into chunks."""
+    return list(iter_chunks(iter_text_blocks(file_bytes)))
+
+
+def _iter_blocks_for(filename: str, file_bytes: bytes) -> tuple[Iterator[PageBlock], str]:
+    lower = filename.lower()
+    if lower.endswith(".pdf"):
+        return iter_pdf_blocks(file_bytes), "pdf_local"
+    if lower.endswith((".docx", ".doc")):
+        return iter_docx_blocks(file_bytes), "docx_local"
+    if lower.endswith((".txt", ".md", ".csv")):
+        return iter_text_blocks(file_bytes), "text_local"
+    return iter_text_blocks(file_bytes), "fallback_local"
+
+
+def iter_parse_file_bytes(
+    file_bytes: bytes,
+    *,
+    filename: str,
+    document_id: str,
+    parser_name: str = "local",
+    parser_version: str = "v1",
+    content_sha256: str | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Lazily parse file bytes into chunk dicts (see :func:`parse_file_bytes`).
+
+    Blocks, chunks and dicts are produced one at a time, so callers that
+    consume in bounded batches keep memory independent of document length.
+    Parser errors surface on the first ``next()``. Pass the upload's
+    *content_sha256* to skip re-hashing the file for chunk ids.
+    """
+    content_key = chunk_content_key(
+        document_id=document_id,
+        content_sha256=content_sha256 or hashlib.sha256(file_bytes).hexdigest(),
+        parser_name=parser_name,
+        parser_version=parser_version,
+    )
+    blocks, content_source = _iter_blocks_for(filename, file_bytes)
+    for chunk in iter_chunks(blocks, content_key=content_key):
+        yield {
+            "chunk_id": chunk.chunk_id,
+            "document_id": document_id,
+            "pages": [chunk.page],
+            "positions": [
+                {
+                    "page": chunk.page,
+                    "bbox": chunk.bbox,
+                    "start": chunk.start_char,
+                    "end": chunk.end_char,
+                }
+            ],
+            "section": chunk.heading_path[0] if chunk.heading_path else "content",
+            "heading_path": chunk.heading_path,
+            "chunk_type": chunk.chunk_type,
+            "parser": parser_name,
+            "parser_version": parser_version,
+            "content_source": content_source,
+            "text": chunk.text,
+            "chunk_hash": _chunk_hash(chunk.text),
+        }
 
 
 def parse_file_bytes(
@@ -300,6 +506,7 @@ def parse_file_bytes(
     document_id: str,
     parser_name: str = "local",
     parser_version: str = "v1",
+    content_sha256: str | None = None,
 ) -> list[dict[str, Any]]:
     """
     Parse file bytes into a list of chunk dicts matching the existing chunk schema.
@@ -308,45 +515,13 @@ def parse_file_bytes(
       document_id, pages, positions, section, heading_path, chunk_type,
       parser, parser_version, content_source, text, chunk_id, chunk_hash
     """
-    lower = filename.lower()
-
-    if lower.endswith(".pdf"):
-        doc_chunks = parse_pdf_bytes(file_bytes)
-        content_source = "pdf_local"
-    elif lower.endswith((".docx", ".doc")):
-        doc_chunks = parse_docx_bytes(file_bytes)
-        content_source = "docx_local"
-    elif lower.endswith((".txt", ".md", ".csv")):
-        doc_chunks = parse_plain_text_bytes(file_bytes)
-        content_source = "text_local"
-    else:
-        doc_chunks = parse_plain_text_bytes(file_bytes)
-        content_source = "fallback_local"
-
-    result: list[dict[str, Any]] = []
-    for chunk in doc_chunks:
-        result.append(
-            {
-                "chunk_id": chunk.chunk_id,
-                "document_id": document_id,
-                "pages": [chunk.page],
-                "positions": [
-                    {
-                        "page": chunk.page,
-                        "bbox": chunk.bbox,
-                        "start": chunk.start_char,
-                        "end": chunk.end_char,
-                    }
-                ],
-                "section": chunk.heading_path[0] if chunk.heading_path else "content",
-                "heading_path": chunk.heading_path,
-                "chunk_type": chunk.chunk_type,
-                "parser": parser_name,
-                "parser_version": parser_version,
-                "content_source": content_source,
-                "text": chunk.text,
-                "chunk_hash": _chunk_hash(chunk.text),
-            }
+    return list(
+        iter_parse_file_bytes(
+            file_bytes,
+            filename=filename,
+            document_id=document_id,
+            parser_name=parser_name,
+            parser_version=parser_version,
+            content_sha256=content_sha256,
         )
-
-    return result
+    )
@@ -67,6 +67,7 @@ class EvaluationState(TypedDict, total=False):
     # cost tracking (SSOT §7.4)
     cost_exceeded: bool
     cost_total_tokens: int
+    cost_cache_hits: int
     # runtime
     retry_count: int
     errors: list[dict[str, Any]]
@@ -193,11 +194,23 @@ def node_score_with_llm(state: EvaluationState, *, store: Any) -> dict[str, Any]
     """LLM soft-scoring for each criteria.  No side effects.
 
     Integrates CostBudgetTracker (SSOT §7.4) to enforce per-task token
-    budget.  When cumulative tokens hit the warn threshold the remaining
-    criteria are scored with mock LLM; when the hard threshold is exceeded
-    scoring stops entirely and ``cost_exceeded`` is set.
+    budget.  Criteria are admitted in order: each reserves its estimated
+    prompt + completion tokens before dispatch, and once projected tokens
+    hit the warn threshold the remaining criteria are scored with mock LLM;
+    when the hard threshold is exceeded admission stops and
+    ``cost_exceeded`` is set.  Admitted LLM calls then run concurrently
+    (``LLM_SCORE_CONCURRENCY``), optionally packed several criteria per
+    request (``LLM_SCORE_BATCH_ENABLED``), and settle their reservations with
+    actual usage, so budget decisions do not depend on completion order.
     """
-    from app.llm_provider import CostBudgetTracker, LLMUsage, llm_score_criteria
+    from app.llm_provider import (
+        CostBudgetTracker,
+        LLMUsage,
+        estimate_score_tokens,
+        llm_score_criteria_batch,
+        plan_score_batches,
+        scoring_concurrency,
+    )
 
     criteria_defs = state.get("criteria_defs", [])
     criteria_evidence = state.get("criteria_evidence", {})
@@ -211,6 +224,7 @@ def node_score_with_llm(state: EvaluationState, *, store: Any) -> dict[str, Any]
     unsupported_claims: list[str] = []
     cost_exceeded = False
 
+    admitted: list[dict[str, Any]] = []
     for criteria in criteria_defs:
         if not isinstance(criteria, dict):
             continue
@@ -218,28 +232,42 @@ def node_score_with_llm(state: EvaluationState, *, store: Any) -> dict[str, Any]
         max_score = float(criteria.get("max_score", 20.0))
         criteria_name = criteria.get("criteria_name") or criteria.get("name") or cid
         requirement_text = criteria.get("requirement_text") or criteria.get("requirement")
-        response_text = criteria.get("response_text") or criteria.get("response")
-
         evidence = criteria_evidence.get(cid, [])
-        citation_ids = [ev.get("chunk_id") for ev in evidence if ev.get("chunk_id")]
 
-        budget_status = cost_tracker.check_budget()
+        estimated = estimate_score_tokens(
+            cid,
+            str(requirement_text or ""),
+            evidence,
+            max_score=max_score,
+            criteria_name=str(criteria_name),
+        )
+        budget_status = cost_tracker.reserve(estimated)
 
         if budget_status == "blocked":
             logger.warning(
-                "Cost budget exceeded for task %s (tokens=%d), skipping criteria %s",
+                "Cost budget exceeded for task %s (projected tokens=%d), skipping criteria %s",
                 evaluation_id,
-                cost_tracker.total_tokens,
+                cost_tracker.projected_tokens,
                 cid,
             )
             cost_exceeded = True
             break
 
+        item = {
+            "criteria": criteria,
+            "criteria_id": cid,
+            "criteria_name": criteria_name,
+            "requirement_text": requirement_text,
+            "max_score": max_score,
+            "evidence": evidence,
+            "reserved": 0,
+            "result": None,
+        }
         if budget_status == "degrade":
             logger.warning(
-                "Cost budget degraded for task %s (tokens=%d), using mock for criteria %s",
+                "Cost budget degraded for task %s (projected tokens=%d), using mock for criteria %s",
                 evaluation_id,
-                cost_tracker.total_tokens,
+                cost_tracker.projected_tokens,
                 cid,
             )
             from app.mock_llm import mock_score_criteria
@@ -253,30 +281,57 @@ def node_score_with_llm(state: EvaluationState, *, store: Any) -> dict[str, Any]
             )
             llm_result["degraded"] = True
             llm_result["degrade_reason"] = "cost_budget"
+            item["result"] = llm_result
         else:
-            if budget_status == "warn":
-                logger.warning(
-                    "Cost budget warning for task %s (tokens=%d/%d)",
-                    evaluation_id,
-                    cost_tracker.total_tokens,
-                    cost_tracker.max_tokens_budget,
-                )
-            llm_result = llm_score_criteria(
-                criteria_id=cid,
-                requirement_text=str(requirement_text or ""),
-                evidence_chunks=evidence,
-                max_score=max_score,
-                criteria_name=str(criteria_name),
-                hard_constraint_pass=hard_constraint_pass,
-            )
+            item["reserved"] = estimated
+        admitted.append(item)
+
+    pending = [item for item in admitted if item["result"] is None]
+    score_items = [
+        {
+            "criteria_id": item["criteria_id"],
+            "criteria_name": str(item["criteria_name"]),
+            "requirement_text": str(item["requirement_text"] or ""),
+            "evidence_chunks": item["evidence"],
+            "max_score": item["max_score"],
+        }
+        for item in pending
+    ]
+    groups = plan_score_batches(score_items)
+
+    def _score(group: list[int]) -> list[dict[str, Any]]:
+        return llm_score_criteria_batch(
+            [score_items[i] for i in group],
+            hard_constraint_pass=hard_constraint_pass,
+        )
+
+    workers = min(scoring_concurrency(), len(groups))
+    if workers > 1:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm-score") as executor:
+            group_results = list(executor.map(_score, groups))
+    else:
+        group_results = [_score(group) for group in groups]
+    for group, results in zip(groups, group_results):
+        for i, llm_result in zip(group, results):
+            pending[i]["result"] = llm_result
+
+    for item in admitted:
+        criteria = item["criteria"]
+        cid = item["criteria_id"]
+        llm_result = item["result"]
+        response_text = criteria.get("response_text") or criteria.get("response")
+        citation_ids = [ev.get("chunk_id") for ev in item["evidence"] if ev.get("chunk_id")]
 
         usage_dict = llm_result.get("usage", {})
         usage = LLMUsage(
             prompt_tokens=int(usage_dict.get("prompt_tokens", 0)),
             completion_tokens=int(usage_dict.get("completion_tokens", 0)),
             total_tokens=int(usage_dict.get("total_tokens", 0)),
+            cache_hit=bool(llm_result.get("cache_hit", False)),
         )
-        cost_tracker.record_usage(usage)
+        cost_tracker.settle(item["reserved"], usage)
 
         score = llm_result["score"]
         hard_pass = llm_result.get("hard_pass", True) and hard_constraint_pass
@@ -287,11 +342,11 @@ def node_score_with_llm(state: EvaluationState, *, store: Any) -> dict[str, Any]
         criteria_results.append(
             {
                 "criteria_id": cid,
-                "criteria_name": str(criteria_name),
-                "requirement_text": str(requirement_text) if requirement_text is not None else None,
+                "criteria_name": str(item["criteria_name"]),
+                "requirement_text": str(item["requirement_text"]) if item["requirement_text"] is not None else None,
                 "response_text": str(response_text) if response_text is not None else None,
                 "score": score,
-                "max_score": max_score,
+                "max_score": item["max_score"],
                 "hard_pass": hard_pass,
                 "reason": reason,
                 "citations": resolved_citations,
@@ -311,6 +366,7 @@ def node_score_with_llm(state: EvaluationState, *, store: Any) -> dict[str, Any]
         "unsupported_claims": unsupported_claims,
         "cost_exceeded": cost_exceeded,
         "cost_total_tokens": cost_tracker.total_tokens,
+        "cost_cache_hits": cost_tracker.cache_hits,
     }
 
 
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import hashlib
+import json
 import os
+import threading
 from functools import lru_cache
 from typing import Any
 
@@ -10,6 +12,8 @@ from chromadb.api import ClientAPI
 from fastapi import FastAPI
 from pydantic import BaseModel, Field
 
+from app.bm25_index import bm25_enabled, get_bm25_index
+
 try:
     from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
 except ImportError:  # pragma: no cover - optional dependency
@@ -26,11 +30,19 @@ class IndexRequest(BaseModel):
     chunks: list[dict[str, Any]] = Field(default_factory=list)
 
 
+class DeleteRequest(BaseModel):
+    index_name: str
+    supplier_id: str | None = None
+    chunk_ids: list[str] = Field(default_factory=list)
+
+
 class QueryFilters(BaseModel):
     tenant_id: str
     project_id: str
     supplier_id: str
     doc_scope: list[str] = Field(default_factory=list)
+    must_include: list[str] = Field(default_factory=list)
+    must_exclude: list[str] = Field(default_factory=list)
 
 
 class QueryRequest(BaseModel):
@@ -80,24 +92,16 @@ class OpenAICompatEmbeddingFunction(EmbeddingFunction):
         return f"openai_compat_{self._model}"
 
     def __call__(self, input: Documents) -> Embeddings:
-        try:
-            import openai
-        except ImportError:
-            raise RuntimeError("openai package is required for embeddings. Install with: pip install openai")
+        from app.llm_clients import get_openai_client
 
-        kwargs: dict[str, Any] = {}
-        if self._api_key:
-            kwargs["api_key"] = self._api_key
-        if self._base_url:
-            kwargs["base_url"] = self._base_url
-
-        if not kwargs.get("api_key") and not self._base_url:
+        if not self._api_key and not self._base_url:
             raise RuntimeError("OPENAI_API_KEY or EMBEDDING_BASE_URL is required for embeddings")
 
-        if not kwargs.get("api_key"):
-            kwargs["api_key"] = "unused"
-
-        client = openai.OpenAI(**kwargs)
+        client = get_openai_client(
+            provider="openai",
+            api_key=self._api_key or "unused",
+            base_url=self._base_url,
+        )
         response = client.embeddings.create(model=self._model, input=input)
         return [item.embedding for item in response.data]
 
@@ -165,9 +169,105 @@ def _chroma_client() -> ClientAPI:
     return chromadb.Client()
 
 
+# Collection handles are cached per name; an entry is only valid for the
+# client that created it so a swapped client (tests, reconfiguration) refreshes.
+_collection_cache: dict[str, tuple[Any, Any]] = {}
+_collection_cache_lock = threading.Lock()
+
+
 def _collection(index_name: str):
     client = _chroma_client()
-    return client.get_or_create_collection(name=index_name, embedding_function=_embedding_fn())
+    with _collection_cache_lock:
+        cached = _collection_cache.get(index_name)
+        if cached is not None and cached[0] is client:
+            return cached[1]
+    collection = client.get_or_create_collection(name=index_name, embedding_function=_embedding_fn())
+    with _collection_cache_lock:
+        _collection_cache[index_name] = (client, collection)
+    return collection
+
+
+def _existing_collection(index_name: str):
+    """Cached handle for *index_name*, or None when it does not exist; never creates it."""
+    client = _chroma_client()
+    with _collection_cache_lock:
+        cached = _collection_cache.get(index_name)
+        if cached is not None and cached[0] is client:
+            return cached[1]
+    embedding_fn = _embedding_fn()
+    try:
+        collection = client.get_collection(name=index_name, embedding_function=embedding_fn)
+    except Exception:  # noqa: BLE001 - absent (NotFoundError / ValueError across chromadb versions)
+        return None
+    with _collection_cache_lock:
+        _collection_cache[index_name] = (client, collection)
+    return collection
+
+
+def _drop_collection(index_name: str) -> None:
+    with _collection_cache_lock:
+        _collection_cache.pop(index_name, None)
+    try:
+        _chroma_client().delete_collection(name=index_name)
+    except Exception:  # noqa: BLE001 - already absent
+        pass
+
+
+def reset_collection_cache() -> None:
+    with _collection_cache_lock:
+        _collection_cache.clear()
+
+
+# ---------------------------------------------------------------------------
+# Supplier sharding
+# ---------------------------------------------------------------------------
+
+_COLLECTION_NAME_MAX = 63
+
+
+def _shard_by_supplier_enabled() -> bool:
+    raw = os.environ.get("LIGHTRAG_SHARD_BY_SUPPLIER", "false").strip().lower()
+    return raw in {"1", "true", "yes", "on"}
+
+
+def _shard_prefix(index_name: str) -> str:
+    if len(index_name) + 18 > _COLLECTION_NAME_MAX:
+        return f"shard_{hashlib.sha256(index_name.encode('utf-8')).hexdigest()[:20]}__sup_"
+    return f"{index_name}__sup_"
+
+
+def shard_collection_name(index_name: str, supplier_id: str) -> str:
+    """Per-supplier collection name derived from the tenant×project index name."""
+    return _shard_prefix(index_name) + hashlib.sha256(supplier_id.encode("utf-8")).hexdigest()[:12]
+
+
+def _resolve_index_name(index_name: str, supplier_id: str) -> str:
+    if supplier_id and _shard_by_supplier_enabled():
+        return shard_collection_name(index_name, supplier_id)
+    return index_name
+
+
+def _collection_count(index_name: str) -> int:
+    collection = _existing_collection(index_name)
+    if collection is None:
+        return 0
+    try:
+        return collection.count()
+    except Exception:
+        return 0
+
+
+def _read_targets(index_name: str, supplier_id: str) -> list[str]:
+    """Collections holding a supplier's chunks: its shard and, until rebalanced, the unsharded one."""
+    target = _resolve_index_name(index_name, supplier_id)
+    if target == index_name:
+        return [index_name]
+    # Shards are filled on write; rows indexed before sharding was switched on
+    # stay in the unsharded collection until rebalance_collection moves them.
+    targets = [target] if _collection_count(target) > 0 else []
+    if not targets or _collection_count(index_name) > 0:
+        targets.append(index_name)
+    return targets
 
 
 def _chunk_text(chunk: dict[str, Any]) -> str:
@@ -196,17 +296,149 @@ def _chunk_metadata(
                 bbox = [float(x) for x in bbox_raw]
             except (TypeError, ValueError):
                 pass
-    return {
+    heading_path = chunk.get("heading_path", [])
+    if not isinstance(heading_path, list):
+        heading_path = []
+    # Chroma metadata values must be scalars, so list fields are stored as JSON.
+    meta = {
         "tenant_id": tenant_id,
         "project_id": project_id,
         "supplier_id": supplier_id,
         "document_id": document_id,
         "doc_type": doc_type,
         "page": page,
-        "bbox": bbox,
+        "bbox": json.dumps(bbox),
         "chunk_type": str(chunk.get("chunk_type") or "text"),
-        "heading_path": chunk.get("heading_path", []),
+        "heading_path": json.dumps(heading_path, ensure_ascii=False),
     }
+    token_count = chunk.get("token_count")
+    if chunk.get("text") and isinstance(token_count, int) and not isinstance(token_count, bool):
+        meta["token_count"] = token_count
+    return meta
+
+
+def _decode_metadata(metadata: dict[str, Any] | None) -> dict[str, Any]:
+    out = dict(metadata or {})
+    for key in ("bbox", "heading_path"):
+        value = out.get(key)
+        if isinstance(value, str):
+            try:
+                out[key] = json.loads(value)
+            except ValueError:
+                out[key] = []
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Embedding reuse (content-hash deduplication)
+# ---------------------------------------------------------------------------
+
+_embedding_reuse_stats: dict[str, int] = {
+    "embeddings_requested_total": 0,
+    "embeddings_reused_total": 0,
+    "embeddings_computed_total": 0,
+}
+
+_HASH_LOOKUP_BATCH = 500
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _embedding_model_id(embedding_fn: Any) -> str:
+    name = getattr(embedding_fn, "name", None)
+    if callable(name):
+        try:
+            return str(name())
+        except Exception:
+            pass
+    return type(embedding_fn).__name__
+
+
+def _embedding_reuse_enabled() -> bool:
+    raw = os.environ.get("LIGHTRAG_EMBEDDING_REUSE", "true").strip().lower()
+    return raw not in {"0", "false", "no", "off"}
+
+
+def embedding_reuse_stats() -> dict[str, int]:
+    """Process-wide counters for embeddings reused vs. sent to the model."""
+    return dict(_embedding_reuse_stats)
+
+
+def reset_embedding_reuse_stats() -> None:
+    for key in _embedding_reuse_stats:
+        _embedding_reuse_stats[key] = 0
+
+
+def _lookup_embeddings(collection: Any, *, content_hashes: list[str], model_id: str) -> dict[str, list[float]]:
+    """Find stored vectors for *content_hashes* embedded by *model_id*."""
+    found: dict[str, list[float]] = {}
+    unique = sorted(set(content_hashes))
+    for start in range(0, len(unique), _HASH_LOOKUP_BATCH):
+        batch = unique[start : start + _HASH_LOOKUP_BATCH]
+        result = collection.get(
+            where={"$and": [{"content_hash": {"$in": batch}}, {"embedding_model": model_id}]},
+            include=["embeddings", "metadatas"],
+        )
+        embeddings = result.get("embeddings")
+        metadatas = result.get("metadatas")
+        if embeddings is None or metadatas is None:
+            continue
+        for metadata, embedding in zip(metadatas, embeddings):
+            content_hash = str((metadata or {}).get("content_hash") or "")
+            if content_hash and content_hash not in found and embedding is not None:
+                found[content_hash] = [float(x) for x in embedding]
+    return found
+
+
+def _upsert_with_embedding_reuse(
+    collection: Any,
+    *,
+    ids: list[str],
+    docs: list[str],
+    metas: list[dict[str, Any]],
+) -> dict[str, int]:
+    """Upsert chunks, embedding only texts whose vectors are not already stored.
+
+    Each record carries ``content_hash`` (sha256 of the embedded text) and
+    ``embedding_model`` metadata, so a re-parse of unchanged paragraphs reuses
+    the vectors written by the previous parse instead of re-embedding them.
+    """
+    embedding_fn = _embedding_fn()
+    model_id = _embedding_model_id(embedding_fn)
+    hashes = [_content_hash(doc) for doc in docs]
+    for meta, content_hash in zip(metas, hashes):
+        meta["content_hash"] = content_hash
+        meta["embedding_model"] = model_id
+
+    known: dict[str, list[float]] = {}
+    if _embedding_reuse_enabled():
+        try:
+            known = _lookup_embeddings(collection, content_hashes=hashes, model_id=model_id)
+        except Exception:
+            known = {}
+    reused = sum(1 for content_hash in hashes if content_hash in known)
+
+    pending: dict[str, str] = {}
+    for doc, content_hash in zip(docs, hashes):
+        if content_hash not in known and content_hash not in pending:
+            pending[content_hash] = doc
+    if pending:
+        vectors = embedding_fn(list(pending.values()))
+        for content_hash, vector in zip(pending.keys(), vectors):
+            known[content_hash] = [float(x) for x in vector]
+
+    collection.upsert(
+        ids=ids,
+        documents=docs,
+        metadatas=metas,
+        embeddings=[known[content_hash] for content_hash in hashes],
+    )
+    _embedding_reuse_stats["embeddings_requested_total"] += len(ids)
+    _embedding_reuse_stats["embeddings_reused_total"] += reused
+    _embedding_reuse_stats["embeddings_computed_total"] += len(pending)
+    return {"embeddings_reused": reused, "embeddings_computed": len(pending)}
 
 
 app = FastAPI(title="LightRAG Lite Service", version="0.1.0")
@@ -214,31 +446,26 @@ app = FastAPI(title="LightRAG Lite Service", version="0.1.0")
 
 @app.post("/index")
 def index_chunks(payload: IndexRequest):
-    collection = _collection(payload.index_name)
-    ids: list[str] = []
-    docs: list[str] = []
-    metas: list[dict[str, Any]] = []
-    for chunk in payload.chunks:
-        if not isinstance(chunk, dict):
-            continue
-        chunk_id = str(chunk.get("chunk_id") or "")
-        if not chunk_id:
-            continue
-        ids.append(chunk_id)
-        docs.append(_chunk_text(chunk))
-        metas.append(
-            _chunk_metadata(
-                chunk=chunk,
-                tenant_id=payload.tenant_id,
-                project_id=payload.project_id,
-                supplier_id=payload.supplier_id or "",
-                document_id=payload.document_id,
-                doc_type=payload.doc_type,
-            )
-        )
-    if ids:
-        collection.upsert(ids=ids, documents=docs, metadatas=metas)
-    return {"success": True, "indexed": len(ids)}
+    stats = index_chunks_with_stats(
+        index_name=payload.index_name,
+        tenant_id=payload.tenant_id,
+        project_id=payload.project_id,
+        supplier_id=payload.supplier_id or "",
+        document_id=payload.document_id,
+        doc_type=payload.doc_type,
+        chunks=payload.chunks,
+    )
+    return {"success": True, **stats}
+
+
+@app.post("/delete")
+def delete_chunks_endpoint(payload: DeleteRequest):
+    deleted = delete_chunks(
+        index_name=payload.index_name,
+        supplier_id=payload.supplier_id or "",
+        chunk_ids=payload.chunk_ids,
+    )
+    return {"success": True, "deleted": deleted}
 
 
 @app.post("/query")
@@ -251,6 +478,9 @@ def query_index(payload: QueryRequest):
         project_id=payload.filters.project_id,
         supplier_id=payload.filters.supplier_id,
         doc_scope=payload.filters.doc_scope,
+        mode=payload.mode,
+        must_include=payload.filters.must_include,
+        must_exclude=payload.filters.must_exclude,
     )
 
 
@@ -259,7 +489,7 @@ def query_index(payload: QueryRequest):
 # ---------------------------------------------------------------------------
 
 
-def index_chunks_to_collection(
+def index_chunks_with_stats(
     *,
     index_name: str,
     tenant_id: str,
@@ -268,8 +498,13 @@ def index_chunks_to_collection(
     document_id: str,
     doc_type: str,
     chunks: list[dict[str, Any]],
-) -> int:
-    """Index chunks directly into a Chroma collection. Returns indexed count."""
+) -> dict[str, int]:
+    """Index chunks into a Chroma collection.
+
+    Returns ``{indexed, embeddings_reused, embeddings_computed}``. With
+    ``LIGHTRAG_SHARD_BY_SUPPLIER`` on, chunks land in the supplier's shard.
+    """
+    index_name = _resolve_index_name(index_name, supplier_id)
     collection = _collection(index_name)
     ids: list[str] = []
     docs: list[str] = []
@@ -295,23 +530,106 @@ def index_chunks_to_collection(
                 doc_type=doc_type,
             )
         )
+    stats = {"indexed": len(ids), "embeddings_reused": 0, "embeddings_computed": 0}
     if ids:
-        collection.upsert(ids=ids, documents=docs, metadatas=metas)
+        stats.update(_upsert_with_embedding_reuse(collection, ids=ids, docs=docs, metas=metas))
+        if bm25_enabled():
+            get_bm25_index().upsert(index_name=index_name, docs=list(zip(ids, docs, metas)))
+    return stats
+
+
+def delete_chunks(*, index_name: str, supplier_id: str, chunk_ids: list[str]) -> int:
+    """Remove chunks (vectors and BM25 postings) by id; returns the number requested."""
+    ids = [str(x) for x in chunk_ids if x]
+    if not ids:
+        return 0
+    for name in _read_targets(index_name, supplier_id):
+        collection = _existing_collection(name)
+        if collection is not None:
+            collection.delete(ids=ids)
+        if bm25_enabled():
+            get_bm25_index().delete(index_name=name, chunk_ids=ids)
     return len(ids)
 
 
-def query_collection(
+def index_chunks_to_collection(
+    *,
+    index_name: str,
+    tenant_id: str,
+    project_id: str,
+    supplier_id: str,
+    document_id: str,
+    doc_type: str,
+    chunks: list[dict[str, Any]],
+) -> int:
+    """Index chunks directly into a Chroma collection. Returns indexed count."""
+    stats = index_chunks_with_stats(
+        index_name=index_name,
+        tenant_id=tenant_id,
+        project_id=project_id,
+        supplier_id=supplier_id,
+        document_id=document_id,
+        doc_type=doc_type,
+        chunks=chunks,
+    )
+    return stats["indexed"]
+
+
+# Reciprocal rank fusion: (vector_weight, lexical_weight) per retrieval mode.
+# Fact lookups ("local") lean on exact terms; relation queries ("global") stay
+# purely semantic.
+_RRF_K = 60
+_MODE_FUSION_WEIGHTS: dict[str, tuple[float, float]] = {
+    "naive": (1.0, 0.0),
+    "local": (0.5, 1.0),
+    "global": (1.0, 0.0),
+    "hybrid": (1.0, 1.0),
+    "mix": (1.0, 1.0),
+}
+
+
+def _fusion_weights(mode: str) -> tuple[float, float]:
+    return _MODE_FUSION_WEIGHTS.get(mode, _MODE_FUSION_WEIGHTS["hybrid"])
+
+
+def _filter_overfetch_max() -> int:
+    raw = os.environ.get("LIGHTRAG_FILTER_OVERFETCH_MAX", "16").strip()
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        return 16
+
+
+def _where_document(*, must_include: list[str], must_exclude: list[str]) -> dict[str, Any] | None:
+    clauses: list[dict[str, Any]] = [{"$contains": term} for term in must_include]
+    clauses.extend({"$not_contains": term} for term in must_exclude)
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+def _vector_search(
     *,
     index_name: str,
     query: str,
-    top_k: int = 10,
+    top_k: int,
     tenant_id: str,
     project_id: str,
     supplier_id: str,
-    doc_scope: list[str] | None = None,
-) -> dict[str, Any]:
-    """Query a Chroma collection directly. Returns {items: [...]}."""
-    collection = _collection(index_name)
+    doc_scope: list[str] | None,
+    allowed_ids: set[str] | None = None,
+    where_document: dict[str, Any] | None = None,
+) -> list[dict[str, Any]]:
+    """Vector top-k within the tenant scope.
+
+    With *allowed_ids* (chunks already known to satisfy text constraints) the
+    candidate pool is over-fetched adaptively: the first round is sized by the
+    estimated selectivity and doubles until top_k survivors are found, the
+    collection is exhausted or ``LIGHTRAG_FILTER_OVERFETCH_MAX`` is reached.
+    """
+    collection = _existing_collection(index_name)
+    if collection is None:
+        return []
     # Chroma requires using $and for multiple field conditions
     where_conditions: list[dict[str, Any]] = [
         {"tenant_id": tenant_id},
@@ -325,16 +643,33 @@ def query_collection(
         count = collection.count()
     except Exception:
         count = 0
-    if count == 0:
-        return {"items": []}
-    effective_k = min(top_k, count)
-    result = collection.query(query_texts=[query], n_results=effective_k, where=where)
-    ids = (result.get("ids") or [[]])[0]
+    if count == 0 or (allowed_ids is not None and not allowed_ids):
+        return []
+    fetch_k = top_k
+    if allowed_ids is not None:
+        max_fetch = top_k * _filter_overfetch_max()
+        fetch_k = min(max_fetch, -(-top_k * count // len(allowed_ids)))
+    while True:
+        effective_k = min(fetch_k, count)
+        result = collection.query(
+            query_texts=[query], n_results=effective_k, where=where, where_document=where_document
+        )
+        ids = (result.get("ids") or [[]])[0]
+        if allowed_ids is None:
+            break
+        kept = sum(1 for chunk_id in ids if chunk_id in allowed_ids)
+        if kept >= top_k or len(ids) < effective_k or effective_k >= count or fetch_k >= max_fetch:
+            break
+        fetch_k = min(max_fetch, fetch_k * 2)
     distances = (result.get("distances") or [[]])[0]
     metadatas = (result.get("metadatas") or [[]])[0]
     documents = (result.get("documents") or [[]])[0]
     out: list[dict[str, Any]] = []
     for idx, chunk_id in enumerate(ids):
+        if allowed_ids is not None and chunk_id not in allowed_ids:
+            continue
+        if len(out) >= top_k:
+            break
         metadata = metadatas[idx] if idx < len(metadatas) else {}
         distance = float(distances[idx]) if idx < len(distances) else 1.0
         score_raw = 1.0 / (1.0 + distance)
@@ -343,9 +678,331 @@ def query_collection(
             "chunk_id": chunk_id,
             "score_raw": round(score_raw, 4),
             "reason": "vector_similarity",
-            "metadata": metadata or {},
+            "metadata": _decode_metadata(metadata),
         }
         if text:
             entry["text"] = text
         out.append(entry)
-    return {"items": out}
+    return out
+
+
+def _lexical_search(
+    *,
+    index_name: str,
+    query: str,
+    top_k: int,
+    tenant_id: str,
+    project_id: str,
+    supplier_id: str,
+    doc_scope: list[str] | None,
+    must_include: list[str] | None = None,
+    must_exclude: list[str] | None = None,
+) -> list[dict[str, Any]]:
+    hits = get_bm25_index().search(
+        index_name=index_name,
+        query=query,
+        top_k=top_k,
+        filters={"tenant_id": tenant_id, "project_id": project_id, "supplier_id": supplier_id},
+        doc_types=doc_scope or None,
+        must_include=must_include,
+        must_exclude=must_exclude,
+    )
+    out: list[dict[str, Any]] = []
+    for hit in hits:
+        entry: dict[str, Any] = {
+            "chunk_id": hit["chunk_id"],
+            "score_raw": round(float(hit["score"]), 4),
+            "reason": "bm25",
+            "metadata": _decode_metadata(hit["metadata"]),
+        }
+        if hit["text"]:
+            entry["text"] = hit["text"]
+        out.append(entry)
+    return out
+
+
+def _rrf_fuse(
+    *,
+    vector_hits: list[dict[str, Any]],
+    lexical_hits: list[dict[str, Any]],
+    vector_weight: float,
+    lexical_weight: float,
+    top_k: int,
+) -> list[dict[str, Any]]:
+    """Fuse two ranked lists; ``score_raw`` is RRF normalised so rank 1 in both lists is 1.0."""
+    fused: dict[str, float] = {}
+    entries: dict[str, dict[str, Any]] = {}
+    sources: dict[str, set[str]] = {}
+    for hits, weight, source in ((vector_hits, vector_weight, "vector"), (lexical_hits, lexical_weight, "bm25")):
+        for rank, hit in enumerate(hits, start=1):
+            chunk_id = hit["chunk_id"]
+            fused[chunk_id] = fused.get(chunk_id, 0.0) + weight / (_RRF_K + rank)
+            entries.setdefault(chunk_id, hit)
+            sources.setdefault(chunk_id, set()).add(source)
+    ceiling = (vector_weight + lexical_weight) / (_RRF_K + 1)
+    ranked = sorted(fused.items(), key=lambda kv: (-kv[1], kv[0]))[:top_k]
+    out: list[dict[str, Any]] = []
+    for chunk_id, score in ranked:
+        entry = dict(entries[chunk_id])
+        entry["score_raw"] = round(score / ceiling, 4) if ceiling else 0.0
+        entry["reason"] = "hybrid_rrf" if len(sources[chunk_id]) > 1 else entry["reason"]
+        out.append(entry)
+    return out
+
+
+def query_collection(
+    *,
+    index_name: str,
+    query: str,
+    top_k: int = 10,
+    tenant_id: str,
+    project_id: str,
+    supplier_id: str,
+    doc_scope: list[str] | None = None,
+    mode: str = "hybrid",
+    must_include: list[str] | None = None,
+    must_exclude: list[str] | None = None,
+) -> dict[str, Any]:
+    """Query a collection directly. Returns {items: [...]}.
+
+    Vector hits are fused with BM25 hits by reciprocal rank fusion, weighted
+    per *mode*; modes without a lexical weight return vector hits unchanged.
+
+    ``must_include``/``must_exclude`` are resolved against the BM25 document
+    table (case-insensitive substring match) so both channels only rank chunks
+    that satisfy them, and ``constraints_applied`` is set in the result. With
+    BM25 disabled, or with a BM25 table that does not yet cover every vector of
+    the collection, they fall back to Chroma ``where_document`` (case-sensitive)
+    and ``constraints_applied`` is false so callers keep verifying.
+
+    With supplier sharding on, the supplier's shard is searched together with
+    the unsharded collection until the latter has been rebalanced away; hits
+    from both are merged by score.
+    """
+    targets = _read_targets(index_name, supplier_id)
+    results = [
+        _query_single_collection(
+            index_name=name,
+            query=query,
+            top_k=top_k,
+            tenant_id=tenant_id,
+            project_id=project_id,
+            supplier_id=supplier_id,
+            doc_scope=doc_scope,
+            mode=mode,
+            must_include=must_include,
+            must_exclude=must_exclude,
+        )
+        for name in targets
+    ]
+    if len(results) == 1:
+        return results[0]
+    best: dict[str, dict[str, Any]] = {}
+    for result in results:
+        for item in result["items"]:
+            current = best.get(item["chunk_id"])
+            if current is None or item["score_raw"] > current["score_raw"]:
+                best[item["chunk_id"]] = item
+    out: dict[str, Any] = {
+        "items": sorted(best.values(), key=lambda item: (-item["score_raw"], item["chunk_id"]))[:top_k]
+    }
+    if "constraints_applied" in results[0]:
+        out["constraints_applied"] = all(result["constraints_applied"] for result in results)
+    return out
+
+
+def _query_single_collection(
+    *,
+    index_name: str,
+    query: str,
+    top_k: int,
+    tenant_id: str,
+    project_id: str,
+    supplier_id: str,
+    doc_scope: list[str] | None,
+    mode: str,
+    must_include: list[str] | None,
+    must_exclude: list[str] | None,
+) -> dict[str, Any]:
+    include = [t for t in (must_include or []) if t.strip()]
+    exclude = [t for t in (must_exclude or []) if t.strip()]
+    constrained = bool(include or exclude)
+    vector_weight, lexical_weight = _fusion_weights(mode)
+    lexical_enabled = bm25_enabled()
+    scope = {
+        "index_name": index_name,
+        "query": query,
+        "top_k": top_k,
+        "tenant_id": tenant_id,
+        "project_id": project_id,
+        "supplier_id": supplier_id,
+        "doc_scope": doc_scope,
+    }
+    # Pushdown needs every vector in the BM25 table: collections indexed before
+    # BM25 existed (or while it was off) fall back to where_document and leave
+    # the constraints for the caller to verify.
+    pushdown = constrained and lexical_enabled and _bm25_covers(index_name)
+    if pushdown:
+        allowed_ids = get_bm25_index().matching_ids(
+            index_name=index_name,
+            filters={"tenant_id": tenant_id, "project_id": project_id, "supplier_id": supplier_id},
+            doc_types=doc_scope or None,
+            must_include=include,
+            must_exclude=exclude,
+        )
+        vector_hits = _vector_search(**scope, allowed_ids=allowed_ids)
+    else:
+        vector_hits = _vector_search(
+            **scope, where_document=_where_document(must_include=include, must_exclude=exclude)
+        )
+    lexical_hits: list[dict[str, Any]] = []
+    if lexical_weight > 0 and lexical_enabled:
+        lexical_hits = _lexical_search(**scope, must_include=include, must_exclude=exclude)
+    items = vector_hits
+    if lexical_hits:
+        items = _rrf_fuse(
+            vector_hits=vector_hits,
+            lexical_hits=lexical_hits,
+            vector_weight=vector_weight,
+            lexical_weight=lexical_weight,
+            top_k=top_k,
+        )
+    out: dict[str, Any] = {"items": items}
+    if constrained:
+        out["constraints_applied"] = pushdown
+    return out
+
+
+def _bm25_covers(index_name: str) -> bool:
+    count = _collection_count(index_name)
+    return count > 0 and get_bm25_index().doc_count(index_name=index_name) >= count
+
+
+def rebuild_bm25_from_collection(index_name: str, *, batch_size: int = 500) -> int:
+    """Re-create the BM25 rows of *index_name* from the documents stored in Chroma.
+
+    For collections indexed before BM25 existed or while it was disabled.
+    Returns the number of chunks indexed.
+    """
+    collection = _existing_collection(index_name)
+    if collection is None:
+        return 0
+    bm25 = get_bm25_index()
+    indexed = 0
+    offset = 0
+    while True:
+        batch = collection.get(limit=batch_size, offset=offset, include=["documents", "metadatas"])
+        ids = list(batch.get("ids") or [])
+        if not ids:
+            break
+        docs = batch.get("documents") or []
+        metas = batch.get("metadatas") or []
+        rows = [
+            (chunk_id, docs[i] or "", metas[i] or {}) for i, chunk_id in enumerate(ids) if i < len(docs) and docs[i]
+        ]
+        indexed += bm25.upsert(index_name=index_name, docs=rows)
+        offset += len(ids)
+    return indexed
+
+
+# ---------------------------------------------------------------------------
+# Maintenance: move data between the unsharded collection and supplier shards
+# ---------------------------------------------------------------------------
+
+
+def _move_records(*, source: str, target_for: Any, batch_size: int, dry_run: bool) -> dict[str, int]:
+    """Move every record of *source* into ``target_for(metadata)``; returns per-target counts.
+
+    Records whose target is *source* itself stay where they are.
+    """
+    source_collection = _collection(source)
+    moved: dict[str, int] = {}
+    offset = 0
+    while True:
+        batch = source_collection.get(
+            limit=batch_size,
+            offset=offset,
+            include=["documents", "metadatas", "embeddings"],
+        )
+        ids = list(batch.get("ids") or [])
+        if not ids:
+            break
+        grouped: dict[str, list[int]] = {}
+        for idx, metadata in enumerate(batch.get("metadatas") or []):
+            grouped.setdefault(target_for(metadata or {}), []).append(idx)
+        kept = len(grouped.pop(source, []))
+        moved_ids: list[str] = []
+        for target, positions in grouped.items():
+            moved[target] = moved.get(target, 0) + len(positions)
+            if dry_run:
+                continue
+            target_ids = [ids[i] for i in positions]
+            docs = [batch["documents"][i] for i in positions]
+            metas = [batch["metadatas"][i] for i in positions]
+            _collection(target).upsert(
+                ids=target_ids,
+                documents=docs,
+                metadatas=metas,
+                embeddings=[[float(x) for x in batch["embeddings"][i]] for i in positions],
+            )
+            if bm25_enabled():
+                bm25 = get_bm25_index()
+                bm25.upsert(index_name=target, docs=list(zip(target_ids, docs, metas)))
+                bm25.delete(index_name=source, chunk_ids=target_ids)
+            moved_ids.extend(target_ids)
+        if dry_run:
+            offset += len(ids)
+        else:
+            if moved_ids:
+                source_collection.delete(ids=moved_ids)
+            offset += kept
+    return moved
+
+
+def rebalance_collection(
+    index_name: str,
+    *,
+    shard_by_supplier: bool,
+    batch_size: int = 500,
+    dry_run: bool = False,
+) -> dict[str, Any]:
+    """Split *index_name* into supplier shards, or merge its shards back.
+
+    Stored embeddings are copied as-is, so nothing is re-embedded. Records
+    without a supplier stay in the unsharded collection, which is only dropped
+    once empty; emptied shards are dropped. Returns ``{index_name, mode, moved, dry_run}``
+    where ``moved`` maps target collection to record count.
+    """
+    moved: dict[str, int] = {}
+    if shard_by_supplier:
+        if _collection_count(index_name) > 0:
+            moved = _move_records(
+                source=index_name,
+                target_for=lambda meta: (
+                    shard_collection_name(index_name, str(meta["supplier_id"]))
+                    if meta.get("supplier_id")
+                    else index_name
+                ),
+                batch_size=batch_size,
+                dry_run=dry_run,
+            )
+            if not dry_run and _collection_count(index_name) == 0:
+                _drop_collection(index_name)
+    else:
+        prefix = _shard_prefix(index_name)
+        for name in _chroma_client().list_collections():
+            name = name if isinstance(name, str) else name.name
+            if not name.startswith(prefix):
+                continue
+            for target, count in _move_records(
+                source=name, target_for=lambda _meta: index_name, batch_size=batch_size, dry_run=dry_run
+            ).items():
+                moved[target] = moved.get(target, 0) + count
+            if not dry_run:
+                _drop_collection(name)
+    return {
+        "index_name": index_name,
+        "mode": "shard" if shard_by_supplier else "merge",
+        "moved": moved,
+        "dry_run": dry_run,
+    }
@@ -0,0 +1,105 @@
+"""Process-wide pool of OpenAI-compatible clients.
+
+Scoring, explanation and embedding calls share one ``openai.OpenAI`` instance
+(and its keep-alive connection pool) per (provider, base_url, api_key hash),
+instead of building a fresh client — and paying a TLS handshake — per call.
+A changed provider, base_url or api_key maps to a new key, so reconfigured
+credentials take effect without a restart; the pool keeps the most recently
+used ``_MAX_CLIENTS`` entries and closes the rest.
+
+Env vars:
+  LLM_HTTP_MAX_CONNECTIONS  — connections per client (default 20)
+  LLM_HTTP_MAX_KEEPALIVE    — idle keep-alive connections per client (default 10)
+  LLM_HTTP_KEEPALIVE_S      — idle keep-alive expiry in seconds (default 60)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any
+
+_MAX_CLIENTS = 8
+
+_clients: OrderedDict[tuple[str, str, str], Any] = OrderedDict()
+_clients_lock = threading.Lock()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, str(default)).strip())
+    except ValueError:
+        return default
+
+
+def _client_key(provider: str, base_url: str, api_key: str) -> tuple[str, str, str]:
+    key_hash = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16] if api_key else ""
+    return (provider, base_url.rstrip("/"), key_hash)
+
+
+def _build_client(openai: Any, *, api_key: str, base_url: str) -> Any:
+    import httpx
+
+    limits = httpx.Limits(
+        max_connections=max(1, _env_int("LLM_HTTP_MAX_CONNECTIONS", 20)),
+        max_keepalive_connections=max(0, _env_int("LLM_HTTP_MAX_KEEPALIVE", 10)),
+        keepalive_expiry=float(max(1, _env_int("LLM_HTTP_KEEPALIVE_S", 60))),
+    )
+    kwargs: dict[str, Any] = {}
+    if api_key:
+        kwargs["api_key"] = api_key
+    if base_url:
+        kwargs["base_url"] = base_url
+    http_client_cls = getattr(openai, "DefaultHttpxClient", None)
+    if http_client_cls is not None:
+        kwargs["http_client"] = http_client_cls(limits=limits)
+    return openai.OpenAI(**kwargs)
+
+
+def get_openai_client(*, provider: str, api_key: str, base_url: str) -> Any:
+    """Return the shared client for this provider configuration, creating it on first use."""
+    try:
+        import openai
+    except ImportError:
+        raise RuntimeError("openai package is required. Install with: pip install 'bid-evaluation-assistant[openai]'")
+
+    key = _client_key(provider, base_url, api_key)
+    stale: list[Any] = []
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _build_client(openai, api_key=api_key, base_url=base_url)
+            _clients[key] = client
+            while len(_clients) > _MAX_CLIENTS:
+                stale.append(_clients.popitem(last=False)[1])
+        else:
+            _clients.move_to_end(key)
+    for old in stale:
+        _close_quietly(old)
+    return client
+
+
+def openai_client_count() -> int:
+    with _clients_lock:
+        return len(_clients)
+
+
+def reset_openai_clients() -> None:
+    """Close and drop every pooled client (config reload, tests)."""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        _close_quietly(client)
+
+
+def _close_quietly(client: Any) -> None:
+    close = getattr(client, "close", None)
+    if close is None:
+        return
+    try:
+        close()
+    except Exception:
+        pass
@@ -17,14 +17,29 @@ Configuration via environment variables:
   OLLAMA_BASE_URL       = http://localhost:11434/v1   (Ollama OpenAI-compat endpoint)
   OLLAMA_MODEL          = qwen2.5:7b
   MOCK_LLM_ENABLED      = true                       (force mock mode)
+  LLM_SCORE_CONCURRENCY = 4                          (parallel criteria scoring calls)
+  LLM_SCORE_COMPLETION_ESTIMATE = 512                (completion tokens reserved per scoring call)
+  LLM_SCORE_BATCH_ENABLED = false                    (pack several criteria into one scoring request)
+  LLM_SCORE_BATCH_MAX_CRITERIA = 8
+  LLM_SCORE_BATCH_MAX_PROMPT_TOKENS = 2 x EVIDENCE_SINGLE_BUDGET
+  LLM_STREAM_ENABLED    = false                      (streamed calls with early JSON validation)
+  LLM_STREAM_TTFT_MS    = 10000                      (time-to-first-token / stall deadline)
+  LLM_STREAM_TOTAL_MS   = 60000                      (total deadline per streamed call)
+  LLM_HEDGE_PERCENTILE  = 95                         (race the fallback past this primary latency; 0 = off)
+  LLM_HEDGE_MIN_SAMPLES = 20                         (samples needed before the percentile is trusted)
+  LLM_HEDGE_DEFAULT_MS  = 15000                      (hedge delay until then)
 """
 
 from __future__ import annotations
 
 import json
 import logging
+import math
 import os
+import threading
 import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -55,6 +70,9 @@ class LLMUsage:
     latency_ms: float = 0.0
     degraded: bool = False
     degrade_reason: str = ""
+    cache_hit: bool = False
+    # Estimated tokens of a hedged stream that lost the race; already in the totals above.
+    abandoned_tokens: int = 0
 
 
 _call_usage_log: list[LLMUsage] = []
@@ -82,6 +100,8 @@ class CostBudgetTracker:
     _cumulative_prompt_tokens: int = field(default=0, init=False)
     _cumulative_completion_tokens: int = field(default=0, init=False)
     _cumulative_total_tokens: int = field(default=0, init=False)
+    _reserved_tokens: int = field(default=0, init=False)
+    _cache_hits: int = field(default=0, init=False)
     _degraded: bool = field(default=False, init=False)
     _blocked: bool = field(default=False, init=False)
 
@@ -89,22 +109,54 @@ class CostBudgetTracker:
         self._cumulative_prompt_tokens += usage.prompt_tokens
         self._cumulative_completion_tokens += usage.completion_tokens
         self._cumulative_total_tokens += usage.total_tokens
+        if usage.cache_hit:
+            self._cache_hits += 1
+
+    def reserve(self, estimated_tokens: int) -> str:
+        """Admit a call before dispatch and hold its estimated tokens.
+
+        Thresholds are evaluated against recorded plus reserved tokens, so
+        calls admitted in a fixed order get the same ok/degrade/blocked
+        outcome no matter when in-flight calls finish. Only an ``ok`` call
+        holds a reservation; pass the same amount to :meth:`settle`.
+        """
+        status = self.check_budget()
+        if status == "ok":
+            self._reserved_tokens += max(0, estimated_tokens)
+        return status
+
+    def settle(self, reserved_tokens: int, usage: LLMUsage) -> None:
+        """Replace a reservation with the call's actual usage."""
+        self._reserved_tokens = max(0, self._reserved_tokens - max(0, reserved_tokens))
+        self.record_usage(usage)
 
     @property
     def total_tokens(self) -> int:
         return self._cumulative_total_tokens
 
+    @property
+    def cache_hits(self) -> int:
+        return self._cache_hits
+
+    @property
+    def reserved_tokens(self) -> int:
+        return self._reserved_tokens
+
+    @property
+    def projected_tokens(self) -> int:
+        return self._cumulative_total_tokens + self._reserved_tokens
+
     @property
     def is_over_budget(self) -> bool:
         if self.max_tokens_budget <= 0:
             return False
-        return self._cumulative_total_tokens > int(self.max_tokens_budget * self.hard_threshold_ratio)
+        return self.projected_tokens > int(self.max_tokens_budget * self.hard_threshold_ratio)
 
     @property
     def should_degrade(self) -> bool:
         if self.max_tokens_budget <= 0:
             return False
-        return self._cumulative_total_tokens >= int(self.max_tokens_budget * self.warn_threshold_ratio)
+        return self.projected_tokens >= int(self.max_tokens_budget * self.warn_threshold_ratio)
 
     def check_budget(self) -> str:
         """Returns 'ok', 'warn', 'degrade', or 'blocked'."""
@@ -132,6 +184,13 @@ def reset_usage_log() -> None:
     _call_usage_log.clear()
 
 
+def scoring_concurrency() -> int:
+    try:
+        return max(1, int(os.environ.get("LLM_SCORE_CONCURRENCY", "4").strip()))
+    except ValueError:
+        return 4
+
+
 def _get_provider_config() -> ProviderConfig:
     provider = os.environ.get("LLM_PROVIDER", "openai").strip().lower()
     fallback = os.environ.get("LLM_FALLBACK_MODEL", "").strip()
@@ -169,21 +228,13 @@ def is_real_llm_available() -> bool:
 
 
 def _create_client(config: ProviderConfig):
-    try:
-        import openai
-    except ImportError:
-        raise RuntimeError("openai package is required. Install with: pip install 'bid-evaluation-assistant[openai]'")
-
-    kwargs: dict[str, Any] = {}
-    if config.api_key:
-        kwargs["api_key"] = config.api_key
-    if config.base_url:
-        kwargs["base_url"] = config.base_url
-
-    if config.provider == "ollama" and "api_key" not in kwargs:
-        kwargs["api_key"] = "ollama"
+    """Return the pooled client for *config* (shared keep-alive connections across calls)."""
+    from app.llm_clients import get_openai_client
 
-    return openai.OpenAI(**kwargs)
+    api_key = config.api_key
+    if config.provider == "ollama" and not api_key:
+        api_key = "ollama"
+    return get_openai_client(provider=config.provider, api_key=api_key, base_url=config.base_url)
 
 
 def _call_chat(
@@ -222,6 +273,322 @@ def _call_chat(
     return content, usage
 
 
+class LLMDeadlineError(TimeoutError):
+    """A streamed call missed its time-to-first-token or total deadline."""
+
+
+class LLMSchemaError(ValueError):
+    """Streamed JSON-mode output is not (and can no longer become) a JSON object."""
+
+
+class LLMCancelledError(RuntimeError):
+    """A streamed call was abandoned because a hedged request already won."""
+
+
+class _JsonObjectScanner:
+    """Incremental scanner that spots the end of the top-level JSON object.
+
+    ``feed`` raises :class:`LLMSchemaError` as soon as the output cannot be a
+    JSON object (first non-space character is not ``{``); ``end`` is the
+    offset just past the closing brace once ``complete`` is set.
+    """
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.started = False
+        self.complete = False
+        self.end = 0
+        self._offset = 0
+
+    def feed(self, text: str) -> None:
+        for ch in text:
+            self._offset += 1
+            if self.complete:
+                return
+            if not self.started:
+                if ch.isspace():
+                    continue
+                if ch != "{":
+                    raise LLMSchemaError(f"expected a JSON object, got {ch!r}")
+                self.started = True
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+                continue
+            if ch == '"':
+                self.in_string = True
+            elif ch in "{[":
+                self.depth += 1
+            elif ch in "}]":
+                self.depth -= 1
+                if self.depth == 0:
+                    self.complete = True
+                    self.end = self._offset
+
+
+def _stream_enabled() -> bool:
+    raw = os.environ.get("LLM_STREAM_ENABLED", "false").strip().lower()
+    return raw in {"1", "true", "yes", "on"}
+
+
+def _env_ms(name: str, default: int) -> float:
+    try:
+        return max(0, int(os.environ.get(name, str(default)).strip())) / 1000.0
+    except ValueError:
+        return default / 1000.0
+
+
+def _call_chat_stream(
+    *,
+    client,
+    model: str,
+    messages: list[dict[str, str]],
+    temperature: float = 0.1,
+    max_tokens: int = 1024,
+    json_mode: bool = False,
+    ttft_s: float = 10.0,
+    total_s: float = 60.0,
+    cancel: threading.Event | None = None,
+    progress: list[str] | None = None,
+) -> tuple[str, LLMUsage]:
+    """Streamed variant of :func:`_call_chat`.
+
+    In JSON mode the stream is closed as soon as the top-level object is
+    complete, and aborted with :class:`LLMSchemaError` once the output cannot
+    be one. The HTTP read timeout doubles as a stall detector (``ttft_s``);
+    deadlines are also checked between chunks. When the stream is cut short
+    before the provider's usage chunk arrives, usage is estimated with
+    :func:`app.token_budget.count_tokens`. Deltas are appended to *progress*
+    as they arrive, so a caller can cost a stream it abandons.
+    """
+    import httpx
+
+    t0 = time.monotonic()
+    kwargs: dict[str, Any] = {
+        "model": model,
+        "temperature": temperature,
+        "messages": messages,
+        "max_tokens": max_tokens,
+        "stream": True,
+        "stream_options": {"include_usage": True},
+        "timeout": httpx.Timeout(total_s, read=ttft_s),
+    }
+    if json_mode:
+        kwargs["response_format"] = {"type": "json_object"}
+
+    scanner = _JsonObjectScanner() if json_mode else None
+    parts: list[str] = progress if progress is not None else []
+    usage_data = None
+    first_token_at: float | None = None
+    stream = client.chat.completions.create(**kwargs)
+    try:
+        for chunk in stream:
+            if cancel is not None and cancel.is_set():
+                raise LLMCancelledError(model)
+            now = time.monotonic()
+            if getattr(chunk, "usage", None):
+                usage_data = chunk.usage
+            delta = chunk.choices[0].delta.content if getattr(chunk, "choices", None) else None
+            if delta:
+                if first_token_at is None:
+                    first_token_at = now
+                parts.append(delta)
+                if scanner is not None:
+                    scanner.feed(delta)
+                    if scanner.complete:
+                        break
+            if first_token_at is None and now - t0 > ttft_s:
+                raise LLMDeadlineError(f"{model}: no token within {ttft_s:.1f}s")
+            if first_token_at is not None and first_token_at - t0 > ttft_s:
+                raise LLMDeadlineError(f"{model}: first token after {first_token_at - t0:.1f}s")
+            if now - t0 > total_s:
+                raise LLMDeadlineError(f"{model}: exceeded {total_s:.1f}s total")
+    finally:
+        close = getattr(stream, "close", None)
+        if close is not None:
+            close()
+
+    content = "".join(parts)
+    if scanner is not None:
+        if not scanner.complete:
+            raise LLMSchemaError(f"{model}: stream ended before the JSON object was complete")
+        content = content[: scanner.end]
+    elapsed_ms = (time.monotonic() - t0) * 1000
+
+    if usage_data is not None:
+        prompt_tokens = getattr(usage_data, "prompt_tokens", 0)
+        completion_tokens = getattr(usage_data, "completion_tokens", 0)
+        total_tokens = getattr(usage_data, "total_tokens", 0)
+    else:
+        prompt_tokens, completion_tokens = _estimate_tokens(messages, content)
+        total_tokens = prompt_tokens + completion_tokens
+    usage = LLMUsage(
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        total_tokens=total_tokens,
+        model=model,
+        latency_ms=round(elapsed_ms, 1),
+    )
+    _call_usage_log.append(usage)
+    return content, usage
+
+
+def _estimate_tokens(messages: list[dict[str, str]], content: str) -> tuple[int, int]:
+    from app.token_budget import count_tokens
+
+    prompt_tokens = sum(count_tokens(m.get("content", "")) for m in messages)
+    return prompt_tokens, count_tokens(content) if content else 0
+
+
+# Recent successful latencies per model; the hedge delay is a percentile of these.
+_latency_samples: dict[str, deque[float]] = {}
+_latency_lock = threading.Lock()
+
+
+def _record_latency(model: str, latency_ms: float) -> None:
+    with _latency_lock:
+        _latency_samples.setdefault(model, deque(maxlen=200)).append(latency_ms)
+
+
+def _hedge_delay_s(model: str) -> float | None:
+    """Seconds to wait on the primary before racing the fallback (None: never hedge)."""
+    try:
+        percentile = float(os.environ.get("LLM_HEDGE_PERCENTILE", "95").strip())
+    except ValueError:
+        percentile = 95.0
+    if percentile <= 0:
+        return None
+    try:
+        min_samples = int(os.environ.get("LLM_HEDGE_MIN_SAMPLES", "20").strip())
+    except ValueError:
+        min_samples = 20
+    with _latency_lock:
+        samples = sorted(_latency_samples.get(model, ()))
+    if len(samples) < max(1, min_samples):
+        return _env_ms("LLM_HEDGE_DEFAULT_MS", 15000)
+    rank = min(len(samples), max(1, math.ceil(min(percentile, 100.0) / 100.0 * len(samples))))
+    return samples[rank - 1] / 1000.0
+
+
+def reset_latency_samples() -> None:
+    with _latency_lock:
+        _latency_samples.clear()
+
+
+def _call_streaming_with_hedge(
+    *,
+    config: ProviderConfig,
+    client,
+    messages: list[dict[str, str]],
+    json_mode: bool,
+    max_tokens: int,
+) -> tuple[str, LLMUsage]:
+    """Stream from the primary model; race the fallback once the primary is slow.
+
+    The fallback is started immediately when the primary fails, or in
+    parallel (hedged) when the primary is still running after its latency
+    percentile. The first successful response wins and the other stream is
+    cancelled at its next chunk; its prompt plus the tokens it streamed so far
+    are added to the winner's usage so the task budget sees both.
+    """
+    ttft_s = _env_ms("LLM_STREAM_TTFT_MS", 10000)
+    total_s = _env_ms("LLM_STREAM_TOTAL_MS", 60000)
+    cancels = {config.model: threading.Event(), config.fallback_model: threading.Event()}
+    progress: dict[str, list[str]] = {config.model: [], config.fallback_model: []}
+
+    def run(model: str) -> tuple[str, LLMUsage]:
+        return _call_chat_stream(
+            client=client,
+            model=model,
+            messages=messages,
+            temperature=config.temperature,
+            max_tokens=max_tokens,
+            json_mode=json_mode,
+            ttft_s=ttft_s,
+            total_s=total_s,
+            cancel=cancels[model],
+            progress=progress[model],
+        )
+
+    def charge_loser(usage: LLMUsage, loser: str) -> None:
+        cancels[loser].set()
+        prompt_tokens, completion_tokens = _estimate_tokens(messages, "".join(progress[loser]))
+        _call_usage_log.append(
+            LLMUsage(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                total_tokens=prompt_tokens + completion_tokens,
+                model=loser,
+                degrade_reason="hedge_cancelled",
+            )
+        )
+        usage.prompt_tokens += prompt_tokens
+        usage.completion_tokens += completion_tokens
+        usage.total_tokens += prompt_tokens + completion_tokens
+        usage.abandoned_tokens += prompt_tokens + completion_tokens
+
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="llm-stream")
+    try:
+        primary = executor.submit(run, config.model)
+        hedge_delay = _hedge_delay_s(config.model) if config.fallback_model else None
+        done, _ = wait([primary], timeout=hedge_delay)
+        if primary in done:
+            try:
+                content, usage = primary.result()
+            except Exception as primary_exc:
+                if not config.fallback_model:
+                    raise
+                logger.warning(
+                    "Primary model %s failed (%s), degrading to %s",
+                    config.model,
+                    type(primary_exc).__name__,
+                    config.fallback_model,
+                )
+                content, usage = run(config.fallback_model)
+                usage.degraded = True
+                usage.degrade_reason = f"primary_failed:{type(primary_exc).__name__}"
+                return content, usage
+            _record_latency(config.model, usage.latency_ms)
+            return content, usage
+
+        logger.info(
+            "Primary model %s slower than %.1fs, hedging with %s", config.model, hedge_delay, config.fallback_model
+        )
+        fallback = executor.submit(run, config.fallback_model)
+        pending = {primary, fallback}
+        primary_exc: BaseException | None = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in (f for f in (primary, fallback) if f in done):
+                try:
+                    content, usage = future.result()
+                except Exception as exc:
+                    if future is primary:
+                        primary_exc = exc
+                    elif not pending:
+                        raise primary_exc or exc
+                    continue
+                if future is primary:
+                    _record_latency(config.model, usage.latency_ms)
+                    charge_loser(usage, config.fallback_model)
+                else:
+                    usage.degraded = True
+                    usage.degrade_reason = "hedged"
+                    charge_loser(usage, config.model)
+                return content, usage
+        raise primary_exc or RuntimeError("hedged LLM call produced no result")
+    finally:
+        for event in cancels.values():
+            event.set()
+        executor.shutdown(wait=False)
+
+
 def _call_with_degradation(
     *,
     config: ProviderConfig,
@@ -231,6 +598,14 @@ def _call_with_degradation(
 ) -> tuple[str, LLMUsage]:
     """Try primary model, then fallback model, raising on total failure."""
     client = _create_client(config)
+    if _stream_enabled():
+        return _call_streaming_with_hedge(
+            config=config,
+            client=client,
+            messages=messages,
+            json_mode=json_mode,
+            max_tokens=max_tokens,
+        )
 
     try:
         return _call_chat(
@@ -264,6 +639,9 @@ def _call_with_degradation(
         return content, usage
 
 
+# Bump whenever the scoring prompts / templates (single or batch) change so cached scores are not reused.
+_SCORE_PROMPT_VERSION = "score_v1"
+
 _SCORE_SYSTEM_PROMPT = """你是一个专业的评标专家AI助手。你需要根据提供的证据对评分项进行评分。
 
 要求：
@@ -295,6 +673,126 @@ _SCORE_USER_TEMPLATE = """评分项ID: {criteria_id}
 }}"""
 
 
+def _format_evidence(evidence_chunks: list[dict[str, Any]]) -> str:
+    evidence_text = ""
+    for i, chunk in enumerate(evidence_chunks, 1):
+        page = chunk.get("page", "?")
+        text = chunk.get("text", "")[:500]
+        evidence_text += f"[证据{i}] (第{page}页): {text}\n\n"
+
+    if not evidence_text.strip():
+        evidence_text = "（无相关证据）"
+    return evidence_text
+
+
+def _build_score_messages(
+    *,
+    criteria_id: str,
+    requirement_text: str,
+    evidence_chunks: list[dict[str, Any]],
+    max_score: float,
+    criteria_name: str,
+) -> list[dict[str, str]]:
+    user_msg = _SCORE_USER_TEMPLATE.format(
+        criteria_id=criteria_id,
+        criteria_name=criteria_name or criteria_id,
+        requirement_text=requirement_text or "未提供具体要求",
+        max_score=max_score,
+        evidence_text=_format_evidence(evidence_chunks),
+    )
+    return [
+        {"role": "system", "content": _SCORE_SYSTEM_PROMPT},
+        {"role": "user", "content": user_msg},
+    ]
+
+
+def _score_cache_key(
+    config: ProviderConfig,
+    *,
+    criteria_id: str,
+    requirement_text: str,
+    evidence_chunks: list[dict[str, Any]],
+    max_score: float,
+    criteria_name: str,
+) -> str | None:
+    from app.llm_score_cache import llm_score_cache_enabled, score_cache_key
+
+    if not llm_score_cache_enabled():
+        return None
+    return score_cache_key(
+        model=config.model,
+        prompt_version=_SCORE_PROMPT_VERSION,
+        criteria_id=criteria_id,
+        criteria_name=criteria_name or criteria_id,
+        requirement_text=requirement_text,
+        max_score=max_score,
+        evidence_chunks=evidence_chunks,
+    )
+
+
+def estimate_score_tokens(
+    criteria_id: str,
+    requirement_text: str,
+    evidence_chunks: list[dict[str, Any]],
+    *,
+    max_score: float = 10.0,
+    criteria_name: str = "",
+) -> int:
+    """Tokens to reserve for one :func:`llm_score_criteria` call (0 when mocked or cached)."""
+    if not is_real_llm_available():
+        return 0
+    cache_key = _score_cache_key(
+        _get_provider_config(),
+        criteria_id=criteria_id,
+        requirement_text=requirement_text,
+        evidence_chunks=evidence_chunks,
+        max_score=max_score,
+        criteria_name=criteria_name,
+    )
+    if cache_key is not None:
+        from app.llm_score_cache import get_llm_score_cache
+
+        if get_llm_score_cache().peek(cache_key):
+            return 0
+    from app.token_budget import count_tokens
+
+    messages = _build_score_messages(
+        criteria_id=criteria_id,
+        requirement_text=requirement_text,
+        evidence_chunks=evidence_chunks,
+        max_score=max_score,
+        criteria_name=criteria_name,
+    )
+    try:
+        completion_estimate = int(os.environ.get("LLM_SCORE_COMPLETION_ESTIMATE", "512").strip())
+    except ValueError:
+        completion_estimate = 512
+    return sum(count_tokens(m["content"]) for m in messages) + max(0, completion_estimate)
+
+
+def _coerce_score_result(result: dict[str, Any], *, max_score: float, usage: LLMUsage) -> dict[str, Any]:
+    score = float(result.get("score", max_score * 0.5))
+    score = max(0.0, min(max_score, score))
+    return {
+        "score": round(score, 2),
+        "max_score": max_score,
+        "hard_pass": bool(result.get("hard_pass", score >= max_score * 0.6)),
+        "reason": str(result.get("reason", "LLM evaluation completed")),
+        "confidence": float(result.get("confidence", 0.75)),
+        "model": usage.model,
+        "degraded": usage.degraded,
+    }
+
+
+def _usage_dict(usage: LLMUsage) -> dict[str, Any]:
+    return {
+        "prompt_tokens": usage.prompt_tokens,
+        "completion_tokens": usage.completion_tokens,
+        "total_tokens": usage.total_tokens,
+        "latency_ms": usage.latency_ms,
+    }
+
+
 def llm_score_criteria(
     criteria_id: str,
     requirement_text: str,
@@ -303,8 +801,14 @@ def llm_score_criteria(
     max_score: float = 10.0,
     criteria_name: str = "",
     hard_constraint_pass: bool = True,
+    use_cache: bool = True,
 ) -> dict[str, Any]:
-    """Score a criteria item. Chain: real LLM (primary -> fallback) -> mock."""
+    """Score a criteria item. Chain: cache -> real LLM (primary -> fallback) -> mock.
+
+    Results from the primary model are cached (see :mod:`app.llm_score_cache`);
+    a hit is returned with zero-token usage and ``cache_hit=True``. Pass
+    ``use_cache=False`` to bypass the lookup and the store.
+    """
     if not is_real_llm_available():
         from app.mock_llm import mock_score_criteria
 
@@ -317,29 +821,33 @@ def llm_score_criteria(
         )
 
     config = _get_provider_config()
+    cache_key = None
+    if use_cache:
+        cache_key = _score_cache_key(
+            config,
+            criteria_id=criteria_id,
+            requirement_text=requirement_text,
+            evidence_chunks=evidence_chunks,
+            max_score=max_score,
+            criteria_name=criteria_name,
+        )
+    if cache_key is not None:
+        from app.llm_score_cache import get_llm_score_cache
 
-    evidence_text = ""
-    for i, chunk in enumerate(evidence_chunks, 1):
-        page = chunk.get("page", "?")
-        text = chunk.get("text", "")[:500]
-        evidence_text += f"[证据{i}] (第{page}页): {text}\n\n"
-
-    if not evidence_text.strip():
-        evidence_text = "（无相关证据）"
+        cached = get_llm_score_cache().get(cache_key)
+        if cached is not None:
+            cached["cache_hit"] = True
+            cached["usage"] = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0, "latency_ms": 0.0}
+            return cached
 
-    user_msg = _SCORE_USER_TEMPLATE.format(
+    messages = _build_score_messages(
         criteria_id=criteria_id,
-        criteria_name=criteria_name or criteria_id,
-        requirement_text=requirement_text or "未提供具体要求",
+        requirement_text=requirement_text,
+        evidence_chunks=evidence_chunks,
         max_score=max_score,
-        evidence_text=evidence_text,
+        criteria_name=criteria_name,
     )
 
-    messages = [
-        {"role": "system", "content": _SCORE_SYSTEM_PROMPT},
-        {"role": "user", "content": user_msg},
-    ]
-
     try:
         content, usage = _call_with_degradation(
             config=config,
@@ -347,25 +855,13 @@ def llm_score_criteria(
             json_mode=True,
             max_tokens=4096,
         )
-        result = json.loads(content)
-        score = float(result.get("score", max_score * 0.5))
-        score = max(0.0, min(max_score, score))
-
-        return {
-            "score": round(score, 2),
-            "max_score": max_score,
-            "hard_pass": bool(result.get("hard_pass", score >= max_score * 0.6)),
-            "reason": str(result.get("reason", "LLM evaluation completed")),
-            "confidence": float(result.get("confidence", 0.75)),
-            "model": usage.model,
-            "degraded": usage.degraded,
-            "usage": {
-                "prompt_tokens": usage.prompt_tokens,
-                "completion_tokens": usage.completion_tokens,
-                "total_tokens": usage.total_tokens,
-                "latency_ms": usage.latency_ms,
-            },
-        }
+        scored = _coerce_score_result(json.loads(content), max_score=max_score, usage=usage)
+        if cache_key is not None and not usage.degraded:
+            from app.llm_score_cache import get_llm_score_cache
+
+            get_llm_score_cache().put(cache_key, scored)
+        scored["usage"] = _usage_dict(usage)
+        return scored
 
     except Exception as exc:
         logger.warning("LLM scoring failed (%s), falling back to mock", type(exc).__name__)
@@ -383,6 +879,219 @@ def llm_score_criteria(
         return result
 
 
+_SCORE_BATCH_ITEM_TEMPLATE = """### 评分项ID: {criteria_id}
+评分项名称: {criteria_name}
+要求描述: {requirement_text}
+满分: {max_score}
+
+相关证据:
+{evidence_text}"""
+
+_SCORE_BATCH_USER_TEMPLATE = """请对以下 {count} 个评分项分别独立评分，每项只依据该项下列出的证据。
+
+{criteria_blocks}
+
+请按以下JSON格式返回评分结果，results 中每个评分项一条，criteria_id 与上文一致:
+{{
+  "results": [
+    {{
+      "criteria_id": "<string>",
+      "score": <float, 0 到该项满分>,
+      "hard_pass": <bool, 是否通过硬性要求>,
+      "reason": "<string, 评分理由，必须引用证据>",
+      "confidence": <float, 0.0-1.0, 评分置信度>
+    }}
+  ]
+}}"""
+
+
+def score_batch_enabled() -> bool:
+    raw = os.environ.get("LLM_SCORE_BATCH_ENABLED", "false").strip().lower()
+    return raw in {"1", "true", "yes", "on"}
+
+
+def _score_batch_limits() -> tuple[int, int]:
+    """(max criteria, max prompt tokens) per batched scoring request."""
+    from app.token_budget import SINGLE_CRITERIA_BUDGET
+
+    try:
+        max_criteria = int(os.environ.get("LLM_SCORE_BATCH_MAX_CRITERIA", "8").strip())
+    except ValueError:
+        max_criteria = 8
+    try:
+        max_tokens = int(os.environ.get("LLM_SCORE_BATCH_MAX_PROMPT_TOKENS", "").strip() or 0)
+    except ValueError:
+        max_tokens = 0
+    return max(1, max_criteria), max_tokens if max_tokens > 0 else SINGLE_CRITERIA_BUDGET * 2
+
+
+def _score_batch_block(item: dict[str, Any]) -> str:
+    return _SCORE_BATCH_ITEM_TEMPLATE.format(
+        criteria_id=item["criteria_id"],
+        criteria_name=item.get("criteria_name") or item["criteria_id"],
+        requirement_text=item.get("requirement_text") or "未提供具体要求",
+        max_score=item.get("max_score", 10.0),
+        evidence_text=_format_evidence(item.get("evidence_chunks", [])),
+    )
+
+
+def plan_score_batches(items: list[dict[str, Any]]) -> list[list[int]]:
+    """Group *items* (indices, in order) into scoring requests.
+
+    Each item is a dict with ``criteria_id``, ``criteria_name``,
+    ``requirement_text``, ``evidence_chunks`` and ``max_score``. Without
+    batch mode (or a real LLM) every item is its own request; otherwise items
+    are packed greedily until the criteria count or the prompt-token limit
+    would be exceeded.
+    """
+    if not items or not score_batch_enabled() or not is_real_llm_available():
+        return [[i] for i in range(len(items))]
+    from app.token_budget import count_tokens
+
+    max_criteria, max_tokens = _score_batch_limits()
+    overhead = count_tokens(_SCORE_SYSTEM_PROMPT) + count_tokens(
+        _SCORE_BATCH_USER_TEMPLATE.format(count=max_criteria, criteria_blocks="")
+    )
+    groups: list[list[int]] = []
+    current: list[int] = []
+    current_tokens = overhead
+    for i, item in enumerate(items):
+        tokens = count_tokens(_score_batch_block(item))
+        if current and (len(current) >= max_criteria or current_tokens + tokens > max_tokens):
+            groups.append(current)
+            current, current_tokens = [], overhead
+        current.append(i)
+        current_tokens += tokens
+    if current:
+        groups.append(current)
+    return groups
+
+
+def llm_score_criteria_batch(
+    items: list[dict[str, Any]],
+    *,
+    hard_constraint_pass: bool = True,
+    use_cache: bool = True,
+) -> list[dict[str, Any]]:
+    """Score several criteria in one JSON-mode request; results follow *items* order.
+
+    Cached criteria are answered from the cache and left out of the request.
+    Criteria missing from (or malformed in) the response, or all of them when
+    the response is not valid JSON, are rescored one by one with
+    :func:`llm_score_criteria`. The request's usage is split across the
+    criteria it scored so per-task totals stay exact.
+    """
+
+    def _single(item: dict[str, Any]) -> dict[str, Any]:
+        return llm_score_criteria(
+            criteria_id=item["criteria_id"],
+            requirement_text=item.get("requirement_text") or "",
+            evidence_chunks=item.get("evidence_chunks", []),
+            max_score=item.get("max_score", 10.0),
+            criteria_name=item.get("criteria_name") or "",
+            hard_constraint_pass=hard_constraint_pass,
+            use_cache=use_cache,
+        )
+
+    if len(items) <= 1 or not is_real_llm_available():
+        return [_single(item) for item in items]
+
+    from app.llm_score_cache import get_llm_score_cache
+
+    config = _get_provider_config()
+    results: list[dict[str, Any] | None] = [None] * len(items)
+    cache_keys: list[str | None] = [None] * len(items)
+    for i, item in enumerate(items):
+        if not use_cache:
+            continue
+        cache_keys[i] = _score_cache_key(
+            config,
+            criteria_id=item["criteria_id"],
+            requirement_text=item.get("requirement_text") or "",
+            evidence_chunks=item.get("evidence_chunks", []),
+            max_score=item.get("max_score", 10.0),
+            criteria_name=item.get("criteria_name") or "",
+        )
+        cached = get_llm_score_cache().get(cache_keys[i]) if cache_keys[i] else None
+        if cached is not None:
+            cached["cache_hit"] = True
+            cached["usage"] = _usage_dict(LLMUsage())
+            results[i] = cached
+
+    pending = [i for i in range(len(items)) if results[i] is None]
+    unattributed: dict[str, Any] | None = None
+    if len(pending) > 1:
+        messages = [
+            {"role": "system", "content": _SCORE_SYSTEM_PROMPT},
+            {
+                "role": "user",
+                "content": _SCORE_BATCH_USER_TEMPLATE.format(
+                    count=len(pending),
+                    criteria_blocks="\n\n".join(_score_batch_block(items[i]) for i in pending),
+                ),
+            },
+        ]
+        parsed: dict[str, dict[str, Any]] = {}
+        usage = LLMUsage()
+        try:
+            content, usage = _call_with_degradation(
+                config=config,
+                messages=messages,
+                json_mode=True,
+                max_tokens=max(4096, 1024 * len(pending)),
+            )
+            for entry in json.loads(content).get("results", []):
+                if isinstance(entry, dict) and "score" in entry:
+                    parsed.setdefault(str(entry.get("criteria_id")), entry)
+        except Exception as exc:
+            logger.warning("Batched LLM scoring failed (%s), scoring criteria individually", type(exc).__name__)
+
+        scored_idx: list[int] = []
+        for i in pending:
+            entry = parsed.get(str(items[i]["criteria_id"]))
+            if entry is None:
+                continue
+            try:
+                scored = _coerce_score_result(entry, max_score=float(items[i].get("max_score", 10.0)), usage=usage)
+            except (TypeError, ValueError):
+                continue
+            if cache_keys[i] is not None and not usage.degraded:
+                get_llm_score_cache().put(cache_keys[i], scored)
+            scored["batched"] = True
+            results[i] = scored
+            scored_idx.append(i)
+        for i, share in zip(scored_idx, _split_usage(usage, len(scored_idx))):
+            results[i]["usage"] = share
+        if not scored_idx and usage.total_tokens:
+            # Nothing usable came back; the spend still counts against the task.
+            unattributed = _usage_dict(usage)
+
+    for i in range(len(items)):
+        if results[i] is not None:
+            continue
+        results[i] = _single(items[i])
+        if unattributed is not None:
+            merged = dict(results[i].get("usage", {}))
+            for key in ("prompt_tokens", "completion_tokens", "total_tokens"):
+                merged[key] = int(merged.get(key, 0)) + int(unattributed[key])
+            results[i]["usage"] = merged
+            unattributed = None
+    return [r for r in results if r is not None]
+
+
+def _split_usage(usage: LLMUsage, parts: int) -> list[dict[str, Any]]:
+    """Split *usage* into *parts* integer shares whose sums equal the original."""
+    if parts <= 0:
+        return []
+    shares = [_usage_dict(LLMUsage(latency_ms=usage.latency_ms)) for _ in range(parts)]
+    for key in ("prompt_tokens", "completion_tokens", "total_tokens"):
+        total = int(getattr(usage, key))
+        base, remainder = divmod(total, parts)
+        for n, share in enumerate(shares):
+            share[key] = base + (1 if n < remainder else 0)
+    return shares
+
+
 _EXPLAIN_SYSTEM_PROMPT = """你是一个专业的评标专家AI助手。根据评分结果和证据，生成清晰、专业的评分解释。
 解释应该简洁明了，引用具体的证据来源页码。"""
 
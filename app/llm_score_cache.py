@@ -0,0 +1,144 @@
+"""Deterministic response cache for LLM criterion scoring.
+
+Keyed by (model, prompt template version, criterion, requirement text, evidence
+chunk hashes), so replays, resumed evaluations and rule-pack re-runs that leave
+a criterion untouched reuse the earlier score instead of calling the LLM again.
+
+Env vars:
+  LLM_SCORE_CACHE_ENABLED      — default true (per call: ``use_cache=False`` bypasses)
+  LLM_SCORE_CACHE_MAX_ENTRIES  — LRU bound (default 2000)
+  LLM_SCORE_CACHE_TTL_S        — entry lifetime in seconds (default 86400)
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+def evidence_fingerprint(evidence_chunks: list[dict[str, Any]], *, text_chars: int = 500) -> list[str]:
+    """Hash each chunk the way it appears in the prompt (page + truncated text), in order."""
+    hashes: list[str] = []
+    for chunk in evidence_chunks:
+        raw = f"{chunk.get('page', '?')}\x1f{str(chunk.get('text', ''))[:text_chars]}"
+        hashes.append(hashlib.sha256(raw.encode("utf-8")).hexdigest())
+    return hashes
+
+
+def score_cache_key(
+    *,
+    model: str,
+    prompt_version: str,
+    criteria_id: str,
+    criteria_name: str,
+    requirement_text: str,
+    max_score: float,
+    evidence_chunks: list[dict[str, Any]],
+) -> str:
+    raw = json.dumps(
+        [
+            model,
+            prompt_version,
+            criteria_id,
+            criteria_name,
+            requirement_text,
+            float(max_score),
+            evidence_fingerprint(evidence_chunks),
+        ],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMScoreCache:
+    """Thread-safe LRU of scoring results with a per-entry TTL."""
+
+    def __init__(self, *, max_entries: int = 2000, ttl_s: float = 86400.0) -> None:
+        self._max_entries = max(1, max_entries)
+        self._ttl_s = ttl_s
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._expired = 0
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._ttl_s > 0 and time.monotonic() - entry[0] > self._ttl_s:
+                del self._entries[key]
+                self._expired += 1
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return copy.deepcopy(entry[1])
+
+    def peek(self, key: str) -> bool:
+        """Whether *key* has a live entry, without touching hit/miss stats or LRU order."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (self._ttl_s <= 0 or time.monotonic() - entry[0] <= self._ttl_s)
+
+    def put(self, key: str, result: dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), copy.deepcopy(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "expired": self._expired,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+            }
+
+
+_cache: LLMScoreCache | None = None
+_cache_lock = threading.Lock()
+
+
+def llm_score_cache_enabled() -> bool:
+    raw = os.environ.get("LLM_SCORE_CACHE_ENABLED", "true").strip().lower()
+    return raw not in {"0", "false", "no", "off"}
+
+
+def get_llm_score_cache() -> LLMScoreCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            try:
+                max_entries = int(os.environ.get("LLM_SCORE_CACHE_MAX_ENTRIES", "2000"))
+            except ValueError:
+                max_entries = 2000
+            try:
+                ttl_s = float(os.environ.get("LLM_SCORE_CACHE_TTL_S", "86400"))
+            except ValueError:
+                ttl_s = 86400.0
+            _cache = LLMScoreCache(max_entries=max_entries, ttl_s=ttl_s)
+        return _cache
+
+
+def llm_score_cache_stats() -> dict[str, Any]:
+    stats = get_llm_score_cache().stats()
+    stats["enabled"] = llm_score_cache_enabled()
+    return stats
+
+
+def reset_llm_score_cache() -> None:
+    global _cache
+    with _cache_lock:
+        _cache = None
@@ -16,6 +16,7 @@ from starlette.middleware.cors import CORSMiddleware
 
 from app.errors import ApiError
 from app.queue_backend import InMemoryQueueBackend, create_queue_from_env
+from app.reranker import start_cross_encoder_warmup
 from app.routes._deps import (
     append_security_audit_log,
     error_response,
@@ -55,6 +56,8 @@ def create_app() -> FastAPI:
 
     app.state.security_cfg = security_cfg
     app.state.queue_backend = queue_backend
+    # Load the cross-encoder off the request path so the first rerank is warm.
+    start_cross_encoder_warmup()
 
     cors_origins = os.environ.get("CORS_ALLOW_ORIGINS", "http://127.0.0.1:5173,http://localhost:5173")
     allow_origins = [x.strip() for x in cors_origins.split(",") if x.strip()]
@@ -0,0 +1,471 @@
+"""Shared MinerU submission and polling loop for concurrent parse jobs.
+
+Parse workers hand their document to the coordinator and wait on a future
+instead of each running its own submit → sleep → poll loop. Uploads that
+arrive within a short window are grouped into one ``/file-urls/batch``
+request and PUT to their pre-signed URLs concurrently; URL submissions become
+individual extract tasks. A single asyncio loop on a daemon thread polls every
+outstanding batch and task, backs off while nothing changes, snaps back to the
+minimum interval when results land, and resolves each document's future as
+soon as its own result is ready — the rest of its batch keeps polling.
+
+Env vars:
+  MINERU_BATCH_ENABLED       — default true (false keeps the per-job blocking poll)
+  MINERU_BATCH_WINDOW_MS     — how long the first upload waits for company (default 200)
+  MINERU_BATCH_MAX_FILES     — files per upload batch (default 50)
+  MINERU_UPLOAD_CONCURRENCY  — parallel PUTs to pre-signed URLs (default 8)
+  MINERU_POLL_MIN_S          — first / post-progress poll interval (default 1)
+  MINERU_POLL_MAX_S          — back-off ceiling while nothing changes (default 15)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.errors import ApiError
+from app.mineru_official_api import MineruApiConfig, MineruOfficialApiClient
+
+logger = logging.getLogger(__name__)
+
+_BACKOFF_FACTOR = 1.6
+
+
+def mineru_data_id(*, tenant_id: str, document_id: str) -> str:
+    """Stable per-document ``data_id`` (MinerU allows [A-Za-z0-9_.-], ≤128 chars)."""
+    return "bea_" + hashlib.sha256(f"{tenant_id}\x1f{document_id}".encode()).hexdigest()[:32]
+
+
+@dataclass
+class _Submission:
+    data_id: str
+    future: Future[str]
+    filename: str = ""
+    file_bytes: bytes | None = None
+    file_url: str | None = None
+
+
+@dataclass
+class _Outstanding:
+    """One remote batch or task still being polled."""
+
+    kind: str  # "batch" | "task"
+    remote_id: str
+    futures: dict[str, Future[str]]
+    deadline: float
+    interval: float
+    next_poll_at: float
+    polls: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+
+def _upstream_error(code: str, message: str) -> ApiError:
+    return ApiError(code=code, message=message, error_class="transient", retryable=True, http_status=503)
+
+
+def _resolve(future: Future[str], *, result: str | None = None, error: BaseException | None = None) -> bool:
+    """Settle *future* unless the waiter already gave up on it."""
+    if future.done():
+        return False
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(str(result))
+    return True
+
+
+class MineruBatchCoordinator:
+    """Groups uploads into MinerU batches and polls all outstanding work from one loop."""
+
+    def __init__(
+        self,
+        *,
+        client: MineruOfficialApiClient,
+        max_poll_time_s: float = 180.0,
+        window_s: float = 0.2,
+        max_files: int = 50,
+        upload_concurrency: int = 8,
+        poll_min_s: float = 1.0,
+        poll_max_s: float = 15.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._client = client
+        self._max_poll_time_s = max(0.01, max_poll_time_s)
+        self._window_s = max(0.0, window_s)
+        self._max_files = max(1, max_files)
+        self._upload_concurrency = max(1, upload_concurrency)
+        self._poll_min_s = max(0.01, poll_min_s)
+        self._poll_max_s = max(self._poll_min_s, poll_max_s)
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._pending_uploads: list[_Submission] = []
+        self._pending_urls: list[_Submission] = []
+        self._first_pending_at: float | None = None
+        self._in_flight: dict[str, Future[str]] = {}
+        self._outstanding: list[_Outstanding] = []
+        self._tasks: set[asyncio.Task[Any]] = set()
+        self._stats = {
+            "submitted": 0,
+            "joined": 0,
+            "batches": 0,
+            "tasks": 0,
+            "polls": 0,
+            "completed": 0,
+            "failed": 0,
+            "timed_out": 0,
+        }
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    # ---- submission (any thread) ----
+
+    def submit_bytes(self, *, data_id: str, filename: str, file_bytes: bytes) -> Future[str]:
+        """Queue *file_bytes* for the next upload batch; the future yields the result zip URL."""
+        return self._submit(_Submission(data_id=data_id, future=Future(), filename=filename, file_bytes=file_bytes))
+
+    def submit_url(self, *, data_id: str, file_url: str) -> Future[str]:
+        """Submit a public file URL as its own extract task; the future yields the result zip URL."""
+        return self._submit(_Submission(data_id=data_id, future=Future(), file_url=file_url))
+
+    def _submit(self, item: _Submission) -> Future[str]:
+        with self._lock:
+            if self._closed:
+                raise _upstream_error("DOC_PARSE_UPSTREAM_UNAVAILABLE", "MinerU coordinator is shut down")
+            existing = self._in_flight.get(item.data_id)
+            if existing is not None and not existing.done():
+                # Same document already on its way (retry overlapping a slow attempt).
+                self._stats["joined"] += 1
+                return existing
+            self._in_flight[item.data_id] = item.future
+            item.future.add_done_callback(lambda f, key=item.data_id: self._forget(key, f))
+            self._stats["submitted"] += 1
+            if item.file_bytes is not None:
+                if not self._pending_uploads:
+                    self._first_pending_at = self._clock()
+                self._pending_uploads.append(item)
+            else:
+                self._pending_urls.append(item)
+            self._ensure_started()
+        self._wake()
+        return item.future
+
+    def _forget(self, data_id: str, future: Future[str]) -> None:
+        with self._lock:
+            if self._in_flight.get(data_id) is future:
+                del self._in_flight[data_id]
+            if future.cancelled():
+                return
+            if future.exception() is None:
+                self._stats["completed"] += 1
+            else:
+                self._stats["failed"] += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "in_flight": len(self._in_flight),
+                "pending_uploads": len(self._pending_uploads),
+                "outstanding_remote": len(self._outstanding),
+            }
+
+    def shutdown(self, *, timeout_s: float = 5.0) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        self._wake()
+        if thread is not None:
+            thread.join(timeout=timeout_s)
+        stopped = _upstream_error("DOC_PARSE_UPSTREAM_UNAVAILABLE", "MinerU coordinator stopped before completion")
+        with self._lock:
+            leftovers = list(self._in_flight.values())
+        for future in leftovers:
+            _resolve(future, error=stopped)
+
+    # ---- event loop thread ----
+
+    def _ensure_started(self) -> None:
+        # Caller holds self._lock.
+        if self._thread is not None:
+            return
+        loop = asyncio.new_event_loop()
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._thread = threading.Thread(target=self._thread_main, name="mineru-coordinator", daemon=True)
+        self._thread.start()
+
+    def _thread_main(self) -> None:
+        assert self._loop is not None
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._run())
+        finally:
+            self._loop.close()
+
+    def _wake(self) -> None:
+        loop, wakeup = self._loop, self._wakeup
+        if loop is None or wakeup is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(wakeup.set)
+        except RuntimeError:
+            pass  # loop closed between the check and the call
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            self._wakeup.clear()
+            with self._lock:
+                if self._closed:
+                    break
+            self._flush_submissions()
+            await self._poll_due()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._next_wakeup_in())
+            except TimeoutError:
+                pass
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _spawn(self, coro: Any) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _next_wakeup_in(self) -> float:
+        now = self._clock()
+        candidates = [self._poll_max_s]
+        with self._lock:
+            if self._pending_uploads and self._first_pending_at is not None:
+                candidates.append(self._first_pending_at + self._window_s - now)
+            candidates.extend(o.next_poll_at - now for o in self._outstanding)
+        return max(0.0, min(candidates))
+
+    def _flush_submissions(self) -> None:
+        now = self._clock()
+        with self._lock:
+            urls, self._pending_urls = self._pending_urls, []
+            groups: list[list[_Submission]] = []
+            window_elapsed = self._first_pending_at is not None and now - self._first_pending_at >= self._window_s
+            while self._pending_uploads and (window_elapsed or len(self._pending_uploads) >= self._max_files):
+                groups.append(self._pending_uploads[: self._max_files])
+                del self._pending_uploads[: self._max_files]
+            if not self._pending_uploads:
+                self._first_pending_at = None
+            elif groups:
+                self._first_pending_at = now
+        for item in urls:
+            self._spawn(self._submit_task(item))
+        for group in groups:
+            self._spawn(self._submit_batch(group))
+
+    async def _submit_task(self, item: _Submission) -> None:
+        try:
+            task_id = await asyncio.to_thread(self._client.submit_task, file_url=str(item.file_url))
+        except Exception as exc:
+            _resolve(item.future, error=exc)
+            return
+        self._track("task", task_id, {item.data_id: item.future})
+
+    async def _submit_batch(self, items: list[_Submission]) -> None:
+        live = [item for item in items if not item.future.done()]
+        if not live:
+            return
+        try:
+            batch_id, upload_urls = await asyncio.to_thread(
+                self._client.request_upload_urls,
+                files=[{"name": item.filename, "data_id": item.data_id} for item in live],
+            )
+        except Exception as exc:
+            for item in live:
+                _resolve(item.future, error=exc)
+            return
+
+        semaphore = asyncio.Semaphore(self._upload_concurrency)
+
+        async def _put(item: _Submission, url: str) -> None:
+            async with semaphore:
+                await asyncio.to_thread(self._client.upload_file_to_url, file_bytes=item.file_bytes, upload_url=url)
+
+        uploads = list(zip(live, upload_urls, strict=False))
+        results = await asyncio.gather(*(_put(item, url) for item, url in uploads), return_exceptions=True)
+        uploaded: dict[str, Future[str]] = {}
+        for (item, _url), outcome in zip(uploads, results, strict=True):
+            item.file_bytes = None
+            if isinstance(outcome, BaseException):
+                _resolve(item.future, error=outcome)
+            else:
+                uploaded[item.data_id] = item.future
+        for item in live[len(uploads) :]:
+            item.file_bytes = None
+            _resolve(item.future, error=_upstream_error("DOC_PARSE_UPSTREAM_ERROR", "MinerU did not return upload URL"))
+        if uploaded:
+            self._track("batch", batch_id, uploaded)
+            with self._lock:
+                self._stats["batches"] += 1
+            logger.info("mineru batch %s submitted with %d file(s)", batch_id, len(uploaded))
+
+    def _track(self, kind: str, remote_id: str, futures: dict[str, Future[str]]) -> None:
+        now = self._clock()
+        with self._lock:
+            if kind == "task":
+                self._stats["tasks"] += 1
+            self._outstanding.append(
+                _Outstanding(
+                    kind=kind,
+                    remote_id=remote_id,
+                    futures=futures,
+                    deadline=now + self._max_poll_time_s,
+                    interval=self._poll_min_s,
+                    next_poll_at=now + self._poll_min_s,
+                    started_at=now,
+                )
+            )
+        assert self._wakeup is not None
+        self._wakeup.set()
+
+    async def _poll_due(self) -> None:
+        now = self._clock()
+        with self._lock:
+            due = [o for o in self._outstanding if o.next_poll_at <= now]
+        if due:
+            await asyncio.gather(*(self._poll_one(o) for o in due))
+        with self._lock:
+            self._outstanding = [o for o in self._outstanding if o.futures]
+
+    async def _poll_one(self, outstanding: _Outstanding) -> None:
+        # Waiters that gave up (cancelled / timed out) no longer need polling.
+        outstanding.futures = {k: f for k, f in outstanding.futures.items() if not f.done()}
+        if not outstanding.futures:
+            return
+        outstanding.polls += 1
+        with self._lock:
+            self._stats["polls"] += 1
+        try:
+            if outstanding.kind == "batch":
+                data = await asyncio.to_thread(self._client.get_batch_status, batch_id=outstanding.remote_id)
+                results = data.get("extract_result") or []
+            else:
+                data = await asyncio.to_thread(self._client.get_task_status, task_id=outstanding.remote_id)
+                results = [{**data, "data_id": next(iter(outstanding.futures))}]
+        except Exception as exc:
+            # Status endpoint hiccup: keep the work outstanding and retry after back-off.
+            logger.warning("mineru %s %s status poll failed: %s", outstanding.kind, outstanding.remote_id, exc)
+            results = []
+
+        progressed = False
+        for result in results:
+            data_id = str(result.get("data_id") or "")
+            if not data_id and len(outstanding.futures) == 1:
+                data_id = next(iter(outstanding.futures))
+            future = outstanding.futures.get(data_id)
+            if future is None:
+                continue
+            state = result.get("state")
+            if state == "done":
+                zip_url = result.get("full_zip_url")
+                if zip_url:
+                    _resolve(future, result=str(zip_url))
+                else:
+                    _resolve(
+                        future,
+                        error=_upstream_error(
+                            "DOC_PARSE_OUTPUT_NOT_FOUND", "MinerU task completed but no zip_url returned"
+                        ),
+                    )
+            elif state == "failed":
+                err_msg = result.get("err_msg", "Unknown error")
+                _resolve(future, error=_upstream_error("DOC_PARSE_UPSTREAM_ERROR", f"MinerU task failed: {err_msg}"))
+            else:
+                continue
+            del outstanding.futures[data_id]
+            progressed = True
+
+        now = self._clock()
+        if outstanding.futures and now >= outstanding.deadline:
+            timeout = _upstream_error(
+                "DOC_PARSE_TIMEOUT", f"MinerU {outstanding.kind} timed out after {self._max_poll_time_s}s"
+            )
+            for future in outstanding.futures.values():
+                _resolve(future, error=timeout)
+            with self._lock:
+                self._stats["timed_out"] += len(outstanding.futures)
+            outstanding.futures = {}
+            return
+        if progressed:
+            outstanding.interval = self._poll_min_s
+        else:
+            outstanding.interval = min(self._poll_max_s, outstanding.interval * _BACKOFF_FACTOR)
+        outstanding.next_poll_at = now + outstanding.interval
+
+
+_coordinator: MineruBatchCoordinator | None = None
+_coordinator_config: MineruApiConfig | None = None
+_coordinator_lock = threading.Lock()
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, str(default)).strip())
+    except ValueError:
+        return default
+
+
+def mineru_batch_enabled() -> bool:
+    raw = os.environ.get("MINERU_BATCH_ENABLED", "true").strip().lower()
+    return raw not in {"0", "false", "no", "off"}
+
+
+def get_mineru_coordinator(config: MineruApiConfig) -> MineruBatchCoordinator:
+    """Process-wide coordinator for *config*; a changed key or endpoint replaces it."""
+    global _coordinator, _coordinator_config
+    stale: MineruBatchCoordinator | None = None
+    with _coordinator_lock:
+        if _coordinator is None or _coordinator_config != config:
+            stale = _coordinator
+            _coordinator = MineruBatchCoordinator(
+                client=MineruOfficialApiClient(config),
+                max_poll_time_s=config.max_poll_time_s,
+                window_s=_env_float("MINERU_BATCH_WINDOW_MS", 200) / 1000.0,
+                max_files=int(_env_float("MINERU_BATCH_MAX_FILES", 50)),
+                upload_concurrency=int(_env_float("MINERU_UPLOAD_CONCURRENCY", 8)),
+                poll_min_s=_env_float("MINERU_POLL_MIN_S", 1.0),
+                poll_max_s=_env_float("MINERU_POLL_MAX_S", 15.0),
+            )
+            _coordinator_config = config
+        coordinator = _coordinator
+    if stale is not None:
+        stale.shutdown()
+    return coordinator
+
+
+def mineru_coordinator_stats() -> dict[str, Any]:
+    with _coordinator_lock:
+        coordinator = _coordinator
+    stats = coordinator.stats() if coordinator is not None else {}
+    stats["enabled"] = mineru_batch_enabled()
+    return stats
+
+
+def reset_mineru_coordinator() -> None:
+    global _coordinator, _coordinator_config
+    with _coordinator_lock:
+        coordinator, _coordinator, _coordinator_config = _coordinator, None, None
+    if coordinator is not None:
+        coordinator.shutdown()
@@ -13,6 +13,7 @@ from __future__ import annotations
 
 import io
 import json
+import logging
 import time
 import zipfile
 from dataclasses import dataclass
@@ -23,6 +24,8 @@ from urllib.error import HTTPError, URLError
 from app.errors import ApiError
 from app.parse_utils import normalize_bbox
 
+logger = logging.getLogger(__name__)
+
 MINERU_API_BASE = "https://mineru.net/api/v4"
 
 
@@ -515,22 +518,31 @@ class MineruOfficialApiClient:
                 time.sleep(self._config.poll_interval_s)
                 continue
 
-            # Check the first result's state
-            first_result = extract_results[0]
-            state = first_result.get("state", "unknown")
+            states = [str(r.get("state", "unknown")) for r in extract_results]
 
             # Log progress every 10 polls
             if poll_count % 10 == 1:
                 elapsed = time.time() - start_time
-                print(f"Poll #{poll_count}: state={state}, elapsed={elapsed:.0f}s")
+                logger.info("mineru batch %s poll #%d: states=%s, elapsed=%.0fs", batch_id, poll_count, states, elapsed)
 
-            if state == "done":
+            failed = next((r for r in extract_results if r.get("state") == "failed"), None)
+            if failed is not None:
+                err_msg = failed.get("err_msg", "Unknown error")
+                raise ApiError(
+                    code="DOC_PARSE_UPSTREAM_ERROR",
+                    message=f"MinerU batch failed: {err_msg}",
+                    error_class="transient",
+                    retryable=True,
+                    http_status=503,
+                )
+
+            if all(state == "done" for state in states):
                 zip_urls = []
                 for r in extract_results:
                     zip_url = r.get("full_zip_url")
                     if zip_url:
                         zip_urls.append(str(zip_url))
-                if not zip_urls:
+                if len(zip_urls) < len(extract_results):
                     raise ApiError(
                         code="DOC_PARSE_OUTPUT_NOT_FOUND",
                         message="MinerU batch completed but no zip_urls returned",
@@ -540,16 +552,6 @@ class MineruOfficialApiClient:
                     )
                 return zip_urls
 
-            if state == "failed":
-                err_msg = first_result.get("err_msg", "Unknown error")
-                raise ApiError(
-                    code="DOC_PARSE_UPSTREAM_ERROR",
-                    message=f"MinerU batch failed: {err_msg}",
-                    error_class="transient",
-                    retryable=True,
-                    http_status=503,
-                )
-
             time.sleep(self._config.poll_interval_s)
 
         raise ApiError(
@@ -19,18 +19,50 @@ import hashlib
 import io
 import json
 import os
+import shutil
+import tempfile
 import time
 import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from dataclasses import dataclass
 from datetime import UTC, datetime
-from typing import Any, Protocol
+from typing import IO, Any, Protocol
 
 from app.errors import ApiError
+from app.mineru_coordinator import MineruBatchCoordinator, get_mineru_coordinator, mineru_data_id
 from app.mineru_official_api import (
     MineruApiConfig,
     MineruContentItem,
     MineruOfficialApiClient,
 )
+from app.object_storage import ObjectPut
+
+# Upload time is not counted against max_poll_time_s; leave room for it.
+_COORDINATOR_WAIT_SLACK_S = 180.0
+
+_ZIP_SPOOL_MAX_BYTES = 8 << 20
+_COPY_CHUNK_BYTES = 1 << 20
+_TEXT_MEMBER_SUFFIXES = (".md", ".json", ".txt")
+_IMAGE_BATCH_MAX_FILES = 64
+_IMAGE_BATCH_MAX_BYTES = 16 << 20
+_IMAGE_CONTENT_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+    ".bmp": "image/bmp",
+    ".tiff": "image/tiff",
+    ".svg": "image/svg+xml",
+}
+
+
+def _image_content_type(name: str) -> str | None:
+    """Content type for an image member under an ``images/`` directory, else None."""
+    if not (name.startswith("images/") or "/images/" in name) or not os.path.basename(name):
+        return None
+    return _IMAGE_CONTENT_TYPES.get(os.path.splitext(name)[1].lower())
 
 
 class ObjectStorageBackend(Protocol):
@@ -116,12 +148,17 @@ class MineruParseService:
         object_storage: ObjectStorageBackend,
         parse_manifests_repo: ParseManifestRepository,
         documents_repo: DocumentRepository,
+        coordinator: MineruBatchCoordinator | None = None,
+        zip_spool_max_bytes: int = _ZIP_SPOOL_MAX_BYTES,
     ) -> None:
         self._config = config
         self._client = MineruOfficialApiClient(config)
+        # When set, submission and polling go through the shared batch loop instead of this thread.
+        self._coordinator = coordinator
         self._object_storage = object_storage
         self._parse_manifests_repo = parse_manifests_repo
         self._documents_repo = documents_repo
+        self._zip_spool_max_bytes = max(0, zip_spool_max_bytes)
 
     def parse_and_persist(
         self,
@@ -167,79 +204,28 @@ class MineruParseService:
         self._parse_manifests_repo.upsert(tenant_id=tenant_id, manifest=manifest)
 
         try:
-            # Step 1: Submit task to MinerU
-            task_id = self._client.submit_task(file_url=file_url)
-
-            # Step 2: Poll until complete
-            zip_url = self._client.poll_until_complete(task_id=task_id)
-
-            # Step 3: Download zip
-            zip_bytes = self._download_zip(zip_url)
-
-            # Step 4: Save zip to object storage
-            zip_storage_uri = self._save_parse_result(
-                tenant_id=tenant_id,
-                document_id=document_id,
-                zip_bytes=zip_bytes,
-            )
-
-            # Step 5: Extract content from zip
-            content = self._extract_zip_content(zip_bytes)
-            content_list = self._parse_content_list(content)
-            full_md = self._extract_full_md(content)
-
-            # Step 5.5: Extract and save images from zip
-            images_storage_uris = self._save_images(
-                tenant_id=tenant_id,
-                document_id=document_id,
-                zip_bytes=zip_bytes,
-            )
-
-            # Step 6: Convert content_list to chunks
-            chunks = self._content_list_to_chunks(
-                content_list=content_list,
-                document_id=document_id,
-                tenant_id=tenant_id,
-                parser=selected_parser,
-                parser_version=parser_version,
-                full_md=full_md,
-            )
-
-            # Step 7: Persist chunks
-            if chunks:
-                self._documents_repo.replace_chunks(
-                    tenant_id=tenant_id,
-                    document_id=document_id,
-                    chunks=chunks,
+            # Step 1-2: Submit task to MinerU and wait for the result zip
+            if self._coordinator is not None:
+                zip_url = self._await_zip_url(
+                    self._coordinator.submit_url(
+                        data_id=mineru_data_id(tenant_id=tenant_id, document_id=document_id),
+                        file_url=file_url,
+                    )
                 )
-
-            # Step 8: Update manifest: success
-            manifest["status"] = "completed"
-            manifest["ended_at"] = datetime.now(tz=UTC).isoformat()
-            manifest["error_code"] = None
-            manifest["images_count"] = len(images_storage_uris)
-            self._parse_manifests_repo.upsert(tenant_id=tenant_id, manifest=manifest)
-
-            # Step 9: Update document status
-            document = self._documents_repo.get(tenant_id=tenant_id, document_id=document_id)
-            if document:
-                document["status"] = "parsed"
-                document["parse_result_uri"] = zip_storage_uri
-                self._documents_repo.upsert(tenant_id=tenant_id, document=document)
-
-            parse_time = time.time() - start_time
-
-            return MineruParseResult(
+            else:
+                task_id = self._client.submit_task(file_url=file_url)
+                zip_url = self._client.poll_until_complete(task_id=task_id)
+
+            # Step 3-9: Download, persist and finish the manifest
+            return self._persist_zip_result(
+                zip_url=zip_url,
+                manifest=manifest,
                 document_id=document_id,
+                tenant_id=tenant_id,
                 job_id=job_id,
-                status="completed",
-                chunks_count=len(chunks),
-                zip_storage_uri=zip_storage_uri,
-                images_storage_uris=images_storage_uris,
-                images_count=len(images_storage_uris),
-                content_list=[self._item_to_dict(item) for item in content_list],
-                full_md=full_md,
-                parse_time_s=parse_time,
+                selected_parser=selected_parser,
+                parser_version=parser_version,
+                start_time=start_time,
             )
 
         except ApiError as e:
@@ -328,97 +314,28 @@ class MineruParseService:
         self._parse_manifests_repo.upsert(tenant_id=tenant_id, manifest=manifest)
 
         try:
-            # Step 1: Request upload URL
-            data_id = document_id or "doc"
-            batch_id, upload_urls = self._client.request_upload_urls(
-                files=[{"name": filename, "data_id": data_id}],
-            )
-
-            if not upload_urls:
-                raise ApiError(
-                    code="DOC_PARSE_UPSTREAM_ERROR",
-                    message="MinerU did not return upload URL",
-                    error_class="transient",
-                    retryable=True,
-                    http_status=503,
+            # Step 1-3: Upload the file and wait for the result zip
+            if self._coordinator is not None:
+                zip_url = self._await_zip_url(
+                    self._coordinator.submit_bytes(
+                        data_id=mineru_data_id(tenant_id=tenant_id, document_id=document_id),
+                        filename=filename,
+                        file_bytes=file_bytes,
+                    )
                 )
+            else:
+                zip_url = self._upload_and_poll(file_bytes=file_bytes, filename=filename, document_id=document_id)
 
-            # Step 2: Upload file
-            self._client.upload_file_to_url(
-                file_bytes=file_bytes,
-                upload_url=upload_urls[0],
-            )
-
-            # Step 3: Poll until complete
-            zip_urls = self._client.poll_batch_until_complete(batch_id=batch_id)
-
-            # Step 4: Download zip
-            zip_bytes = self._download_zip(zip_urls[0])
-
-            # Step 5: Save zip to object storage
-            zip_storage_uri = self._save_parse_result(
-                tenant_id=tenant_id,
-                document_id=document_id,
-                zip_bytes=zip_bytes,
-            )
-
-            # Step 6: Extract content from zip
-            content = self._extract_zip_content(zip_bytes)
-            content_list = self._parse_content_list(content)
-            full_md = self._extract_full_md(content)
-
-            # Step 6.5: Extract and save images from zip
-            images_storage_uris = self._save_images(
-                tenant_id=tenant_id,
-                document_id=document_id,
-                zip_bytes=zip_bytes,
-            )
-
-            # Step 7: Convert content_list to chunks
-            chunks = self._content_list_to_chunks(
-                content_list=content_list,
+            # Step 4-10: Download, persist and finish the manifest
+            return self._persist_zip_result(
+                zip_url=zip_url,
+                manifest=manifest,
                 document_id=document_id,
                 tenant_id=tenant_id,
-                parser=selected_parser,
-                parser_version=parser_version,
-                full_md=full_md,
-            )
-
-            # Step 8: Persist chunks
-            if chunks:
-                self._documents_repo.replace_chunks(
-                    tenant_id=tenant_id,
-                    document_id=document_id,
-                    chunks=chunks,
-                )
-
-            # Step 9: Update manifest: success
-            manifest["status"] = "completed"
-            manifest["ended_at"] = datetime.now(tz=UTC).isoformat()
-            manifest["error_code"] = None
-            manifest["images_count"] = len(images_storage_uris)
-            self._parse_manifests_repo.upsert(tenant_id=tenant_id, manifest=manifest)
-
-            # Step 10: Update document status
-            document = self._documents_repo.get(tenant_id=tenant_id, document_id=document_id)
-            if document:
-                document["status"] = "parsed"
-                document["parse_result_uri"] = zip_storage_uri
-                self._documents_repo.upsert(tenant_id=tenant_id, document=document)
-
-            parse_time = time.time() - start_time
-
-            return MineruParseResult(
-                document_id=document_id,
                 job_id=job_id,
-                status="completed",
-                chunks_count=len(chunks),
-                zip_storage_uri=zip_storage_uri,
-                images_storage_uris=images_storage_uris,
-                images_count=len(images_storage_uris),
-                content_list=[self._item_to_dict(item) for item in content_list],
-                full_md=full_md,
-                parse_time_s=parse_time,
+                selected_parser=selected_parser,
+                parser_version=parser_version,
+                start_time=start_time,
             )
 
         except ApiError as e:
@@ -443,14 +360,135 @@ class MineruParseService:
                 http_status=503,
             ) from e
 
-    def _download_zip(self, zip_url: str) -> bytes:
-        """Download zip file from URL."""
+    def _await_zip_url(self, future: Future[str]) -> str:
+        """Wait for the coordinator to resolve this document's result zip URL."""
+        try:
+            return future.result(timeout=self._config.max_poll_time_s + _COORDINATOR_WAIT_SLACK_S)
+        except FutureTimeoutError as e:
+            future.cancel()
+            raise ApiError(
+                code="DOC_PARSE_TIMEOUT",
+                message=f"MinerU result not ready after {self._config.max_poll_time_s}s",
+                error_class="transient",
+                retryable=True,
+                http_status=503,
+            ) from e
+
+    def _upload_and_poll(self, *, file_bytes: bytes, filename: str, document_id: str) -> str:
+        """Single-file upload followed by a blocking poll (no coordinator)."""
+        data_id = document_id or "doc"
+        batch_id, upload_urls = self._client.request_upload_urls(
+            files=[{"name": filename, "data_id": data_id}],
+        )
+
+        if not upload_urls:
+            raise ApiError(
+                code="DOC_PARSE_UPSTREAM_ERROR",
+                message="MinerU did not return upload URL",
+                error_class="transient",
+                retryable=True,
+                http_status=503,
+            )
+
+        self._client.upload_file_to_url(
+            file_bytes=file_bytes,
+            upload_url=upload_urls[0],
+        )
+
+        zip_urls = self._client.poll_batch_until_complete(batch_id=batch_id)
+        return zip_urls[0]
+
+    def _persist_zip_result(
+        self,
+        *,
+        zip_url: str,
+        manifest: dict[str, Any],
+        document_id: str,
+        tenant_id: str,
+        job_id: str,
+        selected_parser: str,
+        parser_version: str,
+        start_time: float,
+    ) -> MineruParseResult:
+        """Download the result zip, store it and its images, persist chunks and complete the manifest."""
+        zip_file = self._download_zip(zip_url)
+        try:
+            # Save zip to object storage
+            zip_storage_uri = self._save_parse_result(
+                tenant_id=tenant_id,
+                document_id=document_id,
+                zip_file=zip_file,
+            )
+
+            # Read text members and save images in a single pass over the zip
+            zip_file.seek(0)
+            content, images_storage_uris = self._walk_zip(
+                tenant_id=tenant_id,
+                document_id=document_id,
+                zip_file=zip_file,
+            )
+        finally:
+            zip_file.close()
+        content_list = self._parse_content_list(content)
+        full_md = self._extract_full_md(content)
+
+        # Convert content_list to chunks
+        chunks = self._content_list_to_chunks(
+            content_list=content_list,
+            document_id=document_id,
+            tenant_id=tenant_id,
+            parser=selected_parser,
+            parser_version=parser_version,
+            full_md=full_md,
+        )
+
+        # Persist chunks
+        if chunks:
+            self._documents_repo.replace_chunks(
+                tenant_id=tenant_id,
+                document_id=document_id,
+                chunks=chunks,
+            )
+
+        # Update manifest: success
+        manifest["status"] = "completed"
+        manifest["ended_at"] = datetime.now(tz=UTC).isoformat()
+        manifest["error_code"] = None
+        manifest["images_count"] = len(images_storage_uris)
+        self._parse_manifests_repo.upsert(tenant_id=tenant_id, manifest=manifest)
+
+        # Update document status
+        document = self._documents_repo.get(tenant_id=tenant_id, document_id=document_id)
+        if document:
+            document["status"] = "parsed"
+            document["parse_result_uri"] = zip_storage_uri
+            self._documents_repo.upsert(tenant_id=tenant_id, document=document)
+
+        parse_time = time.time() - start_time
+
+        return MineruParseResult(
+            document_id=document_id,
+            job_id=job_id,
+            status="completed",
+            chunks_count=len(chunks),
+            zip_storage_uri=zip_storage_uri,
+            images_storage_uris=images_storage_uris,
+            images_count=len(images_storage_uris),
+            content_list=[self._item_to_dict(item) for item in content_list],
+            full_md=full_md,
+            parse_time_s=parse_time,
+        )
+
+    def _download_zip(self, zip_url: str) -> IO[bytes]:
+        """Stream the result zip into a spooled temp file (memory up to the spool limit, disk beyond)."""
         from urllib import request
 
+        spool: IO[bytes] = tempfile.SpooledTemporaryFile(max_size=self._zip_spool_max_bytes)  # noqa: SIM115 - caller closes
         try:
             with request.urlopen(zip_url, timeout=60) as resp:
-                return resp.read()
+                shutil.copyfileobj(resp, spool, _COPY_CHUNK_BYTES)
         except Exception as e:
+            spool.close()
             raise ApiError(
                 code="DOC_PARSE_OUTPUT_NOT_FOUND",
                 message=f"Failed to download MinerU result: {e}",
@@ -458,35 +496,93 @@ class MineruParseService:
                 retryable=True,
                 http_status=503,
             ) from e
+        spool.seek(0)
+        return spool
 
     def _save_parse_result(
         self,
         *,
         tenant_id: str,
         document_id: str,
-        zip_bytes: bytes,
+        zip_file: IO[bytes],
     ) -> str:
         """Save parse result zip to object storage.
 
         Key format per SSOT: tenants/{tenant_id}/documents/{document_id}/parse/result.zip
         """
+        put_file = getattr(self._object_storage, "put_object_file", None)
+        if put_file is not None:
+            return put_file(
+                tenant_id=tenant_id,
+                object_type="document_parse",
+                object_id=document_id,
+                filename="result.zip",
+                fileobj=zip_file,
+                content_type="application/zip",
+            )
         return self._object_storage.put_object(
             tenant_id=tenant_id,
             object_type="document_parse",
             object_id=document_id,
             filename="result.zip",
-            content_bytes=zip_bytes,
+            content_bytes=zip_file.read(),
             content_type="application/zip",
         )
 
-    def _extract_zip_content(self, zip_bytes: bytes) -> dict[str, str]:
-        """Extract text content from zip."""
+    def _walk_zip(
+        self,
+        *,
+        tenant_id: str,
+        document_id: str,
+        zip_file: IO[bytes],
+        store_images: bool = True,
+    ) -> tuple[dict[str, str], list[str]]:
+        """Read text members and upload image members in one pass over the archive.
+
+        Images are stored at: tenants/{tenant_id}/document_parse/{document_id}/images/{filename}.
+        They are collected into batches (``_IMAGE_BATCH_MAX_FILES`` / ``_IMAGE_BATCH_MAX_BYTES``)
+        handed to ``put_objects`` in the background while the walk fills the next one, so at
+        most two batches are held in memory at once.
+
+        Returns (text content by member name, storage URIs of saved images).
+        """
         content: dict[str, str] = {}
+        storage_uris: list[str] = []
+        pending: list[ObjectPut] = []
+        pending_bytes = 0
+        in_flight: Future[list[str]] | None = None
         try:
-            with zipfile.ZipFile(io.BytesIO(zip_bytes)) as zf:
-                for name in zf.namelist():
-                    if name.endswith((".md", ".json", ".txt")):
-                        content[name] = zf.read(name).decode("utf-8", errors="replace")
+            with (
+                zipfile.ZipFile(zip_file) as zf,
+                ThreadPoolExecutor(max_workers=1, thread_name_prefix="mineru-images") as flusher,
+            ):
+                for info in zf.infolist():
+                    if info.is_dir():
+                        continue
+                    name = info.filename
+                    if name.endswith(_TEXT_MEMBER_SUFFIXES):
+                        content[name] = zf.read(info).decode("utf-8", errors="replace")
+                        continue
+                    content_type = _image_content_type(name) if store_images else None
+                    if content_type is None or info.file_size == 0:
+                        continue
+                    pending.append(
+                        ObjectPut(
+                            object_type="document_parse",
+                            object_id=f"{document_id}/images",
+                            filename=os.path.basename(name),
+                            content_bytes=zf.read(info),
+                            content_type=content_type,
+                        )
+                    )
+                    pending_bytes += info.file_size
+                    if len(pending) >= _IMAGE_BATCH_MAX_FILES or pending_bytes >= _IMAGE_BATCH_MAX_BYTES:
+                        if in_flight is not None:
+                            storage_uris.extend(in_flight.result())
+                        in_flight = flusher.submit(self._put_images, tenant_id=tenant_id, objects=pending)
+                        pending, pending_bytes = [], 0
+                if in_flight is not None:
+                    storage_uris.extend(in_flight.result())
         except zipfile.BadZipFile as e:
             raise ApiError(
                 code="DOC_PARSE_SCHEMA_INVALID",
@@ -495,6 +591,29 @@ class MineruParseService:
                 retryable=True,
                 http_status=503,
             ) from e
+        if pending:
+            storage_uris.extend(self._put_images(tenant_id=tenant_id, objects=pending))
+        return content, storage_uris
+
+    def _put_images(self, *, tenant_id: str, objects: list[ObjectPut]) -> list[str]:
+        put_objects = getattr(self._object_storage, "put_objects", None)
+        if put_objects is not None:
+            return put_objects(tenant_id=tenant_id, objects=objects)
+        return [
+            self._object_storage.put_object(
+                tenant_id=tenant_id,
+                object_type=item.object_type,
+                object_id=item.object_id,
+                filename=item.filename,
+                content_bytes=item.content_bytes,
+                content_type=item.content_type,
+            )
+            for item in objects
+        ]
+
+    def _extract_zip_content(self, zip_bytes: bytes) -> dict[str, str]:
+        """Extract text content from an in-memory zip."""
+        content, _ = self._walk_zip(tenant_id="", document_id="", zip_file=io.BytesIO(zip_bytes), store_images=False)
         return content
 
     def _save_images(
@@ -504,61 +623,13 @@ class MineruParseService:
         document_id: str,
         zip_bytes: bytes,
     ) -> list[str]:
-        """Extract and save images from zip to object storage.
-
-        Images are stored at: tenants/{tenant_id}/document_parse/{document_id}/images/{filename}
-
-        Returns list of storage URIs for saved images.
-        """
-        storage_uris: list[str] = []
-        image_extensions = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp", ".tiff", ".svg"}
-
+        """Extract and save images from an in-memory zip; a corrupt zip yields no images."""
         try:
-            with zipfile.ZipFile(io.BytesIO(zip_bytes)) as zf:
-                for name in zf.namelist():
-                    # Check if file is in images directory and has image extension
-                    lower_name = name.lower()
-                    if name.startswith("images/") or "/images/" in name:
-                        ext = os.path.splitext(name)[1].lower()
-                        if ext in image_extensions:
-                            # Extract filename from path
-                            filename = os.path.basename(name)
-                            if not filename:
-                                continue
-
-                            # Read image bytes
-                            image_bytes = zf.read(name)
-                            if len(image_bytes) == 0:
-                                continue
-
-                            # Determine content type
-                            content_type_map = {
-                                ".jpg": "image/jpeg",
-                                ".jpeg": "image/jpeg",
-                                ".png": "image/png",
-                                ".gif": "image/gif",
-                                ".webp": "image/webp",
-                                ".bmp": "image/bmp",
-                                ".tiff": "image/tiff",
-                                ".svg": "image/svg+xml",
-                            }
-                            content_type = content_type_map.get(ext, "application/octet-stream")
-
-                            # Save to object storage
-                            uri = self._object_storage.put_object(
-                                tenant_id=tenant_id,
-                                object_type="document_parse",
-                                object_id=f"{document_id}/images",
-                                filename=filename,
-                                content_bytes=image_bytes,
-                                content_type=content_type,
-                            )
-                            storage_uris.append(uri)
-
-        except zipfile.BadZipFile:
-            # Log warning but don't fail - images are optional
-            pass
-
+            _, storage_uris = self._walk_zip(
+                tenant_id=tenant_id, document_id=document_id, zip_file=io.BytesIO(zip_bytes)
+            )
+        except ApiError:
+            return []
         return storage_uris
 
     def _parse_content_list(self, content: dict[str, str]) -> list[MineruContentItem]:
@@ -767,9 +838,21 @@ def build_mineru_parse_service(
         enable_formula=source.get("MINERU_ENABLE_FORMULA", "false").strip().lower() in {"1", "true", "yes", "on"},
     )
 
+    try:
+        zip_spool_max_bytes = int(float(source.get("MINERU_ZIP_SPOOL_MAX_MB", "8") or "8") * (1 << 20))
+    except ValueError:
+        zip_spool_max_bytes = _ZIP_SPOOL_MAX_BYTES
+
+    coordinator = None
+    batch_raw = source.get("MINERU_BATCH_ENABLED", "true").strip().lower()
+    if batch_raw not in {"0", "false", "no", "off"}:
+        coordinator = get_mineru_coordinator(config)
+
     return MineruParseService(
         config=config,
         object_storage=object_storage,
         parse_manifests_repo=parse_manifests_repo,
         documents_repo=documents_repo,
+        coordinator=coordinator,
+        zip_spool_max_bytes=zip_spool_max_bytes,
     )
@@ -1,16 +1,25 @@
 from __future__ import annotations
 
+import io
 import json
 import os
 import re
+import shutil
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from hashlib import sha256
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
 from app.errors import ApiError
 
+_COPY_CHUNK_BYTES = 1 << 20
+# Per-directory metadata written by put_objects; "@" never survives _clean_segment, so no key collides with it.
+_BATCH_META_NAME = "@batch.meta.json"
+
 
 def _now_iso() -> str:
     return datetime.now(tz=UTC).isoformat()
@@ -36,6 +45,22 @@ class ObjectStorageConfig:
     retention_days: int
     retention_mode: str
     public_endpoint: str = ""  # For presigned URLs accessible from internet
+    upload_concurrency: int = 8  # put_objects worker threads (S3)
+    multipart_threshold_bytes: int = 8 << 20  # S3 switches to multipart upload at this size
+    multipart_chunk_bytes: int = 8 << 20
+    download_redirect: bool = False  # raw downloads redirect to a presigned URL (S3)
+    download_url_expires_s: int = 900
+
+
+@dataclass(frozen=True)
+class ObjectPut:
+    """One object of a put_objects batch; all objects in a batch share the tenant."""
+
+    object_type: str
+    object_id: str
+    filename: str
+    content_bytes: bytes
+    content_type: str | None = None
 
 
 class ObjectStorageBackend:
@@ -53,9 +78,69 @@ class ObjectStorageBackend:
     ) -> str:
         raise NotImplementedError
 
+    def put_object_file(
+        self,
+        *,
+        tenant_id: str,
+        object_type: str,
+        object_id: str,
+        filename: str,
+        fileobj: BinaryIO,
+        content_type: str | None = None,
+    ) -> str:
+        """Store the remaining contents of *fileobj*; backends override this to stream."""
+        return self.put_object(
+            tenant_id=tenant_id,
+            object_type=object_type,
+            object_id=object_id,
+            filename=filename,
+            content_bytes=fileobj.read(),
+            content_type=content_type,
+        )
+
+    def put_objects(self, *, tenant_id: str, objects: list[ObjectPut]) -> list[str]:
+        """Store a batch of objects; returns storage URIs in input order."""
+        return [
+            self.put_object(
+                tenant_id=tenant_id,
+                object_type=item.object_type,
+                object_id=item.object_id,
+                filename=item.filename,
+                content_bytes=item.content_bytes,
+                content_type=item.content_type,
+            )
+            for item in objects
+        ]
+
     def get_object(self, *, storage_uri: str) -> bytes:
         raise NotImplementedError
 
+    def object_size(self, *, storage_uri: str) -> int:
+        """Size in bytes; raises FileNotFoundError if the object does not exist."""
+        return len(self.get_object(storage_uri=storage_uri))
+
+    def open_stream(
+        self,
+        *,
+        storage_uri: str,
+        start: int = 0,
+        end: int | None = None,
+        chunk_size: int = _COPY_CHUNK_BYTES,
+    ) -> Iterator[bytes]:
+        """Yield bytes ``start..end`` (inclusive; ``end=None`` means to the last byte) in chunks."""
+        payload = self.get_object(storage_uri=storage_uri)
+        stop = len(payload) if end is None else min(end + 1, len(payload))
+        for offset in range(start, stop, chunk_size):
+            yield payload[offset : min(offset + chunk_size, stop)]
+
+    def get_range(self, *, storage_uri: str, start: int, end: int) -> bytes:
+        """Bytes ``start..end`` inclusive, as in an HTTP Range header."""
+        return b"".join(self.open_stream(storage_uri=storage_uri, start=start, end=end))
+
+    def local_path(self, *, storage_uri: str) -> str | None:
+        """Filesystem path of the object when the backend keeps it on local disk, else None."""
+        return None
+
     def delete_object(self, *, storage_uri: str) -> bool:
         raise NotImplementedError
 
@@ -95,6 +180,10 @@ class ObjectStorageBackend:
         """
         return None
 
+    def download_redirect_url(self, *, storage_uri: str) -> str | None:
+        """URL clients should be redirected to instead of proxying the bytes, or None to serve directly."""
+        return None
+
 
 class LocalObjectStorage(ObjectStorageBackend):
     backend_name = "local"
@@ -106,6 +195,7 @@ class LocalObjectStorage(ObjectStorageBackend):
         self._worm_mode = bool(config.worm_mode)
         self._retention_days = max(int(config.retention_days), 0)
         self._retention_mode = (config.retention_mode or "GOVERNANCE").upper()
+        self._batch_meta_lock = threading.Lock()
         self._root.mkdir(parents=True, exist_ok=True)
 
     def put_object(
@@ -129,17 +219,72 @@ class LocalObjectStorage(ObjectStorageBackend):
             return self._uri_for_key(key)
         path.parent.mkdir(parents=True, exist_ok=True)
         path.write_bytes(content_bytes)
-        meta = {
+        self._write_new_meta(path, content_type=content_type)
+        return self._uri_for_key(key)
+
+    def put_object_file(
+        self,
+        *,
+        tenant_id: str,
+        object_type: str,
+        object_id: str,
+        filename: str,
+        fileobj: BinaryIO,
+        content_type: str | None = None,
+    ) -> str:
+        key = self._build_key(
+            tenant_id=tenant_id,
+            object_type=object_type,
+            object_id=object_id,
+            filename=filename,
+        )
+        path = self._path_for_key(key)
+        if path.exists() and self._worm_mode:
+            return self._uri_for_key(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as out:
+            shutil.copyfileobj(fileobj, out, _COPY_CHUNK_BYTES)
+        self._write_new_meta(path, content_type=content_type)
+        return self._uri_for_key(key)
+
+    def put_objects(self, *, tenant_id: str, objects: list[ObjectPut]) -> list[str]:
+        # One timestamp / retention computation per batch, one mkdir and one metadata write per
+        # distinct directory: entries land in the directory's batch file instead of per-object sidecars.
+        base_meta: dict[str, Any] = {
             "legal_hold": False,
-            "content_type": content_type or "application/octet-stream",
             "created_at": _now_iso(),
             "retention_mode": self._retention_mode,
         }
         if self._retention_days > 0:
             retain_until = datetime.now(tz=UTC) + timedelta(days=self._retention_days)
-            meta["retention_until"] = retain_until.isoformat()
-        self._write_meta(path, meta)
-        return self._uri_for_key(key)
+            base_meta["retention_until"] = retain_until.isoformat()
+        batch_meta: dict[Path, dict[str, dict[str, Any]]] = {}
+        uris: list[str] = []
+        for item in objects:
+            key = self._build_key(
+                tenant_id=tenant_id,
+                object_type=item.object_type,
+                object_id=item.object_id,
+                filename=item.filename,
+            )
+            uris.append(self._uri_for_key(key))
+            path = self._path_for_key(key)
+            if self._worm_mode and path.exists():
+                continue
+            if path.parent not in batch_meta:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                batch_meta[path.parent] = {}
+            path.write_bytes(item.content_bytes)
+            # A sidecar left by an earlier put_object would shadow the fresh batch entry.
+            self._meta_path(path).unlink(missing_ok=True)
+            batch_meta[path.parent][path.name] = {
+                **base_meta,
+                "content_type": item.content_type or "application/octet-stream",
+            }
+        for directory, entries in batch_meta.items():
+            if entries:
+                self._update_batch_meta(directory, entries)
+        return uris
 
     def get_object(self, *, storage_uri: str) -> bytes:
         path = self._path_for_uri(storage_uri)
@@ -147,6 +292,42 @@ class LocalObjectStorage(ObjectStorageBackend):
             raise FileNotFoundError(storage_uri)
         return path.read_bytes()
 
+    def object_size(self, *, storage_uri: str) -> int:
+        path = self._path_for_uri(storage_uri)
+        if not path.exists():
+            raise FileNotFoundError(storage_uri)
+        return path.stat().st_size
+
+    def open_stream(
+        self,
+        *,
+        storage_uri: str,
+        start: int = 0,
+        end: int | None = None,
+        chunk_size: int = _COPY_CHUNK_BYTES,
+    ) -> Iterator[bytes]:
+        path = self._path_for_uri(storage_uri)
+        if not path.exists():
+            raise FileNotFoundError(storage_uri)
+        return self._iter_file(path, start=start, end=end, chunk_size=chunk_size)
+
+    @staticmethod
+    def _iter_file(path: Path, *, start: int, end: int | None, chunk_size: int) -> Iterator[bytes]:
+        remaining = None if end is None else max(0, end - start + 1)
+        with path.open("rb") as fh:
+            fh.seek(start)
+            while remaining is None or remaining > 0:
+                chunk = fh.read(chunk_size if remaining is None else min(chunk_size, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    def local_path(self, *, storage_uri: str) -> str | None:
+        path = self._path_for_uri(storage_uri)
+        return str(path) if path.exists() else None
+
     def delete_object(self, *, storage_uri: str) -> bool:
         if self.is_legal_hold_active(storage_uri=storage_uri):
             raise ApiError(
@@ -171,6 +352,8 @@ class LocalObjectStorage(ObjectStorageBackend):
         meta = self._meta_path(path)
         if meta.exists():
             meta.unlink()
+        if self._batch_meta_path(path.parent).exists():
+            self._update_batch_meta(path.parent, {}, drop=path.name)
         return True
 
     def apply_legal_hold(self, *, storage_uri: str) -> bool:
@@ -276,10 +459,41 @@ class LocalObjectStorage(ObjectStorageBackend):
     def _meta_path(self, path: Path) -> Path:
         return Path(f"{path}.meta.json")
 
+    def _batch_meta_path(self, directory: Path) -> Path:
+        return directory / _BATCH_META_NAME
+
+    def _load_batch_meta(self, directory: Path) -> dict[str, dict[str, Any]]:
+        batch_path = self._batch_meta_path(directory)
+        if not batch_path.exists():
+            return {}
+        try:
+            data = json.loads(batch_path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _update_batch_meta(
+        self, directory: Path, entries: dict[str, dict[str, Any]], *, drop: str | None = None
+    ) -> None:
+        with self._batch_meta_lock:
+            merged = self._load_batch_meta(directory)
+            merged.update(entries)
+            if drop is not None:
+                merged.pop(drop, None)
+            batch_path = self._batch_meta_path(directory)
+            if not merged:
+                batch_path.unlink(missing_ok=True)
+                return
+            tmp_path = batch_path.with_name(f"{batch_path.name}.tmp")
+            tmp_path.write_text(json.dumps(merged, ensure_ascii=True, sort_keys=True), encoding="utf-8")
+            os.replace(tmp_path, batch_path)
+
     def _read_meta(self, path: Path) -> dict[str, Any]:
+        # A per-object sidecar (put_object, legal hold, retention updates) wins over the batch entry.
         meta_path = self._meta_path(path)
         if not meta_path.exists():
-            return {"legal_hold": False}
+            entry = self._load_batch_meta(path.parent).get(path.name)
+            return dict(entry) if isinstance(entry, dict) else {"legal_hold": False}
         try:
             return json.loads(meta_path.read_text(encoding="utf-8"))
         except json.JSONDecodeError:
@@ -289,6 +503,18 @@ class LocalObjectStorage(ObjectStorageBackend):
         meta_path = self._meta_path(path)
         meta_path.write_text(json.dumps(meta, ensure_ascii=True, sort_keys=True), encoding="utf-8")
 
+    def _write_new_meta(self, path: Path, *, content_type: str | None) -> None:
+        meta = {
+            "legal_hold": False,
+            "content_type": content_type or "application/octet-stream",
+            "created_at": _now_iso(),
+            "retention_mode": self._retention_mode,
+        }
+        if self._retention_days > 0:
+            retain_until = datetime.now(tz=UTC) + timedelta(days=self._retention_days)
+            meta["retention_until"] = retain_until.isoformat()
+        self._write_meta(path, meta)
+
 
 class S3ObjectStorage(ObjectStorageBackend):
     backend_name = "s3"
@@ -315,6 +541,21 @@ class S3ObjectStorage(ObjectStorageBackend):
             endpoint_url=config.endpoint or None,
             config=boto3.session.Config(s3={"addressing_style": "path" if config.force_path_style else "auto"}),
         )
+        self._upload_concurrency = max(1, int(config.upload_concurrency))
+        self._download_redirect = bool(config.download_redirect)
+        self._download_url_expires_s = max(1, int(config.download_url_expires_s))
+        self._multipart_threshold = max(5 << 20, int(config.multipart_threshold_bytes))
+        self._transfer_config: Any = None
+        try:
+            from boto3.s3.transfer import TransferConfig  # type: ignore
+
+            self._transfer_config = TransferConfig(
+                multipart_threshold=self._multipart_threshold,
+                multipart_chunksize=max(5 << 20, int(config.multipart_chunk_bytes)),
+                max_concurrency=self._upload_concurrency,
+            )
+        except Exception:  # pragma: no cover - boto3 defaults apply
+            self._transfer_config = None
 
     def put_object(
         self,
@@ -329,12 +570,52 @@ class S3ObjectStorage(ObjectStorageBackend):
         key = self._build_key(tenant_id=tenant_id, object_type=object_type, object_id=object_id, filename=filename)
         if self._worm_mode and self._object_exists(key):
             return self._uri_for_key(key)
-        self._client.put_object(
-            Bucket=self._bucket,
-            Key=key,
-            Body=content_bytes,
-            ContentType=content_type or "application/octet-stream",
-        )
+        if len(content_bytes) >= self._multipart_threshold:
+            self._upload_fileobj(io.BytesIO(content_bytes), key=key, content_type=content_type)
+        else:
+            self._client.put_object(
+                Bucket=self._bucket,
+                Key=key,
+                Body=content_bytes,
+                ContentType=content_type or "application/octet-stream",
+            )
+        if self._retention_days > 0:
+            retain_until = datetime.now(tz=UTC) + timedelta(days=self._retention_days)
+            self.set_retention(storage_uri=self._uri_for_key(key), mode=self._retention_mode, retain_until=retain_until)
+        return self._uri_for_key(key)
+
+    def put_objects(self, *, tenant_id: str, objects: list[ObjectPut]) -> list[str]:
+        if len(objects) <= 1:
+            return super().put_objects(tenant_id=tenant_id, objects=objects)
+
+        def _put(item: ObjectPut) -> str:
+            return self.put_object(
+                tenant_id=tenant_id,
+                object_type=item.object_type,
+                object_id=item.object_id,
+                filename=item.filename,
+                content_bytes=item.content_bytes,
+                content_type=item.content_type,
+            )
+
+        workers = min(self._upload_concurrency, len(objects))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="s3-put") as pool:
+            return list(pool.map(_put, objects))
+
+    def put_object_file(
+        self,
+        *,
+        tenant_id: str,
+        object_type: str,
+        object_id: str,
+        filename: str,
+        fileobj: BinaryIO,
+        content_type: str | None = None,
+    ) -> str:
+        key = self._build_key(tenant_id=tenant_id, object_type=object_type, object_id=object_id, filename=filename)
+        if self._worm_mode and self._object_exists(key):
+            return self._uri_for_key(key)
+        self._upload_fileobj(fileobj, key=key, content_type=content_type)
         if self._retention_days > 0:
             retain_until = datetime.now(tz=UTC) + timedelta(days=self._retention_days)
             self.set_retention(storage_uri=self._uri_for_key(key), mode=self._retention_mode, retain_until=retain_until)
@@ -345,6 +626,29 @@ class S3ObjectStorage(ObjectStorageBackend):
         response = self._client.get_object(Bucket=parsed["bucket"], Key=parsed["key"])
         return response["Body"].read()
 
+    def object_size(self, *, storage_uri: str) -> int:
+        parsed = _parse_storage_uri(storage_uri)
+        try:
+            response = self._client.head_object(Bucket=parsed["bucket"], Key=parsed["key"])
+        except Exception as exc:
+            raise FileNotFoundError(storage_uri) from exc
+        return int(response["ContentLength"])
+
+    def open_stream(
+        self,
+        *,
+        storage_uri: str,
+        start: int = 0,
+        end: int | None = None,
+        chunk_size: int = _COPY_CHUNK_BYTES,
+    ) -> Iterator[bytes]:
+        parsed = _parse_storage_uri(storage_uri)
+        kwargs: dict[str, Any] = {"Bucket": parsed["bucket"], "Key": parsed["key"]}
+        if start > 0 or end is not None:
+            kwargs["Range"] = f"bytes={start}-{'' if end is None else end}"
+        response = self._client.get_object(**kwargs)
+        return response["Body"].iter_chunks(chunk_size=chunk_size)
+
     def delete_object(self, *, storage_uri: str) -> bool:
         if self.is_legal_hold_active(storage_uri=storage_uri):
             raise ApiError(
@@ -464,6 +768,11 @@ class S3ObjectStorage(ObjectStorageBackend):
         except Exception:  # pragma: no cover
             return None
 
+    def download_redirect_url(self, *, storage_uri: str) -> str | None:
+        if not self._download_redirect:
+            return None
+        return self.get_presigned_url(storage_uri=storage_uri, expires_in=self._download_url_expires_s)
+
     def _build_key(self, *, tenant_id: str, object_type: str, object_id: str, filename: str) -> str:
         safe_filename = _clean_segment(filename)
         safe_type = _clean_segment(object_type)
@@ -482,6 +791,13 @@ class S3ObjectStorage(ObjectStorageBackend):
     def _uri_for_key(self, key: str) -> str:
         return f"object://{self.backend_name}/{self._bucket}/{key}"
 
+    def _upload_fileobj(self, fileobj: BinaryIO, *, key: str, content_type: str | None) -> None:
+        # Managed transfer: streams the file and switches to multipart upload for large objects.
+        kwargs: dict[str, Any] = {"ExtraArgs": {"ContentType": content_type or "application/octet-stream"}}
+        if self._transfer_config is not None:
+            kwargs["Config"] = self._transfer_config
+        self._client.upload_fileobj(fileobj, self._bucket, key, **kwargs)
+
     def _object_exists(self, key: str) -> bool:
         try:
             self._client.head_object(Bucket=self._bucket, Key=key)
@@ -500,6 +816,13 @@ def _parse_storage_uri(uri: str) -> dict[str, str]:
     return {"backend": parts[0], "bucket": parts[1], "key": parts[2]}
 
 
+def _env_int(env: Any, name: str, default: int) -> int:
+    try:
+        return max(1, int(env.get(name, str(default)).strip() or default))
+    except ValueError:
+        return default
+
+
 def create_object_storage_from_env(environ: dict[str, str] | None = None) -> ObjectStorageBackend:
     env = os.environ if environ is None else environ
     backend = env.get("BEA_OBJECT_STORAGE_BACKEND", "local").strip().lower() or "local"
@@ -523,6 +846,12 @@ def create_object_storage_from_env(environ: dict[str, str] | None = None) -> Obj
         retention_days=max(retention_days, 0),
         retention_mode=env.get("OBJECT_STORAGE_RETENTION_MODE", "GOVERNANCE").strip() or "GOVERNANCE",
         public_endpoint=env.get("OBJECT_STORAGE_PUBLIC_ENDPOINT", "").strip(),
+        upload_concurrency=_env_int(env, "OBJECT_STORAGE_UPLOAD_CONCURRENCY", 8),
+        multipart_threshold_bytes=_env_int(env, "OBJECT_STORAGE_MULTIPART_THRESHOLD_MB", 8) << 20,
+        multipart_chunk_bytes=_env_int(env, "OBJECT_STORAGE_MULTIPART_CHUNK_MB", 8) << 20,
+        download_redirect=env.get("OBJECT_STORAGE_DOWNLOAD_REDIRECT", "false").strip().lower()
+        in {"1", "true", "yes", "on"},
+        download_url_expires_s=_env_int(env, "OBJECT_STORAGE_DOWNLOAD_URL_EXPIRES_S", 900),
     )
     if config.backend == "s3":
         return S3ObjectStorage(config=config)
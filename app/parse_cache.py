@@ -0,0 +1,180 @@
+"""Content-addressed parse result cache keyed by (tenant, file SHA-256, parser, parser version).
+
+The same attachment uploaded under another project or supplier, or parsed
+again after a failed job, reuses the earlier chunks instead of calling MinerU
+or the local parser. Chunks are stored once per key in object storage as
+gzipped JSON lines with document-scoped fields stripped; a small index maps
+the key to that object plus a manifest summary. Entries are tenant-scoped, so
+cached content never crosses tenants.
+
+Env vars:
+  PARSE_CACHE_ENABLED      — default true
+  PARSE_CACHE_MAX_ENTRIES  — LRU bound of the index (default 10000)
+  PARSE_CACHE_INDEX_PATH   — optional SQLite file to persist the index across restarts
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from typing import IO, Any
+
+# Re-derived for every document the cached result is copied into.
+_DOCUMENT_SCOPED_FIELDS = ("chunk_id", "chunk_hash", "document_id", "tenant_id", "token_count", "page", "bbox")
+
+
+def parse_cache_key(*, tenant_id: str, file_sha256: str, parser: str, parser_version: str) -> str:
+    raw = f"{tenant_id}\x1f{file_sha256}\x1f{parser}\x1f{parser_version}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ParseCacheWriter:
+    """Accumulate chunks into a gzipped JSON-lines blob spooled to disk past 1 MiB."""
+
+    def __init__(self) -> None:
+        self._raw: IO[bytes] = tempfile.SpooledTemporaryFile(max_size=1 << 20)  # noqa: SIM115 - closed in finish/discard
+        self._gz = gzip.GzipFile(fileobj=self._raw, mode="wb")
+        self.chunk_count = 0
+
+    def add(self, chunk: dict[str, Any]) -> None:
+        item = {k: v for k, v in chunk.items() if k not in _DOCUMENT_SCOPED_FIELDS}
+        self._gz.write(json.dumps(item, ensure_ascii=False, sort_keys=True).encode("utf-8") + b"\n")
+        self.chunk_count += 1
+
+    def finish(self) -> bytes:
+        self._gz.close()
+        self._raw.seek(0)
+        try:
+            return self._raw.read()
+        finally:
+            self._raw.close()
+
+    def discard(self) -> None:
+        self._gz.close()
+        self._raw.close()
+
+
+def decode_chunks(blob: bytes) -> Iterator[dict[str, Any]]:
+    with gzip.GzipFile(fileobj=io.BytesIO(blob), mode="rb") as gz:
+        for line in gz:
+            if line.strip():
+                yield json.loads(line)
+
+
+class ParseCacheIndex:
+    """Thread-safe LRU of key → entry (storage_uri + manifest summary) with optional SQLite backing."""
+
+    def __init__(self, *, max_entries: int = 10000, path: str | None = None) -> None:
+        self._max_entries = max(1, max_entries)
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._conn: sqlite3.Connection | None = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS parse_cache "
+                "(key TEXT PRIMARY KEY, entry TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self._conn is not None:
+                row = self._conn.execute("SELECT entry FROM parse_cache WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    entry = json.loads(row[0])
+            if entry is None:
+                self._misses += 1
+                return None
+            self._remember(key, entry)
+            self._hits += 1
+            return dict(entry)
+
+    def put(self, key: str, entry: dict[str, Any]) -> None:
+        with self._lock:
+            self._remember(key, dict(entry))
+            self._stores += 1
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO parse_cache (key, entry, updated_at) VALUES (?, ?, ?)",
+                        (key, json.dumps(entry, ensure_ascii=True, sort_keys=True), time.time()),
+                    )
+                    self._conn.execute(
+                        "DELETE FROM parse_cache WHERE key NOT IN "
+                        "(SELECT key FROM parse_cache ORDER BY updated_at DESC LIMIT ?)",
+                        (self._max_entries,),
+                    )
+
+    def drop(self, key: str) -> None:
+        """Forget an entry whose object is gone (storage reset, retention)."""
+        with self._lock:
+            self._entries.pop(key, None)
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute("DELETE FROM parse_cache WHERE key = ?", (key,))
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "stores": self._stores,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "persisted": self._conn is not None,
+            }
+
+    def _remember(self, key: str, entry: dict[str, Any]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+_index: ParseCacheIndex | None = None
+_index_lock = threading.Lock()
+
+
+def parse_cache_enabled() -> bool:
+    raw = os.environ.get("PARSE_CACHE_ENABLED", "true").strip().lower()
+    return raw not in {"0", "false", "no", "off"}
+
+
+def get_parse_cache_index() -> ParseCacheIndex:
+    global _index
+    with _index_lock:
+        if _index is None:
+            try:
+                max_entries = int(os.environ.get("PARSE_CACHE_MAX_ENTRIES", "10000"))
+            except ValueError:
+                max_entries = 10000
+            path = os.environ.get("PARSE_CACHE_INDEX_PATH", "").strip() or None
+            _index = ParseCacheIndex(max_entries=max_entries, path=path)
+        return _index
+
+
+def parse_cache_stats() -> dict[str, Any]:
+    stats = get_parse_cache_index().stats()
+    stats["enabled"] = parse_cache_enabled()
+    return stats
+
+
+def reset_parse_cache_index() -> None:
+    global _index
+    with _index_lock:
+        _index = None
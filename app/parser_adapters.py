@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import json
 import os
-from collections.abc import Iterable, Mapping
+from collections.abc import Iterable, Iterator, Mapping
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Protocol
 from urllib import request
@@ -323,6 +323,7 @@ class LocalParserAdapter:
         file_bytes: bytes,
         filename: str,
         document_id: str,
+        content_sha256: str | None = None,
     ) -> list[dict[str, object]]:
         from app.document_parser import parse_file_bytes
 
@@ -332,6 +333,26 @@ class LocalParserAdapter:
             document_id=document_id,
             parser_name=self.name,
             parser_version=self.version,
+            content_sha256=content_sha256,
+        )
+
+    def iter_parse_file(
+        self,
+        *,
+        file_bytes: bytes,
+        filename: str,
+        document_id: str,
+        content_sha256: str | None = None,
+    ) -> Iterator[dict[str, object]]:
+        from app.document_parser import iter_parse_file_bytes
+
+        return iter_parse_file_bytes(
+            file_bytes,
+            filename=filename,
+            document_id=document_id,
+            parser_name=self.name,
+            parser_version=self.version,
+            content_sha256=content_sha256,
         )
 
 
@@ -0,0 +1,264 @@
+"""Adaptive parser routing between MinerU and the local PyMuPDF path.
+
+Each parse attempt reports its latency and outcome to a per-parser rolling
+window; the number of attempts in flight is the parser's queue depth. A
+parser whose recent error rate or p95 latency crosses its threshold is shed
+for a cool-down period, after which a single trial request decides whether
+it rejoins; one at its in-flight limit is skipped until work drains.
+
+Routing order (``plan_parse_order``):
+  1. text-native PDFs (cheap probe of the first pages finds real text) → local first
+  2. MinerU shedding load → local first, MinerU only as the last resort
+  3. otherwise MinerU first, local as the fallback
+
+Env vars:
+  PARSER_ROUTER_ENABLED         — default true; false keeps the fixed MinerU → local order
+  PARSER_PROBE_PAGES            — pages inspected by the text-native probe (default 3)
+  PARSER_PROBE_MIN_CHARS        — extractable characters per probed page that mark a PDF text-native (default 200)
+  PARSER_HEALTH_WINDOW          — outcomes kept per parser (default 50)
+  PARSER_HEALTH_MIN_SAMPLES     — outcomes before error rate / p95 are judged (default 5)
+  PARSER_HEALTH_MAX_ERROR_RATE  — default 0.5
+  PARSER_HEALTH_MAX_P95_S       — default 120; 0 disables the latency check
+  PARSER_HEALTH_MAX_INFLIGHT    — concurrent attempts before a parser is skipped (default 16; 0 = unbounded)
+  PARSER_HEALTH_COOLDOWN_S      — how long an unhealthy parser is shed before a trial (default 30)
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+PARSER_MINERU = "mineru_official"
+PARSER_LOCAL = "local"
+
+
+class _ParserWindow:
+    __slots__ = ("outcomes", "inflight", "shed_until", "trial_in_flight", "shed_total")
+
+    def __init__(self, size: int) -> None:
+        self.outcomes: deque[tuple[float, bool]] = deque(maxlen=size)
+        self.inflight = 0
+        self.shed_until: float | None = None
+        self.trial_in_flight = False
+        self.shed_total = 0
+
+
+class ParserHealthTracker:
+    """Thread-safe rolling latency / error rate / in-flight counts per parser."""
+
+    def __init__(
+        self,
+        *,
+        window: int = 50,
+        min_samples: int = 5,
+        max_error_rate: float = 0.5,
+        max_p95_s: float = 120.0,
+        max_inflight: int = 16,
+        cooldown_s: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._window = max(1, window)
+        self._min_samples = max(1, min_samples)
+        self._max_error_rate = max_error_rate
+        self._max_p95_s = max_p95_s
+        self._max_inflight = max(0, max_inflight)
+        self._cooldown_s = max(0.0, cooldown_s)
+        self._clock = clock
+        self._parsers: dict[str, _ParserWindow] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, parser: str) -> _ParserWindow:
+        state = self._parsers.get(parser)
+        if state is None:
+            state = self._parsers[parser] = _ParserWindow(self._window)
+        return state
+
+    def available(self, parser: str) -> bool:
+        """Whether the next document may be sent to ``parser``; claims the trial slot after a cool-down."""
+        with self._lock:
+            state = self._get(parser)
+            if self._max_inflight and state.inflight >= self._max_inflight:
+                return False
+            if state.shed_until is None:
+                return True
+            if self._clock() < state.shed_until or state.trial_in_flight:
+                return False
+            state.trial_in_flight = True
+            return True
+
+    def start(self, parser: str) -> None:
+        with self._lock:
+            self._get(parser).inflight += 1
+
+    def finish(self, parser: str, *, latency_s: float, ok: bool | None) -> None:
+        """End an attempt; ``ok=None`` (parser not called, or the consumer abandoned the parse)
+        records no outcome and only frees the in-flight slot and any trial claim."""
+        with self._lock:
+            state = self._get(parser)
+            state.inflight = max(0, state.inflight - 1)
+            if ok is None:
+                # No verdict: let the next document run the trial.
+                state.trial_in_flight = False
+                return
+            if state.trial_in_flight:
+                state.trial_in_flight = False
+                if ok:
+                    # Trial succeeded: forget the window that got the parser shed.
+                    state.outcomes.clear()
+                    state.shed_until = None
+            state.outcomes.append((max(0.0, latency_s), ok))
+            if state.shed_until is not None:
+                if not ok:
+                    state.shed_until = self._clock() + self._cooldown_s
+            elif self._unhealthy_locked(state):
+                state.shed_total += 1
+                state.shed_until = self._clock() + self._cooldown_s
+
+    def _unhealthy_locked(self, state: _ParserWindow) -> bool:
+        if len(state.outcomes) < self._min_samples:
+            return False
+        if _error_rate(state.outcomes) > self._max_error_rate:
+            return True
+        return bool(self._max_p95_s) and _p95(state.outcomes) > self._max_p95_s
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            now = self._clock()
+            out: dict[str, dict[str, Any]] = {}
+            for parser, state in sorted(self._parsers.items()):
+                if state.shed_until is None:
+                    status = "healthy"
+                elif state.trial_in_flight:
+                    status = "trial"
+                else:
+                    status = "shedding" if now < state.shed_until else "cooled_down"
+                out[parser] = {
+                    "status": status,
+                    "samples": len(state.outcomes),
+                    "error_rate": round(_error_rate(state.outcomes), 4) if state.outcomes else 0.0,
+                    "p95_ms": round(_p95(state.outcomes) * 1000, 1) if state.outcomes else 0.0,
+                    "inflight": state.inflight,
+                    "shed_total": state.shed_total,
+                }
+            return out
+
+
+def _error_rate(outcomes: deque[tuple[float, bool]]) -> float:
+    return sum(1 for _, ok in outcomes if not ok) / len(outcomes)
+
+
+def _p95(outcomes: deque[tuple[float, bool]]) -> float:
+    latencies = sorted(latency for latency, _ in outcomes)
+    return latencies[min(len(latencies) - 1, math.ceil(0.95 * len(latencies)) - 1)]
+
+
+def probe_text_native_pdf(file_bytes: bytes, *, pages: int = 3, min_chars: int = 200) -> bool:
+    """True when the first ``pages`` pages carry an extractable text layer (no OCR needed)."""
+    try:
+        import pymupdf
+    except ImportError:
+        return False
+    try:
+        doc = pymupdf.open(stream=file_bytes, filetype="pdf")
+    except Exception:
+        return False
+    try:
+        probed = min(max(1, pages), doc.page_count)
+        if probed == 0:
+            return False
+        chars = sum(len("".join(doc[i].get_text("text").split())) for i in range(probed))
+        return chars >= probed * max(1, min_chars)
+    except Exception:
+        return False
+    finally:
+        doc.close()
+
+
+@dataclass
+class ParseDecision:
+    order: list[str]
+    reason: str
+    probe: dict[str, Any] = field(default_factory=dict)
+
+
+def router_enabled() -> bool:
+    raw = os.environ.get("PARSER_ROUTER_ENABLED", "true").strip().lower()
+    return raw not in {"0", "false", "no", "off"}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, str(default)).strip())
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, str(default)).strip())
+    except ValueError:
+        return default
+
+
+def plan_parse_order(
+    *,
+    filename: str,
+    file_bytes: bytes | None,
+    mineru_enabled: bool,
+    local_enabled: bool,
+    tracker: ParserHealthTracker | None = None,
+) -> ParseDecision:
+    """Order in which the real parsers are tried for one document."""
+    if not mineru_enabled:
+        return ParseDecision(order=[PARSER_LOCAL] if local_enabled else [], reason="mineru_unavailable")
+    if not local_enabled:
+        return ParseDecision(order=[PARSER_MINERU], reason="local_unavailable")
+    if not router_enabled():
+        return ParseDecision(order=[PARSER_MINERU, PARSER_LOCAL], reason="static")
+    probe: dict[str, Any] = {}
+    if file_bytes and filename.lower().endswith(".pdf"):
+        pages = _env_int("PARSER_PROBE_PAGES", 3)
+        started = time.perf_counter()
+        text_native = probe_text_native_pdf(file_bytes, pages=pages, min_chars=_env_int("PARSER_PROBE_MIN_CHARS", 200))
+        probe = {"text_native": text_native, "pages": pages, "ms": round((time.perf_counter() - started) * 1000, 1)}
+        if text_native:
+            return ParseDecision(order=[PARSER_LOCAL, PARSER_MINERU], reason="text_native_pdf", probe=probe)
+    tracker = tracker or get_parser_health()
+    if not tracker.available(PARSER_MINERU):
+        return ParseDecision(order=[PARSER_LOCAL, PARSER_MINERU], reason="mineru_shed", probe=probe)
+    return ParseDecision(order=[PARSER_MINERU, PARSER_LOCAL], reason="default", probe=probe)
+
+
+_tracker: ParserHealthTracker | None = None
+_tracker_lock = threading.Lock()
+
+
+def get_parser_health() -> ParserHealthTracker:
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = ParserHealthTracker(
+                window=_env_int("PARSER_HEALTH_WINDOW", 50),
+                min_samples=_env_int("PARSER_HEALTH_MIN_SAMPLES", 5),
+                max_error_rate=_env_float("PARSER_HEALTH_MAX_ERROR_RATE", 0.5),
+                max_p95_s=_env_float("PARSER_HEALTH_MAX_P95_S", 120.0),
+                max_inflight=_env_int("PARSER_HEALTH_MAX_INFLIGHT", 16),
+                cooldown_s=_env_float("PARSER_HEALTH_COOLDOWN_S", 30.0),
+            )
+        return _tracker
+
+
+def parser_router_stats() -> dict[str, Any]:
+    return {"enabled": router_enabled(), "parsers": get_parser_health().snapshot()}
+
+
+def reset_parser_health() -> None:
+    global _tracker
+    with _tracker_lock:
+        _tracker = None
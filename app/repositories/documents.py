@@ -62,6 +62,21 @@ class InMemoryDocumentsRepository:
             return []
         copied = [dict(x) for x in chunks]
         self._document_chunks[document_id] = copied
+        # Detached list: append_chunks extends the stored one in place.
+        return list(copied)
+
+    def append_chunks(
+        self,
+        *,
+        tenant_id: str,
+        document_id: str,
+        chunks: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        row = self._documents.get(document_id)
+        if row is None or row.get("tenant_id") != tenant_id:
+            return []
+        copied = [dict(x) for x in chunks]
+        self._document_chunks.setdefault(document_id, []).extend(copied)
         return copied
 
     def list_chunks(self, *, tenant_id: str, document_id: str) -> list[dict[str, Any]]:
@@ -195,39 +210,58 @@ class PostgresDocumentsRepository:
         chunks: list[dict[str, Any]],
     ) -> list[dict[str, Any]]:
         delete_sql = f"DELETE FROM {self._chunks_table} WHERE tenant_id = %s AND document_id = %s"
-        insert_sql = f"""
-            INSERT INTO {self._chunks_table} (
-                chunk_id, tenant_id, document_id, chunk_hash, pages, positions, section, heading_path, chunk_type, parser, parser_version, text
-            ) VALUES (%s, %s, %s, %s, %s::jsonb, %s::jsonb, %s, %s::jsonb, %s, %s, %s, %s)
-        """
 
         copied = [dict(x) for x in chunks]
 
         def _op(conn: Any) -> list[dict[str, Any]]:
             with conn.cursor() as cur:
                 cur.execute(delete_sql, (tenant_id, document_id))
-                for chunk in copied:
-                    cur.execute(
-                        insert_sql,
-                        (
-                            chunk.get("chunk_id"),
-                            tenant_id,
-                            document_id,
-                            chunk.get("chunk_hash", ""),
-                            json.dumps(chunk.get("pages", []), ensure_ascii=True, sort_keys=True),
-                            json.dumps(chunk.get("positions", []), ensure_ascii=True, sort_keys=True),
-                            chunk.get("section", ""),
-                            json.dumps(chunk.get("heading_path", []), ensure_ascii=True, sort_keys=True),
-                            chunk.get("chunk_type", "text"),
-                            chunk.get("parser", "mineru"),
-                            chunk.get("parser_version", "v0"),
-                            chunk.get("text", ""),
-                        ),
-                    )
+                self._insert_chunks(cur, tenant_id=tenant_id, document_id=document_id, chunks=copied)
             return copied
 
         return self._tx_runner.run_in_tx(tenant_id=tenant_id, fn=_op)
 
+    def append_chunks(
+        self,
+        *,
+        tenant_id: str,
+        document_id: str,
+        chunks: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        copied = [dict(x) for x in chunks]
+
+        def _op(conn: Any) -> list[dict[str, Any]]:
+            with conn.cursor() as cur:
+                self._insert_chunks(cur, tenant_id=tenant_id, document_id=document_id, chunks=copied)
+            return copied
+
+        return self._tx_runner.run_in_tx(tenant_id=tenant_id, fn=_op)
+
+    def _insert_chunks(self, cur: Any, *, tenant_id: str, document_id: str, chunks: list[dict[str, Any]]) -> None:
+        insert_sql = f"""
+            INSERT INTO {self._chunks_table} (
+                chunk_id, tenant_id, document_id, chunk_hash, pages, positions, section, heading_path, chunk_type, parser, parser_version, text
+            ) VALUES (%s, %s, %s, %s, %s::jsonb, %s::jsonb, %s, %s::jsonb, %s, %s, %s, %s)
+        """
+        for chunk in chunks:
+            cur.execute(
+                insert_sql,
+                (
+                    chunk.get("chunk_id"),
+                    tenant_id,
+                    document_id,
+                    chunk.get("chunk_hash", ""),
+                    json.dumps(chunk.get("pages", []), ensure_ascii=True, sort_keys=True),
+                    json.dumps(chunk.get("positions", []), ensure_ascii=True, sort_keys=True),
+                    chunk.get("section", ""),
+                    json.dumps(chunk.get("heading_path", []), ensure_ascii=True, sort_keys=True),
+                    chunk.get("chunk_type", "text"),
+                    chunk.get("parser", "mineru"),
+                    chunk.get("parser_version", "v0"),
+                    chunk.get("text", ""),
+                ),
+            )
+
     def list_chunks(self, *, tenant_id: str, document_id: str) -> list[dict[str, Any]]:
         sql = f"""
             SELECT chunk_id, document_id, chunk_hash, pages, positions, section, heading_path, chunk_type, parser, parser_version, text
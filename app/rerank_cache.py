@@ -0,0 +1,149 @@
+"""Bounded rerank score cache keyed by (model, normalized query, chunk hash).
+
+Cross-encoder and API rerankers look up every (query, chunk) pair here first
+and only score the misses, so re-running an evaluation or preview does not
+pay for the same pairs twice.
+
+Env vars:
+  RERANK_CACHE_ENABLED      — default true
+  RERANK_CACHE_MAX_ENTRIES  — LRU bound for memory and SQLite (default 50000)
+  RERANK_CACHE_PATH         — optional SQLite file to persist scores across restarts
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """NFKC-fold, lowercase and collapse whitespace so trivially different queries share entries."""
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFKC", query)).strip().lower()
+
+
+def score_key(*, model: str, query: str, text: str) -> str:
+    text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    raw = f"{model}\x1f{normalize_query(query)}\x1f{text_hash}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class RerankScoreCache:
+    """Thread-safe LRU of rerank scores with an optional SQLite backing table."""
+
+    def __init__(self, *, max_entries: int = 50000, path: str | None = None) -> None:
+        self._max_entries = max(1, max_entries)
+        self._entries: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._conn: sqlite3.Connection | None = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS rerank_scores "
+                "(key TEXT PRIMARY KEY, score REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    def get_many(self, keys: list[str]) -> dict[str, float]:
+        found: dict[str, float] = {}
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[key] = self._entries[key]
+            pending = [k for k in dict.fromkeys(keys) if k not in found]
+            if pending and self._conn is not None:
+                marks = ",".join("?" for _ in pending)
+                rows = self._conn.execute(
+                    f"SELECT key, score FROM rerank_scores WHERE key IN ({marks})",
+                    pending,
+                ).fetchall()
+                for key, score in rows:
+                    found[key] = float(score)
+                    self._remember(key, float(score))
+            for key in keys:
+                if key in found:
+                    self._hits += 1
+                else:
+                    self._misses += 1
+        return found
+
+    def put_many(self, scores: dict[str, float]) -> None:
+        if not scores:
+            return
+        with self._lock:
+            for key, score in scores.items():
+                self._remember(key, float(score))
+            if self._conn is not None:
+                now = time.time()
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO rerank_scores (key, score, updated_at) VALUES (?, ?, ?)",
+                        [(key, float(score), now) for key, score in scores.items()],
+                    )
+                    self._conn.execute(
+                        "DELETE FROM rerank_scores WHERE key NOT IN "
+                        "(SELECT key FROM rerank_scores ORDER BY updated_at DESC LIMIT ?)",
+                        (self._max_entries,),
+                    )
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "persisted": self._conn is not None,
+            }
+
+    def _remember(self, key: str, score: float) -> None:
+        self._entries[key] = score
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+_cache: RerankScoreCache | None = None
+_cache_lock = threading.Lock()
+
+
+def rerank_cache_enabled() -> bool:
+    raw = os.environ.get("RERANK_CACHE_ENABLED", "true").strip().lower()
+    return raw not in {"0", "false", "no", "off"}
+
+
+def get_rerank_score_cache() -> RerankScoreCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            try:
+                max_entries = int(os.environ.get("RERANK_CACHE_MAX_ENTRIES", "50000"))
+            except ValueError:
+                max_entries = 50000
+            path = os.environ.get("RERANK_CACHE_PATH", "").strip() or None
+            _cache = RerankScoreCache(max_entries=max_entries, path=path)
+        return _cache
+
+
+def rerank_score_cache_stats() -> dict[str, Any]:
+    stats = get_rerank_score_cache().stats()
+    stats["enabled"] = rerank_cache_enabled()
+    return stats
+
+
+def reset_rerank_score_cache() -> None:
+    global _cache
+    with _cache_lock:
+        _cache = None
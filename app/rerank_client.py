@@ -0,0 +1,315 @@
+"""Shared HTTP client for API rerankers (Cohere / Jina).
+
+One pooled ``httpx.Client`` (keep-alive, HTTP/2 when ``h2`` is installed) is
+reused across requests. Calls are bounded by a semaphore, retried with full
+jitter on transport errors / 429 / 5xx within one overall deadline, guarded by
+a circuit breaker that only counts those failures, and identical in-flight
+requests are coalesced into a single API call.
+
+Env vars:
+  RERANK_API_MAX_CONCURRENCY   — concurrent API calls (default 8)
+  RERANK_API_MAX_RETRIES       — retries after the first attempt (default 2)
+  RERANK_API_BACKOFF_BASE_MS   — backoff base (default 100)
+  RERANK_API_BACKOFF_MAX_MS    — backoff cap (default 2000)
+  RERANK_API_BREAKER_THRESHOLD — consecutive failures that open the breaker (default 5)
+  RERANK_API_BREAKER_RESET_MS  — open duration before a half-open probe (default 30000)
+  RERANK_API_HTTP2             — default true
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling the API while the breaker is open."""
+
+
+class RerankApiStatusError(RuntimeError):
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"rerank API returned HTTP {status_code}")
+        self.status_code = status_code
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed → open → half-open (one probe) → closed."""
+
+    def __init__(self, *, failure_threshold: int = 5, reset_timeout_s: float = 30.0) -> None:
+        self._failure_threshold = max(1, failure_threshold)
+        self._reset_timeout_s = reset_timeout_s
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state_locked()
+
+    def _state_locked(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self._reset_timeout_s:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._state_locked()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probe_in_flight = False
+
+    def release(self) -> None:
+        """End a call that says nothing about API health (e.g. a rejected request)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._opened_at is not None or self._failures >= self._failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+class _Inflight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: dict[str, Any] | None = None
+        self.error: BaseException | None = None
+
+
+class RerankApiClient:
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = 8,
+        max_retries: int = 2,
+        backoff_base_ms: int = 100,
+        backoff_max_ms: int = 2000,
+        breaker: CircuitBreaker | None = None,
+        http2: bool = True,
+    ) -> None:
+        self._max_concurrency = max(1, max_concurrency)
+        self._semaphore = threading.BoundedSemaphore(self._max_concurrency)
+        self._max_retries = max(0, max_retries)
+        self._backoff_base_ms = max(0, backoff_base_ms)
+        self._backoff_max_ms = max(self._backoff_base_ms, backoff_max_ms)
+        self.breaker = breaker or CircuitBreaker()
+        self._http2 = http2
+        self._client: Any = None
+        self._client_lock = threading.Lock()
+        self._inflight: dict[str, _Inflight] = {}
+        self._inflight_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "api_calls": 0,
+            "retries": 0,
+            "coalesced": 0,
+            "breaker_rejections": 0,
+            "deadline_exhausted": 0,
+        }
+
+    def post_json(self, url: str, *, headers: dict[str, str], payload: dict[str, Any], timeout_s: float) -> dict:
+        """POST *payload* and return the decoded JSON body.
+
+        *timeout_s* bounds the whole call, retries and backoff included.
+        Identical concurrent requests share one call. Raises
+        :class:`CircuitOpenError` while the breaker is open.
+        """
+        self._bump("requests")
+        deadline = time.monotonic() + timeout_s
+        body = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+        key = hashlib.sha256(f"{url}\x1f{body}".encode()).hexdigest()
+        with self._inflight_lock:
+            inflight = self._inflight.get(key)
+            leader = inflight is None
+            if leader:
+                inflight = _Inflight()
+                self._inflight[key] = inflight
+        if not leader:
+            self._bump("coalesced")
+            if not inflight.done.wait(timeout=max(0.0, deadline - time.monotonic())):
+                self._bump("deadline_exhausted")
+                raise TimeoutError("rerank API deadline exceeded waiting for a coalesced call")
+            if inflight.error is not None:
+                raise inflight.error
+            return inflight.result or {}
+        try:
+            inflight.result = self._post_with_retries(url, headers=headers, payload=payload, deadline=deadline)
+            return inflight.result
+        except BaseException as exc:
+            inflight.error = exc
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+            inflight.done.set()
+
+    def close(self) -> None:
+        with self._client_lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    def _post_with_retries(
+        self, url: str, *, headers: dict[str, str], payload: dict[str, Any], deadline: float
+    ) -> dict[str, Any]:
+        import httpx
+
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                self._bump("breaker_rejections")
+                raise CircuitOpenError("rerank API circuit breaker is open")
+            try:
+                remaining_s = deadline - time.monotonic()
+                if remaining_s <= 0 or not self._semaphore.acquire(timeout=remaining_s):
+                    raise TimeoutError("rerank API deadline exceeded waiting for a slot")
+                try:
+                    remaining_s = deadline - time.monotonic()
+                    if remaining_s <= 0:
+                        raise TimeoutError("rerank API deadline exceeded waiting for a slot")
+                    self._bump("api_calls")
+                    resp = self._http().post(url, headers=headers, json=payload, timeout=remaining_s)
+                finally:
+                    self._semaphore.release()
+                if resp.status_code >= 400:
+                    raise RerankApiStatusError(resp.status_code)
+                data = resp.json()
+            except TimeoutError:
+                # Spent waiting for a local slot; the API was never called.
+                self._bump("deadline_exhausted")
+                self.breaker.release()
+                raise
+            except (httpx.TransportError, RerankApiStatusError) as exc:
+                retryable = not isinstance(exc, RerankApiStatusError) or exc.status_code in _RETRYABLE_STATUS
+                if not retryable:
+                    self.breaker.release()
+                    raise
+                self.breaker.record_failure()
+                if attempt >= self._max_retries:
+                    raise
+                retry_after_s = _retry_after_seconds(resp) if isinstance(exc, RerankApiStatusError) else None
+                delay_s = self._backoff_s(attempt + 1, retry_after_s)
+                if time.monotonic() + delay_s >= deadline:
+                    self._bump("deadline_exhausted")
+                    raise
+            except Exception:
+                self.breaker.record_failure()
+                raise
+            else:
+                self.breaker.record_success()
+                return data
+            attempt += 1
+            self._bump("retries")
+            time.sleep(delay_s)
+
+    def _backoff_s(self, attempt: int, retry_after_s: float | None) -> float:
+        cap_ms = min(self._backoff_max_ms, self._backoff_base_ms * (2 ** (attempt - 1)))
+        delay_s = random.uniform(0, cap_ms) / 1000.0
+        if retry_after_s is not None:
+            delay_s = max(delay_s, min(retry_after_s, self._backoff_max_ms / 1000.0))
+        return delay_s
+
+    def _http(self) -> Any:
+        with self._client_lock:
+            if self._client is None:
+                import httpx
+
+                self._client = httpx.Client(
+                    http2=self._http2 and _h2_available(),
+                    limits=httpx.Limits(
+                        max_connections=self._max_concurrency,
+                        max_keepalive_connections=self._max_concurrency,
+                    ),
+                )
+            return self._client
+
+    def _bump(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+
+def _retry_after_seconds(resp: Any) -> float | None:
+    raw = getattr(resp, "headers", {}).get("Retry-After")
+    try:
+        return float(raw) if raw is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _h2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, str(default)).strip())
+    except ValueError:
+        return default
+
+
+_client: RerankApiClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_rerank_api_client() -> RerankApiClient:
+    global _client
+    with _client_lock:
+        if _client is None:
+            http2 = os.environ.get("RERANK_API_HTTP2", "true").strip().lower() not in {"0", "false", "no", "off"}
+            _client = RerankApiClient(
+                max_concurrency=_env_int("RERANK_API_MAX_CONCURRENCY", 8),
+                max_retries=_env_int("RERANK_API_MAX_RETRIES", 2),
+                backoff_base_ms=_env_int("RERANK_API_BACKOFF_BASE_MS", 100),
+                backoff_max_ms=_env_int("RERANK_API_BACKOFF_MAX_MS", 2000),
+                breaker=CircuitBreaker(
+                    failure_threshold=_env_int("RERANK_API_BREAKER_THRESHOLD", 5),
+                    reset_timeout_s=_env_int("RERANK_API_BREAKER_RESET_MS", 30000) / 1000.0,
+                ),
+                http2=http2,
+            )
+        return _client
+
+
+def rerank_api_client_stats() -> dict[str, Any]:
+    client = get_rerank_api_client()
+    return {**client.stats, "breaker_state": client.breaker.state}
+
+
+def reset_rerank_api_client() -> None:
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
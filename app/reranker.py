@@ -6,6 +6,9 @@ Backends controlled by RERANK_BACKEND env var:
   - cohere/jina    : API-based rerank (Cohere v2 / Jina v1)
 
 Cross-encoder timeout controlled by RERANK_TIMEOUT_MS (default 2000).
+Cross-encoder pairs from concurrent callers are micro-batched by a resident
+executor (RERANK_BATCH_WINDOW_MS, RERANK_BATCH_MAX_PAIRS). Cross-encoder and
+API scores are cached per (model, query, chunk) — see ``app.rerank_cache``.
 """
 
 from __future__ import annotations
@@ -13,21 +16,31 @@ from __future__ import annotations
 import logging
 import math
 import os
+import queue
 import re
+import threading
+import time
 import unicodedata
 from collections import Counter
-from concurrent.futures import ThreadPoolExecutor
-from concurrent.futures import TimeoutError as FuturesTimeoutError
 from typing import Any
 
+import numpy as np
+
+from app.rerank_cache import get_rerank_score_cache, rerank_cache_enabled, score_key
+from app.rerank_client import CircuitOpenError, get_rerank_api_client
+
 logger = logging.getLogger(__name__)
 
 RERANK_BACKEND = os.environ.get("RERANK_BACKEND", "simple").strip().lower()
 RERANK_MODEL_NAME = os.environ.get("RERANK_MODEL_NAME", "cross-encoder/ms-marco-MiniLM-L-6-v2")
 RERANK_TOP_K = int(os.environ.get("RERANK_TOP_K", "0"))
 RERANK_TIMEOUT_MS = int(os.environ.get("RERANK_TIMEOUT_MS", "2000"))
+RERANK_BATCH_WINDOW_MS = int(os.environ.get("RERANK_BATCH_WINDOW_MS", "5"))
+RERANK_BATCH_MAX_PAIRS = int(os.environ.get("RERANK_BATCH_MAX_PAIRS", "64"))
 
 _cross_encoder_cache: dict[str, Any] = {}
+_cross_encoder_batchers: dict[str, CrossEncoderBatcher] = {}
+_cross_encoder_batchers_lock = threading.Lock()
 
 _CJK_RANGES = (
     "\u4e00-\u9fff"  # CJK Unified Ideographs
@@ -82,7 +95,13 @@ def _tokenize(text: str) -> list[str]:
 
 
 def _rerank_simple(query: str, items: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    """TF-IDF style reranker: ``score_rerank = 0.4 * tfidf + 0.6 * score_raw``."""
+    """TF-IDF style reranker: ``score_rerank = 0.4 * tfidf + 0.6 * score_raw``.
+
+    When the candidates belong to one tenant×project with a populated BM25
+    index, term frequencies and corpus IDF come from the index (no
+    re-tokenising); otherwise IDF is computed over the candidates themselves.
+    Scoring is a dense dot product over the query terms only.
+    """
     query_tokens = _tokenize(query)
     if not query_tokens:
         ranked = []
@@ -93,32 +112,20 @@ def _rerank_simple(query: str, items: list[dict[str, Any]]) -> list[dict[str, An
         return sorted(ranked, key=lambda x: float(x.get("score_rerank", 0)), reverse=True)
 
     query_tf = Counter(query_tokens)
-    n_docs = len(items)
-
-    doc_tokens_list = [_tokenize(str(item.get("text", ""))) for item in items]
+    terms = list(query_tf)
+    tf_matrix, doc_lens, n_docs, df = _term_statistics(terms, items)
 
-    df: Counter[str] = Counter()
-    for tokens in doc_tokens_list:
-        df.update(set(tokens))
+    q_counts = np.array([query_tf[t] for t in terms], dtype=np.float64)
+    idf = np.log((n_docs + 1) / (df + 1)) + 1.0
+    safe_lens = np.where(doc_lens > 0, doc_lens, 1.0)
+    scores = (tf_matrix / safe_lens[:, None]) @ (q_counts * idf)
+    max_possible = float(q_counts.sum()) * (math.log((n_docs + 1) / 2) + 1.0)
+    tfidf_scores = scores / max_possible if max_possible > 0 else np.zeros(len(items))
 
     ranked: list[dict[str, Any]] = []
-    for item, doc_tokens in zip(items, doc_tokens_list):
-        if not doc_tokens:
-            tfidf_score = 0.0
-        else:
-            doc_tf = Counter(doc_tokens)
-            score_sum = 0.0
-            for term, q_count in query_tf.items():
-                if term not in doc_tf:
-                    continue
-                tf = doc_tf[term] / len(doc_tokens)
-                idf = math.log((n_docs + 1) / (df.get(term, 0) + 1)) + 1.0
-                score_sum += q_count * tf * idf
-            max_possible = sum(q * (1.0 * (math.log((n_docs + 1) / 2) + 1.0)) for q in query_tf.values())
-            tfidf_score = score_sum / max_possible if max_possible > 0 else 0.0
-
+    for item, tfidf_score in zip(items, tfidf_scores):
         score_raw = float(item.get("score_raw", 0.5))
-        combined = 0.4 * tfidf_score + 0.6 * score_raw
+        combined = 0.4 * float(tfidf_score) + 0.6 * score_raw
 
         copied = dict(item)
         copied["score_rerank"] = round(min(1.0, combined), 4)
@@ -127,39 +134,94 @@ def _rerank_simple(query: str, items: list[dict[str, Any]]) -> list[dict[str, An
     return sorted(ranked, key=lambda x: float(x.get("score_rerank", 0)), reverse=True)
 
 
+def _candidate_scope(items: list[dict[str, Any]]) -> tuple[str, str] | None:
+    scopes = set()
+    for item in items:
+        metadata = item.get("metadata")
+        if not isinstance(metadata, dict):
+            return None
+        scopes.add((str(metadata.get("tenant_id") or ""), str(metadata.get("project_id") or "")))
+    if len(scopes) != 1:
+        return None
+    scope = scopes.pop()
+    return scope if all(scope) else None
+
+
+def _term_statistics(terms: list[str], items: list[dict[str, Any]]) -> tuple[np.ndarray, np.ndarray, int, np.ndarray]:
+    """Return ``(tf_matrix, doc_lens, n_docs, df)`` for *terms* over *items*.
+
+    ``tf_matrix`` is items × terms raw counts. Corpus statistics are used when
+    available; candidates missing from the index are tokenised on the fly with
+    the index's own ``index_terms`` so every ``doc_len`` counts the same tokens.
+    """
+    from app.bm25_index import bm25_enabled, get_bm25_index, index_terms
+
+    column = {term: j for j, term in enumerate(terms)}
+    tf_matrix = np.zeros((len(items), len(terms)), dtype=np.float64)
+    doc_lens = np.zeros(len(items), dtype=np.float64)
+
+    indexed: dict[str, tuple[int, dict[str, int]]] = {}
+    corpus: tuple[int, dict[str, int]] | None = None
+    scope = _candidate_scope(items)
+    if scope is not None and bm25_enabled():
+        bm25 = get_bm25_index()
+        n_docs, corpus_df = bm25.corpus_stats(tenant_id=scope[0], project_id=scope[1], terms=terms)
+        if n_docs > 0:
+            corpus = (n_docs, corpus_df)
+            chunk_ids = [str(item.get("chunk_id") or "") for item in items]
+            indexed = bm25.term_frequencies(
+                tenant_id=scope[0], project_id=scope[1], chunk_ids=[c for c in chunk_ids if c], terms=terms
+            )
+
+    for i, item in enumerate(items):
+        hit = indexed.get(str(item.get("chunk_id") or ""))
+        if hit is not None:
+            doc_len, counts = hit
+        else:
+            tokens = index_terms(str(item.get("text", "")))
+            doc_len, counts = len(tokens), Counter(tokens)
+        doc_lens[i] = doc_len
+        for term, j in column.items():
+            tf_matrix[i, j] = counts.get(term, 0)
+
+    if corpus is not None:
+        n_docs, corpus_df = corpus
+        return tf_matrix, doc_lens, n_docs, np.array([corpus_df.get(t, 0) for t in terms], dtype=np.float64)
+    # Candidate-level IDF: a term "occurs" in a doc if it has any count there.
+    # Only query terms matter for the score, so df over them is sufficient.
+    return tf_matrix, doc_lens, len(items), (tf_matrix > 0).sum(axis=0).astype(np.float64)
+
+
 def _rerank_cross_encoder(query: str, items: list[dict[str, Any]]) -> list[dict[str, Any]]:
     """Cross-encoder reranker using sentence-transformers ``CrossEncoder``.
 
-    Wraps ``model.predict`` in a timeout (RERANK_TIMEOUT_MS). Falls back to
-    the TF-IDF simple reranker on timeout or import failure.
+    Pairs are scored by the model's resident :class:`CrossEncoderBatcher`
+    with a RERANK_TIMEOUT_MS deadline. Falls back to the TF-IDF simple
+    reranker on timeout or import failure.
     """
     try:
-        from sentence_transformers import CrossEncoder  # noqa: F811
+        batcher = _get_cross_encoder_batcher(RERANK_MODEL_NAME)
     except ImportError:
         logger.warning("sentence-transformers not installed; falling back to simple reranker")
         return _rerank_simple(query, items)
 
-    model = _get_cross_encoder(RERANK_MODEL_NAME)
-    pairs = [(query, str(item.get("text", ""))) for item in items]
-
-    timeout_s = RERANK_TIMEOUT_MS / 1000.0
-    try:
-        with ThreadPoolExecutor(max_workers=1) as pool:
-            future = pool.submit(model.predict, pairs)
-            raw_scores = future.result(timeout=timeout_s)
-    except FuturesTimeoutError:
-        logger.warning(
-            "cross-encoder predict timed out after %dms; falling back to simple reranker",
-            RERANK_TIMEOUT_MS,
-        )
-        return _rerank_simple(query, items)
-
-    ranked: list[dict[str, Any]] = []
-    for item, raw in zip(items, raw_scores):
-        copied = dict(item)
-        copied["score_rerank"] = round(_sigmoid(float(raw)), 4)
-        ranked.append(copied)
-    return sorted(ranked, key=lambda x: float(x.get("score_rerank", 0.0)), reverse=True)
+    keys, scores = _cached_scores(f"cross-encoder:{RERANK_MODEL_NAME}", query, items)
+    missing = [i for i, score in enumerate(scores) if score is None]
+    if missing:
+        pairs = [(query, str(items[i].get("text", ""))) for i in missing]
+        try:
+            raw_scores = batcher.score(pairs, timeout_s=RERANK_TIMEOUT_MS / 1000.0)
+        except TimeoutError:
+            logger.warning(
+                "cross-encoder predict timed out after %dms; falling back to simple reranker",
+                RERANK_TIMEOUT_MS,
+            )
+            return _rerank_simple(query, items)
+        fresh = {i: round(_sigmoid(float(raw)), 4) for i, raw in zip(missing, raw_scores)}
+        _store_scores(keys, fresh)
+        for i, score in fresh.items():
+            scores[i] = score
+    return _ranked_with_scores(items, scores)
 
 
 def _rerank_api(query: str, items: list[dict[str, Any]], *, backend: str = "cohere") -> list[dict[str, Any]]:
@@ -169,9 +231,12 @@ def _rerank_api(query: str, items: list[dict[str, Any]], *, backend: str = "cohe
       COHERE_API_KEY / JINA_API_KEY   — authentication
       RERANK_MODEL_NAME               — model override (optional, auto-detected per backend)
       RERANK_API_TIMEOUT_MS           — HTTP timeout (default 5000)
+
+    Calls go through the shared client in ``app.rerank_client`` (pooling,
+    retries, circuit breaker, coalescing of identical in-flight requests).
     """
     try:
-        import httpx
+        import httpx  # noqa: F401
     except ImportError:
         logger.warning("httpx not installed; falling back to simple reranker")
         return _rerank_simple(query, items)
@@ -197,25 +262,30 @@ def _rerank_api(query: str, items: list[dict[str, Any]], *, backend: str = "cohe
 
     model = os.environ.get(model_env, "").strip() or default_model
     timeout_ms = int(os.environ.get("RERANK_API_TIMEOUT_MS", "5000"))
-    documents = [str(item.get("text", "")) for item in items]
+    keys, scores = _cached_scores(f"{backend}:{model}", query, items)
+    missing = [i for i, score in enumerate(scores) if score is None]
+    if not missing:
+        return _ranked_with_scores(items, scores)
+    documents = [str(items[i].get("text", "")) for i in missing]
 
     try:
-        resp = httpx.post(
+        data = get_rerank_api_client().post_json(
             url,
             headers={
                 "Authorization": f"Bearer {api_key}",
                 "Content-Type": "application/json",
             },
-            json={
+            payload={
                 "model": model,
                 "query": query,
                 "documents": documents,
                 "top_n": len(documents),
             },
-            timeout=timeout_ms / 1000.0,
+            timeout_s=timeout_ms / 1000.0,
         )
-        resp.raise_for_status()
-        data = resp.json()
+    except CircuitOpenError:
+        logger.warning("%s rerank API circuit open; falling back to simple reranker", backend)
+        return _rerank_simple(query, items)
     except Exception:
         logger.warning(
             "%s rerank API call failed; falling back to simple reranker",
@@ -224,18 +294,15 @@ def _rerank_api(query: str, items: list[dict[str, Any]], *, backend: str = "cohe
         )
         return _rerank_simple(query, items)
 
-    score_map: dict[int, float] = {}
+    fresh: dict[int, float] = {}
     for result in data.get("results", []):
         idx = int(result["index"])
-        score_map[idx] = float(result["relevance_score"])
-
-    ranked: list[dict[str, Any]] = []
-    for i, item in enumerate(items):
-        copied = dict(item)
-        copied["score_rerank"] = round(score_map.get(i, 0.0), 4)
-        ranked.append(copied)
-
-    return sorted(ranked, key=lambda x: float(x.get("score_rerank", 0.0)), reverse=True)
+        if 0 <= idx < len(missing):
+            fresh[missing[idx]] = round(float(result["relevance_score"]), 4)
+    _store_scores(keys, fresh)
+    for i in missing:
+        scores[i] = fresh.get(i, 0.0)
+    return _ranked_with_scores(items, scores)
 
 
 # ---------------------------------------------------------------------------
@@ -243,6 +310,29 @@ def _rerank_api(query: str, items: list[dict[str, Any]], *, backend: str = "cohe
 # ---------------------------------------------------------------------------
 
 
+def _cached_scores(model_key: str, query: str, items: list[dict[str, Any]]) -> tuple[list[str], list[float | None]]:
+    """Return per-item cache keys and cached scores (``None`` where unseen)."""
+    keys = [score_key(model=model_key, query=query, text=str(item.get("text", ""))) for item in items]
+    if not rerank_cache_enabled():
+        return keys, [None] * len(items)
+    found = get_rerank_score_cache().get_many(keys)
+    return keys, [found.get(key) for key in keys]
+
+
+def _store_scores(keys: list[str], scores: dict[int, float]) -> None:
+    if scores and rerank_cache_enabled():
+        get_rerank_score_cache().put_many({keys[i]: score for i, score in scores.items()})
+
+
+def _ranked_with_scores(items: list[dict[str, Any]], scores: list[float | None]) -> list[dict[str, Any]]:
+    ranked: list[dict[str, Any]] = []
+    for item, score in zip(items, scores):
+        copied = dict(item)
+        copied["score_rerank"] = score if score is not None else 0.0
+        ranked.append(copied)
+    return sorted(ranked, key=lambda x: float(x.get("score_rerank", 0.0)), reverse=True)
+
+
 def _sigmoid(x: float) -> float:
     if x >= 0:
         return 1.0 / (1.0 + math.exp(-x))
@@ -256,3 +346,165 @@ def _get_cross_encoder(model_name: str) -> Any:
 
         _cross_encoder_cache[model_name] = CrossEncoder(model_name)
     return _cross_encoder_cache[model_name]
+
+
+def _get_cross_encoder_batcher(model_name: str) -> CrossEncoderBatcher:
+    model = _get_cross_encoder(model_name)
+    with _cross_encoder_batchers_lock:
+        batcher = _cross_encoder_batchers.get(model_name)
+        if batcher is None or batcher.model is not model:
+            if batcher is not None:
+                batcher.close()
+            batcher = CrossEncoderBatcher(
+                model,
+                window_ms=RERANK_BATCH_WINDOW_MS,
+                max_pairs=RERANK_BATCH_MAX_PAIRS,
+            )
+            _cross_encoder_batchers[model_name] = batcher
+    return batcher
+
+
+def warmup_cross_encoder(model_name: str | None = None) -> bool:
+    """Load the cross-encoder and run one predict so the first query is not cold.
+
+    Returns False when sentence-transformers is unavailable.
+    """
+    name = model_name or RERANK_MODEL_NAME
+    try:
+        batcher = _get_cross_encoder_batcher(name)
+    except ImportError:
+        logger.warning("sentence-transformers not installed; skipping cross-encoder warmup")
+        return False
+    batcher.score([("warmup", "warmup")], timeout_s=None)
+    logger.info("cross-encoder %s warmed up", name)
+    return True
+
+
+def start_cross_encoder_warmup() -> threading.Thread | None:
+    """Warm the cross-encoder in the background when it is the active backend."""
+    if RERANK_BACKEND != "cross-encoder":
+        return None
+
+    def _run() -> None:
+        try:
+            warmup_cross_encoder()
+        except Exception:
+            logger.warning("cross-encoder warmup failed", exc_info=True)
+
+    thread = threading.Thread(target=_run, name="rerank-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+# ---------------------------------------------------------------------------
+# Micro-batching executor
+# ---------------------------------------------------------------------------
+
+
+class _PairRequest:
+    __slots__ = ("pairs", "done", "scores", "error", "cancelled")
+
+    def __init__(self, pairs: list[tuple[str, str]]) -> None:
+        self.pairs = pairs
+        self.done = threading.Event()
+        self.scores: list[float] = []
+        self.error: BaseException | None = None
+        self.cancelled = False
+
+
+class CrossEncoderBatcher:
+    """Long-lived executor that micro-batches cross-encoder pairs.
+
+    Requests arriving within *window_ms* of the first queued one share a
+    ``predict`` call, which runs in chunks of at most *max_pairs*. A caller
+    that times out marks its request cancelled: queued requests are dropped,
+    and a running batch whose requests are all cancelled stops at the next
+    chunk boundary. One daemon thread per model does all predicting.
+    """
+
+    def __init__(self, model: Any, *, window_ms: int = 5, max_pairs: int = 64) -> None:
+        self.model = model
+        self._window_s = max(0, window_ms) / 1000.0
+        self._max_pairs = max(1, max_pairs)
+        self._queue: queue.Queue[_PairRequest | None] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "batches": 0, "predict_calls": 0, "pairs": 0, "cancelled": 0}
+
+    def score(self, pairs: list[tuple[str, str]], *, timeout_s: float | None) -> list[float]:
+        """Score *pairs*; raises ``TimeoutError`` after *timeout_s* seconds."""
+        if not pairs:
+            return []
+        request = _PairRequest(pairs)
+        self._ensure_worker()
+        self._queue.put(request)
+        if not request.done.wait(timeout_s):
+            request.cancelled = True
+            raise TimeoutError("cross-encoder predict timed out")
+        if request.error is not None:
+            raise request.error
+        return request.scores
+
+    def close(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                self._queue.put(None)
+                self._thread = None
+
+    def _ensure_worker(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="rerank-batcher", daemon=True)
+                self._thread.start()
+
+    def _collect(self, first: _PairRequest) -> list[_PairRequest]:
+        batch = [first]
+        n_pairs = len(first.pairs)
+        deadline = time.monotonic() + self._window_s
+        while n_pairs < self._max_pairs:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                nxt = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if nxt is None:
+                self._queue.put(None)
+                break
+            batch.append(nxt)
+            n_pairs += len(nxt.pairs)
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+            live = [r for r in batch if not r.cancelled]
+            self.stats["requests"] += len(batch)
+            self.stats["cancelled"] += len(batch) - len(live)
+            if not live:
+                continue
+            pairs = [pair for r in live for pair in r.pairs]
+            scores: list[float] = []
+            try:
+                for start in range(0, len(pairs), self._max_pairs):
+                    if all(r.cancelled for r in live):
+                        break
+                    chunk = pairs[start : start + self._max_pairs]
+                    scores.extend(float(x) for x in self.model.predict(chunk))
+                    self.stats["predict_calls"] += 1
+            except Exception as exc:  # noqa: BLE001 - surfaced to every waiting caller
+                for r in live:
+                    r.error = exc
+                    r.done.set()
+                continue
+            self.stats["batches"] += 1
+            self.stats["pairs"] += len(scores)
+            offset = 0
+            for r in live:
+                r.scores = scores[offset : offset + len(r.pairs)]
+                offset += len(r.pairs)
+                r.done.set()
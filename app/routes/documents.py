@@ -2,8 +2,11 @@ from __future__ import annotations
 
 import hashlib
 import mimetypes
+from typing import BinaryIO
 
 from fastapi import APIRouter, File, Form, Header, Request, Response, UploadFile
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
 from app.errors import ApiError
 from app.routes._deps import tenant_id_from_request, trace_id_from_request
@@ -12,6 +15,48 @@ from app.store import store
 
 router = APIRouter(prefix="/api/v1", tags=["documents"])
 
+_UPLOAD_HASH_CHUNK_BYTES = 1 << 20
+
+
+def _parse_byte_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """Single ``bytes=`` range as inclusive (start, end); None means serve the whole object.
+
+    Multi-range and malformed headers are ignored (RFC 9110 lets servers fall back to 200). An
+    unsatisfiable range comes back with ``start >= size`` so the caller can answer 416.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, sep, last = header[len("bytes=") :].strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if not first:
+            suffix = int(last)
+            if suffix <= 0:
+                return (size, size)
+            return (max(0, size - suffix), size - 1)
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start < 0 or end < start:
+        return None
+    if start >= size:
+        return (size, size)
+    return (start, min(end, size - 1))
+
+
+def _hash_upload(fileobj: BinaryIO) -> tuple[str, int]:
+    """SHA-256 and size of a spooled upload, read in chunks; rewinds the file afterwards."""
+    digest = hashlib.sha256()
+    size = 0
+    fileobj.seek(0)
+    while chunk := fileobj.read(_UPLOAD_HASH_CHUNK_BYTES):
+        digest.update(chunk)
+        size += len(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest(), size
+
 
 @router.post("/documents/upload")
 async def upload_document(
@@ -31,27 +76,30 @@ async def upload_document(
             http_status=400,
         )
 
-    file_bytes = await file.read()
+    # The multipart parser has already spooled the body to a temp file; hash it in
+    # chunks and hand the file handle on, so the upload never sits in API memory.
+    file_sha256, file_size = await run_in_threadpool(_hash_upload, file.file)
     payload = {
         "project_id": project_id,
         "supplier_id": supplier_id,
         "doc_type": doc_type,
         "filename": file.filename or "upload.bin",
-        "file_sha256": hashlib.sha256(file_bytes).hexdigest(),
-        "file_size": len(file_bytes),
+        "file_sha256": file_sha256,
+        "file_size": file_size,
         "trace_id": trace_id_from_request(request),
         "tenant_id": tenant_id_from_request(request),
     }
     from fastapi.responses import JSONResponse
 
-    data = store.run_idempotent(
+    data = await run_in_threadpool(
+        store.run_idempotent,
         endpoint="POST:/api/v1/documents/upload",
         tenant_id=tenant_id_from_request(request),
         idempotency_key=idempotency_key,
         payload=payload,
         execute=lambda: store.create_upload_job(
             payload,
-            file_bytes=file_bytes,
+            fileobj=file.file,
             content_type=file.content_type,
         ),
     )
@@ -79,6 +127,8 @@ def parse_document(
         "document_id": document_id,
         "trace_id": trace_id_from_request(request),
         "tenant_id": tenant_id_from_request(request),
+        # An explicit parse request re-parses already chunked documents incrementally.
+        "reparse": True,
     }
     from fastapi.responses import JSONResponse
 
@@ -145,8 +195,39 @@ def get_document_raw(document_id: str, request: Request):
             retryable=False,
             http_status=404,
         )
+    storage = store.object_storage
+    filename = document.get("filename") or ""
+    content_type, _ = mimetypes.guess_type(str(filename))
+    media_type = content_type or "application/octet-stream"
+    redirect_url = storage.download_redirect_url(storage_uri=storage_uri)
+    if redirect_url:
+        return RedirectResponse(redirect_url, status_code=307)
     try:
-        payload = store.object_storage.get_object(storage_uri=storage_uri)
+        local_path = storage.local_path(storage_uri=storage_uri)
+        if local_path is not None:
+            # FileResponse answers Range/If-Range itself and sends the file with sendfile where available.
+            return FileResponse(local_path, media_type=media_type)
+        size = storage.object_size(storage_uri=storage_uri)
+        byte_range = _parse_byte_range(request.headers.get("range"), size)
+        if byte_range is None:
+            return StreamingResponse(
+                storage.open_stream(storage_uri=storage_uri),
+                media_type=media_type,
+                headers={"Content-Length": str(size), "Accept-Ranges": "bytes"},
+            )
+        start, end = byte_range
+        if start >= size:
+            return Response(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+        return StreamingResponse(
+            storage.open_stream(storage_uri=storage_uri, start=start, end=end),
+            status_code=206,
+            media_type=media_type,
+            headers={
+                "Content-Range": f"bytes {start}-{end}/{size}",
+                "Content-Length": str(end - start + 1),
+                "Accept-Ranges": "bytes",
+            },
+        )
     except FileNotFoundError:
         raise ApiError(
             code="DOC_STORAGE_MISSING",
@@ -155,9 +236,6 @@ def get_document_raw(document_id: str, request: Request):
             retryable=False,
             http_status=404,
         )
-    filename = document.get("filename") or ""
-    content_type, _ = mimetypes.guess_type(str(filename))
-    return Response(content=payload, media_type=content_type or "application/octet-stream")
 
 
 @router.get("/documents/{document_id}/chunks")
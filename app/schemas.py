@@ -116,6 +116,7 @@ class CostGateMetrics(BaseModel):
     routing_degrade_passed: bool
     degrade_availability: float = Field(ge=0, le=1)
     budget_alert_coverage: float = Field(ge=0, le=1)
+    llm_cache_hit_rate: float | None = Field(default=None, ge=0, le=1)
 
 
 class CostGateEvaluateRequest(BaseModel):
@@ -151,10 +151,27 @@ class InMemoryStore(
         self.parser_retrieval_metrics: dict[str, int] = {
             "parse_runs_total": 0,
             "parse_fallback_used_total": 0,
+            "parse_stream_batches_total": 0,
+            "parse_stream_aborted_total": 0,
+            "parse_reparse_chunks_reused_total": 0,
+            "parse_reparse_chunks_deleted_total": 0,
+            "parse_cache_hits_total": 0,
+            "parse_cache_misses_total": 0,
+            "parse_cache_stores_total": 0,
+            "parse_mineru_official_used_total": 0,
+            "parse_route_local_preferred_total": 0,
+            "parse_route_shed_total": 0,
             "parse_index_write_total": 0,
             "parse_index_fail_total": 0,
+            "parse_index_embeddings_reused_total": 0,
+            "parse_index_embeddings_computed_total": 0,
+            "parse_index_jobs_enqueued_total": 0,
+            "parse_index_batches_total": 0,
+            "parse_index_lag_ms_last": 0,
+            "parse_index_lag_ms_max": 0,
             "retrieval_queries_total": 0,
             "retrieval_lightrag_calls_total": 0,
+            "retrieval_constraint_pushdown_total": 0,
             "retrieval_lightrag_fail_total": 0,
             "rerank_degraded_total": 0,
         }
@@ -245,10 +262,27 @@ class InMemoryStore(
         self.parser_retrieval_metrics = {
             "parse_runs_total": 0,
             "parse_fallback_used_total": 0,
+            "parse_stream_batches_total": 0,
+            "parse_stream_aborted_total": 0,
+            "parse_reparse_chunks_reused_total": 0,
+            "parse_reparse_chunks_deleted_total": 0,
+            "parse_cache_hits_total": 0,
+            "parse_cache_misses_total": 0,
+            "parse_cache_stores_total": 0,
+            "parse_mineru_official_used_total": 0,
+            "parse_route_local_preferred_total": 0,
+            "parse_route_shed_total": 0,
             "parse_index_write_total": 0,
             "parse_index_fail_total": 0,
+            "parse_index_embeddings_reused_total": 0,
+            "parse_index_embeddings_computed_total": 0,
+            "parse_index_jobs_enqueued_total": 0,
+            "parse_index_batches_total": 0,
+            "parse_index_lag_ms_last": 0,
+            "parse_index_lag_ms_max": 0,
             "retrieval_queries_total": 0,
             "retrieval_lightrag_calls_total": 0,
+            "retrieval_constraint_pushdown_total": 0,
             "retrieval_lightrag_fail_total": 0,
             "rerank_degraded_total": 0,
         }
@@ -312,6 +346,19 @@ class InMemoryStore(
             chunks=deduped,
         )
 
+    def _append_document_chunks(
+        self,
+        *,
+        tenant_id: str,
+        document_id: str,
+        chunks: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        return self.documents_repository.append_chunks(
+            tenant_id=tenant_id,
+            document_id=document_id,
+            chunks=chunks,
+        )
+
     def _persist_parse_manifest(self, *, manifest: dict[str, Any]) -> dict[str, Any]:
         tenant_id = str(manifest.get("tenant_id") or "tenant_default")
         return self.parse_manifests_repository.upsert(tenant_id=tenant_id, manifest=manifest)
@@ -3,9 +3,15 @@ from __future__ import annotations
 import uuid
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
-from typing import Any
+from typing import Any, BinaryIO
 
 from app.errors import ApiError
+from app.llm_score_cache import llm_score_cache_stats
+from app.mineru_coordinator import mineru_coordinator_stats
+from app.parse_cache import parse_cache_stats
+from app.parser_router import parser_router_stats
+from app.rerank_cache import rerank_score_cache_stats
+from app.rerank_client import rerank_api_client_stats
 
 
 @dataclass
@@ -50,8 +56,14 @@ class StoreAdminMixin:
         payload: dict[str, Any],
         *,
         file_bytes: bytes | None = None,
+        fileobj: BinaryIO | None = None,
         content_type: str | None = None,
     ) -> dict[str, Any]:
+        """Register an uploaded document and queue its parse job.
+
+        The raw file is given either as ``file_bytes`` or as a readable ``fileobj``
+        (positioned at the start); a file object is streamed into object storage.
+        """
         tenant_id = payload.get("tenant_id", "tenant_default")
         file_sha256 = payload.get("file_sha256")
 
@@ -74,7 +86,16 @@ class StoreAdminMixin:
 
         document_id = f"doc_{uuid.uuid4().hex[:12]}"
         storage_uri = None
-        if file_bytes is not None:
+        if fileobj is not None:
+            storage_uri = self.object_storage.put_object_file(
+                tenant_id=tenant_id,
+                object_type="document",
+                object_id=document_id,
+                filename=str(payload.get("filename") or "upload.bin"),
+                fileobj=fileobj,
+                content_type=content_type or "application/octet-stream",
+            )
+        elif file_bytes is not None:
             storage_uri = self.object_storage.put_object(
                 tenant_id=tenant_id,
                 object_type="document",
@@ -83,6 +104,7 @@ class StoreAdminMixin:
                 content_bytes=file_bytes,
                 content_type=content_type or "application/octet-stream",
             )
+        if storage_uri is not None:
             active_hold = self._find_active_legal_hold(
                 tenant_id=tenant_id,
                 object_type="document",
@@ -511,6 +533,17 @@ class StoreAdminMixin:
             if item.get("tenant_id") == tenant_id and item.get("status") == "pending"
         )
 
+        pending_index_jobs = [
+            j for j in jobs if j.get("job_type") == "index" and j.get("status") in {"queued", "running", "retrying"}
+        ]
+        index_lag_ms = max(
+            (
+                self._elapsed_ms_since(str((j.get("payload") or {}).get("enqueued_at") or ""))
+                for j in pending_index_jobs
+            ),
+            default=0,
+        )
+
         reports = [r for r in self.evaluation_reports.values() if r.get("tenant_id") == tenant_id]
         if reports:
             citation_coverage_avg = sum(float(r.get("citation_coverage", 0.0)) for r in reports) / len(reports)
@@ -529,6 +562,8 @@ class StoreAdminMixin:
                 "retrying_jobs": retrying_jobs,
                 "dlq_open": dlq_open,
                 "outbox_pending": outbox_pending,
+                "index_jobs_pending": len(pending_index_jobs),
+                "index_lag_ms": index_lag_ms,
                 "max_retries": self.worker_max_retries,
                 "retry_backoff_base_ms": self.worker_retry_backoff_base_ms,
                 "retry_backoff_max_ms": self.worker_retry_backoff_max_ms,
@@ -544,6 +579,12 @@ class StoreAdminMixin:
                 "strategy_version": f"stg_v{self.strategy_version_counter}",
             },
             "parse_retrieval": dict(self.parser_retrieval_metrics),
+            "rerank_cache": rerank_score_cache_stats(),
+            "rerank_api": rerank_api_client_stats(),
+            "llm_score_cache": llm_score_cache_stats(),
+            "parse_cache": parse_cache_stats(),
+            "mineru_coordinator": mineru_coordinator_stats(),
+            "parser_router": parser_router_stats(),
             "slo": {
                 "success_rate": round(success_rate, 4),
             },
@@ -616,6 +657,25 @@ class StoreAdminMixin:
                 http_status=409,
             )
 
+        if job.get("job_type") == "index" and not (force_fail or transient_fail):
+            index_error = self._run_index_job(job=job, tenant_id=tenant_id)
+            if index_error is not None:
+                if self._classify_error_code(index_error)["retryable"]:
+                    transient_fail = True
+                else:
+                    force_fail = True
+                force_error_code = index_error
+
+        index_job_id: str | None = None
+        if job.get("job_type") == "parse" and not (force_fail or transient_fail):
+            parse_error, index_job_id = self._run_parse_job(job=job, tenant_id=tenant_id)
+            if parse_error is not None:
+                if self._classify_error_code(parse_error)["retryable"]:
+                    transient_fail = True
+                else:
+                    force_fail = True
+                force_error_code = parse_error
+
         if transient_fail and not force_fail:
             error_code = force_error_code or "RAG_UPSTREAM_UNAVAILABLE"
             error = self._classify_error_code(error_code)
@@ -726,6 +786,14 @@ class StoreAdminMixin:
                     if document is not None:
                         document["status"] = "parse_failed"
                         self._persist_document(document=document)
+            elif job.get("job_type") == "index":
+                # Chunks are intact; the document stays parsed until the DLQ item is requeued.
+                document_id = job.get("resource", {}).get("id")
+                if isinstance(document_id, str):
+                    document = self.get_document_for_tenant(document_id=document_id, tenant_id=tenant_id)
+                    if document is not None and document.get("status") == "indexing":
+                        document["status"] = "parsed"
+                        self._persist_document(document=document)
             self.append_workflow_checkpoint(
                 thread_id=thread_id,
                 job_id=job_id,
@@ -789,63 +857,6 @@ class StoreAdminMixin:
                 manifest["error_code"] = None
                 manifest["ended_at"] = self._utcnow_iso()
                 self._persist_parse_manifest(manifest=manifest)
-            document_id = job.get("resource", {}).get("id")
-            if isinstance(document_id, str):
-                document = self.get_document_for_tenant(document_id=document_id, tenant_id=tenant_id)
-                if document is not None:
-                    document["status"] = "indexed"
-                    self._persist_document(document=document)
-                    existing_chunks = self.list_document_chunks_for_tenant(
-                        document_id=document_id,
-                        tenant_id=tenant_id,
-                    )
-                    if not existing_chunks:
-                        parsed_chunks = self._parse_document_file(
-                            document=document,
-                            document_id=document_id,
-                            tenant_id=tenant_id,
-                            manifest=manifest,
-                        )
-                        if manifest is not None and parsed_chunks:
-                            manifest["content_source"] = parsed_chunks[0].get("content_source", "unknown")
-                        persisted_chunks = self._persist_document_chunks(
-                            tenant_id=tenant_id,
-                            document_id=document_id,
-                            chunks=parsed_chunks,
-                        )
-                        if manifest is not None:
-                            manifest["chunk_count"] = len(persisted_chunks)
-                            self._persist_parse_manifest(manifest=manifest)
-                        for persisted in persisted_chunks:
-                            page, bbox = self._extract_page_and_bbox(persisted)
-                            self.register_citation_source(
-                                chunk_id=str(persisted["chunk_id"]),
-                                source={
-                                    "chunk_id": persisted["chunk_id"],
-                                    "document_id": document_id,
-                                    "tenant_id": tenant_id,
-                                    "project_id": document.get("project_id"),
-                                    "supplier_id": document.get("supplier_id"),
-                                    "doc_type": document.get("doc_type"),
-                                    "page": page,
-                                    "bbox": bbox,
-                                    "heading_path": persisted.get("heading_path", []),
-                                    "chunk_type": persisted.get("chunk_type", "text"),
-                                    "content_source": persisted.get("content_source", "unknown"),
-                                    "text": persisted.get("text", ""),
-                                    "context": persisted.get("section", ""),
-                                    "score_raw": 0.78,
-                                    "chunk_hash": persisted.get("chunk_hash"),
-                                },
-                            )
-                        self._maybe_index_chunks_to_lightrag(
-                            tenant_id=tenant_id,
-                            project_id=str(document.get("project_id") or ""),
-                            supplier_id=str(document.get("supplier_id") or ""),
-                            document_id=document_id,
-                            doc_type=str(document.get("doc_type") or ""),
-                            chunks=persisted_chunks,
-                        )
         self.append_workflow_checkpoint(
             thread_id=thread_id,
             job_id=job_id,
@@ -854,9 +865,12 @@ class StoreAdminMixin:
             status="succeeded",
             payload={"retry_count": job.get("retry_count", 0)},
         )
-        return {
+        result = {
             "job_id": job_id,
             "final_status": "succeeded",
             "retry_count": succeeded_job.get("retry_count", 0),
             "dlq_id": None,
         }
+        if index_job_id is not None:
+            result["index_job_id"] = index_job_id
+        return result
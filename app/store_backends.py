@@ -7,7 +7,7 @@ import threading
 from collections.abc import Mapping
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
 from app.db.postgres import PostgresTxRunner
 from app.db.rls import PostgresRlsManager
@@ -274,9 +274,10 @@ class SqliteBackedStore(InMemoryStore):
         payload: dict[str, Any],
         *,
         file_bytes: bytes | None = None,
+        fileobj: BinaryIO | None = None,
         content_type: str | None = None,
     ) -> dict[str, Any]:
-        data = super().create_upload_job(payload, file_bytes=file_bytes, content_type=content_type)
+        data = super().create_upload_job(payload, file_bytes=file_bytes, fileobj=fileobj, content_type=content_type)
         self._save_state()
         return data
 
@@ -950,6 +951,25 @@ class PostgresBackedStore(InMemoryStore):
         )
         return saved
 
+    def _append_document_chunks(
+        self,
+        *,
+        tenant_id: str,
+        document_id: str,
+        chunks: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        saved = super()._append_document_chunks(
+            tenant_id=tenant_id,
+            document_id=document_id,
+            chunks=chunks,
+        )
+        self._documents_pg_repo.append_chunks(
+            tenant_id=tenant_id,
+            document_id=document_id,
+            chunks=saved,
+        )
+        return saved
+
     def _persist_evaluation_report(self, *, report: dict[str, Any]) -> dict[str, Any]:
         saved = super()._persist_evaluation_report(report=report)
         tenant_id = str(saved.get("tenant_id") or "tenant_default")
@@ -1318,9 +1338,10 @@ class PostgresBackedStore(InMemoryStore):
         payload: dict[str, Any],
         *,
         file_bytes: bytes | None = None,
+        fileobj: BinaryIO | None = None,
         content_type: str | None = None,
     ) -> dict[str, Any]:
-        data = super().create_upload_job(payload, file_bytes=file_bytes, content_type=content_type)
+        data = super().create_upload_job(payload, file_bytes=file_bytes, fileobj=fileobj, content_type=content_type)
         self._save_state()
         return data
 
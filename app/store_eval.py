@@ -397,18 +397,19 @@ class StoreEvalMixin:
                     if not chunk_id:
                         continue
                     meta = item.get("metadata", {})
-                    evidence.append(
-                        {
-                            "chunk_id": chunk_id,
-                            "page": int(meta.get("page", 1)),
-                            "bbox": meta.get("bbox", [0.0, 0.0, 1.0, 1.0]),
-                            "text": item.get("text", ""),
-                            "score_raw": float(item.get("score_raw", 0.5)),
-                            "tenant_id": tenant_id,
-                            "supplier_id": supplier_id,
-                            "document_id": str(meta.get("document_id", "")),
-                        }
-                    )
+                    entry = {
+                        "chunk_id": chunk_id,
+                        "page": int(meta.get("page", 1)),
+                        "bbox": meta.get("bbox", [0.0, 0.0, 1.0, 1.0]),
+                        "text": item.get("text", ""),
+                        "score_raw": float(item.get("score_raw", 0.5)),
+                        "tenant_id": tenant_id,
+                        "supplier_id": supplier_id,
+                        "document_id": str(meta.get("document_id", "")),
+                    }
+                    if isinstance(meta.get("token_count"), int):
+                        entry["token_count"] = meta["token_count"]
+                    evidence.append(entry)
                 if evidence:
                     return evidence
 
@@ -162,23 +162,55 @@ class StoreOpsMixin:
             )
 
         new_job_id = f"job_{uuid.uuid4().hex[:12]}"
-        self._persist_job(
-            job={
-                "job_id": new_job_id,
-                "job_type": "requeue",
-                "status": "queued",
-                "retry_count": 0,
-                "thread_id": self._new_thread_id("requeue"),
-                "tenant_id": tenant_id,
-                "trace_id": trace_id,
-                "resource": {
-                    "type": "job",
-                    "id": item["job_id"],
+        source_job = self.get_job_for_tenant(job_id=item["job_id"], tenant_id=tenant_id)
+        if source_job is not None and source_job.get("job_type") == "index":
+            # Index work is idempotent and resumes from the stored cursor, so
+            # recovery re-runs the stage itself through the queue.
+            self._persist_job(
+                job={
+                    "job_id": new_job_id,
+                    "job_type": "index",
+                    "status": "queued",
+                    "retry_count": 0,
+                    "thread_id": self._new_thread_id("index"),
+                    "tenant_id": tenant_id,
+                    "trace_id": trace_id,
+                    "resource": dict(source_job.get("resource") or {}),
+                    "payload": {**dict(source_job.get("payload") or {}), "source_dlq_id": dlq_id},
+                    "last_error": None,
+                    "errors": [],
+                }
+            )
+            self.append_outbox_event(
+                tenant_id=tenant_id,
+                event_type="job.created",
+                aggregate_type="job",
+                aggregate_id=new_job_id,
+                payload={
+                    "job_id": new_job_id,
+                    "job_type": "index",
+                    "resource_type": "document",
+                    "resource_id": (source_job.get("resource") or {}).get("id"),
                 },
-                "payload": {"source_dlq_id": dlq_id},
-                "last_error": None,
-            }
-        )
+            )
+        else:
+            self._persist_job(
+                job={
+                    "job_id": new_job_id,
+                    "job_type": "requeue",
+                    "status": "queued",
+                    "retry_count": 0,
+                    "thread_id": self._new_thread_id("requeue"),
+                    "tenant_id": tenant_id,
+                    "trace_id": trace_id,
+                    "resource": {
+                        "type": "job",
+                        "id": item["job_id"],
+                    },
+                    "payload": {"source_dlq_id": dlq_id},
+                    "last_error": None,
+                }
+            )
         item["status"] = "requeued"
         self._persist_dlq_item(item=item)
         self._append_audit_log(
@@ -2,13 +2,30 @@ from __future__ import annotations
 
 import hashlib
 import json
+import logging
 import os
 import re
+import time
 import uuid
+from collections.abc import Iterable, Iterator
 from typing import Any
 
 from app.errors import ApiError
+from app.parse_cache import (
+    ParseCacheWriter,
+    decode_chunks,
+    get_parse_cache_index,
+    parse_cache_enabled,
+    parse_cache_key,
+)
 from app.parser_adapters import ParseRoute, select_parse_route
+from app.parser_router import PARSER_LOCAL, PARSER_MINERU, get_parser_health, plan_parse_order, router_enabled
+from app.token_budget import count_tokens
+
+logger = logging.getLogger(__name__)
+
+# Document statuses meaning the stored chunks may be a truncated prefix of the parse stream.
+_STREAM_INCOMPLETE_STATUSES = frozenset({"parsing", "parse_failed"})
 
 
 class StoreParseMixin:
@@ -28,6 +45,7 @@ class StoreParseMixin:
         tenant_id: str,
         job_id: str,
         trace_id: str | None,
+        file_bytes: bytes | None = None,
     ) -> list[dict[str, Any]] | None:
         """Try parsing with MinerU Official API if configured.
 
@@ -40,8 +58,12 @@ class StoreParseMixin:
         - MINERU_API_KEY environment variable
 
         Returns:
-        - List of chunks if successful
-        - None if MinerU Official API not available or no accessible file
+        - List of chunks if successful (possibly empty)
+        - None if MinerU Official API not available or no accessible file,
+          i.e. MinerU was not called
+
+        Raises whatever the MinerU call raised, so callers can tell a failed
+        call from one that never happened.
         """
         # Check if MinerU Official API is configured
         api_key = os.environ.get("MINERU_API_KEY", "")
@@ -50,100 +72,70 @@ class StoreParseMixin:
 
         filename = str(document.get("filename") or "document.pdf")
 
-        # Try to use MinerU Official API
-        try:
-            from app.mineru_parse_service import build_mineru_parse_service
-
-            service = build_mineru_parse_service(
-                object_storage=self.object_storage,
-                parse_manifests_repo=self.parse_manifests_repository,
-                documents_repo=self.documents_repository,
-            )
-
-            if service is None:
-                return None
+        from app.mineru_parse_service import build_mineru_parse_service
 
-            # Get existing manifest for job info
-            manifest = self.parse_manifests_repository.get(tenant_id=tenant_id, job_id=job_id)
-            selected_parser = manifest.get("selected_parser", "mineru_official") if manifest else "mineru_official"
-            parser_version = manifest.get("parser_version", "v1") if manifest else "v1"
-            fallback_chain = manifest.get("fallback_chain", []) if manifest else []
+        service = build_mineru_parse_service(
+            object_storage=self.object_storage,
+            parse_manifests_repo=self.parse_manifests_repository,
+            documents_repo=self.documents_repository,
+        )
 
-            # Option 1: Use source_url if available (URL-based API)
-            source_url = document.get("source_url")
-            if source_url and isinstance(source_url, str) and source_url.strip():
-                result = service.parse_and_persist(
-                    file_url=source_url.strip(),
-                    document_id=document_id,
-                    tenant_id=tenant_id,
-                    job_id=job_id,
-                    selected_parser=selected_parser,
-                    parser_version=parser_version,
-                    fallback_chain=fallback_chain,
-                    trace_id=trace_id,
-                )
-                chunks = self.documents_repository.get_chunks(
-                    tenant_id=tenant_id,
-                    document_id=document_id,
-                )
-                return [self._ensure_chunk_shape(document_id=document_id, chunk=c) for c in chunks]
+        if service is None:
+            return None
 
-            # Option 2: Use file upload API with storage_uri
-            storage_uri = document.get("storage_uri")
-            if storage_uri and isinstance(storage_uri, str) and storage_uri.strip():
-                # Try to get file bytes for direct upload
-                try:
-                    file_bytes = self.object_storage.get_object(storage_uri=storage_uri)
-                    if file_bytes and len(file_bytes) > 0:
-                        # Use file upload API (simpler than presigned URL)
-                        result = service.parse_and_persist_from_bytes(
-                            file_bytes=file_bytes,
-                            filename=filename,
-                            document_id=document_id,
-                            tenant_id=tenant_id,
-                            job_id=job_id,
-                            selected_parser=selected_parser,
-                            parser_version=parser_version,
-                            fallback_chain=fallback_chain,
-                            trace_id=trace_id,
-                        )
-                        chunks = self.documents_repository.get_chunks(
-                            tenant_id=tenant_id,
-                            document_id=document_id,
-                        )
-                        return [self._ensure_chunk_shape(document_id=document_id, chunk=c) for c in chunks]
-                except Exception:
-                    # File bytes not accessible, try presigned URL
-                    pass
+        # Get existing manifest for job info
+        manifest = self.parse_manifests_repository.get(tenant_id=tenant_id, job_id=job_id)
+        selected_parser = manifest.get("selected_parser", "mineru_official") if manifest else "mineru_official"
+        parser_version = manifest.get("parser_version", "v1") if manifest else "v1"
+        fallback_chain = manifest.get("fallback_chain", []) if manifest else []
+        job_fields = {
+            "document_id": document_id,
+            "tenant_id": tenant_id,
+            "job_id": job_id,
+            "selected_parser": selected_parser,
+            "parser_version": parser_version,
+            "fallback_chain": fallback_chain,
+            "trace_id": trace_id,
+        }
 
-                # Option 3: Try presigned URL (S3 backend only)
-                presigned = self.object_storage.get_presigned_url(
-                    storage_uri=storage_uri,
-                    expires_in=3600,  # 1 hour
-                )
-                if presigned:
-                    result = service.parse_and_persist(
-                        file_url=presigned,
-                        document_id=document_id,
-                        tenant_id=tenant_id,
-                        job_id=job_id,
-                        selected_parser=selected_parser,
-                        parser_version=parser_version,
-                        fallback_chain=fallback_chain,
-                        trace_id=trace_id,
-                    )
-                    chunks = self.documents_repository.get_chunks(
-                        tenant_id=tenant_id,
-                        document_id=document_id,
-                    )
-                    return [self._ensure_chunk_shape(document_id=document_id, chunk=c) for c in chunks]
+        # Option 1: Use source_url if available (URL-based API)
+        source_url = document.get("source_url")
+        if source_url and isinstance(source_url, str) and source_url.strip():
+            service.parse_and_persist(file_url=source_url.strip(), **job_fields)
+            return self._persisted_mineru_chunks(tenant_id=tenant_id, document_id=document_id)
 
+        # Option 2: Use file upload API with storage_uri
+        storage_uri = document.get("storage_uri")
+        if not (storage_uri and isinstance(storage_uri, str) and storage_uri.strip()):
             # No accessible file found
             return None
+        if not file_bytes:
+            try:
+                file_bytes = self.object_storage.get_object(storage_uri=storage_uri)
+            except Exception:
+                # File bytes not accessible, try presigned URL
+                file_bytes = None
+        if file_bytes:
+            # Use file upload API (simpler than presigned URL)
+            service.parse_and_persist_from_bytes(file_bytes=file_bytes, filename=filename, **job_fields)
+            return self._persisted_mineru_chunks(tenant_id=tenant_id, document_id=document_id)
 
+        # Option 3: Try presigned URL (S3 backend only)
+        try:
+            presigned = self.object_storage.get_presigned_url(
+                storage_uri=storage_uri,
+                expires_in=3600,  # 1 hour
+            )
         except Exception:
-            # MinerU Official API failed, return None to fall back to local parsing
+            presigned = None
+        if not presigned:
             return None
+        service.parse_and_persist(file_url=presigned, **job_fields)
+        return self._persisted_mineru_chunks(tenant_id=tenant_id, document_id=document_id)
+
+    def _persisted_mineru_chunks(self, *, tenant_id: str, document_id: str) -> list[dict[str, Any]]:
+        chunks = self.documents_repository.get_chunks(tenant_id=tenant_id, document_id=document_id)
+        return [self._ensure_chunk_shape(document_id=document_id, chunk=c) for c in chunks]
 
     @staticmethod
     def _select_parser(*, filename: str, doc_type: str | None) -> ParseRoute:
@@ -182,6 +174,16 @@ class StoreParseMixin:
                 "retryable": True,
                 "message": "retrieval upstream unavailable",
             },
+            "RAG_INDEX_WRITE_FAILED": {
+                "class": "transient",
+                "retryable": True,
+                "message": "retrieval index write failed",
+            },
+            "DOC_PARSE_STREAM_ABORTED": {
+                "class": "transient",
+                "retryable": True,
+                "message": "parse stream aborted",
+            },
             "INTERNAL_DEBUG_FORCED_FAIL": {
                 "class": "transient",
                 "retryable": True,
@@ -291,63 +293,92 @@ class StoreParseMixin:
         item.setdefault("section", "")
         item.setdefault("content_source", "unknown")
         item.setdefault("text", text)
+        item["token_count"] = count_tokens(text)
         return item
 
-    def _parse_document_file(
+    @staticmethod
+    def _parse_persist_batch_size() -> int:
+        raw = os.environ.get("PARSE_PERSIST_BATCH_SIZE", "256").strip()
+        try:
+            return max(1, int(raw))
+        except ValueError:
+            return 256
+
+    def _iter_parse_document_file(
         self,
         *,
         document: dict[str, Any],
         document_id: str,
         tenant_id: str,
         manifest: dict[str, Any] | None,
-    ) -> list[dict[str, Any]]:
-        """Parse document file with SSOT §3 routing priority.
+    ) -> Iterator[dict[str, Any]]:
+        """Parse document file with SSOT §3 routing priority, yielding normalized chunks.
 
         Priority:
-        1. MinerU Official API (if MINERU_API_KEY + (source_url or presigned URL))
-        2. Local parser (PyMuPDF/python-docx)
+        0. Parse result cache (same tenant + file_sha256 + MinerU or local parser/version)
+        1./2. MinerU Official API (if MINERU_API_KEY + (source_url or presigned URL)) and the
+           local parser (PyMuPDF/python-docx, streamed chunk by chunk), in the order chosen by
+           :func:`app.parser_router.plan_parse_order` — local first for text-native PDFs or
+           while MinerU is shedding load
         3. Stub adapter (fallback)
-        """
-        filename = str(document.get("filename") or "upload.bin")
-        job_id = manifest.get("job_id") if manifest else None
-        trace_id = manifest.get("trace_id") if manifest else None
 
-        # Priority 1: Try MinerU Official API (SSOT §3.1)
-        if job_id:
-            mineru_chunks = self._try_mineru_official_api(
+        A local parser that fails before its first chunk falls through to the
+        stub adapter; failures after that propagate to the consumer. Results of
+        1/2 that are consumed completely are stored in the parse cache.
+        """
+        file_sha256 = str(document.get("file_sha256") or "")
+        cache_enabled = bool(file_sha256) and parse_cache_enabled()
+        if cache_enabled:
+            cached = None
+            for parser, parser_version in self._cached_parser_candidates(manifest=manifest):
+                cached = self._load_cached_parse(
+                    tenant_id=tenant_id,
+                    file_sha256=file_sha256,
+                    parser=parser,
+                    parser_version=parser_version,
+                )
+                if cached is not None:
+                    break
+            if cached is not None:
+                entry, chunks = cached
+                self.parser_retrieval_metrics["parse_cache_hits_total"] += 1
+                if manifest is not None:
+                    manifest["parse_cache"] = {"hit": True, "source_document_id": entry.get("document_id")}
+                for chunk in chunks:
+                    yield self._ensure_chunk_shape(document_id=document_id, chunk=chunk)
+                return
+            self.parser_retrieval_metrics["parse_cache_misses_total"] += 1
+
+        writer = ParseCacheWriter() if cache_enabled else None
+        first: dict[str, Any] | None = None
+        try:
+            for chunk in self._iter_parsed_chunks(
                 document=document,
                 document_id=document_id,
                 tenant_id=tenant_id,
-                job_id=job_id,
-                trace_id=trace_id,
-            )
-            if mineru_chunks:
-                self.parser_retrieval_metrics["parse_mineru_official_used_total"] += 1
-                return mineru_chunks
-
-        # Priority 2: Try local parser (PyMuPDF/python-docx)
-        storage_uri = document.get("storage_uri")
-        file_bytes: bytes | None = None
-
-        if storage_uri:
-            try:
-                file_bytes = self.object_storage.get_object(storage_uri=storage_uri)
-            except Exception:
-                file_bytes = None
-
-        if file_bytes and len(file_bytes) > 0:
-            local_adapter = self._parser_registry._adapters.get("local")
-            if local_adapter is not None and hasattr(local_adapter, "parse_file"):
-                try:
-                    raw_chunks = local_adapter.parse_file(
-                        file_bytes=file_bytes,
-                        filename=filename,
-                        document_id=document_id,
-                    )
-                    if raw_chunks:
-                        return [self._ensure_chunk_shape(document_id=document_id, chunk=c) for c in raw_chunks]
-                except Exception:
-                    pass
+                manifest=manifest,
+            ):
+                if first is None:
+                    first = chunk
+                if writer is not None:
+                    writer.add(chunk)
+                yield chunk
+        except BaseException:
+            if writer is not None:
+                writer.discard()
+            raise
+        if first is not None:
+            if writer is not None:
+                self._store_cached_parse(
+                    writer=writer,
+                    tenant_id=tenant_id,
+                    file_sha256=file_sha256,
+                    document_id=document_id,
+                    first_chunk=first,
+                )
+            return
+        if writer is not None:
+            writer.discard()
 
         # Priority 3: Stub adapter (fallback)
         selected_parser = manifest["selected_parser"] if manifest else "mineru"
@@ -366,15 +397,415 @@ class StoreParseMixin:
         normalized_chunk = self._ensure_chunk_shape(document_id=document_id, chunk=chunk)
         if normalized_chunk.get("parser") != route.selected_parser:
             self.parser_retrieval_metrics["parse_fallback_used_total"] += 1
-        return [normalized_chunk]
+        yield normalized_chunk
+
+    def _iter_parsed_chunks(
+        self,
+        *,
+        document: dict[str, Any],
+        document_id: str,
+        tenant_id: str,
+        manifest: dict[str, Any] | None,
+    ) -> Iterator[dict[str, Any]]:
+        """Real parsers only (MinerU, local) in router order; yields nothing when neither applies."""
+        filename = str(document.get("filename") or "upload.bin")
+        job_id = manifest.get("job_id") if manifest else None
+        trace_id = manifest.get("trace_id") if manifest else None
+        storage_uri = document.get("storage_uri")
+        mineru_enabled = bool(job_id) and bool(os.environ.get("MINERU_API_KEY", "").strip())
+        local_adapter = self._parser_registry._adapters.get("local")
+        parse_fn = getattr(local_adapter, "iter_parse_file", None) or getattr(local_adapter, "parse_file", None)
+
+        file_bytes: bytes | None = None
+        if mineru_enabled and parse_fn is not None and router_enabled() and filename.lower().endswith(".pdf"):
+            # Read once up front so the text-native probe and whichever parser runs share the bytes.
+            file_bytes = self._read_document_bytes(storage_uri)
+        tracker = get_parser_health()
+        decision = plan_parse_order(
+            filename=filename,
+            file_bytes=file_bytes,
+            mineru_enabled=mineru_enabled,
+            local_enabled=parse_fn is not None,
+            tracker=tracker,
+        )
+        if manifest is not None:
+            manifest["parser_route"] = {"order": decision.order, "reason": decision.reason, **decision.probe}
+        if decision.reason == "text_native_pdf":
+            self.parser_retrieval_metrics["parse_route_local_preferred_total"] += 1
+        elif decision.reason == "mineru_shed":
+            self.parser_retrieval_metrics["parse_route_shed_total"] += 1
+
+        for parser in decision.order:
+            if parser == PARSER_MINERU:
+                tracker.start(PARSER_MINERU)
+                started = time.perf_counter()
+                mineru_chunks = None
+                # None: MinerU was never called (no accessible file), which says nothing about its health.
+                mineru_ok: bool | None = None
+                try:
+                    # Priority 1 by default (SSOT §3.1); after local for text-native PDFs or while shed.
+                    mineru_chunks = self._try_mineru_official_api(
+                        document=document,
+                        document_id=document_id,
+                        tenant_id=tenant_id,
+                        job_id=str(job_id),
+                        trace_id=trace_id,
+                        file_bytes=file_bytes,
+                    )
+                    mineru_ok = None if mineru_chunks is None else True
+                except Exception:
+                    # MinerU Official API failed; fall back to the next parser
+                    mineru_ok = False
+                finally:
+                    tracker.finish(PARSER_MINERU, latency_s=time.perf_counter() - started, ok=mineru_ok)
+                if mineru_chunks:
+                    self.parser_retrieval_metrics["parse_mineru_official_used_total"] += 1
+                    yield from mineru_chunks
+                    return
+                continue
+
+            # Local parser (PyMuPDF/python-docx), streamed chunk by chunk
+            if file_bytes is None:
+                file_bytes = self._read_document_bytes(storage_uri)
+            if not file_bytes or parse_fn is None:
+                continue
+            tracker.start(PARSER_LOCAL)
+            started = time.perf_counter()
+            raw_chunks: Iterator[dict[str, Any]] | None = None
+            first: dict[str, Any] | None = None
+            try:
+                raw_chunks = iter(
+                    parse_fn(
+                        file_bytes=file_bytes,
+                        filename=filename,
+                        document_id=document_id,
+                        content_sha256=document.get("file_sha256") or None,
+                    )
+                )
+                first = next(raw_chunks, None)
+            except Exception:
+                first = None
+            if first is None or raw_chunks is None:
+                tracker.finish(PARSER_LOCAL, latency_s=time.perf_counter() - started, ok=False)
+                continue
+            # Drop the local reference so the generator below owns the only copy.
+            file_bytes = None
+            ok: bool | None = None
+            try:
+                yield self._ensure_chunk_shape(document_id=document_id, chunk=first)
+                for raw in raw_chunks:
+                    yield self._ensure_chunk_shape(document_id=document_id, chunk=raw)
+                ok = True
+            except Exception:
+                ok = False
+                raise
+            finally:
+                tracker.finish(PARSER_LOCAL, latency_s=time.perf_counter() - started, ok=ok)
+            return
+
+    def _read_document_bytes(self, storage_uri: Any) -> bytes | None:
+        if not storage_uri:
+            return None
+        try:
+            return self.object_storage.get_object(storage_uri=storage_uri)
+        except Exception:
+            return None
+
+    def _cached_parser_candidates(self, *, manifest: dict[str, Any] | None) -> list[tuple[str, str]]:
+        """(parser, parser_version) keys a cached result may live under, in lookup order.
+
+        The router may hand a document to either real parser, so a result cached by
+        whichever one produced it serves later uploads of the same file.
+        """
+        local_adapter = self._parser_registry._adapters.get("local")
+        candidates = [("local", str(getattr(local_adapter, "version", "v1")))]
+        if manifest and manifest.get("job_id") and os.environ.get("MINERU_API_KEY", "").strip():
+            mineru = (
+                str(manifest.get("selected_parser", "mineru_official")),
+                str(manifest.get("parser_version", "v1")),
+            )
+            candidates.insert(0, mineru)
+        return candidates
+
+    def _load_cached_parse(
+        self,
+        *,
+        tenant_id: str,
+        file_sha256: str,
+        parser: str,
+        parser_version: str,
+    ) -> tuple[dict[str, Any], Iterator[dict[str, Any]]] | None:
+        key = parse_cache_key(
+            tenant_id=tenant_id, file_sha256=file_sha256, parser=parser, parser_version=parser_version
+        )
+        index = get_parse_cache_index()
+        entry = index.get(key)
+        if entry is None:
+            return None
+        try:
+            blob = self.object_storage.get_object(storage_uri=str(entry["storage_uri"]))
+        except Exception:
+            index.drop(key)
+            return None
+        return entry, decode_chunks(blob)
+
+    def _store_cached_parse(
+        self,
+        *,
+        writer: ParseCacheWriter,
+        tenant_id: str,
+        file_sha256: str,
+        document_id: str,
+        first_chunk: dict[str, Any],
+    ) -> None:
+        """Cache under the parser that actually produced the chunks (MinerU may have fallen back to local)."""
+        parser = str(first_chunk.get("parser") or "")
+        parser_version = str(first_chunk.get("parser_version") or "")
+        key = parse_cache_key(
+            tenant_id=tenant_id, file_sha256=file_sha256, parser=parser, parser_version=parser_version
+        )
+        try:
+            storage_uri = self.object_storage.put_object(
+                tenant_id=tenant_id,
+                object_type="parse_cache",
+                object_id=key,
+                filename="chunks.jsonl.gz",
+                content_bytes=writer.finish(),
+                content_type="application/gzip",
+            )
+        except Exception:
+            logger.warning("parse cache store failed for %s", document_id, exc_info=True)
+            return
+        get_parse_cache_index().put(
+            key,
+            {
+                "storage_uri": storage_uri,
+                "document_id": document_id,
+                "parser": parser,
+                "parser_version": parser_version,
+                "content_source": first_chunk.get("content_source", "unknown"),
+                "chunk_count": writer.chunk_count,
+                "created_at": self._utcnow_iso(),
+            },
+        )
+        self.parser_retrieval_metrics["parse_cache_stores_total"] += 1
+
+    def _parse_document_file(
+        self,
+        *,
+        document: dict[str, Any],
+        document_id: str,
+        tenant_id: str,
+        manifest: dict[str, Any] | None,
+    ) -> list[dict[str, Any]]:
+        """Materialized form of :meth:`_iter_parse_document_file`."""
+        return list(
+            self._iter_parse_document_file(
+                document=document,
+                document_id=document_id,
+                tenant_id=tenant_id,
+                manifest=manifest,
+            )
+        )
+
+    def _iter_reuse_chunk_ids(
+        self,
+        chunks: Iterable[dict[str, Any]],
+        *,
+        previous: dict[str, str],
+        reused: set[str],
+    ) -> Iterator[dict[str, Any]]:
+        """Incremental re-parse: keep the old ``chunk_id`` for chunks whose ``chunk_hash`` is unchanged.
+
+        *previous* maps ``chunk_hash`` → ``chunk_id`` of the chunks being
+        replaced; ids carried over are added to *reused* so callers can skip
+        re-indexing them and delete only the ids that disappeared.
+        """
+        for chunk in chunks:
+            old_id = previous.get(str(chunk.get("chunk_hash") or ""))
+            if old_id and old_id not in reused:
+                chunk = {**chunk, "chunk_id": old_id}
+                reused.add(old_id)
+                self.parser_retrieval_metrics["parse_reparse_chunks_reused_total"] += 1
+            yield chunk
+
+    def _run_parse_job(self, *, job: dict[str, Any], tenant_id: str) -> tuple[str | None, str | None]:
+        """Parse the job's document; parse → normalize → persist → cite/index flows in bounded batches.
+
+        Returns ``(error_code, index_job_id)``. A parser failing mid-stream returns
+        its error code so the job takes the retry/DLQ path instead of succeeding
+        with part of the document; the document stays ``parsing`` until the
+        stream completes, so a retried job re-parses instead of trusting the
+        partial chunks.
+        """
+        document_id = job.get("resource", {}).get("id")
+        if not isinstance(document_id, str):
+            return None, None
+        document = self.get_document_for_tenant(document_id=document_id, tenant_id=tenant_id)
+        if document is None:
+            return None, None
+        existing_chunks = self.list_document_chunks_for_tenant(document_id=document_id, tenant_id=tenant_id)
+        reparse = bool((job.get("payload") or {}).get("reparse"))
+        # Chunks left by a stream that never completed (crash, abort) do not count as parsed.
+        stream_incomplete = document.get("status") in _STREAM_INCOMPLETE_STATUSES
+        if existing_chunks and not reparse and not stream_incomplete:
+            document["status"] = "indexed"
+            self._persist_document(document=document)
+            return None, None
+
+        # Batches commit one by one; "parsing" stays on the document until the stream is fully persisted.
+        document["status"] = "parsing"
+        self._persist_document(document=document)
+
+        manifest = self.get_parse_manifest_for_tenant(job_id=str(job.get("job_id")), tenant_id=tenant_id)
+        parsed_stream = self._iter_parse_document_file(
+            document=document,
+            document_id=document_id,
+            tenant_id=tenant_id,
+            manifest=manifest,
+        )
+        previous = {
+            str(c["chunk_hash"]): str(c["chunk_id"])
+            for c in existing_chunks
+            if c.get("chunk_hash") and c.get("chunk_id")
+        }
+        reused: set[str] = set()
+        if previous:
+            parsed_stream = self._iter_reuse_chunk_ids(parsed_stream, previous=previous, reused=reused)
+        sync_index = self._lightrag_index_mode() != "async"
+        index_ok = True
+        chunk_count = 0
+        # Re-parse in async mode: the index job only needs the chunks that changed.
+        changed_ids: list[str] = []
+        try:
+            for persisted_batch in self._iter_persist_document_chunks(
+                tenant_id=tenant_id,
+                document_id=document_id,
+                chunks=parsed_stream,
+            ):
+                if manifest is not None and chunk_count == 0:
+                    manifest["content_source"] = persisted_batch[0].get("content_source", "unknown")
+                chunk_count += len(persisted_batch)
+                for persisted in persisted_batch:
+                    page, bbox = self._extract_page_and_bbox(persisted)
+                    self.register_citation_source(
+                        chunk_id=str(persisted["chunk_id"]),
+                        source={
+                            "chunk_id": persisted["chunk_id"],
+                            "document_id": document_id,
+                            "tenant_id": tenant_id,
+                            "project_id": document.get("project_id"),
+                            "supplier_id": document.get("supplier_id"),
+                            "doc_type": document.get("doc_type"),
+                            "page": page,
+                            "bbox": bbox,
+                            "heading_path": persisted.get("heading_path", []),
+                            "chunk_type": persisted.get("chunk_type", "text"),
+                            "content_source": persisted.get("content_source", "unknown"),
+                            "text": persisted.get("text", ""),
+                            "context": persisted.get("section", ""),
+                            "score_raw": 0.78,
+                            "chunk_hash": persisted.get("chunk_hash"),
+                        },
+                    )
+                changed_batch = [c for c in persisted_batch if c["chunk_id"] not in reused]
+                if previous and not sync_index:
+                    changed_ids.extend(str(c["chunk_id"]) for c in changed_batch)
+                if sync_index and index_ok and changed_batch:
+                    index_ok = self._maybe_index_chunks_to_lightrag(
+                        tenant_id=tenant_id,
+                        project_id=str(document.get("project_id") or ""),
+                        supplier_id=str(document.get("supplier_id") or ""),
+                        document_id=document_id,
+                        doc_type=str(document.get("doc_type") or ""),
+                        chunks=changed_batch,
+                    )
+        except Exception as exc:
+            logger.warning("parse stream for %s aborted: %s", document_id, type(exc).__name__)
+            self.parser_retrieval_metrics["parse_stream_aborted_total"] += 1
+            if manifest is not None:
+                manifest["chunk_count"] = chunk_count
+                self._persist_parse_manifest(manifest=manifest)
+            return (exc.code if isinstance(exc, ApiError) else "DOC_PARSE_STREAM_ABORTED"), None
+
+        # Only a fully consumed stream tells which previous chunks are really gone.
+        removed = sorted(set(previous.values()) - reused)
+        self._delete_index_chunks(
+            tenant_id=tenant_id,
+            project_id=str(document.get("project_id") or ""),
+            supplier_id=str(document.get("supplier_id") or ""),
+            chunk_ids=removed,
+        )
+        if manifest is not None:
+            manifest["chunk_count"] = chunk_count
+            if previous:
+                manifest["reparse"] = {
+                    "chunks_reused": len(reused),
+                    "chunks_added": chunk_count - len(reused),
+                    "chunks_removed": len(removed),
+                }
+            self._persist_parse_manifest(manifest=manifest)
+        index_job_id: str | None = None
+        document["status"] = "indexed"
+        if not sync_index and chunk_count > len(reused):
+            index_job_id = self._enqueue_index_job(
+                tenant_id=tenant_id,
+                document=document,
+                chunk_count=chunk_count - len(reused),
+                parse_job_id=str(job.get("job_id")),
+                trace_id=job.get("trace_id"),
+                chunk_ids=changed_ids if previous else None,
+            )
+            document["status"] = "parsed"
+        self._persist_document(document=document)
+        return None, index_job_id
+
+    def _iter_persist_document_chunks(
+        self,
+        *,
+        tenant_id: str,
+        document_id: str,
+        chunks: Iterable[dict[str, Any]],
+    ) -> Iterator[list[dict[str, Any]]]:
+        """Dedupe and persist *chunks* in ``PARSE_PERSIST_BATCH_SIZE`` batches, yielding each saved batch.
+
+        The first batch replaces the document's existing chunks, later batches
+        append, so only one batch is held at a time. An empty stream still
+        clears the document. A parser error mid-stream propagates to the caller
+        after the batches saved so far.
+        """
+        batch_size = self._parse_persist_batch_size()
+        seen: set[str] = set()
+        replaced = False
+        batch: list[dict[str, Any]] = []
+        iterator = iter(chunks)
+        while True:
+            exhausted = False
+            for chunk in iterator:
+                batch.extend(self._dedupe_chunks(document_id=document_id, chunks=[chunk], seen=seen))
+                if len(batch) >= batch_size:
+                    break
+            else:
+                exhausted = True
+            if batch or not replaced:
+                persist = self._append_document_chunks if replaced else self._persist_document_chunks
+                saved = persist(tenant_id=tenant_id, document_id=document_id, chunks=batch)
+                replaced = True
+                batch = []
+                if saved:
+                    self.parser_retrieval_metrics["parse_stream_batches_total"] += 1
+                    yield saved
+            if exhausted:
+                return
 
     def _dedupe_chunks(
         self,
         *,
         document_id: str,
         chunks: list[dict[str, Any]],
+        seen: set[str] | None = None,
     ) -> list[dict[str, Any]]:
-        seen: set[str] = set()
+        seen = set() if seen is None else seen
         out: list[dict[str, Any]] = []
         for chunk in chunks:
             normalized = self._ensure_chunk_shape(document_id=document_id, chunk=chunk)
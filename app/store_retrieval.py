@@ -4,6 +4,8 @@ import json
 import logging
 import os
 import re
+import uuid
+from datetime import UTC, datetime
 from typing import Any
 from urllib import request
 from urllib.error import URLError
@@ -59,7 +61,26 @@ class StoreRetrievalMixin:
             raw = resp.read().decode("utf-8")
         return json.loads(raw)
 
-    def _maybe_index_chunks_to_lightrag(
+    @staticmethod
+    def _lightrag_index_mode() -> str:
+        mode = os.environ.get("LIGHTRAG_INDEX_MODE", "async").strip().lower()
+        return mode if mode in {"async", "sync"} else "async"
+
+    @staticmethod
+    def _lightrag_index_batch_size() -> int:
+        try:
+            return max(1, int(os.environ.get("LIGHTRAG_INDEX_BATCH_SIZE", "64")))
+        except ValueError:
+            return 64
+
+    @staticmethod
+    def _lightrag_index_timeout_s() -> float:
+        try:
+            return max(0.1, float(os.environ.get("LIGHTRAG_INDEX_TIMEOUT_MS", "10000")) / 1000.0)
+        except ValueError:
+            return 10.0
+
+    def _write_index_batch(
         self,
         *,
         tenant_id: str,
@@ -68,13 +89,15 @@ class StoreRetrievalMixin:
         document_id: str,
         doc_type: str,
         chunks: list[dict[str, Any]],
-    ) -> None:
-        if not chunks:
-            return
+    ) -> dict[str, Any]:
+        """Write one batch of chunks to LightRAG (HTTP) or Chroma (in-process).
+
+        Raises on failure so callers decide between dropping and retrying.
+        """
         index_name = self._retrieval_index_name(tenant_id=tenant_id, project_id=project_id)
+        self.parser_retrieval_metrics["parse_index_write_total"] += 1
         dsn = os.environ.get("LIGHTRAG_DSN", "").strip()
         if dsn:
-            endpoint = dsn.rstrip("/") + "/index"
             payload = {
                 "index_name": index_name,
                 "tenant_id": tenant_id,
@@ -84,20 +107,16 @@ class StoreRetrievalMixin:
                 "doc_type": doc_type,
                 "chunks": chunks,
             }
-            timeout_s = float(os.environ.get("RERANK_TIMEOUT_MS", "2000")) / 1000.0 + 3.0
-            self.parser_retrieval_metrics["parse_index_write_total"] += 1
-            try:
-                self._post_json(endpoint=endpoint, payload=payload, timeout_s=timeout_s)
-                return
-            except (TimeoutError, URLError, ValueError, OSError):
-                self.parser_retrieval_metrics["parse_index_fail_total"] += 1
-                return
-
-        self.parser_retrieval_metrics["parse_index_write_total"] += 1
-        try:
-            from app.lightrag_service import index_chunks_to_collection
+            result = self._post_json(
+                endpoint=dsn.rstrip("/") + "/index",
+                payload=payload,
+                timeout_s=self._lightrag_index_timeout_s(),
+            )
+            stats = result if isinstance(result, dict) else {}
+        else:
+            from app.lightrag_service import index_chunks_with_stats
 
-            indexed = index_chunks_to_collection(
+            stats = index_chunks_with_stats(
                 index_name=index_name,
                 tenant_id=tenant_id,
                 project_id=project_id,
@@ -106,10 +125,196 @@ class StoreRetrievalMixin:
                 doc_type=doc_type,
                 chunks=chunks,
             )
-            if indexed == 0:
-                self.parser_retrieval_metrics["parse_index_fail_total"] += 1
+            if stats["indexed"] == 0:
+                raise ValueError("no indexable chunks in batch")
+        self._record_index_embedding_stats(stats)
+        return stats
+
+    def _delete_index_chunks(
+        self,
+        *,
+        tenant_id: str,
+        project_id: str,
+        supplier_id: str,
+        chunk_ids: list[str],
+    ) -> bool:
+        """Best-effort removal of chunks that disappeared on re-parse; ``False`` on failure."""
+        if not chunk_ids:
+            return True
+        index_name = self._retrieval_index_name(tenant_id=tenant_id, project_id=project_id)
+        try:
+            dsn = os.environ.get("LIGHTRAG_DSN", "").strip()
+            if dsn:
+                self._post_json(
+                    endpoint=dsn.rstrip("/") + "/delete",
+                    payload={"index_name": index_name, "supplier_id": supplier_id, "chunk_ids": chunk_ids},
+                    timeout_s=self._lightrag_index_timeout_s(),
+                )
+            else:
+                from app.lightrag_service import delete_chunks
+
+                delete_chunks(index_name=index_name, supplier_id=supplier_id, chunk_ids=chunk_ids)
         except Exception:
             self.parser_retrieval_metrics["parse_index_fail_total"] += 1
+            return False
+        self.parser_retrieval_metrics["parse_reparse_chunks_deleted_total"] += len(chunk_ids)
+        return True
+
+    def _maybe_index_chunks_to_lightrag(
+        self,
+        *,
+        tenant_id: str,
+        project_id: str,
+        supplier_id: str,
+        document_id: str,
+        doc_type: str,
+        chunks: list[dict[str, Any]],
+    ) -> bool:
+        """Synchronous best-effort indexing (``LIGHTRAG_INDEX_MODE=sync``); ``False`` after a failed batch."""
+        batch_size = self._lightrag_index_batch_size()
+        for start in range(0, len(chunks), batch_size):
+            try:
+                self._write_index_batch(
+                    tenant_id=tenant_id,
+                    project_id=project_id,
+                    supplier_id=supplier_id,
+                    document_id=document_id,
+                    doc_type=doc_type,
+                    chunks=chunks[start : start + batch_size],
+                )
+            except Exception:
+                self.parser_retrieval_metrics["parse_index_fail_total"] += 1
+                return False
+        return True
+
+    def _enqueue_index_job(
+        self,
+        *,
+        tenant_id: str,
+        document: dict[str, Any],
+        chunk_count: int,
+        parse_job_id: str,
+        trace_id: str | None,
+        chunk_ids: list[str] | None = None,
+    ) -> str:
+        """Create a queued ``index`` job for a parsed document and announce it via outbox.
+
+        With *chunk_ids* (an incremental re-parse) the job indexes only those
+        chunks; otherwise every chunk of the document.
+        """
+        document_id = str(document["document_id"])
+        job_id = f"job_{uuid.uuid4().hex[:12]}"
+        payload: dict[str, Any] = {
+            "document_id": document_id,
+            "parse_job_id": parse_job_id,
+            "chunk_count": chunk_count,
+            "index_cursor": 0,
+            "enqueued_at": self._utcnow_iso(),
+        }
+        if chunk_ids is not None:
+            payload["chunk_ids"] = chunk_ids
+        self._persist_job(
+            job={
+                "job_id": job_id,
+                "job_type": "index",
+                "status": "queued",
+                "retry_count": 0,
+                "thread_id": self._new_thread_id("index"),
+                "tenant_id": tenant_id,
+                "trace_id": trace_id,
+                "resource": {
+                    "type": "document",
+                    "id": document_id,
+                },
+                "payload": payload,
+                "last_error": None,
+                "errors": [],
+            }
+        )
+        self.append_outbox_event(
+            tenant_id=tenant_id,
+            event_type="job.created",
+            aggregate_type="job",
+            aggregate_id=job_id,
+            payload={
+                "job_id": job_id,
+                "job_type": "index",
+                "resource_type": "document",
+                "resource_id": document_id,
+            },
+        )
+        self.parser_retrieval_metrics["parse_index_jobs_enqueued_total"] += 1
+        return job_id
+
+    def _run_index_job(self, *, job: dict[str, Any], tenant_id: str) -> str | None:
+        """Index a parsed document in batches, resuming from ``payload.index_cursor``.
+
+        Returns ``None`` on success, otherwise an error code for the shared
+        retry/DLQ handling in ``run_job_once``.
+        """
+        payload = dict(job.get("payload") or {})
+        document_id = str(payload.get("document_id") or job.get("resource", {}).get("id") or "")
+        document = self.get_document_for_tenant(document_id=document_id, tenant_id=tenant_id) if document_id else None
+        if document is None:
+            return "DOC_PARSE_OUTPUT_NOT_FOUND"
+        chunks = self.list_document_chunks_for_tenant(document_id=document_id, tenant_id=tenant_id)
+        if payload.get("chunk_ids") is not None:
+            wanted = set(payload["chunk_ids"])
+            chunks = [c for c in chunks if c.get("chunk_id") in wanted]
+        cursor = max(0, int(payload.get("index_cursor") or 0))
+        if cursor == 0 and document.get("status") != "indexing":
+            document["status"] = "indexing"
+            self._persist_document(document=document)
+        batch_size = self._lightrag_index_batch_size()
+        while cursor < len(chunks):
+            batch = chunks[cursor : cursor + batch_size]
+            try:
+                self._write_index_batch(
+                    tenant_id=tenant_id,
+                    project_id=str(document.get("project_id") or ""),
+                    supplier_id=str(document.get("supplier_id") or ""),
+                    document_id=document_id,
+                    doc_type=str(document.get("doc_type") or ""),
+                    chunks=batch,
+                )
+            except Exception:
+                self.parser_retrieval_metrics["parse_index_fail_total"] += 1
+                return "RAG_INDEX_WRITE_FAILED"
+            cursor += len(batch)
+            payload["index_cursor"] = cursor
+            job["payload"] = payload
+            self._persist_job(job=job)
+            self.parser_retrieval_metrics["parse_index_batches_total"] += 1
+
+        document["status"] = "indexed"
+        self._persist_document(document=document)
+        lag_ms = self._elapsed_ms_since(str(payload.get("enqueued_at") or ""))
+        metrics = self.parser_retrieval_metrics
+        metrics["parse_index_lag_ms_last"] = lag_ms
+        metrics["parse_index_lag_ms_max"] = max(metrics["parse_index_lag_ms_max"], lag_ms)
+        return None
+
+    @staticmethod
+    def _elapsed_ms_since(iso_ts: str) -> int:
+        try:
+            started = datetime.fromisoformat(iso_ts)
+        except ValueError:
+            return 0
+        if started.tzinfo is None:
+            started = started.replace(tzinfo=UTC)
+        return max(0, int((datetime.now(UTC) - started).total_seconds() * 1000))
+
+    def _record_index_embedding_stats(self, stats: dict[str, Any]) -> None:
+        metrics = self.parser_retrieval_metrics
+        for source_key, metric_key in (
+            ("embeddings_reused", "parse_index_embeddings_reused_total"),
+            ("embeddings_computed", "parse_index_embeddings_computed_total"),
+        ):
+            try:
+                value = int(stats.get(source_key) or 0)
+            except (TypeError, ValueError):
+                value = 0
+            metrics[metric_key] = metrics.get(metric_key, 0) + value
 
     def _query_lightrag(
         self,
@@ -121,6 +326,8 @@ class StoreRetrievalMixin:
         selected_mode: str,
         top_k: int,
         doc_scope: list[str],
+        must_include_terms: list[str] | None = None,
+        must_exclude_terms: list[str] | None = None,
     ) -> list[dict[str, Any]] | None:
         index_name = self._retrieval_index_name(tenant_id=tenant_id, project_id=project_id)
         dsn = os.environ.get("LIGHTRAG_DSN", "").strip()
@@ -138,6 +345,8 @@ class StoreRetrievalMixin:
                     "project_id": project_id,
                     "supplier_id": supplier_id,
                     "doc_scope": list(doc_scope),
+                    "must_include": list(must_include_terms or []),
+                    "must_exclude": list(must_exclude_terms or []),
                 },
             }
             timeout_s = float(os.environ.get("RERANK_TIMEOUT_MS", "2000")) / 1000.0 + 3.0
@@ -166,6 +375,9 @@ class StoreRetrievalMixin:
                     project_id=project_id,
                     supplier_id=supplier_id,
                     doc_scope=doc_scope or None,
+                    mode=selected_mode,
+                    must_include=must_include_terms,
+                    must_exclude=must_exclude_terms,
                 )
             except Exception:
                 self.parser_retrieval_metrics["retrieval_lightrag_fail_total"] += 1
@@ -176,6 +388,10 @@ class StoreRetrievalMixin:
         rows = result.get("items")
         if not isinstance(rows, list):
             return []
+        # Constraints enforced by the index itself need no post-filtering here.
+        prefiltered = result.get("constraints_applied") is True
+        if prefiltered:
+            self.parser_retrieval_metrics["retrieval_constraint_pushdown_total"] += 1
         out: list[dict[str, Any]] = []
         dropped_cross_tenant = 0
         for row in rows:
@@ -212,6 +428,8 @@ class StoreRetrievalMixin:
             }
             if row.get("text"):
                 entry["text"] = row["text"]
+            if prefiltered:
+                entry["_prefiltered"] = True
             out.append(entry)
         if dropped_cross_tenant > 0:
             logger.warning(
@@ -323,6 +541,16 @@ class StoreRetrievalMixin:
         agreement = max(0.0, min(1.0, 1.0 - cv))
         return agreement
 
+    def _satisfies_term_constraints(
+        self,
+        candidate: dict[str, Any],
+        include_terms: list[str],
+        exclude_terms: list[str],
+    ) -> bool:
+        source = self.citation_sources.get(str(candidate.get("chunk_id", "")), {})
+        text = str(candidate.get("text") or source.get("text", "")).lower()
+        return all(term in text for term in include_terms) and all(term not in text for term in exclude_terms)
+
     @staticmethod
     def _select_retrieval_mode(*, query_type: str, high_risk: bool) -> str:
         if high_risk:
@@ -363,6 +591,8 @@ class StoreRetrievalMixin:
             selected_mode=selected_mode,
             top_k=top_k,
             doc_scope=doc_scope,
+            must_include_terms=must_include_terms,
+            must_exclude_terms=must_exclude_terms,
         )
         if candidates is None:
             local_candidates = [x for x in self.citation_sources.values() if x.get("tenant_id") == tenant_id]
@@ -419,26 +649,14 @@ class StoreRetrievalMixin:
             include_terms=include_terms,
             exclude_terms=exclude_terms,
         )
-        if include_terms:
-            candidates = [
-                x
-                for x in candidates
-                if all(
-                    term in str(self.citation_sources.get(str(x.get("chunk_id", "")), {}).get("text", "")).lower()
-                    for term in include_terms
-                )
-            ]
-        if exclude_terms:
+        if include_terms or exclude_terms:
             candidates = [
                 x
                 for x in candidates
-                if all(
-                    term not in str(self.citation_sources.get(str(x.get("chunk_id", "")), {}).get("text", "")).lower()
-                    for term in exclude_terms
-                )
+                if x.get("_prefiltered") or self._satisfies_term_constraints(x, include_terms, exclude_terms)
             ]
 
-        items = [dict(x) for x in candidates]
+        items = [{k: v for k, v in x.items() if k != "_prefiltered"} for x in candidates]
         degraded = False
         degrade_reason = ""
         if enable_rerank:
@@ -4,12 +4,18 @@ Spec: retrieval-and-scoring-spec §6.3
   - single criteria <= 6 000 tokens
   - full report     <= 24 000 tokens
   - over-budget trim order: low relevance -> redundant source
+
+Token counts are memoized per text and stored on chunks as ``token_count``
+at parse time, so budgeting works off cached integers.
 """
 
 from __future__ import annotations
 
 import logging
+import math
 import os
+import re
+from functools import lru_cache
 from typing import Any
 
 logger = logging.getLogger(__name__)
@@ -36,14 +42,50 @@ def _get_encoder() -> Any:
     return _encoder
 
 
+# Character classes for the tiktoken-free estimator, calibrated against cl100k_base:
+# CJK ideographs / kana / hangul average ~1.3 tokens each, Latin words ~5 chars per
+# token (at least 1), digit runs split every 3 digits, punctuation and newline runs ~1 token.
+_CJK_RE = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]")
+_WORD_RE = re.compile(r"[A-Za-z]+")
+_DIGITS_RE = re.compile(r"[0-9]+")
+_PUNCT_RE = re.compile(r"[!-/:-@\[-`{-~\u3000-\u303f\uff00-\uffef]")
+_NEWLINES_RE = re.compile(r"\n+")
+_OTHER_RE = re.compile(
+    r"[^\sA-Za-z0-9!-/:-@\[-`{-~\u3000-\u303f\uff00-\uffef"
+    r"\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]"
+)
+_CJK_TOKENS_PER_CHAR = 1.3
+
+
+def estimate_tokens(text: str) -> int:
+    """CJK-aware token estimate used when tiktoken is unavailable."""
+    if not text:
+        return 0
+    tokens = math.ceil(len(_CJK_RE.findall(text)) * _CJK_TOKENS_PER_CHAR)
+    tokens += sum(max(1, (len(word) + 2) // 5) for word in _WORD_RE.findall(text))
+    tokens += sum(math.ceil(len(run) / 3) for run in _DIGITS_RE.findall(text))
+    tokens += len(_PUNCT_RE.findall(text)) + len(_NEWLINES_RE.findall(text))
+    tokens += math.ceil(len(_OTHER_RE.findall(text)) / 2)
+    return max(1, tokens)
+
+
+@lru_cache(maxsize=8192)
 def count_tokens(text: str) -> int:
-    """Count tokens. Uses tiktoken (cl100k_base) when available, else ~3.5 chars/token."""
+    """Count tokens (memoized). Uses tiktoken (cl100k_base) when available, else :func:`estimate_tokens`."""
     enc = _get_encoder()
     if enc is None:
-        return max(1, len(text.encode("utf-8")) // 4)
+        return estimate_tokens(text)
     return len(enc.encode(text))
 
 
+def chunk_token_count(item: dict[str, Any]) -> int:
+    """Token count of an evidence/chunk dict, preferring the ``token_count`` stored at parse time."""
+    cached = item.get("token_count")
+    if isinstance(cached, int) and not isinstance(cached, bool) and cached >= 0:
+        return cached
+    return count_tokens(str(item.get("text", "")))
+
+
 def trim_evidence_to_budget(
     evidence: list[dict[str, Any]],
     max_tokens: int = 0,
@@ -69,7 +111,7 @@ def trim_evidence_to_budget(
     result: list[dict[str, Any]] = []
     total = 0
     for item in ranked:
-        tokens = count_tokens(item.get("text", ""))
+        tokens = chunk_token_count(item)
         if total + tokens > budget and len(result) >= MIN_EVIDENCE_PER_CRITERIA:
             break
         result.append(item)
@@ -123,7 +165,10 @@ def apply_report_budget(
         cid: trim_evidence_to_budget(ev) for cid, ev in criteria_evidence.items()
     }
 
-    total = _total_tokens(trimmed)
+    counts: dict[tuple[str, int], int] = {
+        (cid, idx): chunk_token_count(item) for cid, ev_list in trimmed.items() for idx, item in enumerate(ev_list)
+    }
+    total = sum(counts.values())
     if total <= budget:
         return trimmed
 
@@ -133,16 +178,16 @@ def apply_report_budget(
             scored_refs.append((cid, idx, float(item.get("score_raw", 0.0))))
     scored_refs.sort(key=lambda x: x[2])
 
+    remaining = {cid: len(ev_list) for cid, ev_list in trimmed.items()}
     removed: set[tuple[str, int]] = set()
     for cid, idx, _ in scored_refs:
         if total <= budget:
             break
-        remaining = sum(1 for i, it in enumerate(trimmed[cid]) if (cid, i) not in removed)
-        if remaining <= MIN_EVIDENCE_PER_CRITERIA:
+        if remaining[cid] <= MIN_EVIDENCE_PER_CRITERIA:
             continue
-        tokens = count_tokens(trimmed[cid][idx].get("text", ""))
         removed.add((cid, idx))
-        total -= tokens
+        remaining[cid] -= 1
+        total -= counts[(cid, idx)]
 
     result: dict[str, list[dict[str, Any]]] = {}
     for cid, ev_list in trimmed.items():
@@ -151,4 +196,4 @@ def apply_report_budget(
 
 
 def _total_tokens(criteria_evidence: dict[str, list[dict[str, Any]]]) -> int:
-    return sum(count_tokens(item.get("text", "")) for ev_list in criteria_evidence.values() for item in ev_list)
+    return sum(chunk_token_count(item) for ev_list in criteria_evidence.values() for item in ev_list)
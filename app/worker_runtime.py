@@ -3,6 +3,7 @@ from __future__ import annotations
 import os
 import time
 from collections.abc import Mapping
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from typing import Any
 
@@ -28,7 +29,13 @@ class WorkerRunStats:
 
 
 class WorkerRuntime:
-    """Resident worker runtime used by P3 to process queued jobs."""
+    """Resident worker runtime used by P3 to process queued jobs.
+
+    Parse jobs spend most of their time waiting on MinerU, so with ``parse_concurrency > 1``
+    they run on a bounded pool and several documents of one worker are in flight at once;
+    that is what lets the MinerU batch coordinator merge their uploads. Other job types,
+    and all acks/nacks, stay on the loop thread.
+    """
 
     def __init__(
         self,
@@ -39,6 +46,7 @@ class WorkerRuntime:
         tenant_burst_limit: int = 1,
         max_messages_per_iteration: int = 20,
         poll_interval_ms: int = 200,
+        parse_concurrency: int = 1,
     ) -> None:
         self.store = store
         self.queue_backend = queue_backend
@@ -46,6 +54,19 @@ class WorkerRuntime:
         self.tenant_burst_limit = max(1, int(tenant_burst_limit))
         self.max_messages_per_iteration = max(1, int(max_messages_per_iteration))
         self.poll_interval_ms = max(1, int(poll_interval_ms))
+        self.parse_concurrency = max(1, int(parse_concurrency))
+        self._parse_pool: ThreadPoolExecutor | None = None
+        if self.parse_concurrency > 1:
+            self._parse_pool = ThreadPoolExecutor(
+                max_workers=self.parse_concurrency,
+                thread_name_prefix="worker-parse",
+            )
+        self._parse_inflight: dict[Future[dict[str, Any]], tuple[str, Any]] = {}
+
+    def close(self) -> None:
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=True)
+            self._parse_pool = None
 
     def _list_tenants(self, *, queue_name: str) -> list[str]:
         method = getattr(self.queue_backend, "list_tenants", None)
@@ -66,14 +87,50 @@ class WorkerRuntime:
             stats.acked += 1
             return True
 
+        if self._parse_pool is not None and msg.payload.get("job_type") == "parse":
+            if len(self._parse_inflight) >= self.parse_concurrency:
+                self._drain_parse_jobs(stats=stats, wait_all=False)
+            future = self._parse_pool.submit(self.store.run_job_once, job_id=job_id, tenant_id=tenant_id)
+            self._parse_inflight[future] = (tenant_id, msg)
+            return True
+
         try:
             result = self.store.run_job_once(job_id=job_id, tenant_id=tenant_id)
         except Exception:
             # Keep worker loop alive on unexpected execution failures.
+            result = None
+        self._settle_message(tenant_id=tenant_id, msg=msg, result=result, stats=stats)
+        return True
+
+    def _drain_parse_jobs(self, *, stats: WorkerRunStats, wait_all: bool) -> None:
+        """Settle finished parse jobs: at least one, or every in-flight one when ``wait_all``."""
+        if not self._parse_inflight:
+            return
+        done, _ = wait(
+            list(self._parse_inflight),
+            return_when=ALL_COMPLETED if wait_all else FIRST_COMPLETED,
+        )
+        for future in done:
+            tenant_id, msg = self._parse_inflight.pop(future)
+            try:
+                result = future.result()
+            except Exception:
+                result = None
+            self._settle_message(tenant_id=tenant_id, msg=msg, result=result, stats=stats)
+
+    def _settle_message(
+        self,
+        *,
+        tenant_id: str,
+        msg: Any,
+        result: dict[str, Any] | None,
+        stats: WorkerRunStats,
+    ) -> None:
+        if result is None:
             self.queue_backend.ack(tenant_id=tenant_id, message_id=msg.message_id)
             stats.acked += 1
             stats.failed += 1
-            return True
+            return
         final_status = str(result.get("final_status", ""))
         if final_status == "retrying":
             delay_ms = int(result.get("retry_after_ms", 0) or 0)
@@ -85,7 +142,7 @@ class WorkerRuntime:
             )
             stats.requeued += 1
             stats.retrying += 1
-            return True
+            return
 
         self.queue_backend.ack(tenant_id=tenant_id, message_id=msg.message_id)
         stats.acked += 1
@@ -93,7 +150,6 @@ class WorkerRuntime:
             stats.succeeded += 1
         else:
             stats.failed += 1
-        return True
 
     def run_once(self) -> dict[str, int]:
         stats = WorkerRunStats()
@@ -117,6 +173,7 @@ class WorkerRuntime:
                             break
                 if not progressed:
                     break
+        self._drain_parse_jobs(stats=stats, wait_all=True)
         return stats.as_dict()
 
     def run_forever(self, *, stop_after_iterations: int | None = None) -> dict[str, int]:
@@ -170,4 +227,5 @@ def create_worker_runtime_from_env(
         tenant_burst_limit=tenant_burst_limit,
         max_messages_per_iteration=max_messages_per_iteration,
         poll_interval_ms=poll_interval_ms,
+        parse_concurrency=parse_concurrency,
     )
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.lightrag_service import _chroma_client, rebuild_bm25_from_collection
+
+
+def _index_names() -> list[str]:
+    prefix = os.environ.get("LIGHTRAG_INDEX_PREFIX", "lightrag").strip() or "lightrag"
+    names: list[str] = []
+    for item in _chroma_client().list_collections():
+        name = item if isinstance(item, str) else item.name
+        if name.startswith(f"{prefix}_") or name.startswith("shard_"):
+            names.append(name)
+    return sorted(names)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Rebuild the BM25 index from documents stored in Chroma")
+    parser.add_argument("--index-name", action="append", default=[], help="collection name (repeatable)")
+    parser.add_argument("--all", action="store_true", help="every collection with LIGHTRAG_INDEX_PREFIX, incl. shards")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    index_names = list(args.index_name)
+    if args.all:
+        index_names.extend(n for n in _index_names() if n not in index_names)
+    if not index_names:
+        parser.error("pass --index-name or --all")
+
+    results = [
+        {"index_name": name, "indexed": rebuild_bm25_from_collection(name, batch_size=max(1, args.batch_size))}
+        for name in index_names
+    ]
+    print(json.dumps({"success": True, "results": results}, ensure_ascii=True, sort_keys=True, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
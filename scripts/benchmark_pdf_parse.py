@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Benchmark serial vs page-parallel PDF parsing on synthetic documents.
+
+Usage:
+    python scripts/benchmark_pdf_parse.py --pages 200 800 --workers 4
+
+Generates PDFs with the given page counts (several text blocks per page),
+parses each with PDF_PARSE_WORKERS=1 and with the requested worker count,
+and prints timings plus a check that both paths produce identical chunks.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.document_parser import parse_pdf_bytes, shutdown_pdf_pool
+
+
+def _synthetic_pdf(pages: int, blocks_per_page: int) -> bytes:
+    import pymupdf
+
+    doc = pymupdf.open()
+    for page_no in range(1, pages + 1):
+        page = doc.new_page()
+        for block_no in range(blocks_per_page):
+            text = f"Section {page_no}.{block_no} supplier qualification and pricing evidence line. " * 3
+            page.insert_textbox(
+                pymupdf.Rect(50, 40 + block_no * 70, 545, 100 + block_no * 70),
+                text,
+                fontsize=9,
+            )
+    buf = io.BytesIO()
+    doc.save(buf)
+    doc.close()
+    return buf.getvalue()
+
+
+def _timed_parse(pdf_bytes: bytes, *, workers: int, repeat: int) -> tuple[float, list]:
+    os.environ["PDF_PARSE_WORKERS"] = str(workers)
+    os.environ["PDF_PARSE_PARALLEL_MIN_PAGES"] = "1"
+    chunks: list = []
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        chunks = parse_pdf_bytes(pdf_bytes)
+        best = min(best, time.perf_counter() - t0)
+    return best, chunks
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark page-parallel PDF parsing")
+    parser.add_argument("--pages", type=int, nargs="+", default=[100, 400, 800])
+    parser.add_argument("--blocks-per-page", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=max(2, min(4, os.cpu_count() or 1)))
+    parser.add_argument("--repeat", type=int, default=3, help="best-of-N timing")
+    args = parser.parse_args()
+
+    results = []
+    try:
+        # Warm the pool so process spawn is not billed to the first measurement.
+        _timed_parse(_synthetic_pdf(2, 1), workers=args.workers, repeat=1)
+        for pages in args.pages:
+            pdf_bytes = _synthetic_pdf(pages, args.blocks_per_page)
+            serial_s, serial_chunks = _timed_parse(pdf_bytes, workers=1, repeat=args.repeat)
+            parallel_s, parallel_chunks = _timed_parse(pdf_bytes, workers=args.workers, repeat=args.repeat)
+            identical = [(c.page, c.text) for c in serial_chunks] == [(c.page, c.text) for c in parallel_chunks]
+            results.append(
+                {
+                    "pages": pages,
+                    "pdf_bytes": len(pdf_bytes),
+                    "chunks": len(serial_chunks),
+                    "serial_ms": round(serial_s * 1000, 1),
+                    "parallel_ms": round(parallel_s * 1000, 1),
+                    "speedup": round(serial_s / parallel_s, 2) if parallel_s else None,
+                    "identical": identical,
+                }
+            )
+    finally:
+        shutdown_pdf_pool()
+
+    print(
+        json.dumps(
+            {"workers": args.workers, "cpu_count": os.cpu_count(), "results": results},
+            ensure_ascii=True,
+            sort_keys=True,
+            indent=2,
+        )
+    )
+    return 0 if all(r["identical"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
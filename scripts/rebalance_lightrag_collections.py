@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.lightrag_service import _chroma_client, rebalance_collection
+
+
+def _unsharded_index_names() -> list[str]:
+    prefix = os.environ.get("LIGHTRAG_INDEX_PREFIX", "lightrag").strip() or "lightrag"
+    names: list[str] = []
+    for item in _chroma_client().list_collections():
+        name = item if isinstance(item, str) else item.name
+        if name.startswith(f"{prefix}_") and "__sup_" not in name:
+            names.append(name)
+    return sorted(names)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Split retrieval collections into supplier shards or merge them back")
+    parser.add_argument("--index-name", action="append", default=[], help="tenant×project index name (repeatable)")
+    parser.add_argument(
+        "--all", action="store_true", help="shard mode: every unsharded index with LIGHTRAG_INDEX_PREFIX"
+    )
+    parser.add_argument("--mode", choices=["shard", "merge"], default="shard")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true", help="report record moves without writing")
+    args = parser.parse_args()
+
+    index_names = list(args.index_name)
+    if args.all:
+        if args.mode != "shard":
+            parser.error("--all is only supported with --mode shard")
+        index_names.extend(n for n in _unsharded_index_names() if n not in index_names)
+    if not index_names:
+        parser.error("pass --index-name or --all")
+
+    results = [
+        rebalance_collection(
+            name,
+            shard_by_supplier=args.mode == "shard",
+            batch_size=max(1, args.batch_size),
+            dry_run=args.dry_run,
+        )
+        for name in index_names
+    ]
+    print(json.dumps({"success": True, "results": results}, ensure_ascii=True, sort_keys=True, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
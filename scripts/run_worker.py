@@ -20,10 +20,13 @@ def main() -> int:
     args = parser.parse_args()
 
     runtime = create_worker_runtime_from_env(store=store, queue_backend=queue_backend)
-    if args.iterations > 0:
-        stats = runtime.run_forever(stop_after_iterations=args.iterations)
-    else:
-        stats = runtime.run_forever(stop_after_iterations=None)
+    try:
+        if args.iterations > 0:
+            stats = runtime.run_forever(stop_after_iterations=args.iterations)
+        else:
+            stats = runtime.run_forever(stop_after_iterations=None)
+    finally:
+        runtime.close()
     print(json.dumps({"success": True, "stats": stats}, ensure_ascii=True))
     return 0
 
@@ -10,7 +10,14 @@ ROOT = pathlib.Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+from app.llm_clients import reset_openai_clients
+from app.llm_score_cache import reset_llm_score_cache
 from app.main import create_app, queue_backend
+from app.mineru_coordinator import reset_mineru_coordinator
+from app.parse_cache import reset_parse_cache_index
+from app.parser_router import reset_parser_health
+from app.rerank_cache import reset_rerank_score_cache
+from app.rerank_client import reset_rerank_api_client
 from app.store import store
 
 
@@ -68,6 +75,13 @@ def reset_store(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch):
     store.reset()
     if hasattr(queue_backend, "reset"):
         queue_backend.reset()
+    reset_rerank_score_cache()
+    reset_rerank_api_client()
+    reset_openai_clients()
+    reset_llm_score_cache()
+    reset_parse_cache_index()
+    reset_mineru_coordinator()
+    reset_parser_health()
     yield
 
 
@@ -0,0 +1,108 @@
+import sqlite3
+
+from app.bm25_index import Bm25Index, bm25_enabled, index_terms
+
+
+def _meta(**overrides) -> dict:
+    base = {"tenant_id": "t1", "project_id": "p1", "supplier_id": "s1", "document_id": "d1", "doc_type": "bid"}
+    base.update(overrides)
+    return base
+
+
+def test_index_terms_keep_compound_codes_and_cjk_unigrams():
+    terms = index_terms("第5.2.3条 型号ABC-123")
+    assert "5.2.3" in terms
+    assert "abc-123" in terms
+    assert "第" in terms and "条" in terms
+
+
+def test_search_ranks_exact_term_matches_first():
+    index = Bm25Index()
+    index.upsert(
+        index_name="idx",
+        docs=[
+            ("c1", "交货期为30天", _meta()),
+            ("c2", "质保期12个月，详见第5.2.3条", _meta()),
+            ("c3", "付款方式为月结", _meta()),
+        ],
+    )
+
+    hits = index.search(index_name="idx", query="5.2.3 质保", top_k=2)
+
+    assert hits[0]["chunk_id"] == "c2"
+    assert hits[0]["metadata"]["doc_type"] == "bid"
+    assert len(hits) <= 2
+
+
+def test_upsert_replaces_postings_and_filters_apply():
+    index = Bm25Index()
+    index.upsert(index_name="idx", docs=[("c1", "旧文本 alpha", _meta())])
+    index.upsert(index_name="idx", docs=[("c1", "新文本 beta", _meta(doc_type="tender"))])
+
+    assert index.search(index_name="idx", query="alpha", top_k=5) == []
+    assert [h["chunk_id"] for h in index.search(index_name="idx", query="beta", top_k=5)] == ["c1"]
+    assert index.search(index_name="idx", query="beta", top_k=5, doc_types=["bid"]) == []
+    assert index.search(index_name="idx", query="beta", top_k=5, filters={"supplier_id": "s2"}) == []
+
+    index.delete(index_name="idx", chunk_ids=["c1"])
+    assert index.search(index_name="idx", query="beta", top_k=5) == []
+
+
+def test_index_persists_to_sqlite_file(tmp_path):
+    path = str(tmp_path / "bm25.sqlite3")
+    Bm25Index(path).upsert(index_name="idx", docs=[("c1", "产品编号 XK-42", _meta())])
+
+    hits = Bm25Index(path).search(index_name="idx", query="XK-42", top_k=1)
+
+    assert [h["chunk_id"] for h in hits] == ["c1"]
+
+
+def test_corpus_stats_track_upserts_and_deletes_across_indexes():
+    index = Bm25Index()
+    index.upsert(index_name="idx_a", docs=[("c1", "质保 期", _meta()), ("c2", "交货 期", _meta())])
+    index.upsert(index_name="idx_b", docs=[("c3", "质保 条款", _meta(supplier_id="s2"))])
+
+    assert index.corpus_stats(tenant_id="t1", project_id="p1", terms=["质", "交", "期"]) == (
+        3,
+        {"质": 2, "交": 1, "期": 2},
+    )
+
+    index.upsert(index_name="idx_a", docs=[("c2", "付款 条款", _meta())])
+    index.delete(index_name="idx_b", chunk_ids=["c3"])
+
+    n_docs, df = index.corpus_stats(tenant_id="t1", project_id="p1", terms=["质", "交", "条"])
+    assert n_docs == 2
+    assert df == {"质": 1, "条": 1}
+    assert index.corpus_stats(tenant_id="t1", project_id="other", terms=["质"]) == (0, {})
+
+
+def test_term_frequencies_come_from_postings():
+    index = Bm25Index()
+    index.upsert(index_name="idx", docs=[("c1", "质保质保 12", _meta())])
+
+    assert index.term_frequencies(tenant_id="t1", project_id="p1", chunk_ids=["c1", "missing"], terms=["质", "12"]) == {
+        "c1": (5, {"质": 2, "12": 1})
+    }
+
+
+def test_corpus_stats_are_backfilled_for_existing_files(tmp_path):
+    path = str(tmp_path / "bm25.sqlite3")
+    Bm25Index(path).upsert(index_name="idx", docs=[("c1", "质保", _meta())])
+    with sqlite3.connect(path) as conn:
+        conn.execute("DELETE FROM bm25_term_stats")
+        conn.execute("DELETE FROM bm25_scope_stats")
+
+    assert Bm25Index(path).corpus_stats(tenant_id="t1", project_id="p1", terms=["质"]) == (1, {"质": 1})
+
+
+def test_remote_chroma_needs_a_shared_bm25_path(monkeypatch, tmp_path):
+    monkeypatch.delenv("LIGHTRAG_BM25_PATH", raising=False)
+    monkeypatch.delenv("CHROMA_PERSIST_DIR", raising=False)
+    monkeypatch.delenv("LIGHTRAG_BM25_ENABLED", raising=False)
+    assert bm25_enabled() is True  # in-process Chroma: both live in this process
+
+    monkeypatch.setenv("CHROMA_HOST", "chroma.internal")
+    assert bm25_enabled() is False
+
+    monkeypatch.setenv("LIGHTRAG_BM25_PATH", str(tmp_path / "bm25.sqlite3"))
+    assert bm25_enabled() is True
@@ -242,3 +242,147 @@ class TestEnvConfiguration:
             assert tracker.warn_threshold_ratio == 0.7
             assert tracker.hard_threshold_ratio == 1.5
             reload(mod)
+
+
+class TestReservations:
+    def test_reserve_counts_towards_thresholds(self):
+        tracker = CostBudgetTracker(
+            task_id="t1",
+            max_tokens_budget=10000,
+            warn_threshold_ratio=0.8,
+            hard_threshold_ratio=1.2,
+        )
+        assert tracker.reserve(5000) == "ok"
+        assert tracker.reserve(3000) == "ok"
+        assert tracker.projected_tokens == 8000
+        assert tracker.total_tokens == 0
+        assert tracker.reserve(1000) == "degrade"
+        assert tracker.reserved_tokens == 8000
+
+    def test_settle_replaces_reservation_with_actual_usage(self):
+        tracker = CostBudgetTracker(task_id="t1", max_tokens_budget=10000)
+        tracker.reserve(4000)
+        tracker.settle(4000, LLMUsage(total_tokens=1500))
+        assert tracker.reserved_tokens == 0
+        assert tracker.total_tokens == 1500
+        assert tracker.check_budget() == "ok"
+
+    def test_oversized_reservation_blocks_next_admission(self):
+        tracker = CostBudgetTracker(
+            task_id="t1",
+            max_tokens_budget=1000,
+            warn_threshold_ratio=0.8,
+            hard_threshold_ratio=1.2,
+        )
+        assert tracker.reserve(1300) == "ok"
+        assert tracker.reserve(10) == "blocked"
+
+
+# ---------------------------------------------------------------------------
+# node_score_with_llm admission + concurrency
+# ---------------------------------------------------------------------------
+
+
+class _StubStore:
+    citation_sources: dict = {}
+
+    def _resolve_citations_batch(self, ids, include_quote=False):
+        return []
+
+
+def _scoring_state(n: int) -> dict:
+    return {
+        "evaluation_id": "ev_budget",
+        "criteria_defs": [{"criteria_id": f"c{i}", "max_score": 10.0} for i in range(n)],
+        "criteria_evidence": {},
+        "hard_constraint_pass": True,
+        "citations_all_ids": [],
+    }
+
+
+@pytest.fixture()
+def concurrent_llm(monkeypatch):
+    import threading
+    import time
+
+    import app.llm_provider as provider
+
+    stats = {"active": 0, "peak": 0, "calls": []}
+    lock = threading.Lock()
+
+    def fake_call(*, config, messages, json_mode=False, max_tokens=1024):
+        with lock:
+            stats["active"] += 1
+            stats["peak"] = max(stats["peak"], stats["active"])
+            stats["calls"].append(messages[1]["content"])
+        time.sleep(0.05)
+        with lock:
+            stats["active"] -= 1
+        return '{"score": 8, "hard_pass": true, "reason": "ok", "confidence": 0.9}', LLMUsage(
+            prompt_tokens=300, completion_tokens=100, total_tokens=400, model="m"
+        )
+
+    monkeypatch.setattr(provider, "is_real_llm_available", lambda: True)
+    monkeypatch.setattr(provider, "_call_with_degradation", fake_call)
+    monkeypatch.setattr(provider, "estimate_score_tokens", lambda *a, **kw: 1000)
+    monkeypatch.setattr(provider, "_TASK_COST_WARN_RATIO", 0.8)
+    monkeypatch.setattr(provider, "_TASK_COST_HARD_RATIO", 1.2)
+    return stats
+
+
+class TestConcurrentScoring:
+    def test_calls_run_in_parallel_and_keep_order(self, concurrent_llm, monkeypatch):
+        from app.evaluation_nodes import node_score_with_llm
+
+        monkeypatch.setenv("LLM_SCORE_CONCURRENCY", "4")
+        monkeypatch.setattr("app.llm_provider._TASK_TOKEN_BUDGET", 100000)
+        out = node_score_with_llm(_scoring_state(4), store=_StubStore())
+
+        assert [r["criteria_id"] for r in out["criteria_results"]] == ["c0", "c1", "c2", "c3"]
+        assert concurrent_llm["peak"] > 1
+        assert out["cost_total_tokens"] == 1600
+        assert out["cost_exceeded"] is False
+
+    def test_concurrency_one_is_sequential(self, concurrent_llm, monkeypatch):
+        from app.evaluation_nodes import node_score_with_llm
+
+        monkeypatch.setenv("LLM_SCORE_CONCURRENCY", "1")
+        monkeypatch.setattr("app.llm_provider._TASK_TOKEN_BUDGET", 100000)
+        node_score_with_llm(_scoring_state(3), store=_StubStore())
+        assert concurrent_llm["peak"] == 1
+
+    def test_degrade_decided_by_reservations_in_order(self, concurrent_llm, monkeypatch):
+        from app.evaluation_nodes import node_score_with_llm
+
+        monkeypatch.setattr("app.llm_provider._TASK_TOKEN_BUDGET", 2500)
+        out = node_score_with_llm(_scoring_state(4), store=_StubStore())
+
+        # warn threshold 2000: c0 + c1 reserve 1000 each, c2/c3 degrade to mock
+        assert len(concurrent_llm["calls"]) == 2
+        assert all("c0" in c or "c1" in c for c in concurrent_llm["calls"])
+        assert len(out["criteria_results"]) == 4
+        assert out["cost_total_tokens"] == 800
+
+    def test_blocked_when_reservation_exceeds_hard_threshold(self, concurrent_llm, monkeypatch):
+        from app.evaluation_nodes import node_score_with_llm
+
+        monkeypatch.setattr("app.llm_provider._TASK_TOKEN_BUDGET", 800)
+        out = node_score_with_llm(_scoring_state(3), store=_StubStore())
+
+        assert out["cost_exceeded"] is True
+        assert [r["criteria_id"] for r in out["criteria_results"]] == ["c0"]
+        assert len(concurrent_llm["calls"]) == 1
+
+
+def test_estimate_score_tokens_counts_prompt_plus_completion(monkeypatch):
+    import app.llm_provider as provider
+
+    monkeypatch.setattr(provider, "is_real_llm_available", lambda: False)
+    assert provider.estimate_score_tokens("c1", "req", [{"text": "证据" * 50}]) == 0
+
+    monkeypatch.setattr(provider, "is_real_llm_available", lambda: True)
+    monkeypatch.setenv("LLM_SCORE_COMPLETION_ESTIMATE", "100")
+    short = provider.estimate_score_tokens("c1", "req", [])
+    longer = provider.estimate_score_tokens("c1", "req", [{"text": "证据" * 50}])
+    assert short > 100
+    assert longer > short
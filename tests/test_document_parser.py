@@ -10,6 +10,8 @@ from app.document_parser import (
     DocumentChunk,
     PageBlock,
     chunk_text_blocks,
+    iter_chunks,
+    iter_parse_file_bytes,
     parse_file_bytes,
     parse_pdf_bytes,
     parse_plain_text_bytes,
@@ -64,6 +66,30 @@ class TestChunkTextBlocks:
         assert len(pages_seen) >= 2
 
 
+class TestIterChunks:
+    def test_matches_chunk_text_blocks(self):
+        blocks = [PageBlock(page=i // 3 + 1, text=f"Clause {i}. " + "requirement text " * 12) for i in range(20)]
+        blocks.append(PageBlock(page=7, text="tail"))
+        expected = chunk_text_blocks(blocks)
+        streamed = list(iter_chunks(iter(blocks)))
+        assert [(c.text, c.page, c.start_char, c.end_char) for c in streamed] == [
+            (c.text, c.page, c.start_char, c.end_char) for c in expected
+        ]
+        assert streamed[-1].text.endswith("tail")
+
+    def test_consumes_blocks_lazily(self):
+        consumed: list[int] = []
+
+        def blocks():
+            for i in range(1000):
+                consumed.append(i)
+                yield PageBlock(page=i + 1, text="x" * 300)
+
+        first = next(iter_chunks(blocks(), chunk_size=800))
+        assert first.page == 1
+        assert len(consumed) < 10
+
+
 class TestParsePdfBytes:
     def _make_simple_pdf(self, text: str = "Hello PDF World") -> bytes:
         """Create a minimal PDF with text using pymupdf."""
@@ -119,6 +145,54 @@ class TestParsePdfBytes:
         assert exc_info.value.code == "DOC_PARSE_PDF_CORRUPT"
 
 
+class TestParsePdfParallel:
+    @staticmethod
+    def _make_pdf(pages: int) -> bytes:
+        import pymupdf
+
+        doc = pymupdf.open()
+        for i in range(pages):
+            page = doc.new_page()
+            page.insert_text((72, 72), f"Section {i + 1} qualification evidence. " * 8, fontsize=10)
+            page.insert_text((72, 400), f"Page {i + 1} pricing table notes. " * 6, fontsize=10)
+        buf = io.BytesIO()
+        doc.save(buf)
+        doc.close()
+        return buf.getvalue()
+
+    def test_parallel_parse_matches_serial(self, monkeypatch):
+        from app.document_parser import shutdown_pdf_pool
+
+        pdf_bytes = self._make_pdf(9)
+        monkeypatch.setenv("PDF_PARSE_WORKERS", "1")
+        serial = parse_pdf_bytes(pdf_bytes)
+
+        monkeypatch.setenv("PDF_PARSE_WORKERS", "2")
+        monkeypatch.setenv("PDF_PARSE_PARALLEL_MIN_PAGES", "2")
+        try:
+            parallel = parse_pdf_bytes(pdf_bytes)
+        finally:
+            shutdown_pdf_pool()
+
+        assert [(c.page, c.text, c.bbox) for c in parallel] == [(c.page, c.text, c.bbox) for c in serial]
+
+    def test_pool_failure_falls_back_to_serial(self, monkeypatch):
+        def broken(*args, **kwargs):
+            raise RuntimeError("pool unavailable")
+
+        monkeypatch.setenv("PDF_PARSE_WORKERS", "2")
+        monkeypatch.setenv("PDF_PARSE_PARALLEL_MIN_PAGES", "2")
+        monkeypatch.setattr("app.document_parser._extract_pdf_parallel", broken)
+        chunks = parse_pdf_bytes(self._make_pdf(3))
+        assert {c.page for c in chunks} >= {1}
+
+    def test_page_ranges_cover_all_pages_in_order(self):
+        from app.document_parser import _page_ranges
+
+        assert _page_ranges(10, 4) == [(0, 3), (3, 6), (6, 9), (9, 10)]
+        assert _page_ranges(2, 8) == [(0, 1), (1, 2)]
+
+
 class TestParsePlainText:
     def test_parse_simple_text(self):
         text = "第一段内容。" * 20 + "\n\n" + "第二段内容。" * 20
@@ -177,6 +251,29 @@ class TestParseFileBytes:
         assert len(result) >= 1
         assert result[0]["content_source"] == "text_local"
 
+    def test_iter_parse_file_bytes_matches_list_api(self):
+        text = "\n\n".join(f"第{i}条 评分要求说明。" * 10 for i in range(40))
+        streamed = iter_parse_file_bytes(text.encode("utf-8"), filename="criteria.txt", document_id="doc_iter")
+        listed = parse_file_bytes(text.encode("utf-8"), filename="criteria.txt", document_id="doc_iter")
+        first = next(streamed)
+        rest = list(streamed)
+        assert [c["chunk_hash"] for c in [first, *rest]] == [c["chunk_hash"] for c in listed]
+
+    def test_chunk_ids_are_content_addressed(self):
+        text = ("评标标准第一条\n\n" + "详细描述内容。" * 30 + "\n\n") * 4
+        first = parse_file_bytes(text.encode("utf-8"), filename="criteria.txt", document_id="doc_a")
+        again = parse_file_bytes(text.encode("utf-8"), filename="criteria.txt", document_id="doc_a")
+        upgraded = parse_file_bytes(
+            text.encode("utf-8"), filename="criteria.txt", document_id="doc_a", parser_version="v2"
+        )
+        ids = [c["chunk_id"] for c in first]
+        assert ids == [c["chunk_id"] for c in again]
+        assert len(set(ids)) == len(ids)
+        assert set(ids).isdisjoint(c["chunk_id"] for c in upgraded)
+        # Same file under another document (e.g. another tenant's upload) must not collide.
+        other = parse_file_bytes(text.encode("utf-8"), filename="criteria.txt", document_id="doc_b")
+        assert set(ids).isdisjoint(c["chunk_id"] for c in other)
+
     def test_chunk_schema_completeness(self):
         text = "内容 " * 100
         result = parse_file_bytes(
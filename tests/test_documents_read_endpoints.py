@@ -73,3 +73,64 @@ def test_get_document_chunks_cross_tenant_is_blocked(client):
     )
     assert denied.status_code == 403
     assert denied.json()["error"]["code"] == "TENANT_SCOPE_VIOLATION"
+
+
+def test_get_document_raw_serves_full_body_and_byte_ranges(client):
+    document_id = _upload_doc(client, key="idem_doc_read_upload_5")
+    full = client.get(f"/api/v1/documents/{document_id}/raw", headers={"x-tenant-id": "tenant_a"})
+    assert full.status_code == 200
+    assert full.content == b"%PDF-1.4 doc read"
+    assert full.headers["content-type"] == "application/pdf"
+    assert full.headers["accept-ranges"] == "bytes"
+
+    ranged = client.get(
+        f"/api/v1/documents/{document_id}/raw",
+        headers={"x-tenant-id": "tenant_a", "Range": "bytes=0-7"},
+    )
+    assert ranged.status_code == 206
+    assert ranged.content == b"%PDF-1.4"
+    assert ranged.headers["content-range"] == "bytes 0-7/17"
+
+
+def test_get_document_raw_streams_ranges_without_local_path(client, monkeypatch):
+    from app.store import store
+
+    document_id = _upload_doc(client, key="idem_doc_read_upload_6")
+    monkeypatch.setattr(store.object_storage, "local_path", lambda **kwargs: None)
+    url = f"/api/v1/documents/{document_id}/raw"
+
+    full = client.get(url, headers={"x-tenant-id": "tenant_a"})
+    assert full.status_code == 200
+    assert full.content == b"%PDF-1.4 doc read"
+
+    suffix = client.get(url, headers={"x-tenant-id": "tenant_a", "Range": "bytes=-4"})
+    assert suffix.status_code == 206
+    assert suffix.content == b"read"
+    assert suffix.headers["content-range"] == "bytes 13-16/17"
+    assert suffix.headers["content-length"] == "4"
+
+    open_ended = client.get(url, headers={"x-tenant-id": "tenant_a", "Range": "bytes=9-"})
+    assert open_ended.status_code == 206
+    assert open_ended.content == b"doc read"
+
+    unsatisfiable = client.get(url, headers={"x-tenant-id": "tenant_a", "Range": "bytes=100-200"})
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable.headers["content-range"] == "bytes */17"
+
+
+def test_get_document_raw_redirects_when_backend_offers_url(client, monkeypatch):
+    from app.store import store
+
+    document_id = _upload_doc(client, key="idem_doc_read_upload_7")
+    monkeypatch.setattr(
+        store.object_storage,
+        "download_redirect_url",
+        lambda **kwargs: "https://bucket.example.com/raw.pdf?sig=abc",
+    )
+    resp = client.get(
+        f"/api/v1/documents/{document_id}/raw",
+        headers={"x-tenant-id": "tenant_a"},
+        follow_redirects=False,
+    )
+    assert resp.status_code == 307
+    assert resp.headers["location"] == "https://bucket.example.com/raw.pdf?sig=abc"
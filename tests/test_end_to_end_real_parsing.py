@@ -11,6 +11,7 @@ import io
 
 import pytest
 
+from app import lightrag_service
 from app.store import store
 
 
@@ -305,6 +306,23 @@ class TestEvaluationWithLlmProvider:
 class TestFullPipelineE2E:
     """End-to-end: upload PDF → parse → Chroma index → Chroma retrieve → evaluate."""
 
+    @pytest.fixture(autouse=True)
+    def _local_index(self, monkeypatch, tmp_path):
+        # A private Chroma directory and hash embeddings, so the index job
+        # cannot fail on a missing model or shared client state.
+        monkeypatch.setenv("CHROMA_PERSIST_DIR", str(tmp_path / "chroma"))
+        monkeypatch.setenv("EMBEDDING_BACKEND", "simple")
+        monkeypatch.setenv("LIGHTRAG_INDEX_MODE", "async")
+        self._reset_index_clients()
+        yield
+        self._reset_index_clients()
+
+    @staticmethod
+    def _reset_index_clients() -> None:
+        lightrag_service._chroma_client.cache_clear()
+        lightrag_service._embedding_fn.cache_clear()
+        lightrag_service.reset_collection_cache()
+
     def _upload_and_parse(self, client, *, tenant_id: str, project_id: str, supplier_id: str):
         pdf_bytes = _make_pdf_with_content(
             [
@@ -356,6 +374,8 @@ class TestFullPipelineE2E:
         data = upload_resp.json()["data"]
         result = store.run_job_once(job_id=data["job_id"], tenant_id=tenant_id)
         assert result["final_status"] == "succeeded"
+        index_result = store.run_job_once(job_id=result["index_job_id"], tenant_id=tenant_id)
+        assert index_result["final_status"] == "succeeded"
         return data["document_id"]
 
     def test_full_pipeline_upload_parse_index_retrieve_evaluate(self, client):
@@ -174,6 +174,20 @@ def test_cost_gate_block(client):
     assert "BUDGET_ALERT_COVERAGE_LOW" in data["failed_checks"]
 
 
+def test_cost_gate_reports_llm_cache_hit_rate(client):
+    payload = _cost_payload()
+    payload["metrics"]["llm_cache_hit_rate"] = 0.4
+    resp = client.post(
+        "/api/v1/internal/cost-gates/evaluate",
+        headers={"x-internal-debug": "true"},
+        json=payload,
+    )
+    assert resp.status_code == 200
+    data = resp.json()["data"]
+    assert data["passed"] is True
+    assert data["values"]["llm_cache_hit_rate"] == 0.4
+
+
 def test_cost_gate_requires_internal_header(client):
     resp = client.post(
         "/api/v1/internal/cost-gates/evaluate",
@@ -0,0 +1,145 @@
+import io
+
+from app.store import store
+
+
+def _pdf(pages: int) -> bytes:
+    import pymupdf
+
+    doc = pymupdf.open()
+    for i in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Section {i + 1} supplier qualification evidence. " * 6, fontsize=10)
+        page.insert_text((72, 400), f"Page {i + 1} pricing and delivery commitments. " * 6, fontsize=10)
+    buf = io.BytesIO()
+    doc.save(buf)
+    doc.close()
+    return buf.getvalue()
+
+
+def _upload_and_parse(client) -> str:
+    resp = client.post(
+        "/api/v1/documents/upload",
+        data={"project_id": "prj_reparse", "supplier_id": "sup_reparse", "doc_type": "bid"},
+        files={"file": ("reparse.pdf", io.BytesIO(_pdf(6)), "application/pdf")},
+        headers={"Idempotency-Key": "idem_reparse_upload"},
+    )
+    assert resp.status_code == 202
+    data = resp.json()["data"]
+    assert store.run_job_once(job_id=data["job_id"], tenant_id="tenant_default")["final_status"] == "succeeded"
+    return data["document_id"]
+
+
+def _reparse(client, document_id: str, *, key: str) -> dict:
+    resp = client.post(f"/api/v1/documents/{document_id}/parse", headers={"Idempotency-Key": key})
+    assert resp.status_code == 202
+    job_id = resp.json()["data"]["job_id"]
+    assert store.run_job_once(job_id=job_id, tenant_id="tenant_default")["final_status"] == "succeeded"
+    return store.get_parse_manifest_for_tenant(job_id=job_id, tenant_id="tenant_default")
+
+
+def _chunk_ids(document_id: str) -> list[str]:
+    chunks = store.list_document_chunks_for_tenant(document_id=document_id, tenant_id="tenant_default")
+    return [c["chunk_id"] for c in chunks]
+
+
+def _capture_index(monkeypatch) -> tuple[list[str], list[str]]:
+    written: list[str] = []
+    deleted: list[str] = []
+    monkeypatch.setenv("LIGHTRAG_INDEX_MODE", "sync")
+    monkeypatch.setattr(store, "_write_index_batch", lambda **kw: written.extend(c["chunk_id"] for c in kw["chunks"]))
+    monkeypatch.setattr(
+        "app.lightrag_service.delete_chunks", lambda **kw: deleted.extend(kw["chunk_ids"]) or len(kw["chunk_ids"])
+    )
+    return written, deleted
+
+
+def _amend_first_chunk(monkeypatch, document_id: str) -> None:
+    real_iter = store._iter_parse_document_file
+
+    def edited(**kwargs):
+        for i, chunk in enumerate(real_iter(**kwargs)):
+            if i == 0:
+                chunk = store._ensure_chunk_shape(
+                    document_id=document_id,
+                    chunk={**chunk, "text": chunk["text"] + " (amended)", "chunk_id": "ck_amended", "chunk_hash": ""},
+                )
+            yield chunk
+
+    monkeypatch.setattr(store, "_iter_parse_document_file", edited)
+
+
+def test_reparse_of_unchanged_file_keeps_ids_and_skips_indexing(client, monkeypatch):
+    written, deleted = _capture_index(monkeypatch)
+    document_id = _upload_and_parse(client)
+    original = _chunk_ids(document_id)
+    assert len(original) > 1
+    assert sorted(written) == sorted(original)
+    written.clear()
+
+    manifest = _reparse(client, document_id, key="idem_reparse_same")
+
+    assert _chunk_ids(document_id) == original
+    assert written == []
+    assert deleted == []
+    assert manifest["reparse"] == {"chunks_reused": len(original), "chunks_added": 0, "chunks_removed": 0}
+
+
+def test_reparse_only_reindexes_changed_chunks(client, monkeypatch):
+    written, deleted = _capture_index(monkeypatch)
+    document_id = _upload_and_parse(client)
+    original = _chunk_ids(document_id)
+    written.clear()
+
+    _amend_first_chunk(monkeypatch, document_id)
+    manifest = _reparse(client, document_id, key="idem_reparse_edit")
+
+    current = _chunk_ids(document_id)
+    assert "ck_amended" in current
+    assert set(current) - {"ck_amended"} == set(original[1:])
+    assert written == ["ck_amended"]
+    assert deleted == [original[0]]
+    assert manifest["reparse"]["chunks_removed"] == 1
+    assert store.parser_retrieval_metrics["parse_reparse_chunks_deleted_total"] == 1
+
+
+def test_async_reparse_index_job_only_indexes_changed_chunks(client, monkeypatch):
+    written, _ = _capture_index(monkeypatch)
+    monkeypatch.setenv("LIGHTRAG_INDEX_MODE", "async")
+    document_id = _upload_and_parse(client)
+    written.clear()
+
+    _amend_first_chunk(monkeypatch, document_id)
+    resp = client.post(f"/api/v1/documents/{document_id}/parse", headers={"Idempotency-Key": "idem_reparse_async"})
+    result = store.run_job_once(job_id=resp.json()["data"]["job_id"], tenant_id="tenant_default")
+    assert result["final_status"] == "succeeded"
+    index_job = store.get_job_for_tenant(job_id=result["index_job_id"], tenant_id="tenant_default")
+    assert index_job["payload"]["chunk_ids"] == ["ck_amended"]
+    assert index_job["payload"]["chunk_count"] == 1
+
+    assert store.run_job_once(job_id=result["index_job_id"], tenant_id="tenant_default")["final_status"] == "succeeded"
+    assert written == ["ck_amended"]
+
+
+def test_aborted_reparse_deletes_nothing_from_the_index(client, monkeypatch):
+    monkeypatch.setenv("PARSE_PERSIST_BATCH_SIZE", "1")
+    written, deleted = _capture_index(monkeypatch)
+    document_id = _upload_and_parse(client)
+    original = _chunk_ids(document_id)
+    assert len(original) > 1
+
+    real_iter = store._iter_parse_document_file
+
+    def aborting(**kwargs):
+        for i, chunk in enumerate(real_iter(**kwargs)):
+            if i == 1:
+                raise RuntimeError("page decode failed")
+            yield chunk
+
+    monkeypatch.setattr(store, "_iter_parse_document_file", aborting)
+    resp = client.post(f"/api/v1/documents/{document_id}/parse", headers={"Idempotency-Key": "idem_reparse_abort"})
+    job_id = resp.json()["data"]["job_id"]
+
+    assert store.run_job_once(job_id=job_id, tenant_id="tenant_default")["final_status"] == "retrying"
+    assert deleted == []
+    assert store.parser_retrieval_metrics["parse_reparse_chunks_deleted_total"] == 0
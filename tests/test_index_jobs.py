@@ -0,0 +1,145 @@
+from io import BytesIO
+
+from app.store import store
+
+
+def _upload_and_parse(client, *, key: str = "idem_index_job_upload") -> dict:
+    resp = client.post(
+        "/api/v1/documents/upload",
+        data={"project_id": "prj_idx", "supplier_id": "sup_idx", "doc_type": "bid"},
+        files={"file": ("index-me.pdf", BytesIO(b"%PDF-1.4 index"), "application/pdf")},
+        headers={"Idempotency-Key": key},
+    )
+    assert resp.status_code == 202
+    data = resp.json()["data"]
+    result = store.run_job_once(job_id=data["job_id"], tenant_id="tenant_default")
+    assert result["final_status"] == "succeeded"
+    return {"document_id": data["document_id"], "index_job_id": result.get("index_job_id")}
+
+
+def _seed_parsed_document(chunk_count: int) -> tuple[str, str]:
+    document_id = "doc_index_batches"
+    store._persist_document(
+        document={
+            "document_id": document_id,
+            "tenant_id": "tenant_default",
+            "project_id": "prj_idx",
+            "supplier_id": "sup_idx",
+            "doc_type": "bid",
+            "filename": "batches.pdf",
+            "status": "parsed",
+        }
+    )
+    chunks = [{"chunk_id": f"ck_idx_{i}", "text": f"clause {i}", "page": i + 1} for i in range(chunk_count)]
+    store._persist_document_chunks(tenant_id="tenant_default", document_id=document_id, chunks=chunks)
+    job_id = store._enqueue_index_job(
+        tenant_id="tenant_default",
+        document=store.get_document_for_tenant(document_id=document_id, tenant_id="tenant_default"),
+        chunk_count=chunk_count,
+        parse_job_id="job_parse_src",
+        trace_id=None,
+    )
+    return document_id, job_id
+
+
+def test_parse_job_enqueues_index_job_instead_of_indexing_inline(client, monkeypatch):
+    writes: list[int] = []
+    monkeypatch.setattr(store, "_write_index_batch", lambda **kw: writes.append(len(kw["chunks"])))
+
+    parsed = _upload_and_parse(client)
+
+    assert writes == []
+    assert parsed["index_job_id"]
+    index_job = store.get_job_for_tenant(job_id=parsed["index_job_id"], tenant_id="tenant_default")
+    assert index_job["job_type"] == "index"
+    assert index_job["status"] == "queued"
+    document = store.get_document_for_tenant(document_id=parsed["document_id"], tenant_id="tenant_default")
+    assert document["status"] == "parsed"
+    events = store.list_outbox_events(tenant_id="tenant_default", status="pending")
+    assert any(e["payload"].get("job_type") == "index" for e in events)
+
+    result = store.run_job_once(job_id=parsed["index_job_id"], tenant_id="tenant_default")
+
+    assert result["final_status"] == "succeeded"
+    assert writes
+    document = store.get_document_for_tenant(document_id=parsed["document_id"], tenant_id="tenant_default")
+    assert document["status"] == "indexed"
+    assert store.parser_retrieval_metrics["parse_index_jobs_enqueued_total"] == 1
+
+
+def test_sync_index_mode_keeps_inline_indexing(client, monkeypatch):
+    monkeypatch.setenv("LIGHTRAG_INDEX_MODE", "sync")
+    writes: list[int] = []
+    monkeypatch.setattr(store, "_write_index_batch", lambda **kw: writes.append(len(kw["chunks"])))
+
+    parsed = _upload_and_parse(client, key="idem_index_job_sync")
+
+    assert parsed["index_job_id"] is None
+    assert writes
+
+
+def test_index_job_writes_in_batches(monkeypatch):
+    monkeypatch.setenv("LIGHTRAG_INDEX_BATCH_SIZE", "2")
+    batches: list[list[str]] = []
+    monkeypatch.setattr(
+        store,
+        "_write_index_batch",
+        lambda **kw: batches.append([c["chunk_id"] for c in kw["chunks"]]),
+    )
+    _, job_id = _seed_parsed_document(5)
+
+    result = store.run_job_once(job_id=job_id, tenant_id="tenant_default")
+
+    assert result["final_status"] == "succeeded"
+    assert [len(b) for b in batches] == [2, 2, 1]
+    assert store.parser_retrieval_metrics["parse_index_batches_total"] == 3
+    job = store.get_job_for_tenant(job_id=job_id, tenant_id="tenant_default")
+    assert job["payload"]["index_cursor"] == 5
+
+
+def test_index_job_failure_retries_resumes_and_recovers_from_dlq(monkeypatch):
+    monkeypatch.setenv("LIGHTRAG_INDEX_BATCH_SIZE", "2")
+    monkeypatch.setattr(store, "worker_max_retries", 1)
+    written: list[str] = []
+    fail = {"on": True}
+
+    def flaky_write(**kw):
+        ids = [c["chunk_id"] for c in kw["chunks"]]
+        if fail["on"] and written:
+            raise OSError("lightrag down")
+        written.extend(ids)
+
+    monkeypatch.setattr(store, "_write_index_batch", flaky_write)
+    _, job_id = _seed_parsed_document(4)
+
+    first = store.run_job_once(job_id=job_id, tenant_id="tenant_default")
+    assert first["final_status"] == "retrying"
+    assert first["retry_after_ms"] >= 0
+    job = store.get_job_for_tenant(job_id=job_id, tenant_id="tenant_default")
+    assert job["payload"]["index_cursor"] == 2
+    assert job["last_error"]["code"] == "RAG_INDEX_WRITE_FAILED"
+
+    second = store.run_job_once(job_id=job_id, tenant_id="tenant_default")
+    assert second["final_status"] == "failed"
+    assert second["dlq_id"]
+    assert store.parser_retrieval_metrics["parse_index_fail_total"] == 2
+    document = store.get_document_for_tenant(document_id="doc_index_batches", tenant_id="tenant_default")
+    assert document["status"] == "parsed"
+
+    fail["on"] = False
+    requeued = store.requeue_dlq_item(dlq_id=second["dlq_id"], trace_id=None, tenant_id="tenant_default")
+    recovery_job = store.get_job_for_tenant(job_id=requeued["job_id"], tenant_id="tenant_default")
+    assert recovery_job["job_type"] == "index"
+
+    recovered = store.run_job_once(job_id=requeued["job_id"], tenant_id="tenant_default")
+    assert recovered["final_status"] == "succeeded"
+    assert written == ["ck_idx_0", "ck_idx_1", "ck_idx_2", "ck_idx_3"]
+
+
+def test_ops_metrics_report_pending_index_lag():
+    _seed_parsed_document(1)
+
+    metrics = store.summarize_ops_metrics(tenant_id="tenant_default")
+
+    assert metrics["worker"]["index_jobs_pending"] == 1
+    assert metrics["worker"]["index_lag_ms"] >= 0
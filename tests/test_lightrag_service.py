@@ -0,0 +1,374 @@
+"""Tests for app.lightrag_service – in-process Chroma indexing and query."""
+
+from __future__ import annotations
+
+import uuid
+
+import chromadb
+import pytest
+
+from app import lightrag_service
+from app.bm25_index import Bm25Index
+from app.lightrag_service import (
+    SimpleEmbeddingFunction,
+    embedding_reuse_stats,
+    index_chunks_to_collection,
+    index_chunks_with_stats,
+    query_collection,
+    reset_embedding_reuse_stats,
+)
+
+
+class CountingEmbeddingFunction(SimpleEmbeddingFunction):
+    def __init__(self) -> None:
+        super().__init__(dim=16)
+        self.embedded: list[str] = []
+
+    def __call__(self, input):
+        self.embedded.extend(input)
+        return super().__call__(input)
+
+
+@pytest.fixture
+def embedding_fn(monkeypatch, tmp_path):
+    fn = CountingEmbeddingFunction()
+    client = chromadb.PersistentClient(path=str(tmp_path / "chroma"))
+    monkeypatch.setattr(lightrag_service, "_embedding_fn", lambda: fn)
+    monkeypatch.setattr(lightrag_service, "_chroma_client", lambda: client)
+    bm25 = Bm25Index()
+    monkeypatch.setattr(lightrag_service, "get_bm25_index", lambda: bm25)
+    reset_embedding_reuse_stats()
+    return fn
+
+
+def _index_name() -> str:
+    return f"lightrag_test_{uuid.uuid4().hex[:10]}"
+
+
+def _chunks(*texts: str, prefix: str = "ck") -> list[dict]:
+    return [
+        {
+            "chunk_id": f"{prefix}_{i}",
+            "text": text,
+            "heading_path": ["第一章", "技术要求"],
+            "positions": [{"page": i + 1, "bbox": [1, 2, 3, 4]}],
+        }
+        for i, text in enumerate(texts)
+    ]
+
+
+def _index(index_name: str, chunks: list[dict]) -> dict[str, int]:
+    return index_chunks_with_stats(
+        index_name=index_name,
+        tenant_id="tenant_a",
+        project_id="prj_a",
+        supplier_id="sup_a",
+        document_id="doc_a",
+        doc_type="bid",
+        chunks=chunks,
+    )
+
+
+def test_reindex_reuses_embeddings_for_unchanged_text(embedding_fn):
+    index_name = _index_name()
+    first = _index(index_name, _chunks("交货期为30天", "质保期12个月"))
+    assert first == {"indexed": 2, "embeddings_reused": 0, "embeddings_computed": 2}
+
+    embedding_fn.embedded.clear()
+    second = _index(index_name, _chunks("交货期为30天", "质保期12个月", "付款方式为月结", prefix="ck_v2"))
+
+    assert second == {"indexed": 3, "embeddings_reused": 2, "embeddings_computed": 1}
+    assert embedding_fn.embedded == ["付款方式为月结"]
+    assert embedding_reuse_stats() == {
+        "embeddings_requested_total": 5,
+        "embeddings_reused_total": 2,
+        "embeddings_computed_total": 3,
+    }
+
+
+def test_duplicate_text_in_one_batch_is_embedded_once(embedding_fn):
+    stats = _index(_index_name(), _chunks("同一段落", "同一段落", "另一段落"))
+    assert stats["embeddings_computed"] == 2
+    assert sorted(embedding_fn.embedded) == ["另一段落", "同一段落"]
+
+
+def test_embedding_reuse_can_be_disabled(embedding_fn, monkeypatch):
+    index_name = _index_name()
+    _index(index_name, _chunks("交货期为30天"))
+    monkeypatch.setenv("LIGHTRAG_EMBEDDING_REUSE", "false")
+    stats = _index(index_name, _chunks("交货期为30天"))
+    assert stats == {"indexed": 1, "embeddings_reused": 0, "embeddings_computed": 1}
+
+
+def test_query_decodes_list_metadata(embedding_fn):
+    index_name = _index_name()
+    assert (
+        index_chunks_to_collection(
+            index_name=index_name,
+            tenant_id="tenant_a",
+            project_id="prj_a",
+            supplier_id="sup_a",
+            document_id="doc_a",
+            doc_type="bid",
+            chunks=_chunks("交货期为30天"),
+        )
+        == 1
+    )
+    result = query_collection(
+        index_name=index_name,
+        query="交货期为30天",
+        top_k=5,
+        tenant_id="tenant_a",
+        project_id="prj_a",
+        supplier_id="sup_a",
+    )
+    assert len(result["items"]) == 1
+    metadata = result["items"][0]["metadata"]
+    assert metadata["bbox"] == [1.0, 2.0, 3.0, 4.0]
+    assert metadata["heading_path"] == ["第一章", "技术要求"]
+
+
+def _query(index_name: str, query: str, *, mode: str, top_k: int = 3) -> list[dict]:
+    return query_collection(
+        index_name=index_name,
+        query=query,
+        top_k=top_k,
+        tenant_id="tenant_a",
+        project_id="prj_a",
+        supplier_id="sup_a",
+        mode=mode,
+    )["items"]
+
+
+def test_hybrid_mode_fuses_bm25_hits_for_exact_codes(embedding_fn):
+    index_name = _index_name()
+    filler = [f"一般性说明段落 {i}" for i in range(20)]
+    _index(index_name, _chunks(*filler, "产品型号 ZX-9000A 满足招标文件第5.2.3条要求"))
+
+    items = _query(index_name, "ZX-9000A", mode="hybrid")
+
+    assert items[0]["chunk_id"] == "ck_20"
+    assert items[0]["reason"] in {"bm25", "hybrid_rrf"}
+    assert 0.0 < items[0]["score_raw"] <= 1.0
+    assert items[0]["metadata"]["heading_path"] == ["第一章", "技术要求"]
+
+
+def test_global_mode_stays_vector_only(embedding_fn):
+    index_name = _index_name()
+    _index(index_name, _chunks("交货期为30天", "质保期12个月"))
+
+    items = _query(index_name, "质保期", mode="global")
+
+    assert items
+    assert {item["reason"] for item in items} == {"vector_similarity"}
+
+
+def test_bm25_respects_tenant_filters(embedding_fn):
+    index_name = _index_name()
+    _index(index_name, _chunks("第5.2.3条 质保期"))
+
+    items = query_collection(
+        index_name=index_name,
+        query="5.2.3",
+        top_k=3,
+        tenant_id="tenant_a",
+        project_id="prj_a",
+        supplier_id="sup_other",
+        mode="local",
+    )["items"]
+
+    assert items == []
+
+
+def test_must_include_is_pushed_down_and_fills_top_k(embedding_fn):
+    index_name = _index_name()
+    texts = [f"一般性说明段落 {i}" for i in range(30)] + [f"质保期{i}个月" for i in range(6)]
+    _index(index_name, _chunks(*texts))
+
+    result = query_collection(
+        index_name=index_name,
+        query="一般性说明",
+        top_k=5,
+        tenant_id="tenant_a",
+        project_id="prj_a",
+        supplier_id="sup_a",
+        mode="global",
+        must_include=["质保"],
+        must_exclude=["质保期0个月"],
+    )
+
+    assert result["constraints_applied"] is True
+    assert len(result["items"]) == 5
+    assert all("质保" in item["text"] and "质保期0个月" not in item["text"] for item in result["items"])
+
+
+def test_constraints_fall_back_to_where_document_without_bm25(embedding_fn, monkeypatch):
+    monkeypatch.setenv("LIGHTRAG_BM25_ENABLED", "false")
+    index_name = _index_name()
+    _index(index_name, _chunks("产品型号 ZX-9000A", "产品型号 KQ-100"))
+
+    result = query_collection(
+        index_name=index_name,
+        query="产品型号",
+        top_k=5,
+        tenant_id="tenant_a",
+        project_id="prj_a",
+        supplier_id="sup_a",
+        must_include=["ZX-9000A"],
+    )
+
+    assert result["constraints_applied"] is False
+    assert [item["chunk_id"] for item in result["items"]] == ["ck_0"]
+
+
+def test_collections_without_bm25_rows_skip_pushdown_until_rebuilt(embedding_fn, monkeypatch):
+    monkeypatch.setenv("LIGHTRAG_BM25_ENABLED", "false")
+    index_name = _index_name()
+    _index(index_name, _chunks("产品型号 ZX-9000A", "产品型号 KQ-100"))
+    monkeypatch.setenv("LIGHTRAG_BM25_ENABLED", "true")
+
+    def constrained() -> dict:
+        return query_collection(
+            index_name=index_name,
+            query="产品型号",
+            top_k=5,
+            tenant_id="tenant_a",
+            project_id="prj_a",
+            supplier_id="sup_a",
+            must_include=["ZX-9000A"],
+        )
+
+    result = constrained()
+    assert result["constraints_applied"] is False
+    assert [item["chunk_id"] for item in result["items"]] == ["ck_0"]
+
+    assert lightrag_service.rebuild_bm25_from_collection(index_name, batch_size=1) == 2
+    result = constrained()
+    assert result["constraints_applied"] is True
+    assert [item["chunk_id"] for item in result["items"]] == ["ck_0"]
+
+
+def _index_supplier(index_name: str, supplier_id: str, *texts: str) -> None:
+    index_chunks_with_stats(
+        index_name=index_name,
+        tenant_id="tenant_a",
+        project_id="prj_a",
+        supplier_id=supplier_id,
+        document_id=f"doc_{supplier_id}",
+        doc_type="bid",
+        chunks=_chunks(*texts, prefix=f"ck_{supplier_id}"),
+    )
+
+
+def _query_supplier(index_name: str, supplier_id: str, query: str) -> list[dict]:
+    return query_collection(
+        index_name=index_name,
+        query=query,
+        top_k=5,
+        tenant_id="tenant_a",
+        project_id="prj_a",
+        supplier_id=supplier_id,
+    )["items"]
+
+
+def test_collection_handles_are_cached(embedding_fn, monkeypatch):
+    index_name = _index_name()
+    client = lightrag_service._chroma_client()
+    calls: list[str] = []
+    original = client.get_or_create_collection
+
+    def counting_get_or_create(*args, **kwargs):
+        calls.append(kwargs.get("name"))
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(client, "get_or_create_collection", counting_get_or_create)
+    _index(index_name, _chunks("交货期为30天"))
+    _query(index_name, "交货期", mode="hybrid")
+    _query(index_name, "交货期", mode="hybrid")
+
+    assert calls == [index_name]
+
+
+def test_supplier_sharding_isolates_vectors(embedding_fn, monkeypatch):
+    monkeypatch.setenv("LIGHTRAG_SHARD_BY_SUPPLIER", "true")
+    index_name = _index_name()
+    _index_supplier(index_name, "sup_a", "交货期为30天")
+    _index_supplier(index_name, "sup_b", "交货期为45天", "质保期24个月")
+
+    client = lightrag_service._chroma_client()
+    shard_a = client.get_collection(lightrag_service.shard_collection_name(index_name, "sup_a"))
+    shard_b = client.get_collection(lightrag_service.shard_collection_name(index_name, "sup_b"))
+    assert (shard_a.count(), shard_b.count()) == (1, 2)
+
+    items = _query_supplier(index_name, "sup_a", "交货期")
+    assert [item["chunk_id"] for item in items] == ["ck_sup_a_0"]
+
+
+def test_rebalance_splits_and_merges_supplier_shards(embedding_fn, monkeypatch):
+    index_name = _index_name()
+    _index_supplier(index_name, "sup_a", "交货期为30天")
+    _index_supplier(index_name, "sup_b", "交货期为45天", "质保期24个月")
+
+    monkeypatch.setenv("LIGHTRAG_SHARD_BY_SUPPLIER", "true")
+    # Before rebalancing, sharded queries fall back to the unsharded collection.
+    assert [i["chunk_id"] for i in _query_supplier(index_name, "sup_b", "质保期")][0] == "ck_sup_b_1"
+
+    dry = lightrag_service.rebalance_collection(index_name, shard_by_supplier=True, dry_run=True)
+    assert sum(dry["moved"].values()) == 3
+    assert lightrag_service._collection(index_name).count() == 3
+
+    embedding_fn.embedded.clear()
+    result = lightrag_service.rebalance_collection(index_name, shard_by_supplier=True, batch_size=2)
+    assert result["moved"] == {
+        lightrag_service.shard_collection_name(index_name, "sup_a"): 1,
+        lightrag_service.shard_collection_name(index_name, "sup_b"): 2,
+    }
+    assert embedding_fn.embedded == []  # stored vectors are copied, not re-embedded
+    assert [i["chunk_id"] for i in _query_supplier(index_name, "sup_b", "质保期")][0] == "ck_sup_b_1"
+    assert [i["chunk_id"] for i in _query_supplier(index_name, "sup_a", "交货期")] == ["ck_sup_a_0"]
+
+    monkeypatch.setenv("LIGHTRAG_SHARD_BY_SUPPLIER", "false")
+    merged = lightrag_service.rebalance_collection(index_name, shard_by_supplier=False)
+    assert merged["moved"] == {index_name: 3}
+    assert lightrag_service._collection(index_name).count() == 3
+    assert [i["chunk_id"] for i in _query_supplier(index_name, "sup_b", "24")][0] == "ck_sup_b_1"
+
+
+def test_sharded_reads_cover_unmigrated_rows_without_creating_shards(embedding_fn, monkeypatch):
+    index_name = _index_name()
+    _index_supplier(index_name, "sup_a", "交货期为30天")
+    client = lightrag_service._chroma_client()
+    shard_a = lightrag_service.shard_collection_name(index_name, "sup_a")
+
+    monkeypatch.setenv("LIGHTRAG_SHARD_BY_SUPPLIER", "true")
+    assert [i["chunk_id"] for i in _query_supplier(index_name, "sup_a", "交货期")] == ["ck_sup_a_0"]
+    assert shard_a not in {c if isinstance(c, str) else c.name for c in client.list_collections()}
+
+    # New writes land in the shard; the old row is still found in the base collection.
+    index_chunks_with_stats(
+        index_name=index_name,
+        tenant_id="tenant_a",
+        project_id="prj_a",
+        supplier_id="sup_a",
+        document_id="doc_new",
+        doc_type="bid",
+        chunks=_chunks("交货期为60天", prefix="ck_new"),
+    )
+    ids = {i["chunk_id"] for i in _query_supplier(index_name, "sup_a", "交货期")}
+    assert ids == {"ck_sup_a_0", "ck_new_0"}
+
+    lightrag_service.delete_chunks(index_name=index_name, supplier_id="sup_a", chunk_ids=["ck_sup_a_0", "ck_new_0"])
+    assert _query_supplier(index_name, "sup_a", "交货期") == []
+
+
+def test_rebalance_keeps_supplierless_rows_reachable(embedding_fn, monkeypatch):
+    index_name = _index_name()
+    _index_supplier(index_name, "sup_a", "交货期为30天")
+    _index_supplier(index_name, "", "招标文件评分办法", "评分细则")
+
+    monkeypatch.setenv("LIGHTRAG_SHARD_BY_SUPPLIER", "true")
+    result = lightrag_service.rebalance_collection(index_name, shard_by_supplier=True, batch_size=1)
+
+    assert result["moved"] == {lightrag_service.shard_collection_name(index_name, "sup_a"): 1}
+    assert lightrag_service._collection_count(index_name) == 2
+    assert {i["chunk_id"] for i in _query_supplier(index_name, "", "评分")} == {"ck__0", "ck__1"}
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import sys
+import types
+
+import pytest
+
+from app.llm_clients import get_openai_client, openai_client_count, reset_openai_clients
+from app.llm_provider import ProviderConfig, _create_client
+
+
+class _FakeHttpClient:
+    def __init__(self, *, limits) -> None:
+        self.limits = limits
+
+
+class _FakeOpenAI:
+    instances: list[_FakeOpenAI] = []
+
+    def __init__(self, **kwargs) -> None:
+        self.kwargs = kwargs
+        self.closed = False
+        self.embeddings = types.SimpleNamespace(
+            create=lambda model, input: types.SimpleNamespace(
+                data=[types.SimpleNamespace(embedding=[0.1, 0.2]) for _ in input]
+            )
+        )
+        _FakeOpenAI.instances.append(self)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture()
+def fake_openai(monkeypatch):
+    _FakeOpenAI.instances = []
+    module = types.SimpleNamespace(OpenAI=_FakeOpenAI, DefaultHttpxClient=_FakeHttpClient)
+    monkeypatch.setitem(sys.modules, "openai", module)
+    yield _FakeOpenAI
+    reset_openai_clients()
+
+
+def test_same_config_reuses_client(fake_openai):
+    a = get_openai_client(provider="openai", api_key="sk-1", base_url="https://api.example.com/v1")
+    b = get_openai_client(provider="openai", api_key="sk-1", base_url="https://api.example.com/v1/")
+    assert a is b
+    assert len(fake_openai.instances) == 1
+    assert a.kwargs["http_client"].limits.max_keepalive_connections == 10
+
+
+def test_changed_api_key_builds_new_client(fake_openai):
+    a = get_openai_client(provider="openai", api_key="sk-1", base_url="")
+    b = get_openai_client(provider="openai", api_key="sk-2", base_url="")
+    assert a is not b
+    assert openai_client_count() == 2
+
+
+def test_pool_is_bounded_and_closes_evicted(fake_openai, monkeypatch):
+    monkeypatch.setattr("app.llm_clients._MAX_CLIENTS", 2)
+    first = get_openai_client(provider="openai", api_key="k1", base_url="")
+    get_openai_client(provider="openai", api_key="k2", base_url="")
+    get_openai_client(provider="openai", api_key="k3", base_url="")
+    assert openai_client_count() == 2
+    assert first.closed
+
+
+def test_reset_closes_clients(fake_openai):
+    client = get_openai_client(provider="openai", api_key="k1", base_url="")
+    reset_openai_clients()
+    assert client.closed
+    assert openai_client_count() == 0
+
+
+def test_llm_and_embedding_share_client(fake_openai):
+    from app.lightrag_service import OpenAICompatEmbeddingFunction
+
+    config = ProviderConfig(provider="openai", model="m", api_key="sk-1", base_url="https://api.example.com/v1")
+    llm_client = _create_client(config)
+    embed = OpenAICompatEmbeddingFunction(model="e", api_key="sk-1", base_url="https://api.example.com/v1")
+    assert len(embed(["a", "b"])) == 2
+    assert _create_client(config) is llm_client
+    assert len(fake_openai.instances) == 1
+
+
+def test_ollama_defaults_api_key(fake_openai):
+    client = _create_client(ProviderConfig(provider="ollama", model="q", base_url="http://localhost:11434/v1"))
+    assert client.kwargs["api_key"] == "ollama"
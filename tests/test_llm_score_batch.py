@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+import app.llm_provider as provider
+from app.llm_provider import LLMUsage, llm_score_criteria_batch, plan_score_batches
+
+
+def _items(n: int, *, text: str = "证据内容") -> list[dict]:
+    return [
+        {
+            "criteria_id": f"c{i}",
+            "criteria_name": f"评分项{i}",
+            "requirement_text": f"要求{i}",
+            "evidence_chunks": [{"chunk_id": f"ck{i}", "page": i + 1, "text": text}],
+            "max_score": 10.0,
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.fixture()
+def batch_llm(monkeypatch):
+    calls: list[str] = []
+    responses: list[str] = []
+
+    def fake_call(*, config, messages, json_mode=False, max_tokens=1024):
+        user = messages[1]["content"]
+        calls.append(user)
+        if responses:
+            return responses.pop(0), LLMUsage(prompt_tokens=600, completion_tokens=101, total_tokens=701, model="m1")
+        if "results" in user:
+            ids = [line.split(": ", 1)[1] for line in user.splitlines() if line.startswith("### 评分项ID: ")]
+            body = {"results": [{"criteria_id": cid, "score": 7, "hard_pass": True, "reason": "ok"} for cid in ids]}
+            return json.dumps(body), LLMUsage(prompt_tokens=600, completion_tokens=101, total_tokens=701, model="m1")
+        return '{"score": 6, "hard_pass": true, "reason": "single"}', LLMUsage(total_tokens=400, model="m1")
+
+    monkeypatch.setattr(provider, "is_real_llm_available", lambda: True)
+    monkeypatch.setattr(provider, "_call_with_degradation", fake_call)
+    monkeypatch.setenv("LLM_SCORE_BATCH_ENABLED", "true")
+    return calls, responses
+
+
+def test_plan_is_one_request_per_criterion_when_disabled(batch_llm, monkeypatch):
+    monkeypatch.setenv("LLM_SCORE_BATCH_ENABLED", "false")
+    assert plan_score_batches(_items(3)) == [[0], [1], [2]]
+
+
+def test_plan_splits_on_criteria_count_and_prompt_tokens(batch_llm, monkeypatch):
+    monkeypatch.setenv("LLM_SCORE_BATCH_MAX_CRITERIA", "2")
+    assert plan_score_batches(_items(5)) == [[0, 1], [2, 3], [4]]
+
+    monkeypatch.setenv("LLM_SCORE_BATCH_MAX_CRITERIA", "8")
+    monkeypatch.setenv("LLM_SCORE_BATCH_MAX_PROMPT_TOKENS", "900")
+    groups = plan_score_batches(_items(4, text="资质证明" * 60))
+    assert all(len(g) < 4 for g in groups)
+    assert [i for g in groups for i in g] == [0, 1, 2, 3]
+
+
+def test_batch_scores_in_one_request_and_splits_usage(batch_llm):
+    calls, _ = batch_llm
+    results = llm_score_criteria_batch(_items(3))
+
+    assert len(calls) == 1
+    assert [r["score"] for r in results] == [7.0, 7.0, 7.0]
+    assert all(r["batched"] for r in results)
+    assert sum(r["usage"]["total_tokens"] for r in results) == 701
+    assert sum(r["usage"]["prompt_tokens"] for r in results) == 600
+
+
+def test_missing_entries_fall_back_per_criterion(batch_llm):
+    calls, responses = batch_llm
+    responses.append(json.dumps({"results": [{"criteria_id": "c0", "score": 9}, {"criteria_id": "c2", "score": "x"}]}))
+    results = llm_score_criteria_batch(_items(3))
+
+    assert len(calls) == 3
+    assert results[0]["score"] == 9.0 and results[0]["usage"]["total_tokens"] == 701
+    assert results[1]["reason"] == "single"
+    assert results[2]["reason"] == "single"
+
+
+def test_unparseable_response_rescored_individually_and_spend_kept(batch_llm):
+    calls, responses = batch_llm
+    responses.append("not json")
+    results = llm_score_criteria_batch(_items(2))
+
+    assert len(calls) == 3
+    assert [r["reason"] for r in results] == ["single", "single"]
+    assert sum(r["usage"]["total_tokens"] for r in results) == 701 + 800
+
+
+def test_cached_criteria_are_left_out_of_the_request(batch_llm):
+    calls, _ = batch_llm
+    llm_score_criteria_batch(_items(2))
+    results = llm_score_criteria_batch(_items(3))
+
+    assert len(calls) == 2
+    assert [r.get("cache_hit", False) for r in results] == [True, True, False]
+    assert calls[-1].startswith("评分项ID: c2")
+
+
+def test_node_uses_fewer_requests_in_batch_mode(batch_llm):
+    from app.evaluation_nodes import node_score_with_llm
+
+    class _Store:
+        citation_sources: dict = {}
+
+        def _resolve_citations_batch(self, ids, include_quote=False):
+            return []
+
+    calls, _ = batch_llm
+    state = {
+        "evaluation_id": "ev_batch",
+        "criteria_defs": [{"criteria_id": f"c{i}", "max_score": 10.0} for i in range(4)],
+        "criteria_evidence": {},
+        "citations_all_ids": [],
+    }
+    out = node_score_with_llm(state, store=_Store())
+
+    assert len(calls) == 1
+    assert [r["criteria_id"] for r in out["criteria_results"]] == ["c0", "c1", "c2", "c3"]
+    assert out["cost_total_tokens"] == 701
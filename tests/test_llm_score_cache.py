@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import pytest
+
+import app.llm_provider as provider
+from app.llm_provider import CostBudgetTracker, LLMUsage, llm_score_criteria
+from app.llm_score_cache import LLMScoreCache, get_llm_score_cache, score_cache_key
+
+_EVIDENCE = [{"chunk_id": "ck_1", "page": 3, "text": "质保期为五年"}]
+
+
+def _key(**overrides) -> str:
+    params = {
+        "model": "m1",
+        "prompt_version": "score_v1",
+        "criteria_id": "warranty",
+        "criteria_name": "质保",
+        "requirement_text": "质保期不少于三年",
+        "max_score": 10.0,
+        "evidence_chunks": _EVIDENCE,
+    }
+    params.update(overrides)
+    return score_cache_key(**params)
+
+
+def test_key_changes_with_model_prompt_version_requirement_and_evidence():
+    base = _key()
+    assert _key() == base
+    assert _key(model="m2") != base
+    assert _key(prompt_version="score_v2") != base
+    assert _key(requirement_text="质保期不少于五年") != base
+    assert _key(evidence_chunks=[{"chunk_id": "ck_1", "page": 3, "text": "质保期为三年"}]) != base
+    # chunk metadata the prompt never sees does not split entries
+    assert _key(evidence_chunks=[{"chunk_id": "other", "page": 3, "text": "质保期为五年"}]) == base
+
+
+def test_ttl_expires_entries(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("app.llm_score_cache.time.monotonic", lambda: clock[0])
+    cache = LLMScoreCache(max_entries=10, ttl_s=60)
+    cache.put("k", {"score": 1.0})
+    assert cache.get("k") == {"score": 1.0}
+    clock[0] += 61
+    assert not cache.peek("k")
+    assert cache.get("k") is None
+    assert cache.stats()["expired"] == 1
+
+
+def test_size_bound_evicts_least_recently_used():
+    cache = LLMScoreCache(max_entries=2, ttl_s=0)
+    cache.put("a", {"score": 1.0})
+    cache.put("b", {"score": 2.0})
+    cache.get("a")
+    cache.put("c", {"score": 3.0})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"score": 1.0}
+
+
+@pytest.fixture()
+def fake_llm(monkeypatch):
+    calls: list[str] = []
+
+    def fake_call(*, config, messages, json_mode=False, max_tokens=1024):
+        calls.append(messages[1]["content"])
+        return '{"score": 8, "hard_pass": true, "reason": "符合", "confidence": 0.9}', LLMUsage(
+            prompt_tokens=300, completion_tokens=50, total_tokens=350, model=config.model
+        )
+
+    monkeypatch.setattr(provider, "is_real_llm_available", lambda: True)
+    monkeypatch.setattr(provider, "_call_with_degradation", fake_call)
+    monkeypatch.setenv("LLM_MODEL", "m1")
+    return calls
+
+
+def _score(**kwargs):
+    return llm_score_criteria("warranty", "质保期不少于三年", _EVIDENCE, max_score=10.0, **kwargs)
+
+
+def test_second_score_is_served_from_cache_with_zero_usage(fake_llm):
+    first = _score()
+    second = _score()
+
+    assert len(fake_llm) == 1
+    assert second["score"] == first["score"] == 8.0
+    assert second["cache_hit"] is True
+    assert second["usage"]["total_tokens"] == 0
+    assert "cache_hit" not in first
+    assert provider.estimate_score_tokens("warranty", "质保期不少于三年", _EVIDENCE, max_score=10.0) == 0
+
+
+def test_bypass_flag_and_env_disable(fake_llm, monkeypatch):
+    _score()
+    _score(use_cache=False)
+    assert len(fake_llm) == 2
+
+    monkeypatch.setenv("LLM_SCORE_CACHE_ENABLED", "false")
+    _score()
+    assert len(fake_llm) == 3
+
+
+def test_degraded_results_are_not_cached(monkeypatch):
+    def degraded_call(*, config, messages, json_mode=False, max_tokens=1024):
+        usage = LLMUsage(total_tokens=100, model="fallback", degraded=True, degrade_reason="primary_failed:Timeout")
+        return '{"score": 5}', usage
+
+    monkeypatch.setattr(provider, "is_real_llm_available", lambda: True)
+    monkeypatch.setattr(provider, "_call_with_degradation", degraded_call)
+    _score()
+    assert get_llm_score_cache().stats()["entries"] == 0
+
+
+def test_cache_hits_are_tracked_by_cost_budget(fake_llm):
+    from app.evaluation_nodes import node_score_with_llm
+
+    class _Store:
+        citation_sources: dict = {}
+
+        def _resolve_citations_batch(self, ids, include_quote=False):
+            return []
+
+    state = {
+        "evaluation_id": "ev_cache",
+        "criteria_defs": [{"criteria_id": "warranty", "criteria_name": "质保", "requirement_text": "质保期不少于三年"}],
+        "criteria_evidence": {"warranty": _EVIDENCE},
+        "citations_all_ids": [],
+    }
+    first = node_score_with_llm(state, store=_Store())
+    second = node_score_with_llm(state, store=_Store())
+
+    assert first["cost_total_tokens"] == 350
+    assert first["cost_cache_hits"] == 0
+    assert second["cost_total_tokens"] == 0
+    assert second["cost_cache_hits"] == 1
+    assert len(fake_llm) == 1
+
+    tracker = CostBudgetTracker(task_id="t")
+    tracker.record_usage(LLMUsage(cache_hit=True))
+    assert tracker.cache_hits == 1
+    assert tracker.total_tokens == 0
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import time
+import types
+
+import pytest
+
+import app.llm_provider as provider
+from app.llm_provider import ProviderConfig
+
+# Resolve names through the module at call time: other tests reload app.llm_provider,
+# which rebinds the exception classes raised by its functions.
+
+_MESSAGES = [{"role": "system", "content": "sys"}, {"role": "user", "content": "score it"}]
+
+
+def _chunk(text: str | None = None, usage=None):
+    choices = [types.SimpleNamespace(delta=types.SimpleNamespace(content=text))] if text is not None else []
+    return types.SimpleNamespace(choices=choices, usage=usage)
+
+
+class _FakeStream:
+    def __init__(self, pieces, *, delay_s: float = 0.0, first_delay_s: float = 0.0) -> None:
+        self._pieces = list(pieces)
+        self._delay_s = delay_s
+        self._first_delay_s = first_delay_s
+        self.consumed = 0
+        self.closed = False
+
+    def __iter__(self):
+        for n, piece in enumerate(self._pieces):
+            time.sleep(self._first_delay_s if n == 0 else self._delay_s)
+            self.consumed += 1
+            yield piece
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _FakeClient:
+    def __init__(self, streams: dict[str, _FakeStream]) -> None:
+        self.streams = streams
+        self.requests: list[dict] = []
+        self.chat = types.SimpleNamespace(completions=types.SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        self.requests.append(kwargs)
+        return self.streams[kwargs["model"]]
+
+
+@pytest.fixture(autouse=True)
+def _clean_latency():
+    provider.reset_latency_samples()
+    yield
+    provider.reset_latency_samples()
+
+
+def test_scanner_detects_completion_and_violation():
+    scanner = provider._JsonObjectScanner()
+    scanner.feed('  {"reason": "含}括号\\"", "a": [1, {"b": 2}]')
+    assert not scanner.complete
+    scanner.feed("} trailing")
+    assert scanner.complete
+    text = '  {"reason": "含}括号\\"", "a": [1, {"b": 2}]} trailing'
+    assert text[: scanner.end].endswith("]}")
+
+    with pytest.raises(provider.LLMSchemaError):
+        provider._JsonObjectScanner().feed("Sure! Here is the JSON")
+
+
+def test_stream_stops_once_json_object_is_complete():
+    stream = _FakeStream([_chunk('{"score": '), _chunk("8}"), _chunk(" and more rambling"), _chunk("...")])
+    client = _FakeClient({"m1": stream})
+    content, usage = provider._call_chat_stream(client=client, model="m1", messages=_MESSAGES, json_mode=True)
+
+    assert content == '{"score": 8}'
+    assert stream.consumed == 2
+    assert stream.closed
+    assert usage.prompt_tokens > 0 and usage.completion_tokens > 0
+    assert client.requests[0]["stream"] is True
+
+
+def test_stream_uses_provider_usage_when_reported():
+    usage = types.SimpleNamespace(prompt_tokens=11, completion_tokens=3, total_tokens=14)
+    stream = _FakeStream([_chunk("hello"), _chunk(" world"), _chunk(usage=usage)])
+    content, result = provider._call_chat_stream(client=_FakeClient({"m1": stream}), model="m1", messages=_MESSAGES)
+    assert content == "hello world"
+    assert result.total_tokens == 14
+
+
+def test_stream_aborts_on_schema_violation():
+    stream = _FakeStream([_chunk("I think the score is"), _chunk(" 8")])
+    with pytest.raises(provider.LLMSchemaError):
+        provider._call_chat_stream(client=_FakeClient({"m1": stream}), model="m1", messages=_MESSAGES, json_mode=True)
+    assert stream.consumed == 1
+
+
+def test_stream_enforces_ttft_and_total_deadlines():
+    slow_start = _FakeStream([_chunk('{"score": 8}')], first_delay_s=0.15)
+    with pytest.raises(provider.LLMDeadlineError):
+        provider._call_chat_stream(client=_FakeClient({"m1": slow_start}), model="m1", messages=_MESSAGES, ttft_s=0.05)
+
+    rambling = _FakeStream([_chunk("{")] + [_chunk('"k": 1, ')] * 50, delay_s=0.01)
+    with pytest.raises(provider.LLMDeadlineError):
+        provider._call_chat_stream(
+            client=_FakeClient({"m1": rambling}), model="m1", messages=_MESSAGES, json_mode=True, total_s=0.1
+        )
+    assert rambling.consumed < 51
+
+
+def test_hedge_delay_uses_latency_percentile(monkeypatch):
+    monkeypatch.setenv("LLM_HEDGE_DEFAULT_MS", "1500")
+    monkeypatch.setenv("LLM_HEDGE_MIN_SAMPLES", "5")
+    monkeypatch.setenv("LLM_HEDGE_PERCENTILE", "80")
+    assert provider._hedge_delay_s("m1") == 1.5
+    for ms in (100, 200, 300, 400, 500):
+        provider._record_latency("m1", ms)
+    assert provider._hedge_delay_s("m1") == 0.4
+
+    monkeypatch.setenv("LLM_HEDGE_PERCENTILE", "0")
+    assert provider._hedge_delay_s("m1") is None
+
+
+@pytest.fixture()
+def streaming_client(monkeypatch):
+    monkeypatch.setenv("LLM_STREAM_ENABLED", "true")
+    holder: dict = {}
+    monkeypatch.setattr(provider, "_create_client", lambda config: holder["client"])
+    return holder
+
+
+def test_slow_primary_is_hedged_with_fallback(streaming_client, monkeypatch):
+    monkeypatch.setenv("LLM_HEDGE_DEFAULT_MS", "50")
+    primary = _FakeStream([_chunk('{"score": 1}')], first_delay_s=0.5)
+    fallback = _FakeStream([_chunk('{"score": 9}')])
+    streaming_client["client"] = _FakeClient({"primary": primary, "fallback": fallback})
+    config = ProviderConfig(model="primary", fallback_model="fallback", api_key="k")
+
+    t0 = time.monotonic()
+    content, usage = provider._call_with_degradation(config=config, messages=_MESSAGES, json_mode=True)
+
+    assert content == '{"score": 9}'
+    assert usage.model == "fallback"
+    assert usage.degraded and usage.degrade_reason == "hedged"
+    assert time.monotonic() - t0 < 0.4
+
+
+def test_hedge_loser_tokens_are_charged_to_the_budget(streaming_client, monkeypatch):
+    from app.token_budget import count_tokens
+
+    monkeypatch.setenv("LLM_HEDGE_DEFAULT_MS", "50")
+    primary = _FakeStream([_chunk('{"score": '), _chunk("1}")], delay_s=0.5)
+    fallback = _FakeStream([_chunk('{"score": 9}')])
+    streaming_client["client"] = _FakeClient({"primary": primary, "fallback": fallback})
+    config = ProviderConfig(model="primary", fallback_model="fallback", api_key="k")
+
+    content, usage = provider._call_with_degradation(config=config, messages=_MESSAGES, json_mode=True)
+
+    prompt_tokens = sum(count_tokens(m["content"]) for m in _MESSAGES)
+    loser_tokens = prompt_tokens + count_tokens('{"score": ')
+    winner_tokens = prompt_tokens + count_tokens('{"score": 9}')
+    assert content == '{"score": 9}'
+    assert usage.abandoned_tokens == loser_tokens
+    assert usage.total_tokens == winner_tokens + loser_tokens
+
+    tracker = provider.CostBudgetTracker(task_id="t_hedge", max_tokens_budget=10_000)
+    tracker.reserve(100)
+    tracker.settle(100, usage)
+    assert tracker.total_tokens == winner_tokens + loser_tokens
+
+
+def test_failed_primary_falls_back_without_waiting(streaming_client):
+    primary = _FakeStream([_chunk("not json")])
+    fallback = _FakeStream([_chunk('{"score": 7}')])
+    streaming_client["client"] = _FakeClient({"primary": primary, "fallback": fallback})
+    config = ProviderConfig(model="primary", fallback_model="fallback", api_key="k")
+
+    content, usage = provider._call_with_degradation(config=config, messages=_MESSAGES, json_mode=True)
+    assert content == '{"score": 7}'
+    assert usage.degrade_reason == "primary_failed:LLMSchemaError"
+
+
+def test_fast_primary_records_latency_and_is_not_hedged(streaming_client):
+    primary = _FakeStream([_chunk('{"score": 6}')])
+    client = _FakeClient({"primary": primary, "fallback": _FakeStream([_chunk('{"score": 0}')])})
+    streaming_client["client"] = client
+    config = ProviderConfig(model="primary", fallback_model="fallback", api_key="k")
+
+    content, usage = provider._call_with_degradation(config=config, messages=_MESSAGES, json_mode=True)
+    assert content == '{"score": 6}'
+    assert not usage.degraded
+    assert [r["model"] for r in client.requests] == ["primary"]
+    assert len(provider._latency_samples["primary"]) == 1
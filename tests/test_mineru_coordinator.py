@@ -0,0 +1,240 @@
+"""Tests for the shared MinerU batch submission / polling coordinator."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from app.errors import ApiError
+from app.mineru_coordinator import (
+    MineruBatchCoordinator,
+    get_mineru_coordinator,
+    mineru_coordinator_stats,
+    mineru_data_id,
+    reset_mineru_coordinator,
+)
+from app.mineru_official_api import MineruApiConfig
+
+
+class FakeMineruClient:
+    """Scripted MinerU client: each data_id becomes done after ``ready_after`` status polls."""
+
+    def __init__(self, *, ready_after: dict[str, int] | None = None, failed: set[str] | None = None) -> None:
+        self.ready_after = ready_after or {}
+        self.failed = failed or set()
+        self.batches: dict[str, list[str]] = {}
+        self.upload_requests: list[list[dict[str, str]]] = []
+        self.uploads: list[str] = []
+        self.polls: dict[str, int] = {}
+        self.tasks: dict[str, str] = {}
+        self.lock = threading.Lock()
+
+    def request_upload_urls(self, *, files, model_version="vlm"):
+        with self.lock:
+            batch_id = f"batch_{len(self.batches) + 1}"
+            self.batches[batch_id] = [f["data_id"] for f in files]
+            self.upload_requests.append(list(files))
+        return batch_id, [f"https://upload.example.com/{batch_id}/{f['data_id']}" for f in files]
+
+    def upload_file_to_url(self, *, file_bytes, upload_url, content_type="application/pdf"):
+        with self.lock:
+            self.uploads.append(upload_url)
+        return True
+
+    def _state(self, data_id: str, polls: int) -> dict:
+        if data_id in self.failed:
+            return {"data_id": data_id, "state": "failed", "err_msg": "PDF corrupted"}
+        if polls >= self.ready_after.get(data_id, 1):
+            return {"data_id": data_id, "state": "done", "full_zip_url": f"https://cdn.example.com/{data_id}.zip"}
+        return {"data_id": data_id, "state": "running"}
+
+    def get_batch_status(self, *, batch_id):
+        with self.lock:
+            self.polls[batch_id] = self.polls.get(batch_id, 0) + 1
+            polls = self.polls[batch_id]
+        return {"batch_id": batch_id, "extract_result": [self._state(d, polls) for d in self.batches[batch_id]]}
+
+    def submit_task(self, *, file_url, page_ranges=None):
+        with self.lock:
+            task_id = f"task_{len(self.tasks) + 1}"
+            self.tasks[task_id] = file_url
+        return task_id
+
+    def get_task_status(self, *, task_id):
+        with self.lock:
+            self.polls[task_id] = self.polls.get(task_id, 0) + 1
+            polls = self.polls[task_id]
+        state = self._state(task_id, polls)
+        state.pop("data_id")
+        return state
+
+
+def _coordinator(client: FakeMineruClient, **kwargs) -> MineruBatchCoordinator:
+    options = {"window_s": 0.05, "poll_min_s": 0.01, "poll_max_s": 0.05, "max_poll_time_s": 5.0}
+    options.update(kwargs)
+    return MineruBatchCoordinator(client=client, **options)
+
+
+@pytest.fixture
+def fake_client():
+    return FakeMineruClient()
+
+
+class TestMineruBatchCoordinator:
+    def test_concurrent_uploads_share_one_batch(self, fake_client):
+        coordinator = _coordinator(fake_client)
+        try:
+            futures = [
+                coordinator.submit_bytes(data_id=f"d{i}", filename=f"f{i}.pdf", file_bytes=b"%PDF") for i in range(5)
+            ]
+            urls = [f.result(timeout=5) for f in futures]
+        finally:
+            coordinator.shutdown()
+
+        assert urls == [f"https://cdn.example.com/d{i}.zip" for i in range(5)]
+        assert len(fake_client.upload_requests) == 1
+        assert [f["data_id"] for f in fake_client.upload_requests[0]] == [f"d{i}" for i in range(5)]
+        assert len(fake_client.uploads) == 5
+        stats = coordinator.stats()
+        assert stats["batches"] == 1
+        assert stats["completed"] == 5
+
+    def test_batch_split_at_max_files(self, fake_client):
+        coordinator = _coordinator(fake_client, max_files=2)
+        try:
+            futures = [coordinator.submit_bytes(data_id=f"d{i}", filename="a.pdf", file_bytes=b"x") for i in range(5)]
+            for f in futures:
+                f.result(timeout=5)
+        finally:
+            coordinator.shutdown()
+
+        assert sorted(len(files) for files in fake_client.upload_requests) == [1, 2, 2]
+
+    def test_documents_complete_as_their_results_arrive(self):
+        client = FakeMineruClient(ready_after={"fast": 1, "slow": 4})
+        coordinator = _coordinator(client, poll_max_s=0.02)
+        try:
+            fast = coordinator.submit_bytes(data_id="fast", filename="a.pdf", file_bytes=b"x")
+            slow = coordinator.submit_bytes(data_id="slow", filename="b.pdf", file_bytes=b"y")
+            assert fast.result(timeout=5) == "https://cdn.example.com/fast.zip"
+            assert not slow.done()
+            assert slow.result(timeout=5) == "https://cdn.example.com/slow.zip"
+        finally:
+            coordinator.shutdown()
+
+    def test_failed_member_does_not_fail_the_batch(self):
+        client = FakeMineruClient(failed={"bad"})
+        coordinator = _coordinator(client)
+        try:
+            good = coordinator.submit_bytes(data_id="good", filename="a.pdf", file_bytes=b"x")
+            bad = coordinator.submit_bytes(data_id="bad", filename="b.pdf", file_bytes=b"y")
+            assert good.result(timeout=5) == "https://cdn.example.com/good.zip"
+            with pytest.raises(ApiError) as exc:
+                bad.result(timeout=5)
+        finally:
+            coordinator.shutdown()
+
+        assert exc.value.code == "DOC_PARSE_UPSTREAM_ERROR"
+        assert coordinator.stats()["failed"] == 1
+
+    def test_upload_url_request_failure_fails_every_member(self, fake_client):
+        def _boom(**kwargs):
+            raise ApiError(
+                code="DOC_PARSE_UPSTREAM_UNAVAILABLE",
+                message="down",
+                error_class="transient",
+                retryable=True,
+                http_status=503,
+            )
+
+        fake_client.request_upload_urls = _boom
+        coordinator = _coordinator(fake_client)
+        try:
+            futures = [coordinator.submit_bytes(data_id=f"d{i}", filename="a.pdf", file_bytes=b"x") for i in range(2)]
+            for f in futures:
+                with pytest.raises(ApiError) as exc:
+                    f.result(timeout=5)
+                assert exc.value.code == "DOC_PARSE_UPSTREAM_UNAVAILABLE"
+        finally:
+            coordinator.shutdown()
+
+    def test_times_out_outstanding_work(self):
+        client = FakeMineruClient(ready_after={"d": 10_000})
+        coordinator = _coordinator(client, max_poll_time_s=0.1)
+        try:
+            future = coordinator.submit_bytes(data_id="d", filename="a.pdf", file_bytes=b"x")
+            with pytest.raises(ApiError) as exc:
+                future.result(timeout=5)
+        finally:
+            coordinator.shutdown()
+
+        assert exc.value.code == "DOC_PARSE_TIMEOUT"
+        assert coordinator.stats()["timed_out"] == 1
+
+    def test_poll_interval_backs_off_without_progress(self):
+        client = FakeMineruClient(ready_after={"d": 10_000})
+        coordinator = _coordinator(client, poll_min_s=0.01, poll_max_s=0.2, max_poll_time_s=5.0)
+        try:
+            coordinator.submit_bytes(data_id="d", filename="a.pdf", file_bytes=b"x")
+            time.sleep(0.5)
+            polls = client.polls.get("batch_1", 0)
+        finally:
+            coordinator.shutdown()
+
+        # Fixed 10 ms polling would be ~45 polls in this window.
+        assert 2 <= polls < 20
+
+    def test_duplicate_submission_joins_in_flight_future(self):
+        client = FakeMineruClient(ready_after={"d": 3})
+        coordinator = _coordinator(client)
+        try:
+            first = coordinator.submit_bytes(data_id="d", filename="a.pdf", file_bytes=b"x")
+            second = coordinator.submit_bytes(data_id="d", filename="a.pdf", file_bytes=b"x")
+            assert first is second
+            first.result(timeout=5)
+        finally:
+            coordinator.shutdown()
+
+        assert coordinator.stats()["joined"] == 1
+        assert len(client.uploads) == 1
+
+    def test_url_submissions_poll_as_tasks(self, fake_client):
+        coordinator = _coordinator(fake_client)
+        try:
+            zip_url = coordinator.submit_url(data_id="d", file_url="https://example.com/a.pdf").result(timeout=5)
+        finally:
+            coordinator.shutdown()
+
+        assert zip_url == "https://cdn.example.com/task_1.zip"
+        assert fake_client.tasks == {"task_1": "https://example.com/a.pdf"}
+        assert coordinator.stats()["tasks"] == 1
+
+    def test_shutdown_fails_pending_futures(self):
+        client = FakeMineruClient(ready_after={"d": 10_000})
+        coordinator = _coordinator(client)
+        future = coordinator.submit_bytes(data_id="d", filename="a.pdf", file_bytes=b"x")
+        coordinator.shutdown()
+
+        with pytest.raises(ApiError):
+            future.result(timeout=1)
+        with pytest.raises(ApiError):
+            coordinator.submit_bytes(data_id="e", filename="a.pdf", file_bytes=b"x")
+
+
+class TestCoordinatorSingleton:
+    def test_data_id_is_stable_and_tenant_scoped(self):
+        a = mineru_data_id(tenant_id="t1", document_id="doc_1")
+        assert a == mineru_data_id(tenant_id="t1", document_id="doc_1")
+        assert a != mineru_data_id(tenant_id="t2", document_id="doc_1")
+        assert a.startswith("bea_") and len(a) <= 128
+
+    def test_get_coordinator_reuses_per_config(self):
+        config = MineruApiConfig(api_key="k1")
+        first = get_mineru_coordinator(config)
+        assert get_mineru_coordinator(MineruApiConfig(api_key="k1")) is first
+        second = get_mineru_coordinator(MineruApiConfig(api_key="k2"))
+        assert second is not first
+        assert mineru_coordinator_stats()["enabled"] is True
+        reset_mineru_coordinator()
@@ -191,6 +191,18 @@ class TestMineruOfficialApiClient:
 
             assert exc.value.code == "DOC_PARSE_TIMEOUT"
 
+    def test_poll_batch_until_complete_waits_for_every_file(self, client):
+        """A batch is only complete once every file in it is done."""
+        client._config.poll_interval_s = 0.0
+        with patch.object(client, "get_batch_status") as mock_status:
+            mock_status.side_effect = [
+                {"extract_result": [{"state": "done", "full_zip_url": "u1"}, {"state": "running"}]},
+                {"extract_result": [{"state": "done", "full_zip_url": "u1"}, {"state": "done", "full_zip_url": "u2"}]},
+            ]
+
+            assert client.poll_batch_until_complete(batch_id="b") == ["u1", "u2"]
+            assert mock_status.call_count == 2
+
 
 class TestMineruOfficialApiAdapter:
     """Test the high-level adapter."""
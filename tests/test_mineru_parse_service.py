@@ -2,13 +2,16 @@
 
 from __future__ import annotations
 
+import io
 import json
+from concurrent.futures import Future
 from datetime import datetime
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from app.errors import ApiError
+from app.mineru_coordinator import MineruBatchCoordinator, mineru_data_id
 from app.mineru_official_api import MineruApiConfig, MineruContentItem
 from app.mineru_parse_service import (
     MineruParseResult,
@@ -177,7 +180,7 @@ class TestMineruParseService:
 
         with (
             patch.object(service, "_client", mock_client),
-            patch.object(service, "_download_zip", return_value=test_zip),
+            patch.object(service, "_download_zip", return_value=io.BytesIO(test_zip)),
         ):
             result = service.parse_and_persist(
                 file_url="https://example.com/test.pdf",
@@ -216,7 +219,7 @@ class TestMineruParseService:
 
         with (
             patch.object(service, "_client", mock_client),
-            patch.object(service, "_download_zip", return_value=test_zip),
+            patch.object(service, "_download_zip", return_value=io.BytesIO(test_zip)),
         ):
             service.parse_and_persist(
                 file_url="https://example.com/test.pdf",
@@ -406,6 +409,107 @@ class TestMineruParseService:
         assert uris == []
 
 
+class TestStreamingZipHandling:
+    """Result zips are spooled to disk, walked once and images uploaded in parallel."""
+
+    def test_walk_zip_uploads_images_in_batches(self, config, manifests_repo, documents_repo, monkeypatch):
+        import zipfile
+
+        import app.mineru_parse_service as service_module
+
+        monkeypatch.setattr(service_module, "_IMAGE_BATCH_MAX_FILES", 10)
+
+        class BatchStorage(MockObjectStorage):
+            def __init__(self):
+                super().__init__()
+                self.batches: list[int] = []
+
+            def put_objects(self, *, tenant_id, objects):
+                self.batches.append(len(objects))
+                return [
+                    self.put_object(
+                        tenant_id=tenant_id,
+                        object_type=o.object_type,
+                        object_id=o.object_id,
+                        filename=o.filename,
+                        content_bytes=o.content_bytes,
+                        content_type=o.content_type,
+                    )
+                    for o in objects
+                ]
+
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, "w") as zf:
+            zf.writestr("full.md", "# Title")
+            zf.writestr("doc_content_list.json", "[]")
+            for i in range(24):
+                zf.writestr(f"images/img_{i}.png", b"\x89PNG" + bytes([i]) * 64)
+        buf.seek(0)
+
+        storage = BatchStorage()
+        service = MineruParseService(
+            config=config,
+            object_storage=storage,
+            parse_manifests_repo=manifests_repo,
+            documents_repo=documents_repo,
+        )
+        content, uris = service._walk_zip(tenant_id="tenant_a", document_id="doc_1", zip_file=buf)
+
+        assert set(content) == {"full.md", "doc_content_list.json"}
+        assert storage.batches == [10, 10, 4]
+        assert [uri.rsplit("/", 1)[-1] for uri in uris] == [f"img_{i}.png" for i in range(24)]
+
+    def test_walk_zip_rejects_corrupt_archive(self, service):
+        with pytest.raises(ApiError) as exc:
+            service._walk_zip(tenant_id="t", document_id="d", zip_file=io.BytesIO(b"not a zip"))
+        assert exc.value.code == "DOC_PARSE_SCHEMA_INVALID"
+
+    def test_download_zip_spools_response(self, service):
+        payload = _make_test_zip()
+
+        class _Resp(io.BytesIO):
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                self.close()
+
+        with patch("urllib.request.urlopen", return_value=_Resp(payload)):
+            spooled = service._download_zip("https://cdn.example.com/result.zip")
+        try:
+            assert spooled.tell() == 0
+            assert spooled.read() == payload
+        finally:
+            spooled.close()
+
+    def test_result_zip_stored_via_put_object_file(self, service, object_storage):
+        streamed: list[str] = []
+
+        def put_object_file(*, fileobj, **kwargs):
+            streamed.append(kwargs["filename"])
+            return object_storage.put_object(content_bytes=fileobj.read(), **kwargs)
+
+        object_storage.put_object_file = put_object_file
+        mock_client = MagicMock()
+        mock_client.submit_task.return_value = "task_123"
+        mock_client.poll_until_complete.return_value = "https://cdn.example.com/result.zip"
+
+        with (
+            patch.object(service, "_client", mock_client),
+            patch.object(service, "_download_zip", return_value=io.BytesIO(_make_test_zip())),
+        ):
+            result = service.parse_and_persist(
+                file_url="https://example.com/test.pdf",
+                document_id="doc_123",
+                tenant_id="tenant_abc",
+                job_id="job_xyz",
+            )
+
+        assert streamed == ["result.zip"]
+        assert result.chunks_count == 2
+        assert object_storage.objects[result.zip_storage_uri] == _make_test_zip()
+
+
 class TestBuildMineruParseService:
     """Test factory function."""
 
@@ -442,9 +546,11 @@ class TestBuildMineruParseService:
                 "MINERU_MAX_POLL_TIME_S": "300",
                 "MINERU_IS_OCR": "false",
                 "MINERU_ENABLE_FORMULA": "true",
+                "MINERU_ZIP_SPOOL_MAX_MB": "2",
             },
         )
         assert result is not None
+        assert result._zip_spool_max_bytes == 2 << 20
         assert result._config.timeout_s == 60.0
         assert result._config.max_poll_time_s == 300.0
         assert result._config.is_ocr is False
@@ -474,3 +580,90 @@ class TestMineruParseResult:
         assert result.chunks_count == 5
         assert result.images_count == 1
         assert result.parse_time_s == 12.5
+
+
+class TestBuildMineruParseServiceCoordinator:
+    def test_build_service_attaches_coordinator_unless_disabled(self):
+        kwargs = {
+            "object_storage": MockObjectStorage(),
+            "parse_manifests_repo": MockParseManifestsRepo(),
+            "documents_repo": MockDocumentsRepo(),
+        }
+        enabled = build_mineru_parse_service(env={"MINERU_API_KEY": "k"}, **kwargs)
+        disabled = build_mineru_parse_service(env={"MINERU_API_KEY": "k", "MINERU_BATCH_ENABLED": "false"}, **kwargs)
+        assert isinstance(enabled._coordinator, MineruBatchCoordinator)
+        assert disabled._coordinator is None
+
+
+class TestServiceWithCoordinator:
+    def test_parse_from_bytes_waits_on_coordinator(self):
+        manifests = MockParseManifestsRepo()
+        documents = MockDocumentsRepo()
+        coordinator = MagicMock()
+        future: Future[str] = Future()
+        future.set_result("https://cdn.example.com/result.zip")
+        coordinator.submit_bytes.return_value = future
+        service = MineruParseService(
+            config=MineruApiConfig(api_key="k", max_poll_time_s=5.0),
+            object_storage=MockObjectStorage(),
+            parse_manifests_repo=manifests,
+            documents_repo=documents,
+            coordinator=coordinator,
+        )
+        client = MagicMock()
+
+        with (
+            patch.object(service, "_client", client),
+            patch.object(service, "_download_zip", return_value=io.BytesIO(_make_test_zip())),
+        ):
+            result = service.parse_and_persist_from_bytes(
+                file_bytes=b"%PDF",
+                filename="a.pdf",
+                document_id="doc_1",
+                tenant_id="tenant_a",
+                job_id="job_1",
+            )
+
+        assert result.chunks_count == 2
+        coordinator.submit_bytes.assert_called_once()
+        assert coordinator.submit_bytes.call_args.kwargs["data_id"] == mineru_data_id(
+            tenant_id="tenant_a", document_id="doc_1"
+        )
+        client.request_upload_urls.assert_not_called()
+        client.poll_batch_until_complete.assert_not_called()
+        assert manifests.get(tenant_id="tenant_a", job_id="job_1")["status"] == "completed"
+
+    def test_coordinator_error_marks_manifest_failed(self):
+        manifests = MockParseManifestsRepo()
+        coordinator = MagicMock()
+        future: Future[str] = Future()
+        future.set_exception(
+            ApiError(
+                code="DOC_PARSE_TIMEOUT",
+                message="slow",
+                error_class="transient",
+                retryable=True,
+                http_status=503,
+            )
+        )
+        coordinator.submit_url.return_value = future
+        service = MineruParseService(
+            config=MineruApiConfig(api_key="k"),
+            object_storage=MockObjectStorage(),
+            parse_manifests_repo=manifests,
+            documents_repo=MockDocumentsRepo(),
+            coordinator=coordinator,
+        )
+
+        with pytest.raises(ApiError) as exc:
+            service.parse_and_persist(
+                file_url="https://example.com/a.pdf",
+                document_id="doc_1",
+                tenant_id="tenant_a",
+                job_id="job_1",
+            )
+
+        assert exc.value.code == "DOC_PARSE_TIMEOUT"
+        manifest = manifests.get(tenant_id="tenant_a", job_id="job_1")
+        assert manifest["status"] == "failed"
+        assert manifest["error_code"] == "DOC_PARSE_TIMEOUT"
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import json
 from io import BytesIO
 
@@ -28,6 +29,21 @@ def test_upload_persists_object_storage(client):
     assert stored == content
 
 
+def test_upload_streams_file_handle_to_object_storage(client, monkeypatch):
+    content = b"%PDF-1.4 " + bytes(range(256)) * (12 * 1024)  # ~3 MiB, spooled to disk by the form parser
+
+    def _no_bytes_put(**kwargs):
+        raise AssertionError("upload must stream via put_object_file, not buffer bytes")
+
+    monkeypatch.setattr(store.object_storage, "put_object", _no_bytes_put)
+    document_id = _upload_document(client, tenant_id="tenant_obj", content=content)
+    doc = store.get_document_for_tenant(document_id=document_id, tenant_id="tenant_obj")
+    assert doc is not None
+    assert doc["file_sha256"] == hashlib.sha256(content).hexdigest()
+    assert doc["file_size"] == len(content)
+    assert store.object_storage.get_object(storage_uri=doc["storage_uri"]) == content
+
+
 def test_report_archived_to_object_storage(client):
     created = client.post(
         "/api/v1/evaluations",
@@ -0,0 +1,136 @@
+import io
+
+from app.parse_cache import (
+    ParseCacheIndex,
+    ParseCacheWriter,
+    decode_chunks,
+    get_parse_cache_index,
+    parse_cache_key,
+)
+from app.store import store
+
+
+def _pdf(pages: int = 4) -> bytes:
+    import pymupdf
+
+    doc = pymupdf.open()
+    for i in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Section {i + 1} supplier qualification evidence. " * 6, fontsize=10)
+    buf = io.BytesIO()
+    doc.save(buf)
+    doc.close()
+    return buf.getvalue()
+
+
+def _upload_and_parse(client, *, key: str, tenant: str = "tenant_default") -> str:
+    resp = client.post(
+        "/api/v1/documents/upload",
+        data={"project_id": "prj_cache", "supplier_id": "sup_cache", "doc_type": "bid"},
+        files={"file": ("cached.pdf", io.BytesIO(_pdf()), "application/pdf")},
+        headers={"Idempotency-Key": key, "x-tenant-id": tenant},
+    )
+    assert resp.status_code == 202
+    data = resp.json()["data"]
+    assert store.run_job_once(job_id=data["job_id"], tenant_id=tenant)["final_status"] == "succeeded"
+    return data["document_id"]
+
+
+def _reparse(client, document_id: str, *, key: str) -> dict:
+    resp = client.post(f"/api/v1/documents/{document_id}/parse", headers={"Idempotency-Key": key})
+    assert resp.status_code == 202
+    job_id = resp.json()["data"]["job_id"]
+    assert store.run_job_once(job_id=job_id, tenant_id="tenant_default")["final_status"] == "succeeded"
+    return store.get_parse_manifest_for_tenant(job_id=job_id, tenant_id="tenant_default")
+
+
+def _count_local_parses(monkeypatch) -> list[str]:
+    calls: list[str] = []
+    adapter = store._parser_registry._adapters["local"]
+    real = adapter.iter_parse_file
+
+    def spy(**kwargs):
+        calls.append(kwargs["document_id"])
+        return real(**kwargs)
+
+    monkeypatch.setattr(adapter, "iter_parse_file", spy)
+    return calls
+
+
+def _texts(document_id: str, tenant: str = "tenant_default") -> list[str]:
+    return [c["text"] for c in store.list_document_chunks_for_tenant(document_id=document_id, tenant_id=tenant)]
+
+
+def test_writer_round_trip_strips_document_scoped_fields():
+    writer = ParseCacheWriter()
+    writer.add({"chunk_id": "ck_1", "document_id": "doc_a", "chunk_hash": "h", "text": "条款一", "pages": [1]})
+    chunks = list(decode_chunks(writer.finish()))
+    assert chunks == [{"text": "条款一", "pages": [1]}]
+    assert writer.chunk_count == 1
+
+
+def test_key_is_scoped_by_tenant_and_parser_version():
+    base = {"tenant_id": "t1", "file_sha256": "abc", "parser": "local", "parser_version": "v1"}
+    assert parse_cache_key(**base) == parse_cache_key(**base)
+    assert parse_cache_key(**base) != parse_cache_key(**{**base, "tenant_id": "t2"})
+    assert parse_cache_key(**base) != parse_cache_key(**{**base, "parser_version": "v2"})
+
+
+def test_index_persists_to_sqlite(tmp_path):
+    path = str(tmp_path / "parse_cache.sqlite3")
+    ParseCacheIndex(path=path).put("k", {"storage_uri": "object://local/b/k", "chunk_count": 3})
+    assert ParseCacheIndex(path=path).get("k") == {"storage_uri": "object://local/b/k", "chunk_count": 3}
+
+
+def test_reparse_of_cached_file_skips_parser(client, monkeypatch):
+    calls = _count_local_parses(monkeypatch)
+    document_id = _upload_and_parse(client, key="idem_cache_first")
+    assert calls == [document_id]
+    original = _texts(document_id)
+
+    manifest = _reparse(client, document_id, key="idem_cache_reparse")
+
+    assert calls == [document_id]
+    assert _texts(document_id) == original
+    assert manifest["parse_cache"] == {"hit": True, "source_document_id": document_id}
+    assert manifest["chunk_count"] == len(original)
+    metrics = store.parser_retrieval_metrics
+    assert (metrics["parse_cache_hits_total"], metrics["parse_cache_stores_total"]) == (1, 1)
+
+
+def test_parser_version_change_misses(client, monkeypatch):
+    calls = _count_local_parses(monkeypatch)
+    document_id = _upload_and_parse(client, key="idem_cache_version")
+    monkeypatch.setattr(store._parser_registry._adapters["local"], "version", "v2")
+
+    manifest = _reparse(client, document_id, key="idem_cache_version_reparse")
+
+    assert calls == [document_id, document_id]
+    assert "parse_cache" not in manifest
+
+
+def test_cache_is_not_shared_across_tenants(client, monkeypatch):
+    calls = _count_local_parses(monkeypatch)
+    first = _upload_and_parse(client, key="idem_cache_tenant_a")
+    second = _upload_and_parse(client, key="idem_cache_tenant_b", tenant="tenant_other")
+
+    assert calls == [first, second]
+    assert store.parser_retrieval_metrics["parse_cache_hits_total"] == 0
+
+
+def test_missing_cache_object_falls_back_to_parsing(client, monkeypatch):
+    calls = _count_local_parses(monkeypatch)
+    document_id = _upload_and_parse(client, key="idem_cache_missing")
+    real_get = store.object_storage.get_object
+
+    def get_object(*, storage_uri: str) -> bytes:
+        if "parse_cache" in storage_uri:
+            raise FileNotFoundError(storage_uri)
+        return real_get(storage_uri=storage_uri)
+
+    monkeypatch.setattr(store.object_storage, "get_object", get_object)
+
+    _reparse(client, document_id, key="idem_cache_missing_reparse")
+
+    assert calls == [document_id, document_id]
+    assert get_parse_cache_index().stats()["stores"] == 2
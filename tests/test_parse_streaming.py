@@ -0,0 +1,143 @@
+import io
+
+import pytest
+
+from app.store import store
+
+
+def _multi_page_pdf(pages: int) -> bytes:
+    import pymupdf
+
+    doc = pymupdf.open()
+    for i in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Section {i + 1} supplier qualification evidence. " * 6, fontsize=10)
+        page.insert_text((72, 400), f"Page {i + 1} pricing and delivery commitments. " * 6, fontsize=10)
+    buf = io.BytesIO()
+    doc.save(buf)
+    doc.close()
+    return buf.getvalue()
+
+
+def _upload(client, *, key: str, pages: int = 12) -> dict:
+    resp = client.post(
+        "/api/v1/documents/upload",
+        data={"project_id": "prj_stream", "supplier_id": "sup_stream", "doc_type": "bid"},
+        files={"file": ("stream.pdf", io.BytesIO(_multi_page_pdf(pages)), "application/pdf")},
+        headers={"Idempotency-Key": key},
+    )
+    assert resp.status_code == 202
+    return resp.json()["data"]
+
+
+def test_parse_persists_and_indexes_in_bounded_batches(client, monkeypatch):
+    monkeypatch.setenv("PARSE_PERSIST_BATCH_SIZE", "2")
+    monkeypatch.setenv("LIGHTRAG_INDEX_MODE", "sync")
+    index_batches: list[int] = []
+    monkeypatch.setattr(store, "_write_index_batch", lambda **kw: index_batches.append(len(kw["chunks"])))
+    data = _upload(client, key="idem_parse_stream_batches")
+
+    result = store.run_job_once(job_id=data["job_id"], tenant_id="tenant_default")
+
+    assert result["final_status"] == "succeeded"
+    chunks = store.list_document_chunks_for_tenant(document_id=data["document_id"], tenant_id="tenant_default")
+    assert len(chunks) > 2
+    assert all(c["parser"] == "local" for c in chunks)
+    assert len({c["chunk_hash"] for c in chunks}) == len(chunks)
+    assert max(index_batches) <= 2
+    assert sum(index_batches) == len(chunks)
+    manifest = store.get_parse_manifest_for_tenant(job_id=data["job_id"], tenant_id="tenant_default")
+    assert manifest["chunk_count"] == len(chunks)
+    assert manifest["content_source"] == "pdf_local"
+    assert store.parser_retrieval_metrics["parse_stream_batches_total"] == len(index_batches)
+    assert all(store.get_citation_source(chunk_id=c["chunk_id"], tenant_id="tenant_default") for c in chunks)
+
+
+def test_stream_abort_propagates_after_saved_batches(monkeypatch):
+    monkeypatch.setenv("PARSE_PERSIST_BATCH_SIZE", "2")
+    document_id = "doc_stream_abort"
+    store._persist_document(
+        document={"document_id": document_id, "tenant_id": "tenant_default", "filename": "a.pdf", "status": "parsed"}
+    )
+
+    def chunks():
+        for i in range(3):
+            yield {"text": f"clause {i}", "page": i + 1}
+        raise RuntimeError("page decode failed")
+
+    saved: list[list[dict]] = []
+    with pytest.raises(RuntimeError):
+        for batch in store._iter_persist_document_chunks(
+            tenant_id="tenant_default", document_id=document_id, chunks=chunks()
+        ):
+            saved.append(batch)
+
+    assert [len(batch) for batch in saved] == [2]
+
+
+def test_parser_failure_mid_stream_retries_the_job(client, monkeypatch):
+    monkeypatch.setenv("PARSE_PERSIST_BATCH_SIZE", "2")
+    data = _upload(client, key="idem_parse_stream_abort")
+    real_iter = store._iter_parse_document_file
+
+    def failing(**kwargs):
+        for i, chunk in enumerate(real_iter(**kwargs)):
+            if i == 3:
+                raise RuntimeError("page decode failed")
+            yield chunk
+
+    monkeypatch.setattr(store, "_iter_parse_document_file", failing)
+    result = store.run_job_once(job_id=data["job_id"], tenant_id="tenant_default")
+
+    assert result["final_status"] == "retrying"
+    manifest = store.get_parse_manifest_for_tenant(job_id=data["job_id"], tenant_id="tenant_default")
+    assert manifest["status"] == "retrying"
+    assert manifest["error_code"] == "DOC_PARSE_STREAM_ABORTED"
+    document = store.get_document_for_tenant(document_id=data["document_id"], tenant_id="tenant_default")
+    assert document["status"] != "indexed"
+    assert store.parser_retrieval_metrics["parse_stream_aborted_total"] == 1
+
+
+def test_retry_after_aborted_stream_reparses_partial_chunks(client, monkeypatch):
+    monkeypatch.setenv("PARSE_PERSIST_BATCH_SIZE", "2")
+    data = _upload(client, key="idem_parse_stream_resume")
+    real_iter = store._iter_parse_document_file
+    fail = {"armed": True}
+
+    def flaky(**kwargs):
+        for i, chunk in enumerate(real_iter(**kwargs)):
+            if i == 3 and fail["armed"]:
+                raise RuntimeError("worker crashed")
+            yield chunk
+
+    monkeypatch.setattr(store, "_iter_parse_document_file", flaky)
+    assert store.run_job_once(job_id=data["job_id"], tenant_id="tenant_default")["final_status"] == "retrying"
+    partial = store.list_document_chunks_for_tenant(document_id=data["document_id"], tenant_id="tenant_default")
+    assert 0 < len(partial) <= 3
+    document = store.get_document_for_tenant(document_id=data["document_id"], tenant_id="tenant_default")
+    assert document["status"] == "parsing"
+
+    fail["armed"] = False
+    assert store.run_job_once(job_id=data["job_id"], tenant_id="tenant_default")["final_status"] == "succeeded"
+
+    chunks = store.list_document_chunks_for_tenant(document_id=data["document_id"], tenant_id="tenant_default")
+    assert len(chunks) > len(partial)
+    document = store.get_document_for_tenant(document_id=data["document_id"], tenant_id="tenant_default")
+    assert document["status"] in {"indexed", "parsed"}
+
+
+def test_later_batches_dedupe_against_earlier_ones(monkeypatch):
+    monkeypatch.setenv("PARSE_PERSIST_BATCH_SIZE", "2")
+    document_id = "doc_stream_dedupe"
+    store._persist_document(
+        document={"document_id": document_id, "tenant_id": "tenant_default", "filename": "a.pdf", "status": "parsed"}
+    )
+    repeated = [{"text": "same clause", "page": 1}, {"text": "other clause", "page": 1}] * 3
+
+    saved = list(
+        store._iter_persist_document_chunks(tenant_id="tenant_default", document_id=document_id, chunks=repeated)
+    )
+
+    assert sum(len(batch) for batch in saved) == 2
+    stored = store.list_document_chunks_for_tenant(document_id=document_id, tenant_id="tenant_default")
+    assert len(stored) == 2
@@ -0,0 +1,202 @@
+import io
+
+from app.parser_router import (
+    PARSER_LOCAL,
+    PARSER_MINERU,
+    ParserHealthTracker,
+    get_parser_health,
+    plan_parse_order,
+    probe_text_native_pdf,
+)
+from app.store import store
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _pdf(*, text: bool, pages: int = 3) -> bytes:
+    import pymupdf
+
+    doc = pymupdf.open()
+    for i in range(pages):
+        page = doc.new_page()
+        if text:
+            lines = [f"Section {i + 1}.{j} supplier qualification and pricing evidence." for j in range(12)]
+            page.insert_text((72, 72), "\n".join(lines), fontsize=9)
+    buf = io.BytesIO()
+    doc.save(buf)
+    doc.close()
+    return buf.getvalue()
+
+
+def _tracker(**kwargs) -> tuple[ParserHealthTracker, _Clock]:
+    clock = _Clock()
+    options = {"window": 10, "min_samples": 3, "max_error_rate": 0.5, "max_p95_s": 5.0, "cooldown_s": 30.0}
+    options.update(kwargs)
+    return ParserHealthTracker(clock=clock, **options), clock
+
+
+def _record(tracker: ParserHealthTracker, parser: str, *, latency_s: float = 0.1, ok: bool = True) -> None:
+    tracker.start(parser)
+    tracker.finish(parser, latency_s=latency_s, ok=ok)
+
+
+def test_error_rate_sheds_parser_until_a_trial_succeeds():
+    tracker, clock = _tracker()
+    for _ in range(3):
+        _record(tracker, PARSER_MINERU, ok=False)
+    assert tracker.available(PARSER_MINERU) is False
+    assert tracker.snapshot()[PARSER_MINERU]["status"] == "shedding"
+
+    clock.now += 31
+    assert tracker.available(PARSER_MINERU) is True  # the single trial
+    assert tracker.available(PARSER_MINERU) is False
+    _record(tracker, PARSER_MINERU, ok=True)
+
+    assert tracker.available(PARSER_MINERU) is True
+    snapshot = tracker.snapshot()[PARSER_MINERU]
+    assert snapshot["status"] == "healthy"
+    assert snapshot["samples"] == 1
+    assert snapshot["shed_total"] == 1
+
+
+def test_failed_trial_restarts_cooldown():
+    tracker, clock = _tracker()
+    for _ in range(3):
+        _record(tracker, PARSER_MINERU, ok=False)
+    clock.now += 31
+    assert tracker.available(PARSER_MINERU) is True
+    _record(tracker, PARSER_MINERU, ok=False)
+    assert tracker.available(PARSER_MINERU) is False
+    clock.now += 31
+    assert tracker.available(PARSER_MINERU) is True
+
+
+def test_trial_without_verdict_frees_the_trial_slot():
+    tracker, clock = _tracker()
+    for _ in range(3):
+        _record(tracker, PARSER_MINERU, ok=False)
+    clock.now += 31
+    assert tracker.available(PARSER_MINERU) is True
+    tracker.start(PARSER_MINERU)
+    tracker.finish(PARSER_MINERU, latency_s=0.0, ok=None)  # e.g. no accessible file
+
+    assert tracker.snapshot()[PARSER_MINERU]["status"] == "cooled_down"
+    assert tracker.available(PARSER_MINERU) is True
+    _record(tracker, PARSER_MINERU, ok=True)
+    assert tracker.snapshot()[PARSER_MINERU]["status"] == "healthy"
+
+
+def test_slow_p95_and_inflight_limit_shed_load():
+    tracker, _ = _tracker(max_inflight=2)
+    for _ in range(3):
+        _record(tracker, PARSER_MINERU, latency_s=12.0)
+    assert tracker.available(PARSER_MINERU) is False
+    assert tracker.snapshot()[PARSER_MINERU]["p95_ms"] == 12000.0
+
+    tracker.start(PARSER_LOCAL)
+    tracker.start(PARSER_LOCAL)
+    assert tracker.available(PARSER_LOCAL) is False
+    tracker.finish(PARSER_LOCAL, latency_s=0.1, ok=None)
+    assert tracker.available(PARSER_LOCAL) is True
+    assert tracker.snapshot()[PARSER_LOCAL]["samples"] == 0
+
+
+def test_probe_tells_text_native_from_scanned_pdfs():
+    assert probe_text_native_pdf(_pdf(text=True)) is True
+    assert probe_text_native_pdf(_pdf(text=False)) is False
+    assert probe_text_native_pdf(b"not a pdf") is False
+
+
+def test_plan_prefers_local_for_text_native_and_when_mineru_is_shed(monkeypatch):
+    tracker, _ = _tracker()
+    plan = plan_parse_order(
+        filename="a.pdf", file_bytes=_pdf(text=True), mineru_enabled=True, local_enabled=True, tracker=tracker
+    )
+    assert (plan.order, plan.reason) == ([PARSER_LOCAL, PARSER_MINERU], "text_native_pdf")
+    assert plan.probe["text_native"] is True
+
+    scanned = _pdf(text=False)
+    plan = plan_parse_order(
+        filename="a.pdf", file_bytes=scanned, mineru_enabled=True, local_enabled=True, tracker=tracker
+    )
+    assert (plan.order, plan.reason) == ([PARSER_MINERU, PARSER_LOCAL], "default")
+
+    for _ in range(3):
+        _record(tracker, PARSER_MINERU, ok=False)
+    plan = plan_parse_order(
+        filename="a.pdf", file_bytes=scanned, mineru_enabled=True, local_enabled=True, tracker=tracker
+    )
+    assert (plan.order, plan.reason) == ([PARSER_LOCAL, PARSER_MINERU], "mineru_shed")
+
+    monkeypatch.setenv("PARSER_ROUTER_ENABLED", "false")
+    plan = plan_parse_order(
+        filename="a.pdf", file_bytes=scanned, mineru_enabled=True, local_enabled=True, tracker=tracker
+    )
+    assert (plan.order, plan.reason) == ([PARSER_MINERU, PARSER_LOCAL], "static")
+
+
+def _upload_and_parse(client, *, pdf: bytes, key: str) -> dict:
+    resp = client.post(
+        "/api/v1/documents/upload",
+        data={"project_id": "prj_route", "supplier_id": "sup_route", "doc_type": "bid"},
+        files={"file": ("routed.pdf", io.BytesIO(pdf), "application/pdf")},
+        headers={"Idempotency-Key": key},
+    )
+    assert resp.status_code == 202
+    job_id = resp.json()["data"]["job_id"]
+    assert store.run_job_once(job_id=job_id, tenant_id="tenant_default")["final_status"] == "succeeded"
+    return store.get_parse_manifest_for_tenant(job_id=job_id, tenant_id="tenant_default")
+
+
+def _spy_mineru(monkeypatch, outcome=None) -> list[str]:
+    calls: list[str] = []
+
+    def fake(**kwargs):
+        calls.append(kwargs["document_id"])
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(store, "_try_mineru_official_api", fake)
+    return calls
+
+
+def test_text_native_pdf_skips_mineru(client, monkeypatch):
+    monkeypatch.setenv("MINERU_API_KEY", "k")
+    calls = _spy_mineru(monkeypatch)
+
+    manifest = _upload_and_parse(client, pdf=_pdf(text=True), key="idem_route_text")
+
+    assert calls == []
+    assert manifest["parser_route"]["reason"] == "text_native_pdf"
+    assert store.parser_retrieval_metrics["parse_route_local_preferred_total"] == 1
+    assert get_parser_health().snapshot()[PARSER_LOCAL]["samples"] == 1
+
+
+def test_scanned_pdf_tries_mineru_and_records_its_failures(client, monkeypatch):
+    monkeypatch.setenv("MINERU_API_KEY", "k")
+    calls = _spy_mineru(monkeypatch, RuntimeError("mineru unavailable"))
+
+    manifest = _upload_and_parse(client, pdf=_pdf(text=False), key="idem_route_scan")
+
+    assert len(calls) == 1
+    assert manifest["parser_route"]["order"] == [PARSER_MINERU, PARSER_LOCAL]
+    assert get_parser_health().snapshot()[PARSER_MINERU]["error_rate"] == 1.0
+
+
+def test_mineru_skipped_or_empty_is_not_an_error(client, monkeypatch):
+    monkeypatch.setenv("MINERU_API_KEY", "k")
+    _spy_mineru(monkeypatch, None)  # no accessible file: MinerU never called
+    _upload_and_parse(client, pdf=_pdf(text=False), key="idem_route_skip")
+    assert get_parser_health().snapshot()[PARSER_MINERU]["samples"] == 0
+
+    _spy_mineru(monkeypatch, [])  # MinerU answered with zero chunks
+    _upload_and_parse(client, pdf=_pdf(text=False, pages=2), key="idem_route_empty")
+    snapshot = get_parser_health().snapshot()[PARSER_MINERU]
+    assert (snapshot["samples"], snapshot["error_rate"]) == (1, 0.0)
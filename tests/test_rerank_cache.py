@@ -0,0 +1,31 @@
+from app.rerank_cache import RerankScoreCache, normalize_query, score_key
+
+
+def test_score_key_normalizes_query_but_not_model_or_text():
+    base = score_key(model="jina:m1", query="交货期  要求", text="chunk")
+    assert score_key(model="jina:m1", query=" 交货期 要求 ", text="chunk") == base
+    assert score_key(model="jina:m2", query="交货期 要求", text="chunk") != base
+    assert score_key(model="jina:m1", query="交货期 要求", text="chunk2") != base
+    assert normalize_query("ＡＢＣ  Test") == "abc test"
+
+
+def test_cache_is_lru_bounded_and_reports_hit_rate():
+    cache = RerankScoreCache(max_entries=2)
+    cache.put_many({"a": 0.1, "b": 0.2})
+    assert cache.get_many(["a"]) == {"a": 0.1}
+    cache.put_many({"c": 0.3})
+
+    assert cache.get_many(["a", "b", "c"]) == {"a": 0.1, "c": 0.3}
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (3, 1, 2)
+    assert stats["hit_rate"] == 0.75
+
+
+def test_cache_persists_scores_in_sqlite(tmp_path):
+    path = str(tmp_path / "rerank.sqlite3")
+    RerankScoreCache(path=path).put_many({"k1": 0.9})
+
+    reopened = RerankScoreCache(path=path)
+
+    assert reopened.get_many(["k1", "k2"]) == {"k1": 0.9}
+    assert reopened.stats()["persisted"] is True
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import httpx
+import pytest
+
+from app.rerank_client import CircuitBreaker, CircuitOpenError, RerankApiClient, RerankApiStatusError
+
+
+class _Resp:
+    def __init__(self, status_code: int = 200, data: dict | None = None, headers: dict | None = None):
+        self.status_code = status_code
+        self._data = data or {"results": []}
+        self.headers = headers or {}
+
+    def json(self):
+        return self._data
+
+
+class _FakeHttp:
+    def __init__(self, responses: list, delay_s: float = 0.0):
+        self.responses = list(responses)
+        self.delay_s = delay_s
+        self.calls = 0
+        self.timeouts: list[float] = []
+        self._lock = threading.Lock()
+
+    def post(self, url, *, headers, json, timeout):
+        with self._lock:
+            self.calls += 1
+            self.timeouts.append(timeout)
+            outcome = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        if self.delay_s:
+            time.sleep(self.delay_s)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+def _client(fake: _FakeHttp, **kwargs) -> RerankApiClient:
+    kwargs.setdefault("backoff_base_ms", 1)
+    kwargs.setdefault("backoff_max_ms", 2)
+    client = RerankApiClient(**kwargs)
+    client._http = lambda: fake
+    return client
+
+
+def _post(client: RerankApiClient, query: str = "q") -> dict:
+    return client.post_json("https://rerank.local", headers={}, payload={"query": query}, timeout_s=1.0)
+
+
+def test_retries_transient_errors_then_succeeds():
+    fake = _FakeHttp([httpx.ConnectError("boom"), _Resp(503), _Resp(200, {"results": [{"index": 0}]})])
+    client = _client(fake, max_retries=2)
+
+    assert _post(client) == {"results": [{"index": 0}]}
+    assert fake.calls == 3
+    assert client.stats["retries"] == 2
+    assert client.breaker.state == "closed"
+
+
+def test_client_errors_are_not_retried():
+    fake = _FakeHttp([_Resp(401)])
+    client = _client(fake, max_retries=3)
+
+    with pytest.raises(RerankApiStatusError):
+        _post(client)
+    assert fake.calls == 1
+
+
+def test_client_errors_do_not_trip_the_breaker():
+    fake = _FakeHttp([_Resp(400)])
+    client = _client(fake, max_retries=0, breaker=CircuitBreaker(failure_threshold=1))
+
+    for _ in range(3):
+        with pytest.raises(RerankApiStatusError):
+            _post(client)
+    assert fake.calls == 3
+    assert client.breaker.state == "closed"
+
+
+def test_retries_stop_at_the_overall_deadline():
+    fake = _FakeHttp([_Resp(503)], delay_s=0.04)
+    client = _client(fake, max_retries=10, backoff_base_ms=20, backoff_max_ms=20)
+
+    started = time.monotonic()
+    with pytest.raises(RerankApiStatusError):
+        client.post_json("https://rerank.local", headers={}, payload={"query": "q"}, timeout_s=0.1)
+
+    assert time.monotonic() - started < 0.5
+    assert 1 <= fake.calls <= 3
+    assert fake.timeouts[0] <= 0.1
+    assert all(later < earlier for earlier, later in zip(fake.timeouts, fake.timeouts[1:]))
+    assert client.stats["deadline_exhausted"] == 1
+
+
+def test_breaker_opens_and_recovers_after_reset_timeout():
+    fake = _FakeHttp([_Resp(500)])
+    client = _client(fake, max_retries=0, breaker=CircuitBreaker(failure_threshold=2, reset_timeout_s=0.05))
+
+    for _ in range(2):
+        with pytest.raises(RerankApiStatusError):
+            _post(client)
+    with pytest.raises(CircuitOpenError):
+        _post(client)
+    assert fake.calls == 2
+    assert client.stats["breaker_rejections"] == 1
+
+    time.sleep(0.06)
+    fake.responses = [_Resp(200)]
+    assert client.breaker.state == "half_open"
+    _post(client)
+    assert client.breaker.state == "closed"
+
+
+def test_identical_concurrent_requests_are_coalesced():
+    fake = _FakeHttp([_Resp(200, {"results": [{"index": 0, "relevance_score": 0.5}]})], delay_s=0.2)
+    client = _client(fake)
+    results: list[dict] = []
+
+    threads = [threading.Thread(target=lambda: results.append(_post(client))) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert fake.calls == 1
+    assert len(results) == 4 and all(r == results[0] for r in results)
+    assert client.stats["coalesced"] == 3
+
+    _post(client, query="other")
+    assert fake.calls == 2
+
+
+def test_waiting_for_a_slot_or_a_coalesced_call_counts_against_the_deadline():
+    fake = _FakeHttp([_Resp(200)], delay_s=0.3)
+    client = _client(fake, max_concurrency=1)
+    leader = threading.Thread(target=lambda: _post(client, query="slow"))
+    leader.start()
+    time.sleep(0.05)
+
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):  # same query: waits on the leader's call
+        client.post_json("https://rerank.local", headers={}, payload={"query": "slow"}, timeout_s=0.05)
+    with pytest.raises(TimeoutError):  # other query: waits for the only slot
+        client.post_json("https://rerank.local", headers={}, payload={"query": "other"}, timeout_s=0.05)
+    assert time.monotonic() - started < 0.25
+    leader.join()
+
+    assert fake.calls == 1
+    assert client.stats["deadline_exhausted"] == 2
+    assert client.breaker.state == "closed"
@@ -2,11 +2,22 @@
 
 from __future__ import annotations
 
+import threading
+import time
 from unittest import mock
 
 import pytest
 
-from app.reranker import _rerank_api, _rerank_simple, _sigmoid, _tokenize, rerank_items
+from app.rerank_cache import rerank_score_cache_stats
+from app.reranker import (
+    CrossEncoderBatcher,
+    _rerank_api,
+    _rerank_simple,
+    _sigmoid,
+    _tokenize,
+    rerank_items,
+    warmup_cross_encoder,
+)
 
 # ---------------------------------------------------------------------------
 # Fixtures
@@ -193,7 +204,7 @@ class TestRerankApi:
                 ]
             }
         )
-        with mock.patch("httpx.post", return_value=fake_resp) as mock_post:
+        with mock.patch("httpx.Client.post", return_value=fake_resp) as mock_post:
             result = _rerank_api("test query", items, backend="cohere")
 
         mock_post.assert_called_once()
@@ -216,7 +227,7 @@ class TestRerankApi:
                 ]
             }
         )
-        with mock.patch("httpx.post", return_value=fake_resp) as mock_post:
+        with mock.patch("httpx.Client.post", return_value=fake_resp) as mock_post:
             result = _rerank_api("query", items, backend="jina")
 
         assert "api.jina.ai" in mock_post.call_args.args[0]
@@ -233,7 +244,7 @@ class TestRerankApi:
     def test_api_rerank_http_error_falls_back(self, monkeypatch):
         monkeypatch.setenv("COHERE_API_KEY", "test-key")
         items = _make_items(3)
-        with mock.patch("httpx.post", side_effect=Exception("connection failed")):
+        with mock.patch("httpx.Client.post", side_effect=Exception("connection failed")):
             result = _rerank_api("query", items, backend="cohere")
         assert len(result) == 3
         assert all("score_rerank" in it for it in result)
@@ -250,7 +261,7 @@ class TestRerankApi:
                 ]
             }
         )
-        with mock.patch("httpx.post", return_value=fake_resp) as mock_post:
+        with mock.patch("httpx.Client.post", return_value=fake_resp) as mock_post:
             _rerank_api("q", items, backend="jina")
         assert mock_post.call_args.kwargs["json"]["model"] == "jina-reranker-v3-custom"
 
@@ -265,7 +276,185 @@ class TestRerankApi:
                 ]
             }
         )
-        with mock.patch("httpx.post", return_value=fake_resp):
+        with mock.patch("httpx.Client.post", return_value=fake_resp):
             result = rerank_items("q", items, backend="cohere")
         assert len(result) == 2
         assert result[0]["score_rerank"] == 0.8
+
+
+# ---------------------------------------------------------------------------
+# Cross-encoder micro-batching executor
+# ---------------------------------------------------------------------------
+
+
+class _FakeCrossEncoder:
+    def __init__(self, delay_s: float = 0.0):
+        self.delay_s = delay_s
+        self.calls: list[int] = []
+
+    def predict(self, pairs):
+        self.calls.append(len(pairs))
+        if self.delay_s:
+            time.sleep(self.delay_s)
+        return [float(len(doc)) for _, doc in pairs]
+
+
+class TestCrossEncoderBatcher:
+    def test_concurrent_requests_share_one_predict(self):
+        model = _FakeCrossEncoder()
+        batcher = CrossEncoderBatcher(model, window_ms=200, max_pairs=64)
+        results: dict[int, list[float]] = {}
+
+        def worker(i: int) -> None:
+            results[i] = batcher.score([("q", "x" * (i + 1)), ("q", "y")], timeout_s=5)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        batcher.close()
+
+        assert sum(model.calls) == 8
+        assert len(model.calls) < 4
+        assert results[2] == [3.0, 1.0]
+
+    def test_large_request_is_chunked_by_max_pairs(self):
+        model = _FakeCrossEncoder()
+        batcher = CrossEncoderBatcher(model, window_ms=0, max_pairs=3)
+        scores = batcher.score([("q", "d")] * 7, timeout_s=5)
+        batcher.close()
+        assert scores == [1.0] * 7
+        assert model.calls == [3, 3, 1]
+
+    def test_timed_out_request_stops_at_chunk_boundary(self):
+        model = _FakeCrossEncoder(delay_s=0.1)
+        batcher = CrossEncoderBatcher(model, window_ms=0, max_pairs=1)
+        with pytest.raises(TimeoutError):
+            batcher.score([("q", "d")] * 20, timeout_s=0.05)
+        time.sleep(0.3)
+        batcher.close()
+        assert len(model.calls) < 20
+
+    def test_rerank_cross_encoder_uses_resident_batcher(self, monkeypatch):
+        import app.reranker as mod
+
+        model = _FakeCrossEncoder()
+        monkeypatch.setattr(mod, "_cross_encoder_cache", {mod.RERANK_MODEL_NAME: model})
+        monkeypatch.setattr(mod, "_cross_encoder_batchers", {})
+        items = [{"chunk_id": "short", "text": "a"}, {"chunk_id": "long", "text": "abcd"}]
+
+        first = rerank_items("q", items, backend="cross-encoder")
+        second = rerank_items("q", items, backend="cross-encoder")
+
+        assert [it["chunk_id"] for it in first] == ["long", "short"]
+        assert first == second
+        assert len(mod._cross_encoder_batchers) == 1
+        assert warmup_cross_encoder() is True
+
+
+# ---------------------------------------------------------------------------
+# Rerank score cache
+# ---------------------------------------------------------------------------
+
+
+class TestRerankScoreCaching:
+    def test_api_only_sends_unseen_pairs(self, monkeypatch):
+        monkeypatch.setenv("JINA_API_KEY", "test-key")
+        first_resp = _FakeResponse(
+            {"results": [{"index": 0, "relevance_score": 0.7}, {"index": 1, "relevance_score": 0.2}]}
+        )
+        with mock.patch("httpx.Client.post", return_value=first_resp):
+            _rerank_api("warranty terms", _make_items(2), backend="jina")
+
+        second_resp = _FakeResponse({"results": [{"index": 0, "relevance_score": 0.9}]})
+        with mock.patch("httpx.Client.post", return_value=second_resp) as mock_post:
+            result = _rerank_api("Warranty  terms", _make_items(3), backend="jina")
+
+        assert mock_post.call_args.kwargs["json"]["documents"] == ["chunk text 2"]
+        assert [(it["chunk_id"], it["score_rerank"]) for it in result] == [
+            ("ck_2", 0.9),
+            ("ck_0", 0.7),
+            ("ck_1", 0.2),
+        ]
+        stats = rerank_score_cache_stats()
+        assert (stats["hits"], stats["misses"]) == (2, 3)
+
+    def test_fully_cached_query_skips_api(self, monkeypatch):
+        monkeypatch.setenv("JINA_API_KEY", "test-key")
+        resp = _FakeResponse({"results": [{"index": 0, "relevance_score": 0.5}]})
+        with mock.patch("httpx.Client.post", return_value=resp):
+            _rerank_api("q", _make_items(1), backend="jina")
+        with mock.patch("httpx.Client.post") as mock_post:
+            result = _rerank_api("q", _make_items(1), backend="jina")
+        mock_post.assert_not_called()
+        assert result[0]["score_rerank"] == 0.5
+
+    def test_cache_can_be_disabled(self, monkeypatch):
+        monkeypatch.setenv("JINA_API_KEY", "test-key")
+        monkeypatch.setenv("RERANK_CACHE_ENABLED", "false")
+        resp = _FakeResponse({"results": [{"index": 0, "relevance_score": 0.5}]})
+        with mock.patch("httpx.Client.post", return_value=resp) as mock_post:
+            _rerank_api("q", _make_items(1), backend="jina")
+            _rerank_api("q", _make_items(1), backend="jina")
+        assert mock_post.call_count == 2
+
+    def test_cross_encoder_scores_only_unseen_pairs(self, monkeypatch):
+        import app.reranker as mod
+
+        model = _FakeCrossEncoder()
+        monkeypatch.setattr(mod, "_cross_encoder_cache", {mod.RERANK_MODEL_NAME: model})
+        monkeypatch.setattr(mod, "_cross_encoder_batchers", {})
+
+        rerank_items("q", [{"chunk_id": "a", "text": "aa"}], backend="cross-encoder")
+        rerank_items("q", [{"chunk_id": "a", "text": "aa"}, {"chunk_id": "b", "text": "b"}], backend="cross-encoder")
+
+        assert model.calls == [1, 1]
+
+
+class TestSimpleBackendCorpusIdf:
+    def test_uses_corpus_idf_from_bm25_index(self, monkeypatch):
+        import app.bm25_index as bm25_mod
+
+        index = bm25_mod.Bm25Index()
+        meta = {"tenant_id": "t1", "project_id": "p1", "supplier_id": "s1"}
+        corpus = [(f"c{i}", f"common filler {i}", meta) for i in range(20)]
+        corpus += [("rare_doc", "rare common", meta), ("common_doc", "common common", meta)]
+        index.upsert(index_name="idx", docs=corpus)
+        monkeypatch.setattr(bm25_mod, "get_bm25_index", lambda: index)
+
+        items = [
+            {"chunk_id": "common_doc", "score_raw": 0.5, "text": "", "metadata": meta},
+            {"chunk_id": "rare_doc", "score_raw": 0.5, "text": "", "metadata": meta},
+        ]
+        result = _rerank_simple("rare common", items)
+
+        # Text is empty: term frequencies must come from the index postings.
+        assert result[0]["chunk_id"] == "rare_doc"
+        assert result[0]["score_rerank"] > result[1]["score_rerank"] > 0.3
+
+    def test_falls_back_to_candidate_idf_without_shared_scope(self):
+        items = [
+            {"chunk_id": "a", "score_raw": 0.5, "text": "bidding rules", "metadata": {"tenant_id": "t1"}},
+            {"chunk_id": "b", "score_raw": 0.5, "text": "other", "metadata": {"tenant_id": "t2"}},
+        ]
+        result = _rerank_simple("bidding", items)
+        assert result[0]["chunk_id"] == "a"
+
+    def test_indexed_and_unindexed_candidates_share_doc_lengths(self, monkeypatch):
+        import app.bm25_index as bm25_mod
+
+        index = bm25_mod.Bm25Index()
+        meta = {"tenant_id": "t1", "project_id": "p1", "supplier_id": "s1"}
+        text = "条款 5.2.3 型号 ABC-123 要求"
+        index.upsert(index_name="idx", docs=[("indexed", text, meta), ("other", "无关 内容", meta)])
+        monkeypatch.setattr(bm25_mod, "get_bm25_index", lambda: index)
+
+        items = [
+            {"chunk_id": "indexed", "score_raw": 0.5, "text": text, "metadata": meta},
+            {"chunk_id": "not_indexed", "score_raw": 0.5, "text": text, "metadata": meta},
+        ]
+        result = _rerank_simple("要求", items)
+
+        # Compound codes count towards doc_len on both paths, so identical text scores identically.
+        assert result[0]["score_rerank"] == result[1]["score_rerank"]
@@ -398,3 +398,44 @@ def test_retrieval_query_uses_lightrag_index_prefix_and_filters_metadata(client,
     assert data["index_name"] == "lightragx_tenant_a_prj_a"
     assert data["total"] == 1
     assert data["items"][0]["chunk_id"] == "ck_retr_a1"
+
+
+def test_retrieval_query_pushes_term_constraints_to_lightrag(monkeypatch):
+    monkeypatch.setenv("LIGHTRAG_DSN", "http://lightrag.local")
+    sent: list[dict] = []
+
+    def fake_post_json(*, endpoint, payload, timeout_s):
+        sent.append(payload)
+        return {
+            "constraints_applied": True,
+            "items": [
+                {
+                    "chunk_id": f"ck_push_{i}",
+                    "score_raw": 0.9 - i * 0.1,
+                    "metadata": {"tenant_id": "tenant_a", "project_id": "prj_a", "supplier_id": "sup_a"},
+                }
+                for i in range(3)
+            ],
+        }
+
+    monkeypatch.setattr(store, "_post_json", fake_post_json)
+    result = store.retrieval_query(
+        tenant_id="tenant_a",
+        project_id="prj_a",
+        supplier_id="sup_a",
+        query="质保期",
+        query_type="fact",
+        high_risk=False,
+        top_k=3,
+        doc_scope=[],
+        enable_rerank=False,
+        must_include_terms=["质保"],
+        must_exclude_terms=["违约"],
+    )
+
+    assert sent[0]["filters"]["must_include"] == ["质保"]
+    assert sent[0]["filters"]["must_exclude"] == ["违约"]
+    # Items carry no text locally; the index already enforced the constraints.
+    assert result["total"] == 3
+    assert all("_prefiltered" not in item for item in result["items"])
+    assert store.parser_retrieval_metrics["retrieval_constraint_pushdown_total"] == 1
@@ -1,6 +1,8 @@
 """Tests for S3ObjectStorage with mocked boto3."""
 
+import json
 import sys
+from dataclasses import replace
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -183,3 +185,273 @@ def test_local_storage_presigned_url_returns_none():
     # LocalStorage should return None (not supported)
     url = storage.get_presigned_url(storage_uri=uri, expires_in=3600)
     assert url is None
+
+
+def test_s3_put_object_file_uses_managed_upload(mock_boto3):
+    """put_object_file should stream through upload_fileobj (multipart for large files)."""
+    import importlib
+    import io
+
+    import app.object_storage as object_storage_module
+
+    importlib.reload(object_storage_module)
+
+    from app.object_storage import ObjectStorageConfig, S3ObjectStorage
+
+    _, mock_client = mock_boto3
+    config = ObjectStorageConfig(
+        backend="s3",
+        bucket="test-bucket",
+        root="/tmp",
+        prefix="",
+        worm_mode=False,
+        endpoint="http://localhost:9000",
+        region="us-east-1",
+        access_key="key",
+        secret_key="secret",
+        force_path_style=True,
+        retention_days=0,
+        retention_mode="GOVERNANCE",
+    )
+    storage = S3ObjectStorage(config=config)
+    fileobj = io.BytesIO(b"zip-bytes")
+
+    uri = storage.put_object_file(
+        tenant_id="tenant_1",
+        object_type="document_parse",
+        object_id="doc_1",
+        filename="result.zip",
+        fileobj=fileobj,
+        content_type="application/zip",
+    )
+
+    assert uri == "object://s3/test-bucket/tenants/tenant_1/document_parse/doc_1/result.zip"
+    mock_client.upload_fileobj.assert_called_once_with(
+        fileobj,
+        "test-bucket",
+        "tenants/tenant_1/document_parse/doc_1/result.zip",
+        ExtraArgs={"ContentType": "application/zip"},
+    )
+    mock_client.put_object.assert_not_called()
+
+
+def test_local_storage_put_object_file_streams_to_disk(tmp_path):
+    """LocalStorage put_object_file should copy the file object and write metadata."""
+    import io
+
+    from app.object_storage import LocalObjectStorage, ObjectStorageConfig
+
+    config = ObjectStorageConfig(
+        backend="local",
+        bucket="test-bucket",
+        root=str(tmp_path),
+        prefix="",
+        worm_mode=False,
+        endpoint="",
+        region="",
+        access_key="",
+        secret_key="",
+        force_path_style=True,
+        retention_days=0,
+        retention_mode="GOVERNANCE",
+    )
+    storage = LocalObjectStorage(config=config)
+    payload = b"x" * (3 << 20)
+
+    uri = storage.put_object_file(
+        tenant_id="tenant_1",
+        object_type="document_parse",
+        object_id="doc_1",
+        filename="result.zip",
+        fileobj=io.BytesIO(payload),
+        content_type="application/zip",
+    )
+
+    assert storage.get_object(storage_uri=uri) == payload
+    meta_files = list(tmp_path.rglob("result.zip.meta.json"))
+    assert len(meta_files) == 1
+    assert '"content_type": "application/zip"' in meta_files[0].read_text()
+
+
+def test_s3_put_objects_uploads_in_parallel_and_keeps_order(mock_boto3):
+    """put_objects should fan out over the pool, multipart large bodies and return URIs in order."""
+    import importlib
+
+    import app.object_storage as object_storage_module
+
+    importlib.reload(object_storage_module)
+
+    from app.object_storage import ObjectPut, ObjectStorageConfig, S3ObjectStorage
+
+    _, mock_client = mock_boto3
+    config = ObjectStorageConfig(
+        backend="s3",
+        bucket="test-bucket",
+        root="/tmp",
+        prefix="",
+        worm_mode=False,
+        endpoint="http://localhost:9000",
+        region="us-east-1",
+        access_key="key",
+        secret_key="secret",
+        force_path_style=True,
+        retention_days=0,
+        retention_mode="GOVERNANCE",
+        upload_concurrency=4,
+        multipart_threshold_bytes=5 << 20,
+    )
+    storage = S3ObjectStorage(config=config)
+    objects = [
+        ObjectPut(object_type="document_parse", object_id="doc_1/images", filename=f"img_{i}.png", content_bytes=b"x")
+        for i in range(6)
+    ]
+    objects.append(
+        ObjectPut(object_type="document", object_id="doc_1", filename="big.pdf", content_bytes=b"x" * (5 << 20))
+    )
+
+    uris = storage.put_objects(tenant_id="tenant_1", objects=objects)
+
+    assert [uri.rsplit("/", 1)[-1] for uri in uris] == [f"img_{i}.png" for i in range(6)] + ["big.pdf"]
+    assert mock_client.put_object.call_count == 6
+    mock_client.upload_fileobj.assert_called_once()
+    assert mock_client.upload_fileobj.call_args.args[2] == "tenants/tenant_1/documents/doc_1/raw/big.pdf"
+
+
+def test_local_storage_put_objects_batches_metadata(tmp_path):
+    """LocalStorage put_objects writes one metadata file per directory and honours WORM."""
+    from app.object_storage import LocalObjectStorage, ObjectPut, ObjectStorageConfig
+
+    config = ObjectStorageConfig(
+        backend="local",
+        bucket="test-bucket",
+        root=str(tmp_path),
+        prefix="",
+        worm_mode=True,
+        endpoint="",
+        region="",
+        access_key="",
+        secret_key="",
+        force_path_style=True,
+        retention_days=0,
+        retention_mode="GOVERNANCE",
+    )
+    storage = LocalObjectStorage(config=config)
+    objects = [
+        ObjectPut(
+            object_type="document_parse",
+            object_id="doc_1/images",
+            filename=f"img_{i}.png",
+            content_bytes=f"img{i}".encode(),
+            content_type="image/png",
+        )
+        for i in range(3)
+    ]
+
+    uris = storage.put_objects(tenant_id="tenant_1", objects=objects)
+    assert [storage.get_object(storage_uri=uri) for uri in uris] == [b"img0", b"img1", b"img2"]
+    meta_files = list(tmp_path.rglob("*.meta.json"))
+    assert [path.name for path in meta_files] == ["@batch.meta.json"]
+    assert storage.is_legal_hold_active(storage_uri=uris[1]) is False
+    assert storage.apply_legal_hold(storage_uri=uris[1]) is True
+    assert storage.is_legal_hold_active(storage_uri=uris[1]) is True
+    assert storage.release_legal_hold(storage_uri=uris[1]) is True
+    assert storage.delete_object(storage_uri=uris[2]) is True
+    assert "img_2.png" not in json.loads(meta_files[0].read_text(encoding="utf-8"))
+
+    # WORM: existing objects are not overwritten.
+    again = storage.put_objects(
+        tenant_id="tenant_1",
+        objects=[
+            ObjectPut(
+                object_type="document_parse", object_id="doc_1/images", filename="img_0.png", content_bytes=b"new"
+            )
+        ],
+    )
+    assert again == uris[:1]
+    assert storage.get_object(storage_uri=uris[0]) == b"img0"
+
+
+def test_s3_ranged_reads_and_download_redirect(mock_boto3):
+    """S3 open_stream sends a Range header; download redirects presign only when enabled."""
+    import importlib
+
+    import app.object_storage as object_storage_module
+
+    importlib.reload(object_storage_module)
+
+    from app.object_storage import ObjectStorageConfig, S3ObjectStorage
+
+    _, mock_client = mock_boto3
+
+    config = ObjectStorageConfig(
+        backend="s3",
+        bucket="test-bucket",
+        root="/tmp",
+        prefix="",
+        worm_mode=False,
+        endpoint="",
+        region="",
+        access_key="",
+        secret_key="",
+        force_path_style=True,
+        retention_days=0,
+        retention_mode="GOVERNANCE",
+    )
+    storage = S3ObjectStorage(config=config)
+    uri = "object://s3/test-bucket/tenants/tenant_1/documents/doc_1/raw/test.pdf"
+    mock_client.get_object.return_value = {"Body": MagicMock(iter_chunks=MagicMock(return_value=iter([b"PDF"])))}
+    mock_client.head_object.return_value = {"ContentLength": 42}
+
+    assert storage.get_range(storage_uri=uri, start=1, end=3) == b"PDF"
+    mock_client.get_object.assert_called_once_with(
+        Bucket="test-bucket", Key="tenants/tenant_1/documents/doc_1/raw/test.pdf", Range="bytes=1-3"
+    )
+    assert storage.object_size(storage_uri=uri) == 42
+    assert storage.local_path(storage_uri=uri) is None
+    assert storage.download_redirect_url(storage_uri=uri) is None
+
+    mock_client.generate_presigned_url.return_value = "https://test-bucket.s3.amazonaws.com/key?sig=abc"
+    redirecting = S3ObjectStorage(config=replace(config, download_redirect=True, download_url_expires_s=60))
+    assert redirecting.download_redirect_url(storage_uri=uri) == "https://test-bucket.s3.amazonaws.com/key?sig=abc"
+    assert mock_client.generate_presigned_url.call_args.kwargs["ExpiresIn"] == 60
+
+
+def test_local_storage_ranged_reads(tmp_path):
+    """LocalStorage streams inclusive byte ranges in chunks and exposes the file path."""
+    from app.object_storage import LocalObjectStorage, ObjectStorageConfig
+
+    config = ObjectStorageConfig(
+        backend="local",
+        bucket="test-bucket",
+        root=str(tmp_path),
+        prefix="",
+        worm_mode=True,
+        endpoint="",
+        region="",
+        access_key="",
+        secret_key="",
+        force_path_style=True,
+        retention_days=0,
+        retention_mode="GOVERNANCE",
+    )
+    storage = LocalObjectStorage(config=config)
+    uri = storage.put_object(
+        tenant_id="tenant_1", object_type="document", object_id="doc_1", filename="a.pdf", content_bytes=b"0123456789"
+    )
+
+    assert storage.get_range(storage_uri=uri, start=2, end=5) == b"2345"
+    assert list(storage.open_stream(storage_uri=uri, start=3, chunk_size=3)) == [b"345", b"678", b"9"]
+    assert storage.object_size(storage_uri=uri) == 10
+    assert storage.local_path(storage_uri=uri).endswith("a.pdf")
+    with pytest.raises(FileNotFoundError):
+        storage.open_stream(storage_uri=uri.replace("a.pdf", "missing.pdf"))
+
+
+@pytest.mark.parametrize(("raw", "expected"), [("", False), ("maybe", False), ("false", False), ("true", True)])
+def test_download_redirect_flag_is_opt_in(mock_boto3, raw, expected):
+    from app.object_storage import create_object_storage_from_env
+
+    storage = create_object_storage_from_env(
+        {"BEA_OBJECT_STORAGE_BACKEND": "s3", "OBJECT_STORAGE_DOWNLOAD_REDIRECT": raw}
+    )
+    assert storage._download_redirect is expected
@@ -9,7 +9,9 @@ from app.token_budget import (
     MIN_EVIDENCE_PER_CRITERIA,
     _dedup_by_document,
     apply_report_budget,
+    chunk_token_count,
     count_tokens,
+    estimate_tokens,
     trim_evidence_to_budget,
 )
 
@@ -192,3 +194,68 @@ class TestTrimEvidenceDedup:
         result = trim_evidence_to_budget(ev, max_tokens=100_000)
         doc_ids = [r["document_id"] for r in result]
         assert doc_ids.count("d1") == 1
+
+
+# ---------------------------------------------------------------------------
+# Estimator and cached counts
+# ---------------------------------------------------------------------------
+
+
+class TestEstimateTokens:
+    def test_cjk_counts_per_character(self):
+        text = "招标文件要求投标人具有一级资质"
+        # UTF-8 bytes/4 would give 11 for 15 ideographs; cl100k needs at least one token each.
+        assert estimate_tokens(text) >= len(text)
+
+    def test_english_words_and_numbers(self):
+        assert estimate_tokens("hello world") == 2
+        assert estimate_tokens("2024") == 2
+
+    def test_mixed_text_is_additive(self):
+        mixed = "注册资本 5000 万元，ISO9001 认证。"
+        assert estimate_tokens(mixed) > estimate_tokens("注册资本万元认证")
+
+    def test_count_tokens_falls_back_to_estimator(self, monkeypatch):
+        monkeypatch.setattr("app.token_budget._get_encoder", lambda: None)
+        count_tokens.cache_clear()
+        try:
+            assert count_tokens("资质证书齐全") == estimate_tokens("资质证书齐全")
+        finally:
+            count_tokens.cache_clear()
+
+
+class TestCachedCounts:
+    def test_stored_token_count_is_used(self):
+        assert chunk_token_count({"text": "a" * 4000, "token_count": 7}) == 7
+        assert chunk_token_count({"text": "hello world"}) == count_tokens("hello world")
+
+    def test_report_budget_counts_each_item_once(self, monkeypatch):
+        calls: list[str] = []
+
+        def counting(text: str) -> int:
+            calls.append(text)
+            return 100
+
+        monkeypatch.setattr("app.token_budget.count_tokens", counting)
+        data = {"c1": _make_evidence(6, text_len=50), "c2": _make_evidence(6, text_len=50)}
+        result = apply_report_budget(data, max_tokens=500)
+
+        assert sum(len(v) for v in result.values()) == 5
+        # one count per item in the trim pass and one for the report total; removals reuse the integers
+        assert len(calls) == 2 * 12
+
+    def test_report_budget_uses_parse_time_counts(self, monkeypatch):
+        monkeypatch.setattr("app.token_budget.count_tokens", lambda text: pytest.fail("recounted"))
+        data = {
+            "c1": [dict(item, token_count=200) for item in _make_evidence(4, text_len=50)],
+            "c2": [dict(item, token_count=200) for item in _make_evidence(4, text_len=50)],
+        }
+        result = apply_report_budget(data, max_tokens=1000)
+        assert sum(len(v) for v in result.values()) == 5
+
+
+def test_ensure_chunk_shape_stores_token_count():
+    from app.store import InMemoryStore
+
+    chunk = InMemoryStore._ensure_chunk_shape(document_id="doc_1", chunk={"text": "投标人须具备一级资质"})
+    assert chunk["token_count"] == count_tokens("投标人须具备一级资质")
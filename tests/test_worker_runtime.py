@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import threading
+
 from app.queue_backend import InMemoryQueueBackend
 from app.store import InMemoryStore
 from app.worker_runtime import WorkerRuntime
@@ -44,6 +46,52 @@ def test_worker_runtime_processes_multiple_tenants_fairly():
     assert s.get_job_for_tenant(job_id=job_b, tenant_id="tenant_b")["status"] == "succeeded"
 
 
+class _BlockingParseStore:
+    """Parse jobs wait until ``expected`` of them are running at once (what the MinerU coordinator needs)."""
+
+    def __init__(self, *, expected: int) -> None:
+        self.barrier = threading.Barrier(expected, timeout=5)
+        self.lock = threading.Lock()
+        self.running = 0
+        self.peak = 0
+
+    def run_job_once(self, *, job_id: str, tenant_id: str) -> dict[str, str]:
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        try:
+            self.barrier.wait()
+        finally:
+            with self.lock:
+                self.running -= 1
+        return {"job_id": job_id, "final_status": "succeeded"}
+
+
+def test_worker_keeps_several_parse_jobs_in_flight():
+    s = _BlockingParseStore(expected=2)
+    q = InMemoryQueueBackend()
+    rt = WorkerRuntime(
+        store=s,
+        queue_backend=q,
+        queue_names=["jobs"],
+        tenant_burst_limit=2,
+        max_messages_per_iteration=4,
+        parse_concurrency=2,
+    )
+    try:
+        q.enqueue(tenant_id="tenant_a", queue_name="jobs", payload={"job_id": "job_1", "job_type": "parse"})
+        q.enqueue(tenant_id="tenant_a", queue_name="jobs", payload={"job_id": "job_2", "job_type": "parse"})
+        result = rt.run_once()
+    finally:
+        rt.close()
+
+    assert s.peak == 2
+    assert result["processed"] == 2
+    assert result["succeeded"] == 2
+    assert result["acked"] == 2
+    assert q.list_tenants(queue_name="jobs") == []
+
+
 def test_store_reads_worker_runtime_config_from_env(monkeypatch):
     monkeypatch.setenv("RESUME_TOKEN_TTL_HOURS", "12")
     monkeypatch.setenv("WORKER_MAX_RETRIES", "5")